@@ -0,0 +1,374 @@
+#!/usr/bin/env python
+# [SublimeLinter pep8-max-line-length:300]
+# -*- coding: utf-8 -*-
+
+"""
+Runs Runner.do_run on synthetic economies of growing size and reports
+the throughput (sweeps and transactions per second), the peak memory
+and the time taken by each phase of Updater.do_update for every size.
+The results are stored in a json file, and compared with the results
+of an earlier run if one is given.
+
+Usage:
+./benchmarks/benchmark_scaling.py [--sizes 10,100,1000] [--sweeps 10] [--transactions 1]
+                                  [--on-disk] [--no-profile] [--output results.json] [--baseline results.json]
+Example (run from the root of the repository):
+./benchmarks/benchmark_scaling.py --sizes 10,100,1000,10000 --sweeps 5 --output benchmarks/results/scaling.json
+
+black_rhino is a multi-agent simulator for financial network analysis
+Copyright (C) 2016 Co-Pierre Georg (co-pierre.georg@keble.ox.ac.uk)
+Pawel Fiedor (pawel@fiedor.eu)
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, version 3 of the License.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program. If not, see <http://www.gnu.org/licenses/>
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.append(os.path.join(ROOT, "src"))  # the updater imports the market as a top level module
+
+SIZES = [10, 100, 1000, 10000, 100000]
+IDENTIFIER = "benchmark_scaling"
+MEASUREMENT_CONFIG = "tests/measurements/test_output.xml"
+ASSETS = {"MBS": [0.05, 0.001, 0.0], "ABS": [0.07, 0.002, 0.0]}  # name -> [mean, variance, current returns]
+
+# the parameters of the agents, as in the configs of tests/agents/
+BANK_PARAMETERS = {"interest_rate_loans": 0.004, "interest_rate_deposits": 0.002, "target_leverage": 2.0}
+FIRM_PARAMETERS = {"productivity": 1.25, "total_factor_productivity": 1.8, "labour_elasticity": 0.3, "capital_elasticity": 0.7}
+HOUSEHOLD_PARAMETERS = {"labour": 24.0, "propensity_to_save": 0.4, "ownership_of_banks": 1.0}
+CENTRAL_BANK_PARAMETERS = {"interest_rate_cb_loans": 0.003}
+
+
+# -------------------------------------------------------------------------
+# agent_counts(num_agents)
+# returns the number of banks, firms and households of an economy of
+# num_agents agents (and one central bank), in the proportions 1:5:14
+# -------------------------------------------------------------------------
+def agent_counts(num_agents):
+    num_banks = max(1, num_agents // 20)
+    num_firms = max(1, num_agents // 4)
+    num_households = max(1, num_agents - num_banks - num_firms)
+    return num_banks, num_firms, num_households
+# -------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------
+# economy(num_agents, transactions_per_household)
+# returns the agents of the economy as kind -> list of (identifier,
+# parameters), and the initial transactions as a list of (type_, asset,
+# from_, to, amount, interest, maturity, time_of_default) by identifier.
+# Every household gets transactions_per_household deposits at a bank,
+# which lends them on to a firm, which holds capital of the household,
+# as the three agents of the test configs do
+# -------------------------------------------------------------------------
+def economy(num_agents, transactions_per_household=1):
+    num_banks, num_firms, num_households = agent_counts(num_agents)
+    agents = {"banks": [("bank_%d" % i, dict(BANK_PARAMETERS)) for i in range(num_banks)],
+              "firms": [("firm_%d" % i, dict(FIRM_PARAMETERS)) for i in range(num_firms)],
+              "households": [("household_%d" % i, dict(HOUSEHOLD_PARAMETERS)) for i in range(num_households)],
+              "central_bank": [("central_bank", dict(CENTRAL_BANK_PARAMETERS))]}
+    # the agents differ a little, so that the markets don't see identical agents
+    for i, (identifier, parameters) in enumerate(agents["households"]):
+        parameters["labour"] = 24.0 * (0.75 + 0.5 * ((i * 7919) % 101) / 100.0)
+    for i, (identifier, parameters) in enumerate(agents["firms"]):
+        parameters["productivity"] = 1.25 * (0.9 + 0.2 * ((i * 104729) % 101) / 100.0)
+    transactions = []
+    for i in range(num_households):
+        for k in range(transactions_per_household):
+            household = "household_%d" % i
+            bank = "bank_%d" % ((i + k) % num_banks)
+            firm = "firm_%d" % ((i + k) % num_firms)
+            transactions.append(("deposits", "", household, bank, 30.0, 0.0, 0, -1))
+            transactions.append(("loans", "", bank, firm, 30.0, 0.0, 0, -1))
+            transactions.append(("capital", "", firm, household, 30.0, 0.0, 0, -1))
+    return agents, transactions
+# -------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------
+# static_parameters(agents, num_sweeps, seed)
+# returns the static parameters of the environment of the economy
+# -------------------------------------------------------------------------
+def static_parameters(agents, num_sweeps, seed):
+    return {"num_simulations": 1.0,
+            "num_sweeps": float(num_sweeps),
+            "num_banks": float(len(agents["banks"])),
+            "num_firms": float(len(agents["firms"])),
+            "num_households": float(len(agents["households"])),
+            "measurement_config": MEASUREMENT_CONFIG,
+            "max_leverage_ratio": 3.0,
+            "seed": float(seed)}
+# -------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------
+# write_economy(directory, agents, transactions, num_sweeps, seed)
+# writes the config files of the economy to the directory, the deposits
+# and loans go into the files of the banks and the capital into those
+# of the firms, returns the directory of the environment config
+# -------------------------------------------------------------------------
+def write_economy(directory, agents, transactions, num_sweeps, seed):
+    from xml.sax.saxutils import quoteattr
+    directories = {"banks": "bank_directory", "firms": "firm_directory",
+                   "households": "household_directory", "central_bank": "central_bank_directory"}
+    tags = {"banks": "bank", "firms": "firm", "households": "household", "central_bank": "central_bank"}
+    owned = {}  # identifier -> transactions written to its file
+    for transaction in transactions:
+        owner = transaction[2] if transaction[0] != "deposits" else transaction[3]
+        owned.setdefault(owner, []).append(transaction)
+    parameters = static_parameters(agents, num_sweeps, seed)
+    for kind in agents:
+        parameters[directories[kind]] = os.path.join(directory, kind) + os.sep
+        os.makedirs(parameters[directories[kind]])
+        for identifier, agent_parameters in agents[kind]:
+            lines = ["<%s identifier=%s>" % (tags[kind], quoteattr(identifier))]
+            for name, value in sorted(agent_parameters.items()):
+                lines.append("    <parameter type='static' name='%s' value='%s'></parameter>" % (name, value))
+            for type_, asset, from_, to, amount, interest, maturity, time_of_default in owned.get(identifier, []):
+                lines.append("    <transaction type='%s' asset='%s' from='%s' to='%s' amount='%s' interest='%s' maturity='%s' time_of_default='%s'></transaction>"
+                             % (type_, asset, from_, to, amount, interest, maturity, time_of_default))
+            lines.append("</%s>" % tags[kind])
+            with open(os.path.join(parameters[directories[kind]], identifier + ".xml"), "w") as agent_file:
+                agent_file.write("\n".join(lines) + "\n")
+    lines = ["<environment identifier='%s'>" % IDENTIFIER]
+    for name, value in sorted(parameters.items()):
+        lines.append("    <parameter type='static' name='%s' value='%s'></parameter>" % (name, value))
+    for name, (mean, variance, current) in sorted(ASSETS.items()):
+        lines.append("    <parameter type='asset' name='%s' mean='%s' variance='%s'></parameter>" % (name, mean, variance))
+    lines.append("</environment>")
+    environment_directory = os.path.join(directory, "environments") + os.sep
+    os.makedirs(environment_directory)
+    with open(environment_directory + IDENTIFIER + ".xml", "w") as environment_file:
+        environment_file.write("\n".join(lines) + "\n")
+    return environment_directory
+# -------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------
+# snapshot_economy(agents, transactions, num_sweeps, seed)
+# returns the economy as a snapshot (see src.snapshot), so that the
+# environment is set up in memory by Environment.restore_snapshot
+# -------------------------------------------------------------------------
+def snapshot_economy(agents, transactions, num_sweeps, seed):
+    from src.bank import Bank
+    from src.firm import Firm
+    from src.household import Household
+    from src.central_bank import CentralBank
+    from src.snapshot import SNAPSHOT_FORMAT
+    snapshot_agents = {}
+    for kind, agent_class in [("banks", Bank), ("firms", Firm), ("households", Household), ("central_bank", CentralBank)]:
+        # the agents keep the default parameters of their class, as when read from a file
+        defaults = agent_class().parameters
+        snapshot_agents[kind] = []
+        for identifier, agent_parameters in agents[kind]:
+            parameters = dict(defaults)
+            parameters.update(agent_parameters)
+            snapshot_agents[kind].append((identifier, parameters, {}))
+    return {"format": SNAPSHOT_FORMAT,
+            "config_hash": None,
+            "identifier": IDENTIFIER,
+            "static_parameters": static_parameters(agents, num_sweeps, seed),
+            "variable_parameters": {},
+            "assets": ASSETS,
+            "shocks": [],
+            "agents": snapshot_agents,
+            "transactions": transactions,
+            "network": IDENTIFIER}
+# -------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------
+# build_environment(num_agents, options, profile)
+# returns the environment of the synthetic economy and the time taken
+# to set it up, with the profiler of the updates switched on if asked
+# -------------------------------------------------------------------------
+def build_environment(num_agents, options, profile=False):
+    from src.environment import Environment
+    agents, transactions = economy(num_agents, options.transactions)
+    start = time.perf_counter()
+    if options.on_disk:
+        directory = tempfile.mkdtemp(prefix="black_rhino_benchmark_")
+        try:
+            environment_directory = write_economy(directory, agents, transactions, options.sweeps, options.seed)
+            environment = Environment(environment_directory, IDENTIFIER)
+        finally:
+            shutil.rmtree(directory)
+    else:
+        environment = Environment.__new__(Environment)
+        environment.restore_snapshot(snapshot_economy(agents, transactions, options.sweeps, options.seed))
+    build_time = time.perf_counter() - start
+    if profile:
+        environment.static_parameters["profile_updates"] = 1.0
+    return environment, len(transactions), build_time
+# -------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------
+# run(environment)
+# does the run and returns the runner, the time taken and the number of
+# transactions made during the run, the rows of the measurement are kept
+# in memory and everything printed by the model is dropped
+# -------------------------------------------------------------------------
+def run(environment):
+    from src.runner import Runner
+    made = [0]
+    new_transaction = environment.new_transaction
+
+    def counting_new_transaction(*args):
+        made[0] = made[0] + 1
+        new_transaction(*args)
+
+    environment.new_transaction = counting_new_transaction
+    runner = Runner(environment)
+    rows = []
+    runner.measurement_sink = rows.append
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        start = time.perf_counter()
+        runner.do_run(environment)
+        elapsed = time.perf_counter() - start
+    del environment.new_transaction
+    return runner, elapsed, made[0]
+# -------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------
+# peak_memory()
+# returns the peak resident memory of the process in MB
+# -------------------------------------------------------------------------
+def peak_memory():
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":  # bytes on macOS, kilobytes elsewhere
+        return peak / 1e6
+    return peak / 1e3
+# -------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------
+# benchmark(num_agents, options)
+# returns the results for one size of the economy, it is done in a
+# process of its own so that the peak memory is that of this size only.
+# The throughput is taken from a run without the profiler, the phases
+# from a second run of the same economy (with the same seed) with it,
+# as the profiler counts the books around every phase
+# -------------------------------------------------------------------------
+def benchmark(num_agents, options):
+    os.chdir(ROOT)
+    environment, initial_transactions, build_time = build_environment(num_agents, options)
+    num_banks, num_firms, num_households = agent_counts(num_agents)
+    runner, elapsed, made = run(environment)
+    result = {"agents": num_agents,
+              "banks": num_banks,
+              "firms": num_firms,
+              "households": num_households,
+              "initial_transactions": initial_transactions,
+              "sweeps": options.sweeps,
+              "build_time": build_time,
+              "run_time": elapsed,
+              "sweeps_per_second": options.sweeps / elapsed,
+              "transactions": made,
+              "transactions_per_second": made / elapsed,
+              "peak_memory_mb": peak_memory(),
+              "phases": {}}
+    del runner, environment
+    if options.profile:
+        environment, initial_transactions, build_time = build_environment(num_agents, options, profile=True)
+        runner, elapsed, made = run(environment)
+        for name, (wall_time, created, removed, memory_peak) in runner.updater.profiler.summary():
+            result["phases"][name] = {"seconds_per_sweep": wall_time / options.sweeps,
+                                      "created": created,
+                                      "removed": removed,
+                                      "memory_peak_mb": memory_peak / 1e6}
+    return result
+# -------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------
+# print_result(result, baseline)
+# prints the result of one size, with the ratio to the baseline if any
+# -------------------------------------------------------------------------
+def print_result(result, baseline=None):
+    def ratio(key, values):
+        if baseline is None or key not in baseline or not baseline[key]:
+            return ""
+        return " (%.2fx)" % (values[key] / baseline[key])
+    print("%d agents (%d banks, %d firms, %d households), %d initial transactions"
+          % (result["agents"], result["banks"], result["firms"], result["households"], result["initial_transactions"]))
+    print("  %-34s %12.3f%s" % ("set up [s]", result["build_time"], ratio("build_time", result)))
+    print("  %-34s %12.2f%s" % ("sweeps / s", result["sweeps_per_second"], ratio("sweeps_per_second", result)))
+    print("  %-34s %12.1f%s" % ("transactions / s", result["transactions_per_second"], ratio("transactions_per_second", result)))
+    print("  %-34s %12.1f%s" % ("peak memory [MB]", result["peak_memory_mb"], ratio("peak_memory_mb", result)))
+    for name, phase in result["phases"].items():
+        baseline_phase = None if baseline is None else baseline.get("phases", {}).get(name)
+        change = ""
+        if baseline_phase is not None and baseline_phase["seconds_per_sweep"] > 0.0:
+            change = " (%.2fx)" % (phase["seconds_per_sweep"] / baseline_phase["seconds_per_sweep"])
+        print("  %-34s %12.5f%s" % (name + " [s / sweep]", phase["seconds_per_sweep"], change))
+# -------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------
+#
+#  MAIN
+#
+# -------------------------------------------------------------------------
+if __name__ == '__main__':
+
+    from multiprocessing import Pool
+
+    parser = argparse.ArgumentParser(description="Scaling benchmark of Runner.do_run on synthetic economies.")
+    parser.add_argument("--sizes", default=",".join(str(size) for size in SIZES), help="comma separated numbers of agents")
+    parser.add_argument("--sweeps", type=int, default=10, help="number of sweeps of every run")
+    parser.add_argument("--transactions", type=int, default=1, help="initial deposits, loans and capital per household")
+    parser.add_argument("--seed", type=int, default=1, help="seed of the runs")
+    parser.add_argument("--on-disk", action="store_true", help="write the economy to config files and read it from them")
+    parser.add_argument("--no-profile", dest="profile", action="store_false", help="skip the profiled run of the phases")
+    parser.add_argument("--output", default=None, help="json file the results are written to")
+    parser.add_argument("--baseline", default=None, help="json file of earlier results to compare with")
+    options = parser.parse_args()
+
+    baselines = {}
+    if options.baseline is not None:
+        with open(options.baseline) as baseline_file:
+            for result in json.load(baseline_file)["results"]:
+                baselines[result["agents"]] = result
+
+    results = []
+    for num_agents in [int(size) for size in options.sizes.split(",")]:
+        # a fresh process for every size, see benchmark
+        pool = Pool(1)
+        try:
+            result = pool.apply(benchmark, (num_agents, options))
+        finally:
+            pool.close()
+            pool.join()
+        print_result(result, baselines.get(num_agents))
+        results.append(result)
+
+    if options.output is not None:
+        directory = os.path.dirname(options.output)
+        if directory != "" and not os.path.isdir(directory):
+            os.makedirs(directory)
+        with open(options.output, "w") as output_file:
+            json.dump({"sweeps": options.sweeps, "transactions": options.transactions, "seed": options.seed,
+                       "on_disk": options.on_disk, "time": time.strftime("%Y-%m-%d %H:%M:%S"), "results": results},
+                      output_file, indent=2)
+        print("Results written to %s" % options.output)
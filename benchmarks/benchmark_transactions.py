@@ -0,0 +1,107 @@
+#!/usr/bin/env python
+# [SublimeLinter pep8-max-line-length:300]
+# -*- coding: utf-8 -*-
+
+"""
+Compares the memory footprint and construction time of Transaction
+and the slotted CompactTransaction on the test_all_methods environment
+scaled up to a given number of transactions.
+
+Usage:
+./benchmarks/benchmark_transactions.py [num_transactions]
+Example (run from the root of the repository):
+./benchmarks/benchmark_transactions.py 1000000
+
+black_rhino is a multi-agent simulator for financial network analysis
+Copyright (C) 2016 Co-Pierre Georg (co-pierre.georg@keble.ox.ac.uk)
+Pawel Fiedor (pawel@fiedor.eu)
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, version 3 of the License.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program. If not, see <http://www.gnu.org/licenses/>
+"""
+
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+# -------------------------------------------------------------------------
+# book_transactions(environment, num_transactions)
+# books deposits of households at banks, loans of banks to firms
+# and labour of households at firms in a round-robin fashion
+# -------------------------------------------------------------------------
+def book_transactions(environment, num_transactions):
+    kinds = [("deposits", environment.households, environment.banks, 0.02),
+             ("loans", environment.banks, environment.firms, 0.05),
+             ("labour", environment.households, environment.firms, 0.0)]
+    for i in range(num_transactions):
+        type_, originators, recipients, interest = kinds[i % len(kinds)]
+        from_ = originators[i % len(originators)]
+        to = recipients[(i // len(originators)) % len(recipients)]
+        environment.new_transaction(type_, "", from_.identifier, to.identifier, 1.0 + (i % 7), interest, 0, -1)
+# -------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------
+# measure(environment, num_transactions)
+# returns the time taken, and the net and peak memory allocated
+# while booking the transactions, the agents' books are emptied first
+# -------------------------------------------------------------------------
+def measure(environment, num_transactions):
+    from src.ledger import Ledger
+    for agent in environment.agents_generator():
+        agent.accounts = Ledger()
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    book_transactions(environment, num_transactions)
+    elapsed = time.perf_counter() - start
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, current, peak
+# -------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------
+#
+#  MAIN
+#
+# -------------------------------------------------------------------------
+if __name__ == '__main__':
+
+    from src.environment import Environment
+
+    if len(sys.argv) > 2:
+        print("Usage: ./benchmarks/benchmark_transactions.py [num_transactions]")
+        sys.exit()
+    num_transactions = 100000
+    if len(sys.argv) == 2:
+        num_transactions = int(sys.argv[1])
+
+    environment = Environment("tests/environments/", "test_all_methods")
+
+    results = {}
+    for compact in [0.0, 1.0]:
+        environment.static_parameters["compact_transactions"] = compact
+        results[compact] = measure(environment, num_transactions)
+
+    print("Booked %d transactions on the test_all_methods environment" % num_transactions)
+    print("%-20s %12s %16s %16s %14s" % ("", "time [s]", "net memory [MB]", "peak memory [MB]", "bytes / tranx"))
+    for compact, name in [(0.0, "Transaction"), (1.0, "CompactTransaction")]:
+        elapsed, current, peak = results[compact]
+        print("%-20s %12.3f %16.2f %16.2f %14.1f" % (name, elapsed, current / 1e6, peak / 1e6, float(current) / num_transactions))
+    print("Memory reduction: %.1f%%, speed-up: %.2fx" % (100.0 * (1.0 - float(results[1.0][1]) / results[0.0][1]),
+                                                          results[0.0][0] / results[1.0][0]))
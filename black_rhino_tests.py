@@ -36,32 +36,52 @@ if __name__ == '__main__':
     # sys.path.append('src/')
     import logging
 
+    from tests.tests_agent_loader import TestsAgentLoader
+    from tests.tests_aggregates import TestsAggregates
     from tests.tests_bank import TestsBank
     from tests.tests_central_bank import TestsCentralBank
+    from tests.tests_compact_transaction import TestsCompactTransaction
     from tests.tests_environment import TestsEnvironment
     from tests.tests_firm import TestsFirm
     from tests.tests_helper import TestsHelper
     from tests.tests_household import TestsHousehold
+    from tests.tests_ledger import TestsLedger
     from tests.tests_market import TestsMarket
     from tests.tests_measurement import TestsMeasurement
+    from tests.tests_monte_carlo import TestsMonteCarlo
     from tests.tests_network import TestsNetwork
+    from tests.tests_profiler import TestsProfiler
     from tests.tests_runner import TestsRunner
+    from tests.tests_settlement import TestsSettlement
     from tests.tests_shock import TestsShock
+    from tests.tests_snapshot import TestsSnapshot
+    from tests.tests_trace import TestsTrace
     from tests.tests_transaction import TestsTransaction
+    from tests.tests_transaction_store import TestsTransactionStore
     from tests.tests_updater import TestsUpdater
 
+    test_agent_loader = TestsAgentLoader()
+    test_aggregates = TestsAggregates()
     test_bank = TestsBank()
     test_central_bank = TestsCentralBank()
+    test_compact_transaction = TestsCompactTransaction()
     test_environment = TestsEnvironment()
     test_firm = TestsFirm()
     test_helper = TestsHelper()
     test_household = TestsHousehold()
+    test_ledger = TestsLedger()
     test_market = TestsMarket()
     test_measurement = TestsMeasurement()
+    test_monte_carlo = TestsMonteCarlo()
     test_network = TestsNetwork()
+    test_profiler = TestsProfiler()
     test_runner = TestsRunner()
+    test_settlement = TestsSettlement()
     test_shock = TestsShock()
+    test_snapshot = TestsSnapshot()
+    test_trace = TestsTrace()
     test_transaction = TestsTransaction()
+    test_transaction_store = TestsTransactionStore()
     test_updater = TestsUpdater()
 
     # Tests for Bank
@@ -161,6 +181,8 @@ if __name__ == '__main__':
     test_environment.environment__initialize_households_from_files(["tests/environments/", "test_all_methods", "tests/log/"])
     test_environment.environment__initialize_central_bank_from_files(["tests/environments/", "test_all_methods", "tests/log/"])
     test_environment.environment__get_agent_by_id(["tests/environments/", "test_all_methods", "tests/log/"])
+    test_environment.environment__get_agents_by_ids(["tests/environments/", "test_all_methods", "tests/log/"])
+    test_environment.environment__fork(["tests/environments/", "test_all_methods", "tests/log/"])
     test_environment.environment__read_transactions_for_banks(["tests/environments/", "test_all_methods", "tests/log/"])
     test_environment.environment__read_transactions_for_firms(["tests/environments/", "test_all_methods", "tests/log/"])
     test_environment.environment__read_transactions_for_households(["tests/environments/", "test_all_methods", "tests/log/"])
@@ -169,6 +191,21 @@ if __name__ == '__main__':
     test_environment.environment__check_agent_homogeneity(["tests/environments/", "test_all_methods", "tests/log/"])
     test_environment.environment__update_asset_returns(["tests/environments/", "test_all_methods", "tests/log/"])
 
+    # Tests for AgentLoader
+    test_agent_loader.agent_loader__parse_agent_file(["tests/environments/", "test_all_methods", "tests/log/"])
+    test_agent_loader.agent_loader__parse_agent_directory(["tests/environments/", "test_all_methods", "tests/log/"])
+    test_agent_loader.agent_loader__parse_in_worker(["tests/environments/", "test_all_methods", "tests/log/"])
+    test_agent_loader.agent_loader__load_agents_from_files(["tests/environments/", "test_all_methods", "tests/log/"])
+
+    # Tests for Snapshot
+    test_snapshot.snapshot__config_hash(["tests/environments/", "test_all_methods", "tests/log/"])
+    test_snapshot.snapshot__save_and_restore(["tests/environments/", "test_all_methods", "tests/log/"])
+    test_snapshot.snapshot__restore_into_initialized(["tests/environments/", "test_all_methods", "tests/log/"])
+    test_snapshot.snapshot__initialize_from_snapshot(["tests/environments/", "test_all_methods", "tests/log/"])
+
+    # Tests for Trace
+    test_trace.trace__trade(["tests/environments/", "test_all_methods", "tests/log/"])
+
     # Tests for Transaction
     test_transaction.transaction__init(["tests/environments/", "test_all_methods", "tests/log/"])
     test_transaction.transaction__del(["tests/environments/", "test_all_methods", "tests/log/"])
@@ -198,6 +235,35 @@ if __name__ == '__main__':
     test_transaction.transaction__clear_accounts(["tests/environments/", "test_all_methods", "tests/log/"])
     test_transaction.transaction__purge_accounts(["tests/environments/", "test_all_methods", "tests/log/"])
 
+    # Tests for CompactTransaction
+    test_compact_transaction.compact_transaction__init(["tests/environments/", "test_all_methods", "tests/log/"])
+    test_compact_transaction.compact_transaction__add_transaction(["tests/environments/", "test_all_methods", "tests/log/"])
+    test_compact_transaction.compact_transaction__remove_transaction(["tests/environments/", "test_all_methods", "tests/log/"])
+    test_compact_transaction.compact_transaction__new_transaction(["tests/environments/", "test_all_methods", "tests/log/"])
+
+    # Tests for TransactionStore
+    test_transaction_store.transaction_store__bind(["tests/environments/", "test_all_methods", "tests/log/"])
+    test_transaction_store.transaction_store__sync(["tests/environments/", "test_all_methods", "tests/log/"])
+    test_transaction_store.transaction_store__revalue(["tests/environments/", "test_all_methods", "tests/log/"])
+    test_transaction_store.transaction_store__revalue_between_banks(["tests/environments/", "test_all_methods", "tests/log/"])
+    test_transaction_store.transaction_store__refresh_balances(["tests/environments/", "test_all_methods", "tests/log/"])
+    test_transaction_store.transaction_store__unbind(["tests/environments/", "test_all_methods", "tests/log/"])
+
+    # Tests for Ledger
+    test_ledger.ledger__append(["tests/environments/", "test_all_methods", "tests/log/"])
+    test_ledger.ledger__remove(["tests/environments/", "test_all_methods", "tests/log/"])
+    test_ledger.ledger__filter(["tests/environments/", "test_all_methods", "tests/log/"])
+    test_ledger.ledger__get_balance(["tests/environments/", "test_all_methods", "tests/log/"])
+    test_ledger.ledger__get_num_transactions(["tests/environments/", "test_all_methods", "tests/log/"])
+    test_ledger.ledger__update_amount(["tests/environments/", "test_all_methods", "tests/log/"])
+    test_ledger.ledger__is_balanced(["tests/environments/", "test_all_methods", "tests/log/"])
+    test_ledger.ledger__discard_many(["tests/environments/", "test_all_methods", "tests/log/"])
+    test_ledger.ledger__purge(["tests/environments/", "test_all_methods", "tests/log/"])
+
+    # Tests for Aggregates
+    test_aggregates.aggregates__add_transaction(["tests/environments/", "test_all_methods", "tests/log/"])
+    test_aggregates.aggregates__set_active(["tests/environments/", "test_all_methods", "tests/log/"])
+
     # Tests for Helper
     test_helper.helper__initialize_standard_bank(["tests/environments/", "test_all_methods", "tests/log/"])
     test_helper.helper__initialize_standard_firm(["tests/environments/", "test_all_methods", "tests/log/"])
@@ -217,9 +283,20 @@ if __name__ == '__main__':
     test_market.market__get_amplification(["tests/environments/", "test_all_methods", "tests/log/"])
     test_market.market__set_amplification(["tests/environments/", "test_all_methods", "tests/log/"])
     test_market.market__tatonnement(["tests/environments/", "test_all_methods", "tests/log/"])
+    test_market.market__tatonnement_vectorized(["tests/environments/", "test_all_methods", "tests/log/"])
+    test_market.market__tatonnement_parallel(["tests/environments/", "test_all_methods", "tests/log/"])
+    test_market.market__warm_start(["tests/environments/", "test_all_methods", "tests/log/"])
     test_market.market__rationing(["tests/environments/", "test_all_methods", "tests/log/"])
     test_market.market__rationing_proportional(["tests/environments/", "test_all_methods", "tests/log/"])
     test_market.market__rationing_abstract(["tests/environments/", "test_all_methods", "tests/log/"])
+    test_market.market__rationing_abstract_lazy(["tests/environments/", "test_all_methods", "tests/log/"])
+    test_market.market__rationing_seeded(["tests/environments/", "test_all_methods", "tests/log/"])
+    test_market.market__rationing_linear(["tests/environments/", "test_all_methods", "tests/log/"])
+    test_market.market__rationing_proportional_matrix(["tests/environments/", "test_all_methods", "tests/log/"])
+    test_market.market__add_order(["tests/environments/", "test_all_methods", "tests/log/"])
+    test_market.market__cancel_and_replace_order(["tests/environments/", "test_all_methods", "tests/log/"])
+    test_market.market__add_order_assets(["tests/environments/", "test_all_methods", "tests/log/"])
+    test_market.market__call_auction(["tests/environments/", "test_all_methods", "tests/log/"])
 
     # Tests for Measurement
     test_measurement.measurement__get_identifier(["tests/environments/", "test_all_methods", "tests/log/"])
@@ -241,6 +318,9 @@ if __name__ == '__main__':
     test_measurement.measurement__write_to_file(["tests/environments/", "test_all_methods", "tests/log/"])
     test_measurement.measurement__close_file(["tests/environments/", "test_all_methods", "tests/log/"])
     test_measurement.measurement__read_xml_config_file(["tests/environments/", "test_all_methods", "tests/log/"])
+    test_measurement.measurement__write_to_buffer(["tests/environments/", "test_all_methods", "tests/log/"])
+    test_measurement.measurement__buffer_kinds(["tests/environments/", "test_all_methods", "tests/log/"])
+    test_measurement.measurement__measure(["tests/environments/", "test_all_methods", "tests/log/"])
 
     # Tests for Network
     test_network.network__init(["tests/environments/", "test_all_methods", "tests/log/"])
@@ -259,6 +339,15 @@ if __name__ == '__main__':
     test_network.network__subnetwork_by_maturity(["tests/environments/", "test_all_methods", "tests/log/"])
     test_network.network__subnetwork_by_time_of_default(["tests/environments/", "test_all_methods", "tests/log/"])
     test_network.network__update_network(["tests/environments/", "test_all_methods", "tests/log/"])
+    test_network.network__incremental(["tests/environments/", "test_all_methods", "tests/log/"])
+    test_network.network__query(["tests/environments/", "test_all_methods", "tests/log/"])
+
+    # Tests for MonteCarlo
+    test_monte_carlo.monte_carlo__seed_for_run(["tests/environments/", "test_all_methods", "tests/log/"])
+    test_monte_carlo.monte_carlo__do_runs(["tests/environments/", "test_all_methods", "tests/log/"])
+
+    # Tests for Profiler
+    test_profiler.profiler__run(["tests/environments/", "test_all_methods", "tests/log/"])
 
     # Tests for Runner << TINA TO WRITE
     test_runner.runner__init__(["tests/environments/", "test_all_methods", "tests/log/"])
@@ -268,6 +357,10 @@ if __name__ == '__main__':
     test_runner.runner__set_num_sweeps(["tests/environments/", "test_all_methods", "tests/log/"])
     test_runner.runner__do_run(["tests/environments/", "test_all_methods", "tests/log/"])
 
+    # Tests for Settlement
+    test_settlement.settlement__add(["tests/environments/", "test_all_methods", "tests/log/"])
+    test_settlement.settlement__post(["tests/environments/", "test_all_methods", "tests/log/"])
+
     # Tests for Shock
     test_shock.shock__do_shock(["tests/environments/", "test_all_methods", "tests/log/"])
 
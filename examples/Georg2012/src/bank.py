@@ -237,9 +237,6 @@ class Bank(object):
 	# get_interest
 	#-------------------------------------------------------------------------
 	def get_interest(self,  type):
-		from random import Random
-		
-		random = Random()
 		volume = 0.0 
 		sign = 1.0 # will be negative if interest has to be paid by the bank
 		
@@ -286,9 +283,10 @@ class Bank(object):
 	# def get_new_deposits(scaleFactor)
 	# This method returns the NET flow of deposits, not the absolute value
 	#-------------------------------------------------------------------------
-	def get_new_deposits(self,  scaleFactor):
-		from random import Random
-		random = Random()
+	def get_new_deposits(self,  scaleFactor,  random=None):
+		if random is None: # the generator of the simulation should be passed, see updater.do_update_phase2
+			from random import Random
+			random = Random()
 		oldValue = 0.0
 		newValue = 0.0
 		returnValue = 0.0
@@ -458,10 +456,9 @@ class Bank(object):
 	# transfer_investments
 	#-------------------------------------------------------------------------
 	def transfer_investments(self,  state):
-		from random import Random
 		from transaction import Transaction
 		
-		random = Random()
+		random = state.rng
 		
 		currentVolume = 0.0
 		optimalVolume = 0.0
@@ -582,8 +579,7 @@ class Bank(object):
 	#-------------------------------------------------------------------------
 	def initialize_transactions(self, state):
 		from transaction import Transaction
-		from random import Random
-		random = Random()
+		random = state.rng
 		
 		value = 0.0
 		
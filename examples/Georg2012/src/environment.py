@@ -20,6 +20,7 @@ along with this program. If not, see <http://www.gnu.org/licenses/>.
 
 import logging
 import os
+from random import Random
 import networkx as nx
 
 #-------------------------------------------------------------------------
@@ -62,6 +63,9 @@ class Environment(object):
 		self.read_environment_file(environment_filename)
 		logging.info("  environment file read: %s",  environment_filename)
 		
+		# all random draws of the simulation are taken from the generator carried by the state
+		self.state.rng = Random(self.parameters.seed)
+		
 		# then read in all the banks
 		if (self.parameters.bankDirectory  != ""):
 			if (self.parameters.bankDirectory != "none"): # none is used for tests only
@@ -108,6 +112,8 @@ class Environment(object):
 				self.parameters.numBanks = int(subelement.attrib['value'])
 			if (subelement.attrib['type'] == 'bankDirectory'):
 				self.parameters.bankDirectory = str(subelement.attrib['value'])
+			if (subelement.attrib['type'] == 'seed'):
+				self.parameters.seed = int(subelement.attrib['value'])
 			if (subelement.attrib['type'] == 'graphType'): 
 				self.parameters.graphType = str(subelement.attrib['value'])
 			if (subelement.attrib['type'] == 'graphParameter1'): 
@@ -123,7 +123,7 @@ class Network(object):
 	# do_interbank_trades
 	#-------------------------------------------------------------------------
 	def do_interbank_trades(self,  state):
-		from random import shuffle
+		shuffle = state.rng.shuffle
 		activeBanks = []
 		neighbors = []
 		
@@ -33,6 +33,7 @@ class Parameters(object):
 	numSweeps = 0
 	numBanks = 0
 	bankDirectory = ""
+	seed = None # seed of the random number generator of the simulation, None means it is seeded by the system
 	# parameters for the networks
 	graphType = ""
 	graphParameter1 = 0.0
@@ -22,6 +22,9 @@ along with this program. If not, see <http://www.gnu.org/licenses/>.
 #------------------------------------------------------------------------------
 #  class State
 #------------------------------------------------------------------------------
+from random import Random
+
+
 class State(object):
 	#
 	# VARIABLES
@@ -63,6 +66,7 @@ class State(object):
 	
 	# bookkeeping parameters
 	insolvencyHistory= [] # [num, time] the number of bank insolvencies and when they occured
+	rng = Random() # the random number generator of the simulation, seeded in environment.initialize
 
 	#
 	# METHODS
@@ -115,7 +115,8 @@ class Updater(object):
 	def do_update_phase2(self,  environment,  active_banks,  time,  debug):
 		for bank in active_banks:
 			# next, determine new deposit level
-			new_deposit_level = bank.get_new_deposits(self.environment.get_state(time).scaleFactorHouseholds)
+			state = self.environment.get_state(time)
+			new_deposit_level = bank.get_new_deposits(state.scaleFactorHouseholds,  state.rng)
 			bank.Q = bank.Q + new_deposit_level
 			# and calculate the liquidity demand
 			bank.calculate_liquidity_demand()
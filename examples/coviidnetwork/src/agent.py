@@ -1,6 +1,5 @@
 import logging
 from xml.etree import ElementTree
-import numpy as np
 
 
 class Agent:
@@ -42,10 +41,10 @@ class Agent:
         except:
             logging.error("    ERROR: %s could not be parsed", agent_filename)
 
-    def infect(self, neighours):
+    def infect(self, neighours, rng):
         for neighbour in neighours:
             # only infect neighbours that are susceptible
-            random_draw = np.random.random()
+            random_draw = rng.random()
             if neighbour.status == 's' and random_draw < self.transmission_rate:
                 neighbour.status = 'i1'
 
@@ -3,14 +3,13 @@ import copy
 from xml.etree import ElementTree
 from examples.coviidnetwork.src.agent import Agent
 import networkx as nx
-import random
 import numpy as np
 
 
 class Environment:
     def __init__(self, environment_directory, identifier, seed=1):
-        np.random.seed(seed)
-        random.seed(seed)
+        # the random number generator of the run, passed on to the runner, updater and agents
+        self.rng = np.random.default_rng(seed)
 
         self.identifier = identifier
         self.static_parameters = {}
@@ -25,7 +24,7 @@ class Environment:
         self.initialize_agents_from_files(self.static_parameters['agent_directory'])
 
         # create network
-        self.network = nx.erdos_renyi_graph(self.static_parameters["num_agents"], 0.01)
+        self.network = nx.erdos_renyi_graph(self.static_parameters["num_agents"], 0.01, seed=seed)
         self.agents = [Agent(x, 's', self.agent_parameters["transmission_rate"],
                              self.agent_parameters["probability_hospital"], self.agent_parameters["probability_to_die"],
                              self.agent_parameters["probability_susceptible"]
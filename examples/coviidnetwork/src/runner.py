@@ -1,6 +1,5 @@
 from examples.coviidnetwork.src.updater import Updater
 import numpy as np
-import random
 
 
 class Runner:
@@ -40,19 +39,20 @@ class Runner:
     def set_num_sweeps(self, value):
         super(Runner, self).set_num_sweeps(value)
 
-    def do_run(self, environment, seed=1):
+    def do_run(self, environment, seed=None):
         # loop over all time steps and do the updating
-        # set monte carlo seed
-        np.random.seed(seed)  # TODO necessary to do twice?
-        random.seed(seed)
+        # set monte carlo seed, the generator is seeded once per run
+        # and not on every step, otherwise each step repeats the same draws
+        if seed is not None:
+            environment.rng = np.random.default_rng(seed)
         # For each update step
         # infect a random agent
-        random_agent_idx = np.random.randint(0, len(environment.agents))
+        random_agent_idx = environment.rng.integers(0, len(environment.agents))
         environment.agents[random_agent_idx].status = 'i1'
 
         for i in range(self.num_sweeps): #sweeps is time periods
             self.current_step = i
-            self.updater.do_update(environment, seed=seed)
+            self.updater.do_update(environment)
             #measurement.write_to_file()
 
         print("***\nThis run had {}s sweeps and {}s simulations".format(self.num_sweeps, environment.static_parameters['num_simulations']))
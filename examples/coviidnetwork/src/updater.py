@@ -1,17 +1,12 @@
-import random
-import numpy as np
-
-
 class Updater:
     def __init__(self, environment):
         self.environment = environment
         self.new_opinion = {}
         self.initial_opinion = {}
 
-    def do_update(self, environment, seed=1):
-        # set monte carlo seed
-        np.random.seed(seed)  # TODO necessary to do twice?
-        random.seed(seed)
+    def do_update(self, environment):
+        # all the random draws come from the generator of the run
+        rng = environment.rng
 
         # some agents are the infected
         sick_with_symptoms = []
@@ -43,7 +38,7 @@ class Updater:
                 agent.sick_days += 1
                 # some agents recover
                 if agent.sick_days > environment.agent_parameters['days_incubation']:
-                    if np.random.random() < agent.prob_hospital:
+                    if rng.random() < agent.prob_hospital:
                         agent.status = 'c'
                         sick_with_symptoms.remove(agent)
                     else:
@@ -55,7 +50,7 @@ class Updater:
                 agent.critical_days += 1
                 # some agents in critical status will die, the rest will recover
                 if agent.critical_days > environment.agent_parameters['days_critical']:
-                    if np.random.random() < (agent.prob_death * environment.health_overburdened_multi):
+                    if rng.random() < (agent.prob_death * environment.health_overburdened_multi):
                         agent.status = 'd'
                         critical.remove(agent)
                     else:
@@ -65,7 +60,7 @@ class Updater:
             if agent.status == 'r':
                 recovered.append(agent)
                 agent.days_recovered += 1
-                if np.random.random() < (agent.prob_susceptible * agent.days_recovered):
+                if rng.random() < (agent.prob_susceptible * agent.days_recovered):
                     recovered.remove(agent)
                     agent.status = 's'
 
@@ -80,7 +75,7 @@ class Updater:
             neighbours_from_graph = [x for x in environment.network.neighbors(agent.identifier)]
             # find the corresponding agents
             neighbours_to_infect = [environment.agents[idx] for idx in neighbours_from_graph]
-            agent.infect(neighbours_to_infect)
+            agent.infect(neighbours_to_infect, rng)
 
         environment.infection_states.append(environment.store_network())
 
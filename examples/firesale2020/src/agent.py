@@ -210,9 +210,9 @@ class Agent(BaseAgent):
  
     def check_accounts(self):
         if self.state_variables['total_assets'] == self.state_variables['equity'] + self.state_variables['debt']:
-            print("yes, great - the accounting worked for %s" %self.identifier)
+            logging.debug("yes, great - the accounting worked for %s", self.identifier)
         else:
-            print('no.. damn!')
+            logging.debug('no.. damn!')
 
     def initialize_shock(self, environment):
         self.state_variables['shock_for_agent'] = 0.0
@@ -249,24 +249,24 @@ class Agent(BaseAgent):
             return 0
 
         else:
-            print(self.state_variables['cash_reserves'] , "cash reserves")
+            logging.debug("%s cash reserves", self.state_variables['cash_reserves'])
             new_equity = self.state_variables["equity"] - abs(self.state_variables["equity_losses"]) 
-            print('new_equity', new_equity, self.identifier)
+            logging.debug('new_equity %s %s', new_equity, self.identifier)
             new_debt = new_equity * self.parameters['leverage']
-            print(self.state_variables['debt']  , "debt" , self.identifier)
-            print(new_debt, "new debt", self.identifier)
+            logging.debug("%s debt %s", self.state_variables['debt'], self.identifier)
+            logging.debug("%s new debt %s", new_debt, self.identifier)
 
             difference = self.state_variables['debt']  - new_debt  
-            print(difference , "difference", self.identifier)
+            logging.debug("%s difference %s", difference, self.identifier)
          
             if (self.state_variables['cash_reserves'] - difference) > 0:              
                     buffer = (self.state_variables['cash_reserves'] - difference)
-                    print(buffer, "BUFFER", "Cash reserves are enough!!!, no fire-sale for", self.identifier)
+                    logging.debug("%s BUFFER Cash reserves are enough!!!, no fire-sale for %s", buffer, self.identifier)
                     return buffer
 
             if (self.state_variables['cash_reserves'] - difference) <= 0 and self.state_variables['cash_reserves'] >0:
-                    print(self.state_variables['cash_reserves'], difference)
-                    print("Cash reserves are NOT enough!!!, Fire-sale for", self.identifier)
+                    logging.debug('%s %s', self.state_variables['cash_reserves'], difference)
+                    logging.debug("Cash reserves are NOT enough!!!, Fire-sale for %s", self.identifier)
                     paid_by_cash = self.state_variables['cash_reserves']
                     
                     self.state_variables["debt_paid_by_cash"] = paid_by_cash  
@@ -387,14 +387,14 @@ class Agent(BaseAgent):
         df2 = pd.DataFrame({'current_step':[current_step]})
 
         self.results_df = pd.concat([df2, df1], axis=1)
-        logging.info('Agent.py; function: Appended agents state_variables results to %s dataframe' %self.identifier )
+        logging.info('Agent.py; function: Appended agents state_variables results to %s dataframe', self.identifier)
 
         "To add parameters uncomment and use instead of line\
         above. But DON't forget to change method\
         def update_results_to_dataframe below\
         and uncomment "
         self.results_df = pd.concat([df2, df1, df3], axis=1)
-        logging.info('Agent.py; function: Appended agents parameter and state_variables results to %s dataframe' %self.identifier )
+        logging.info('Agent.py; function: Appended agents parameter and state_variables results to %s dataframe', self.identifier)
         return self.results_df
 
 
@@ -20,6 +20,11 @@ You should have received a copy of the GNU General Public License
 along with this program. If not, see <http://www.gnu.org/licenses/>.
 """
 
+import heapq
+try:
+    import numpy as np
+except ImportError:  # numpy is only needed for the vectorized rationing
+    np = None
 from abm_template.src.basemarket import BaseMarket
 
 # -------------------------------------------------------------------------
@@ -186,3 +191,120 @@ class Market(BaseMarket):
     def rationing_abstract(self, agents, matching_function, allow_match):
         return super(Market, self).rationing_abstract(agents, matching_function, allow_match)
     # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # rationing_abstract_lazy(agents, matching_function, allow_match, vectorized, batch, attribute)
+    # This function performs the same rationing as rationing_abstract
+    # and gives the same trades, without scoring and sorting all the pairs
+    # of agents. Only a seller and a buyer can trade, so only such pairs
+    # are considered, and allow_match is checked before matching_function.
+    # Every agent has a row of the pairs it makes with the agents after it
+    # in the list, of which only the best (batch) are scored and kept at
+    # a time, and the best pair of every row is kept in a heap, so that
+    # the pairs are taken in the order of rationing_abstract (by priority
+    # and then by the position of the agents in the list). When the pairs
+    # kept for a row run out, the row is scored again against the agents
+    # which still have something to trade. The rationing stops as soon as
+    # all the supply or all the demand is exhausted.
+    # If vectorized is True, matching_function and allow_match are called
+    # with one agent and a numpy array of the agents it is paired with, and
+    # return an array of priorities and an array of booleans respectively.
+    # The functions are then given attribute(agent) instead of the agent,
+    # e.g. its identifier or its wealth, so that the arrays are numeric.
+    # -------------------------------------------------------------------------
+    def rationing_abstract_lazy(self, agents, matching_function, allow_match, vectorized=False, batch=16, attribute=None):
+        to_return = []
+        if vectorized:
+            if np is None:
+                raise ImportError("The vectorized abstract rationing requires numpy.")
+            if attribute is None:
+                attribute = self.agent_itself
+            values = np.asarray([attribute(agent[0]) for agent in agents])
+            # signs of the supply and demand which is left, 0 when exhausted
+            signs = np.sign(np.array([agent[1] for agent in agents], dtype=float))
+        batch = max(1, int(batch))
+        sellers_left = len([agent for agent in agents if agent[1] > 0])
+        buyers_left = len([agent for agent in agents if agent[1] < 0])
+        rows = {}  # position of the agent -> pairs kept for it as (-priority, position of the other agent)
+        heap = []  # (-priority, position of the agent, position of the other agent)
+
+        # The pairs of a row which come after the key (-priority, position)
+        # best first, at most batch of them, or a few more with equal keys
+        def score_row(i, after):
+            sign = agents[i][1]
+            if vectorized:
+                others = np.nonzero(signs[i+1:] * np.sign(sign) < 0)[0] + (i + 1)
+                if len(others) == 0:
+                    return []
+                others = others[np.asarray(allow_match(values[i], values[others]), dtype=bool)]
+                if len(others) == 0:
+                    return []
+                keys = -np.asarray(matching_function(values[i], values[others]), dtype=float)
+                if after is not None:
+                    later = (keys > after[0]) | ((keys == after[0]) & (others > after[1]))
+                    others = others[later]
+                    keys = keys[later]
+                if len(keys) > batch:
+                    # the top (batch) keys, with the ties at the threshold
+                    threshold = np.partition(keys, batch - 1)[batch - 1]
+                    best = keys <= threshold
+                    others = others[best]
+                    keys = keys[best]
+                order = np.lexsort((others, keys))
+                return [(float(keys[k]), int(others[k])) for k in order]
+            pairs = []
+            for j in range(i + 1, len(agents)):
+                if sign * agents[j][1] < 0 and allow_match(agents[i][0], agents[j][0]) is True:
+                    key = (-matching_function(agents[i][0], agents[j][0]), j)
+                    if after is None or key > after:
+                        pairs.append(key)
+            return heapq.nsmallest(batch, pairs)
+
+        # Puts the next pair of the row in the heap
+        def next_pair(i, after):
+            if len(rows[i]) == 0:
+                rows[i] = score_row(i, after)
+                rows[i].reverse()
+            if len(rows[i]) > 0:
+                key, j = rows[i].pop()
+                heapq.heappush(heap, (key, i, j))
+
+        for i in range(len(agents)):
+            if agents[i][1] != 0:
+                rows[i] = []
+                next_pair(i, None)
+        while len(heap) > 0 and sellers_left > 0 and buyers_left > 0:
+            key, i, j = heapq.heappop(heap)
+            agent_one = agents[i]
+            agent_two = agents[j]
+            # We check whether one agent has excess supply and the other excess demand
+            if agent_one[1] * agent_two[1] < 0 and agent_one[0] != agent_two[0]:
+                if agent_one[1] < 0:
+                    seller, buyer = agent_two, agent_one
+                else:
+                    seller, buyer = agent_one, agent_two
+                # The value traded is the minimum of the excess supply and demand
+                value = min(seller[1], -buyer[1])
+                to_return.append([seller[0], buyer[0], value])
+                seller[1] = seller[1] - value
+                buyer[1] = buyer[1] + value
+                if seller[1] == 0:
+                    sellers_left = sellers_left - 1
+                if buyer[1] == 0:
+                    buyers_left = buyers_left - 1
+                if vectorized:
+                    signs[i] = np.sign(agent_one[1])
+                    signs[j] = np.sign(agent_two[1])
+            if agent_one[1] != 0:
+                next_pair(i, (key, j))
+        return to_return
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # agent_itself(agent)
+    # the default attribute of rationing_abstract_lazy
+    # -------------------------------------------------------------------------
+    @staticmethod
+    def agent_itself(agent):
+        return agent
+    # -------------------------------------------------------------------------
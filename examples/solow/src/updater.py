@@ -257,7 +257,7 @@ class Updater(BaseModel):
         def allow_match_basic(agent_one, agent_two):
             return True
         # We find the actual trades
-        rationed = market.rationing_abstract(for_rationing, matching_agents_basic, allow_match_basic)
+        rationed = market.rationing_abstract_lazy(for_rationing, matching_agents_basic, allow_match_basic)
         # Then we go through the rationing
         # and move the goods and cash appropriately
         for ration in rationed:
@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+# [SublimeLinter pep8-max-line-length:150]
+# -*- coding: utf-8 -*-
+
+"""
+black_rhino is a multi-agent simulator for financial network analysis
+Copyright (C) 2016 Co-Pierre Georg (co-pierre.georg@keble.ox.ac.uk)
+Pawel Fiedor (pawel@fiedor.eu)
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, version 3 of the License.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program. If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import logging
+import multiprocessing
+import os
+from xml.etree import ElementTree
+
+# -------------------------------------------------------------------------
+# Loader of agent config files, used by Environment
+#
+# Each config file looks somewhat like the below
+# <bank identifier='string'>
+#     <parameter name='string' value='string'></parameter>
+#     <transaction type='deposits' asset='' from='household_id' to='bank_id' amount='30' interest='0.02' maturity='0' time_of_default='-1'></transaction>
+# </bank>
+# and is parsed in a single pass into a record
+# (identifier, parameters, transactions)
+# where parameters is a dictionary of name -> value and transactions is a
+# list of (type_, asset, from_, to, amount, interest, maturity, time_of_default)
+# with from_ and to being the identifiers of the agents. The counterparties
+# are resolved by the environment once all agents are known.
+# The functions are module level so that they can be sent to a process pool.
+# -------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------
+# parse_agent_file(filename)
+# returns the record of the config file, if it can't be parsed the record
+# has what was read before the error, as the agents used to get from
+# BaseAgent.get_parameters_from_file, and no transactions
+# -------------------------------------------------------------------------
+def parse_agent_file(filename):
+    identifier = None
+    parameters = {}
+    transactions = []
+    try:
+        for event, element in ElementTree.iterparse(filename, events=("start", "end")):
+            if event == "start":
+                if identifier is None:
+                    # the root element carries the identifier of the agent
+                    identifier = element.attrib['identifier']
+                continue
+            if element.tag == "parameter":
+                value = element.attrib['value']
+                try:
+                    parameters[element.attrib['name']] = float(value)
+                except ValueError:
+                    parameters[element.attrib['name']] = value
+                element.clear()
+            elif element.tag == "transaction":
+                transactions.append((str(element.attrib['type']),
+                                     str(element.attrib['asset']),
+                                     str(element.attrib['from']),
+                                     str(element.attrib['to']),
+                                     float(element.attrib['amount']),
+                                     float(element.attrib['interest']),
+                                     float(element.attrib['maturity']),
+                                     float(element.attrib['time_of_default'])))
+                element.clear()
+    except Exception:
+        logging.error("    ERROR: %s could not be parsed",  filename)
+        return ("" if identifier is None else identifier, parameters, [])
+    return (identifier, parameters, transactions)
+# -------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------
+# parse_agent_directory(directory, listing, processes)
+# returns the records of the given files in the directory, in order
+# if processes is larger than one the files are parsed in a process pool,
+# unless this is a daemonic process (e.g. a worker of MonteCarlo) which
+# can't start processes of its own, then they are parsed here
+# -------------------------------------------------------------------------
+def parse_agent_directory(directory, listing=None, processes=1):
+    if listing is None:
+        listing = os.listdir(directory)
+    filenames = [os.path.join(directory, infile) for infile in listing]
+    if processes > 1 and multiprocessing.current_process().daemon:
+        logging.info("  parsing the files in %s in this daemonic process",  directory)
+        processes = 1
+    if processes > 1 and len(filenames) > 1:
+        pool = multiprocessing.Pool(processes)
+        try:
+            records = pool.map(parse_agent_file, filenames, max(1, len(filenames) // (4 * processes)))
+        finally:
+            pool.close()
+            pool.join()
+    else:
+        records = [parse_agent_file(filename) for filename in filenames]
+    return records
+# -------------------------------------------------------------------------
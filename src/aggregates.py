@@ -0,0 +1,252 @@
+#!/usr/bin/env python
+# [SublimeLinter pep8-max-line-length:150]
+# -*- coding: utf-8 -*-
+
+"""
+black_rhino is a multi-agent simulator for financial network analysis
+Copyright (C) 2016 Co-Pierre Georg (co-pierre.georg@keble.ox.ac.uk)
+Pawel Fiedor (pawel@fiedor.eu)
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, version 3 of the License.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program. If not, see <http://www.gnu.org/licenses/>.
+"""
+
+# ============================================================================
+#
+# class Aggregates
+#
+# ============================================================================
+
+
+class Aggregates(object):
+    #
+    #
+    # VARIABLES
+    #
+    #
+
+    # The registry of system-wide aggregates kept up to date as the books
+    # change, so that measurements read them in O(1) instead of walking
+    # the accounts of every agent at every sweep. An aggregate is the sum
+    # of the amounts of the transactions of a type (and asset), optionally
+    # only those where the agent on one side ("from" or "to") is of the
+    # given class, e.g. the deposits of all households are
+    #   register("household_deposits", "deposits", "from", "Household")
+    # Like the incremental network, the aggregates are fed by the hooks of
+    # the transactions: adding a transaction counts it, changing its amount
+    # moves the totals by the change, and taking it off the books (through
+    # Ledger.unlink) takes it out again. A transaction counted here points
+    # to the registry through its aggregates variable. Changes done in bulk
+    # by the columnar store bypass the hooks and are followed by refresh().
+    # The number of active agents of every class is kept as well, it is
+    # updated by set_active, an agent is active if its active parameter is
+    # not negative (as in the measurements of Georg2012).
+    # It is switched on by the static parameter incremental_aggregates.
+    sums = {}  # name -> [type_, direction, agent_class, asset]
+    totals = {}  # name -> running sum of the amounts
+    counted = {}  # identifier -> [transaction, amount counted, names of the aggregates it is in]
+    active = {}  # agent class -> number of active agents
+
+    #
+    #
+    # CODE
+    #
+    #
+
+    # -------------------------------------------------------------------------
+    # __init__
+    # -------------------------------------------------------------------------
+    def __init__(self):
+        self.sums = {}
+        self.totals = {}
+        self.counted = {}
+        self.active = {}
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # __contains__(name)
+    # -------------------------------------------------------------------------
+    def __contains__(self, name):
+        return name in self.sums
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # agent_class(agent)
+    # returns the name of the class of the agent, e.g. "Household"
+    # -------------------------------------------------------------------------
+    @staticmethod
+    def agent_class(agent):
+        return agent.__class__.__name__
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # is_active(agent)
+    # -------------------------------------------------------------------------
+    @staticmethod
+    def is_active(agent):
+        return getattr(agent, "parameters", {}).get("active", 0) >= 0
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # matches(name, transaction)
+    # returns whether the transaction is counted in the aggregate
+    # -------------------------------------------------------------------------
+    def matches(self, name, transaction):
+        type_, direction, agent_class, asset = self.sums[name]
+        if type_ is not None and transaction.type_ != type_:
+            return False
+        if asset is not None and transaction.asset != asset:
+            return False
+        if agent_class is None:
+            return True
+        agent = transaction.from_ if direction == "from" else transaction.to
+        return self.agent_class(agent) == agent_class
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # register(name, type_, direction, agent_class, asset)
+    # adds the aggregate and counts the transactions already tracked in it
+    # registering the same name again replaces the aggregate
+    # -------------------------------------------------------------------------
+    def register(self, name, type_=None, direction="from", agent_class=None, asset=None):
+        if direction not in ("from", "to"):
+            raise ValueError("The direction of an aggregate is either from or to.")
+        if name in self.sums:
+            self.unregister(name)
+        self.sums[name] = [type_, direction, agent_class, asset]
+        self.totals[name] = 0.0
+        for entry in self.counted.values():
+            if self.matches(name, entry[0]):
+                entry[2].append(name)
+                self.totals[name] = self.totals[name] + entry[1]
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # unregister(name)
+    # -------------------------------------------------------------------------
+    def unregister(self, name):
+        del self.sums[name]
+        del self.totals[name]
+        for entry in self.counted.values():
+            if name in entry[2]:
+                entry[2].remove(name)
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # total(name)
+    # returns the current value of the aggregate
+    # -------------------------------------------------------------------------
+    def total(self, name):
+        return self.totals[name]
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # add_transaction(transaction)
+    # counts the transaction in the aggregates it matches, counting the
+    # same transaction twice has no effect
+    # -------------------------------------------------------------------------
+    def add_transaction(self, transaction):
+        if transaction.identifier in self.counted:
+            return
+        amount = float(transaction.amount)
+        names = []
+        for name in self.sums:
+            if self.matches(name, transaction):
+                names.append(name)
+                self.totals[name] = self.totals[name] + amount
+        self.counted[transaction.identifier] = [transaction, amount, names]
+        transaction.aggregates = self
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # remove_transaction(transaction)
+    # takes the transaction out of the aggregates, if it is counted
+    # -------------------------------------------------------------------------
+    def remove_transaction(self, transaction):
+        entry = self.counted.pop(transaction.identifier, None)
+        if entry is None:
+            return
+        for name in entry[2]:
+            self.totals[name] = self.totals[name] - entry[1]
+        transaction.aggregates = None
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # set_amount(transaction)
+    # moves the totals the transaction is counted in by its change
+    # -------------------------------------------------------------------------
+    def set_amount(self, transaction):
+        entry = self.counted.get(transaction.identifier)
+        if entry is None:
+            return
+        amount = float(transaction.amount)
+        change = amount - entry[1]
+        for name in entry[2]:
+            self.totals[name] = self.totals[name] + change
+        entry[1] = amount
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # refresh()
+    # sums the totals anew from the current amounts of the transactions
+    # counted, after they were changed in bulk by the columnar store, this
+    # also gets rid of the accumulated floating point error
+    # -------------------------------------------------------------------------
+    def refresh(self):
+        for name in self.totals:
+            self.totals[name] = 0.0
+        for entry in self.counted.values():
+            entry[1] = float(entry[0].amount)
+            for name in entry[2]:
+                self.totals[name] = self.totals[name] + entry[1]
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # rebuild(environment)
+    # counts all the transactions on the books and the active agents of
+    # the environment from scratch
+    # -------------------------------------------------------------------------
+    def rebuild(self, environment):
+        for entry in self.counted.values():
+            entry[0].aggregates = None
+        self.counted = {}
+        for name in self.totals:
+            self.totals[name] = 0.0
+        self.active = {}
+        for agent in environment.agents_generator():
+            if self.is_active(agent):
+                agent_class = self.agent_class(agent)
+                self.active[agent_class] = self.active.get(agent_class, 0) + 1
+            for transaction in agent.accounts:
+                self.add_transaction(transaction)
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # set_active(agent, active)
+    # sets the active parameter of the agent and updates the counts
+    # -------------------------------------------------------------------------
+    def set_active(self, agent, active):
+        agent_class = self.agent_class(agent)
+        change = int(active >= 0) - int(self.is_active(agent))
+        agent.parameters["active"] = active
+        self.active[agent_class] = self.active.get(agent_class, 0) + change
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # num_active(agent_class)
+    # returns the number of active agents of the class, or of all classes
+    # -------------------------------------------------------------------------
+    def num_active(self, agent_class=None):
+        if agent_class is None:
+            return sum(self.active.values())
+        return self.active.get(agent_class, 0)
+    # -------------------------------------------------------------------------
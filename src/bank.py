@@ -22,6 +22,7 @@ along with this program. If not, see <http://www.gnu.org/licenses/>.
 
 import logging
 from abm_template.src.baseagent import BaseAgent
+from src.ledger import Ledger
 
 # ============================================================================
 #
@@ -40,7 +41,7 @@ class Bank(BaseAgent):
     identifier = ""  # identifier of the specific bank
     parameters = {}  # parameters of the specific bank
     state_variables = {}  # state variables of the specific bank
-    accounts = []  # all accounts of a bank (filled with transactions)
+    accounts = Ledger()  # all accounts of a bank (filled with transactions)
 
     #
     #
@@ -99,7 +100,7 @@ class Bank(BaseAgent):
         self.identifier = ""  # identifier of the specific bank
         self.parameters = {}  # parameters of the specific bank
         self.state_variables = {}  # state variables of the specific bank
-        self.accounts = []  # all accounts of a bank (filled with transactions)
+        self.accounts = Ledger()  # all accounts of a bank (filled with transactions)
         # DO NOT EVER ASSIGN PARAMETERS BY HAND AS DONE BELOW IN PRODUCTION CODE
         # ALWAYS READ THE PARAMETERS FROM CONFIG FILES
         # OR USE THE FUNCTIONS FOR SETTING / CHANGING VARIABLES
@@ -154,15 +155,16 @@ class Bank(BaseAgent):
     def check_consistency(self):
         assets = ["loans", "cash"]
         liabilities = ["deposits"]
-        return super(Bank, self).check_consistency(assets, liabilities)
+        return self.accounts.is_balanced(assets, liabilities)
     # -------------------------------------------------------------------------
 
     # -------------------------------------------------------------------------
     # get_account
     # returns the value of all transactions of a given type
+    # this is read from the running balances kept by the ledger
     # -------------------------------------------------------------------------
     def get_account(self,  type_):
-        return super(Bank, self).get_account(type_)
+        return self.accounts.get_balance(type_)
     # -------------------------------------------------------------------------
 
     # -------------------------------------------------------------------------
@@ -170,7 +172,7 @@ class Bank(BaseAgent):
     # returns the number of transactions of a given type
     # -------------------------------------------------------------------------
     def get_account_num_transactions(self,  type_):
-        return super(Bank, self).get_account_num_transactions(type_)
+        return float(self.accounts.get_num_transactions(type_))
     # -------------------------------------------------------------------------
 
     # -------------------------------------------------------------------------
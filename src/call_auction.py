@@ -0,0 +1,193 @@
+#!/usr/bin/env python
+# [SublimeLinter pep8-max-line-length:150]
+# -*- coding: utf-8 -*-
+
+"""
+black_rhino is a multi-agent simulator for financial network analysis
+Copyright (C) 2016 Co-Pierre Georg (co-pierre.georg@keble.ox.ac.uk)
+Pawel Fiedor (pawel@fiedor.eu)
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, version 3 of the License.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program. If not, see <http://www.gnu.org/licenses/>.
+"""
+
+try:
+    import numpy as np
+except ImportError:  # numpy is only needed for the call auction
+    np = None
+
+# ============================================================================
+#
+# class CallAuction
+#
+# ============================================================================
+
+
+class CallAuction(object):
+    #
+    #
+    # VARIABLES
+    #
+    #
+
+    # The periodic call auction of Market, the alternative to the
+    # continuous matching of the limit order book. The orders of a sweep
+    # are only collected when they are submitted, and clear() executes
+    # them all at a single uniform price, the price at which the most
+    # volume is exchanged. The price is found from the cumulative demand
+    # and supply at every limit price, computed with sorted arrays:
+    #   demand(p) = volume of the buy orders with a limit of at least p
+    #   supply(p) = volume of the sell orders with a limit of at most p
+    # and the price maximises min(demand(p), supply(p)). Ties are broken by
+    # the smallest imbalance |demand(p) - supply(p)|, then by taking the
+    # middle of the tied prices. Orders are executed in price-time priority,
+    # orders with a limit price of None are market orders, and the orders
+    # which are not executed are dropped.
+    # The topology of an order is that of Market:
+    # order[0] = agent
+    # order[1] = price
+    # order[2] = volume
+    # order[3] = time
+    # order[4] = ident
+    # order[5] = type_
+    # Trades are returned as [seller, buyer, quantity, price].
+    orders = {}  # "buy", "sell" -> list of the orders submitted
+    price = None  # the price of the last auction, None if nothing was exchanged
+    volume = 0.0  # the volume exchanged in the last auction
+
+    #
+    #
+    # CODE
+    #
+    #
+
+    # -------------------------------------------------------------------------
+    # __init__
+    # -------------------------------------------------------------------------
+    def __init__(self):
+        if np is None:
+            raise ImportError("The call auction requires numpy.")
+        self.orders = {"buy": [], "sell": []}
+        self.price = None
+        self.volume = 0.0
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # __len__
+    # returns the number of orders waiting for the auction
+    # -------------------------------------------------------------------------
+    def __len__(self):
+        return len(self.orders["buy"]) + len(self.orders["sell"])
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # submit_order(agent, price, volume, time, ident, type_)
+    # collects the order for the next auction, a price of None is a
+    # market order
+    # -------------------------------------------------------------------------
+    def submit_order(self, agent, price, volume, time, ident, type_):
+        if type_ not in self.orders:
+            raise ValueError("The type of an order is either buy or sell.")
+        if volume > 0.0:
+            self.orders[type_].append([agent, price, volume, time, ident, type_])
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # limits(type_)
+    # returns the limit prices and the volumes of the orders of the type
+    # as arrays, market orders have a limit of +inf to buy and -inf to sell
+    # -------------------------------------------------------------------------
+    def limits(self, type_):
+        market_limit = np.inf if type_ == "buy" else -np.inf
+        prices = np.array([market_limit if order[1] is None else order[1] for order in self.orders[type_]], dtype=float)
+        volumes = np.array([order[2] for order in self.orders[type_]], dtype=float)
+        return prices, volumes
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # clearing_price()
+    # returns the uniform price of the auction and the volume exchanged
+    # at it, (None, 0.0) if no orders cross
+    # -------------------------------------------------------------------------
+    def clearing_price(self):
+        buy_prices, buy_volumes = self.limits("buy")
+        sell_prices, sell_volumes = self.limits("sell")
+        candidates = np.unique(np.concatenate((buy_prices, sell_prices)))
+        candidates = candidates[np.isfinite(candidates)]
+        if len(candidates) == 0 or len(buy_prices) == 0 or len(sell_prices) == 0:
+            return None, 0.0
+        # cumulative volumes of the orders sorted by their limit prices
+        buy_order = np.argsort(buy_prices, kind="stable")
+        buy_prices = buy_prices[buy_order]
+        buy_cumulative = np.concatenate(([0.0], np.cumsum(buy_volumes[buy_order])))
+        sell_order = np.argsort(sell_prices, kind="stable")
+        sell_prices = sell_prices[sell_order]
+        sell_cumulative = np.concatenate(([0.0], np.cumsum(sell_volumes[sell_order])))
+        demand = buy_cumulative[-1] - buy_cumulative[np.searchsorted(buy_prices, candidates, side="left")]
+        supply = sell_cumulative[np.searchsorted(sell_prices, candidates, side="right")]
+        exchanged = np.minimum(demand, supply)
+        volume = exchanged.max()
+        if volume <= 0.0:
+            return None, 0.0
+        best = np.nonzero(exchanged == volume)[0]
+        imbalance = np.abs(demand[best] - supply[best])
+        best = best[imbalance == imbalance.min()]
+        return float(candidates[best[(len(best) - 1) // 2]]), float(volume)
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # allocate(type_, price, volume)
+    # returns [agent, quantity] of the orders of the type executed at the
+    # price, filling the volume in price-time priority
+    # -------------------------------------------------------------------------
+    def allocate(self, type_, price, volume):
+        if type_ == "buy":
+            eligible = [order for order in self.orders[type_] if order[1] is None or order[1] >= price]
+            eligible.sort(key=lambda order: (order[1] is not None, -(order[1] or 0.0), order[3]))
+        else:
+            eligible = [order for order in self.orders[type_] if order[1] is None or order[1] <= price]
+            eligible.sort(key=lambda order: (order[1] is not None, order[1] or 0.0, order[3]))
+        allocations = []
+        for order in eligible:
+            if volume <= 0.0:
+                break
+            quantity = min(volume, order[2])
+            allocations.append([order[0], quantity])
+            volume = volume - quantity
+        return allocations
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # clear()
+    # executes the auction, empties it and returns the list of trades
+    # the sellers and buyers executed are paired in one merge pass
+    # -------------------------------------------------------------------------
+    def clear(self):
+        self.price, self.volume = self.clearing_price()
+        trades = []
+        if self.price is not None:
+            sellers = self.allocate("sell", self.price, self.volume)
+            buyers = self.allocate("buy", self.price, self.volume)
+            i = 0
+            j = 0
+            while i < len(sellers) and j < len(buyers):
+                quantity = min(sellers[i][1], buyers[j][1])
+                trades.append([sellers[i][0], buyers[j][0], quantity, self.price])
+                sellers[i][1] = sellers[i][1] - quantity
+                buyers[j][1] = buyers[j][1] - quantity
+                if sellers[i][1] <= 0.0:
+                    i = i + 1
+                if buyers[j][1] <= 0.0:
+                    j = j + 1
+        self.orders = {"buy": [], "sell": []}
+        return trades
+    # -------------------------------------------------------------------------
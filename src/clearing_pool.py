@@ -0,0 +1,196 @@
+#!/usr/bin/env python
+# [SublimeLinter pep8-max-line-length:150]
+# -*- coding: utf-8 -*-
+
+"""
+black_rhino is a multi-agent simulator for financial network analysis
+Copyright (C) 2016 Co-Pierre Georg (co-pierre.georg@keble.ox.ac.uk)
+Pawel Fiedor (pawel@fiedor.eu)
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, version 3 of the License.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program. If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import multiprocessing
+try:
+    import numpy as np
+except ImportError:  # numpy is only needed for the vectorized curves
+    np = None
+
+
+# -------------------------------------------------------------------------
+# can_start_workers()
+# returns whether this process can start the worker processes, a daemonic
+# process (e.g. a worker of the process pool of MonteCarlo) can't
+# -------------------------------------------------------------------------
+def can_start_workers():
+    return not multiprocessing.current_process().daemon
+# -------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------
+# aggregate(curves, price)
+# returns the total supply or demand of the curves at the price, the
+# curves are [function, [parameter arrays]] as made by Market.curve
+# -------------------------------------------------------------------------
+def aggregate(curves, price):
+    total = 0.0
+    for function, parameters in curves:
+        if parameters is not None:
+            total = total + float(np.sum(function(price, *parameters)))
+    return total
+# -------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------
+# partition(curves, num_parts)
+# returns the curves split into num_parts lists of curves, each with
+# a contiguous slice of the agents of every curve
+# -------------------------------------------------------------------------
+def partition(curves, num_parts):
+    parts = [[] for i in range(num_parts)]
+    for function, parameters in curves:
+        if parameters is None:
+            continue
+        slices = [np.array_split(column, num_parts) for column in parameters]
+        for i in range(num_parts):
+            if len(slices[0][i]) > 0:
+                parts[i].append([function, [column_slices[i] for column_slices in slices]])
+    return parts
+# -------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------
+# clearing_worker(connection)
+# the loop of a worker process, it keeps the partition of the curves it
+# was last sent and answers each price with its partial demand and supply
+# messages are ("load", supply_curves, demand_curves), ("price", price)
+# and ("close",)
+# -------------------------------------------------------------------------
+def clearing_worker(connection):
+    supply_curves = []
+    demand_curves = []
+    while True:
+        message = connection.recv()
+        if message[0] == "load":
+            supply_curves = message[1]
+            demand_curves = message[2]
+        elif message[0] == "price":
+            try:
+                connection.send((aggregate(demand_curves, message[1]), aggregate(supply_curves, message[1])))
+            except Exception as error:
+                connection.send(error)
+        elif message[0] == "close":
+            break
+    connection.close()
+# -------------------------------------------------------------------------
+
+# ============================================================================
+#
+# class ClearingPool
+#
+# ============================================================================
+
+
+class ClearingPool(object):
+    #
+    #
+    # VARIABLES
+    #
+    #
+
+    # The pool of worker processes used by Market.tatonnement_parallel.
+    # Each worker holds a partition of the agents' supply and demand
+    # curves, which is sent once with load() whenever the agents change
+    # (once per sweep), so that each price tried only sends the price to
+    # the workers and gets the partial demand and supply back. The pool
+    # is meant to be kept for the whole run, see Updater.sell_labour.
+    processes = 1
+    workers = []  # the worker processes
+    connections = []  # the ends of the pipes to the workers
+
+    #
+    #
+    # CODE
+    #
+    #
+
+    # -------------------------------------------------------------------------
+    # __init__(processes)
+    # -------------------------------------------------------------------------
+    def __init__(self, processes=None):
+        if np is None:
+            raise ImportError("The clearing pool requires numpy.")
+        if not can_start_workers():
+            raise RuntimeError("The clearing pool can't start worker processes from a daemonic process.")
+        if processes is None:
+            processes = multiprocessing.cpu_count()
+        self.processes = max(1, int(processes))
+        self.workers = []
+        self.connections = []
+        for i in range(self.processes):
+            parent_end, worker_end = multiprocessing.Pipe()
+            worker = multiprocessing.Process(target=clearing_worker, args=(worker_end,))
+            worker.daemon = True
+            worker.start()
+            worker_end.close()
+            self.workers.append(worker)
+            self.connections.append(parent_end)
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # load(supply_curves, demand_curves)
+    # sends each worker its partition of the curves
+    # -------------------------------------------------------------------------
+    def load(self, supply_curves, demand_curves):
+        supply_parts = partition(supply_curves, self.processes)
+        demand_parts = partition(demand_curves, self.processes)
+        for connection, supply_part, demand_part in zip(self.connections, supply_parts, demand_parts):
+            connection.send(("load", supply_part, demand_part))
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # excess_demand(price)
+    # returns the total (demand, supply) at the price over all workers
+    # the replies of all the workers are read before an error of one of
+    # them is raised, so none is left in the pipes for the next price
+    # -------------------------------------------------------------------------
+    def excess_demand(self, price):
+        for connection in self.connections:
+            connection.send(("price", price))
+        results = [connection.recv() for connection in self.connections]
+        demand = 0.0
+        supply = 0.0
+        for result in results:
+            if isinstance(result, Exception):
+                raise result
+            demand = demand + result[0]
+            supply = supply + result[1]
+        return demand, supply
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # close()
+    # stops the workers
+    # -------------------------------------------------------------------------
+    def close(self):
+        for connection in self.connections:
+            try:
+                connection.send(("close",))
+            except (OSError, EOFError):
+                pass
+            connection.close()
+        for worker in self.workers:
+            worker.join()
+        self.workers = []
+        self.connections = []
+    # -------------------------------------------------------------------------
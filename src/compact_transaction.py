@@ -0,0 +1,335 @@
+#!/usr/bin/env python
+# [SublimeLinter pep8-max-line-length:150]
+# -*- coding: utf-8 -*-
+
+"""
+black_rhino is a multi-agent simulator for financial network analysis
+Copyright (C) 2016 Co-Pierre Georg (co-pierre.georg@keble.ox.ac.uk)
+Pawel Fiedor (pawel@fiedor.eu)
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, version 3 of the License.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program. If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import itertools
+from src.ledger import Ledger
+from src.transaction_store import stored_column
+
+# -------------------------------------------------------------------------
+#
+# class CompactTransaction
+#
+# -------------------------------------------------------------------------
+
+
+class CompactTransaction(object):
+
+    #
+    #
+    # VARIABLES
+    #
+    #
+
+    # The compact transaction has the same public attributes and methods
+    # as src.transaction.Transaction, but it does not derive from the
+    # abstract BaseTransaction. This lets it use __slots__, so instances
+    # don't carry a __dict__, and it is identified by an integer taken
+    # from a counter shared by all compact transactions instead of uuid4.
+    # It is used by Environment.new_transaction when the environment has
+    # the static parameter compact_transactions set to 1.
+    # IMPLEMENTATION NOTE: with slots there are no class level defaults,
+    # all the variables are set in __init__ below
+    __slots__ = ("identifier",  # unique identifier of the transaction, may be useful for iterators
+                 "type_",  # type of transactions, e.g. "deposit"
+                 "asset",  # type of asset, used for investment types
+                 "from_",  # agent being the originator of the transaction
+                 "to",  # agent being the recipient of the transaction
+                 "_amount",  # amount of the transaction, accessed through the amount property below
+                 "_interest",  # interest rate paid to the originator each time step
+                 "_maturity",  # time (in steps) to maturity
+                 "_time_of_default",  # control variable checking for defaulted transactions
+                 "store",  # the columnar store the transaction is bound to, if any
+                 "row",  # the row of the transaction in the store
+                 "network",  # the incremental network the transaction is an edge of, if any
+                 "aggregates")  # the incremental aggregates the transaction is counted in, if any
+
+    identifiers = itertools.count(1)  # the source of identifiers, monotonic within the process
+
+    #
+    #
+    # METHODS
+    #
+    #
+
+    # -------------------------------------------------------------------------
+    # __init__
+    # Takes the next integer identifier off the counter
+    # -------------------------------------------------------------------------
+    def __init__(self):
+        self.store = None  # needs to be there before amount is first set
+        self.row = -1
+        self.network = None
+        self.aggregates = None
+        self._amount = 0.0
+        self.identifier = next(CompactTransaction.identifiers)
+        self.type_ = ""
+        self.asset = ""
+        self.from_ = 0.0
+        self.to = 0.0
+        self.interest = 0.0
+        self.maturity = 0
+        self.time_of_default = -1
+    # ------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # functions for setting/changing variables
+    # these either return or set specific value to the above variables
+    # the checks are the same as in BaseTransaction
+    # -------------------------------------------------------------------------
+    def get_identifier(self):
+        return self.identifier
+
+    def set_identifier(self, identifier, environment):
+        self.identifier = identifier
+
+    def get_type_(self):
+        return self.type_
+
+    def set_type_(self, type_, environment):
+        if not isinstance(type_, str):
+            raise TypeError
+        self.type_ = type_
+
+    def get_asset(self):
+        return self.asset
+
+    def set_asset(self, asset, environment):
+        if not isinstance(asset, str):
+            raise TypeError
+        self.asset = asset
+
+    def get_from_(self):
+        return self.from_
+
+    def set_from_(self, from_, environment):
+        self.from_ = from_
+
+    def get_to(self):
+        return self.to
+
+    def set_to(self, to, environment):
+        self.to = to
+
+    def get_amount(self):
+        return self.amount
+
+    def set_amount(self, amount, environment):
+        if not (isinstance(amount, float) or isinstance(amount, int)):
+            raise TypeError
+        self.amount = float(amount)
+
+    # -------------------------------------------------------------------------
+    # amount
+    # the ledgers of the agents holding the transaction are kept up to date
+    # on every change, and the store is used if the transaction is bound
+    # to one, as in Transaction
+    # -------------------------------------------------------------------------
+    @property
+    def amount(self):
+        if self.store is None:
+            return self._amount
+        return self.store.table["amount"][self.row].item()
+
+    @amount.setter
+    def amount(self, value):
+        previous_amount = self.amount
+        if self.store is None:
+            self._amount = value
+        else:
+            self.store.table["amount"][self.row] = value
+        for ledger in self.get_ledgers():
+            ledger.update_amount(self, previous_amount)
+        if self.network is not None:
+            self.network.set_amount(self)
+        if self.aggregates is not None:
+            self.aggregates.set_amount(self)
+    # -------------------------------------------------------------------------
+
+    # the remaining numeric variables are backed by the store as well
+    interest = stored_column("interest")
+    maturity = stored_column("maturity")
+    time_of_default = stored_column("time_of_default")
+
+    def get_interest(self):
+        return self.interest
+
+    def set_interest(self, interest, environment):
+        if not (isinstance(interest, float) or isinstance(interest, int)):
+            raise TypeError
+        self.interest = float(interest)
+
+    def get_maturity(self):
+        return self.maturity
+
+    def set_maturity(self, maturity, environment):
+        if not (isinstance(maturity, float) or isinstance(maturity, int)):
+            raise TypeError
+        self.maturity = int(maturity)
+
+    def get_time_of_default(self):
+        return self.time_of_default
+
+    def set_time_of_default(self, time_of_default, environment):
+        if not (isinstance(time_of_default, float) or isinstance(time_of_default, int)):
+            raise TypeError
+        self.time_of_default = int(time_of_default)
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # get_ledgers()
+    # returns the ledgers (accounts) of the agents holding the transaction
+    # a transaction from an agent to itself is held in one ledger only
+    # -------------------------------------------------------------------------
+    def get_ledgers(self):
+        ledgers = []
+        for agent in (self.from_, self.to):
+            accounts = getattr(agent, "accounts", None)
+            if isinstance(accounts, Ledger) and not any(accounts is ledger for ledger in ledgers):
+                ledgers.append(accounts)
+        return ledgers
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # this_transaction
+    # sets the variables of the transaction to the given values
+    # negative amounts reverse the direction of the transaction
+    # -------------------------------------------------------------------------
+    def this_transaction(self, type_, asset, from_, to, amount,  interest,  maturity, time_of_default):
+        self.type_ = type_
+        self.asset = asset
+        # the convention used is that amounts are positive
+        if amount >= 0:
+            self.from_ = from_
+            self.to = to
+        else:
+            self.from_ = to
+            self.to = from_
+            amount = abs(amount)
+        self.amount = amount
+        self.interest = interest
+        self.maturity = maturity
+        self.time_of_default = time_of_default
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # add_transaction
+    # adds the transaction to appropriate agents' accounts
+    # agents can be given either as agents or as their identifiers
+    # -------------------------------------------------------------------------
+    def add_transaction(self, type_, asset, from_, to, amount,  interest,  maturity, time_of_default, environment):
+        self.this_transaction(type_, asset, from_, to, amount,  interest,  maturity, time_of_default)
+        if isinstance(self.from_, str):
+            self.from_ = environment.get_agent_by_id(self.from_)
+        if isinstance(self.to, str):
+            self.to = environment.get_agent_by_id(self.to)
+        if hasattr(self.from_, "accounts") and hasattr(self.to, "accounts"):
+            self.from_.accounts.append(self)
+            if self.from_ != self.to:
+                self.to.accounts.append(self)
+        else:
+            raise TypeError("Transaction's from or to is not an instance of an agent.")
+        network = getattr(environment, "network", None)
+        if network is not None and network.incremental:
+            network.add_transaction(self)
+        aggregates = getattr(environment, "aggregates", None)
+        if aggregates is not None:
+            aggregates.add_transaction(self)
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # remove_transaction
+    # removes the transaction from appropriate agents' accounts
+    # -------------------------------------------------------------------------
+    def remove_transaction(self, environment):
+        for ledger in self.get_ledgers():
+            ledger.discard(self)
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # remove_transactions(transactions, environment)
+    # removes a number of transactions from the appropriate agents' accounts
+    # grouping them by ledger so each ledger is compacted at most once
+    # -------------------------------------------------------------------------
+    def remove_transactions(self, transactions, environment):
+        ledgers = {}
+        for transaction in transactions:
+            for ledger in transaction.get_ledgers():
+                if id(ledger) not in ledgers:
+                    ledgers[id(ledger)] = [ledger, []]
+                ledgers[id(ledger)][1].append(transaction)
+        for ledger, to_remove in ledgers.values():
+            ledger.discard_many(to_remove)
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # print_transaction()
+    # prints the transaction and its properties
+    # -------------------------------------------------------------------------
+    def print_transaction(self):
+        print(self.write_transaction().rstrip("\n"))
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # __str__()
+    # prints the transaction and its properties
+    # -------------------------------------------------------------------------
+    def __str__(self):
+        return self.write_transaction()
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # write_transaction()
+    # returns a string with the transaction and its properties
+    # in the same format as Transaction
+    # -------------------------------------------------------------------------
+    def write_transaction(self):
+        text = "        <transaction type='" + self.type_ + "'>\n"
+        if self.asset != "":
+            text = text + "            <property type='asset' value='" + self.asset + "'>\n"
+        text = text + "            <property type='from' value='" + str(getattr(self.from_, "identifier", self.from_)) + "'></property>\n"
+        text = text + "            <property type='to' value='" + str(getattr(self.to, "identifier", self.to)) + "'></property>\n"
+        text = text + "            <property type='amount' value='" + str(self.amount) + "'></property>\n"
+        text = text + "            <property type='interest' value='" + str(self.interest) + "'></property>\n"
+        text = text + "            <property type='maturity' value='" + str(self.maturity) + "'></property>\n"
+        text = text + "            <property type='time_of_default' value='" + str(self.time_of_default) + "'></property>\n"
+        text = text + "        </transaction>\n"
+        return text
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # clear_accounts()
+    # deletes all transactions of a given agent
+    # this should be used very sparingly, as this does not account
+    # for the economics of the process
+    # -------------------------------------------------------------------------
+    def clear_accounts(self, agent, environment):
+        self.remove_transactions(agent.accounts, environment)
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # purge_accounts()
+    # removes all transactions of all agents with amount of zero
+    # -------------------------------------------------------------------------
+    def purge_accounts(self, environment):
+        for agent in environment.agents_generator():
+            agent.accounts.purge()
+    # -------------------------------------------------------------------------
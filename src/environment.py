@@ -50,6 +50,13 @@ class Environment(BaseConfig):
     shocks = []  # list of shocks: [sweep_from, sweep_to, kind_of_shock]
 
     network = Network("")  # network of transaction
+    transaction_store = None  # columnar store of transactions, used if columnar_transactions is set to 1
+    aggregates = None  # incremental aggregates of the books, used if incremental_aggregates is set to 1
+    rng = None  # random number generator of the run, see seed_rng
+
+    agent_index = {}  # identifier -> agent, used by get_agent_by_id
+    agent_index_signature = None  # the lists of agents the index was built from, see agent_lists_signature
+    duplicate_ids = set()  # identifiers shared by more than one agent
 
     static_parameters = {}  # a dictionary containing all static parameters (with a fixed value)
     variable_parameters = {}  # a dictionary containing all variable parameters (with a range of possible values)
@@ -211,9 +218,57 @@ class Environment(BaseConfig):
     # get_agent_by_id
     # returns an agent based on the id
     # -------------------------------------------------------------------------
+    # the agents are looked up in a dictionary which is rebuilt whenever
+    # the lists of agents change, on a miss we rebuild it once more in case
+    # an identifier was changed after the agent had been indexed
+    # -------------------------------------------------------------------------
     def get_agent_by_id(self, ident):
-        # self.agents = [self.banks, self.firms, self.households]
-        return super(Environment, self).get_agent_by_id(ident)
+        if self.agent_index_signature != self.agent_lists_signature():
+            self.rebuild_agent_index()
+        agent = self.agent_index.get(ident)
+        if agent is None or agent.identifier != ident:
+            self.rebuild_agent_index()
+            agent = self.agent_index.get(ident)
+        if ident in self.duplicate_ids:
+            raise LookupError('At least two agents have the same ID.')
+        if agent is None:
+            raise LookupError('No agents have the provided ID.')
+        return agent
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # get_agents_by_ids(idents)
+    # returns a list of agents for a list of ids, in the same order
+    # -------------------------------------------------------------------------
+    def get_agents_by_ids(self, idents):
+        return [self.get_agent_by_id(ident) for ident in idents]
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # agent_lists_signature()
+    # returns the identity and length of each list of agents, if these
+    # change (e.g. an agent is appended to banks) the index is rebuilt
+    # IMPLEMENTATION NOTE: replacing an agent in a list in place is not
+    # picked up, call rebuild_agent_index after doing so
+    # -------------------------------------------------------------------------
+    def agent_lists_signature(self):
+        return tuple((id(agents), len(agents)) for agents in self.agents)
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # rebuild_agent_index()
+    # builds the dictionary of agents by identifier and notes the
+    # identifiers which are not unique
+    # -------------------------------------------------------------------------
+    def rebuild_agent_index(self):
+        self.agent_index = {}
+        self.duplicate_ids = set()
+        for agent in self.agents_generator():
+            if agent.identifier in self.agent_index:
+                self.duplicate_ids.add(agent.identifier)
+            else:
+                self.agent_index[agent.identifier] = agent
+        self.agent_index_signature = self.agent_lists_signature()
     # -------------------------------------------------------------------------
 
     # -------------------------------------------------------------------------
@@ -283,6 +338,9 @@ class Environment(BaseConfig):
     # -------------------------------------------------------------------------
     def initialize(self,  environment_directory,  identifier):
         self.identifier = identifier
+        # the lists of agents are refilled in place, usually to the same
+        # lengths, so the index of the agents is dropped explicitly
+        self.agent_index_signature = None
 
         self.static_parameters = {}
         self.static_parameters["num_simulations"] = 0
@@ -302,10 +360,19 @@ class Environment(BaseConfig):
         self.read_xml_config_file(environment_filename)
         logging.info("  environment file read: %s",  environment_filename)
 
-        # then read in all the banks
+        # the random number generator is seeded with the static parameter
+        # seed if there is one, and from the system otherwise
+        self.seed_rng(self.static_parameters.get("seed", None))
+
+        # then read in all the banks, every config file is parsed once and
+        # the records are kept to add the transactions once all agents are known
+        bank_records = []
+        firm_records = []
+        household_records = []
+        central_bank_records = []
         if (self.bank_directory != ""):
             if (self.bank_directory != "none"):  # none is used for tests only
-                self.initialize_banks_from_files(self.bank_directory)
+                bank_records = self.initialize_banks_from_files(self.bank_directory)
                 logging.info("  banks read from directory: %s",  self.bank_directory)
         else:
             logging.error("ERROR: no bank_directory given in %s\n",  environment_filename)
@@ -313,7 +380,7 @@ class Environment(BaseConfig):
         # then read in all the firms
         if (self.firm_directory != ""):
             if (self.firm_directory != "none"):  # none is used for tests only
-                self.initialize_firms_from_files(self.firm_directory)
+                firm_records = self.initialize_firms_from_files(self.firm_directory)
                 logging.info("  firms read from directory: %s",  self.firm_directory)
         else:
             logging.error("ERROR: no firm_directory given in %s\n",  environment_filename)
@@ -321,7 +388,7 @@ class Environment(BaseConfig):
         # then read in all the households
         if (self.household_directory != ""):
             if (self.household_directory != "none"):  # none is used for tests only
-                self.initialize_households_from_files(self.household_directory)
+                household_records = self.initialize_households_from_files(self.household_directory)
                 logging.info("  households read from directory: %s",  self.household_directory)
         else:
             logging.error("ERROR: no household_directory given in %s\n",  environment_filename)
@@ -329,7 +396,7 @@ class Environment(BaseConfig):
         # then read in the central bank
         if (self.central_bank_directory != ""):
             if (self.bank_directory != "none"):  # none is used for tests only
-                self.initialize_central_bank_from_files(self.central_bank_directory)
+                central_bank_records = self.initialize_central_bank_from_files(self.central_bank_directory)
                 logging.info("  central bank read from directory: %s",  self.central_bank_directory)
         else:
             logging.error("ERROR: no central_bank_directory given in %s\n",  environment_filename)
@@ -337,6 +404,16 @@ class Environment(BaseConfig):
         # add agents to the list of all agents
         self.agents = [self.banks, self.firms, self.households, self.central_bank]
 
+        # set up the columnar store of transactions if asked for, the
+        # transactions read below are bound to it on the first sync
+        self.transaction_store = None
+        if self.static_parameters.get("columnar_transactions", 0.0) == 1.0:
+            from src.transaction_store import TransactionStore
+            self.transaction_store = TransactionStore()
+
+        # the aggregates count the transactions as they are added below
+        self.initialize_aggregates()
+
         # initialize the network
         self.network.identifier = self.identifier
         self.network.initialize_networks(self)
@@ -344,7 +421,7 @@ class Environment(BaseConfig):
         # then, initialize transactions from the config files for banks
         if (self.bank_directory != ""):
             if (self.bank_directory != "none"):  # none is used for tests only
-                self.read_transactions_for_banks(self.bank_directory)
+                self.add_transactions_from_records(bank_records)
                 logging.info("  banks' transactions read from directory: %s",  self.bank_directory)
         else:
             logging.error("ERROR: no bank_directory given in %s\n",  environment_filename)
@@ -352,7 +429,7 @@ class Environment(BaseConfig):
         # then, initialize transactions from the config files for firms
         if (self.firm_directory != ""):
             if (self.firm_directory != "none"):  # none is used for tests only
-                self.read_transactions_for_firms(self.firm_directory)
+                self.add_transactions_from_records(firm_records)
                 logging.info("  firms' transactions read from directory: %s",  self.firm_directory)
         else:
             logging.error("ERROR: no firm_directory given in %s\n",  environment_filename)
@@ -360,7 +437,7 @@ class Environment(BaseConfig):
         # then, initialize transactions from the config files for households
         if (self.household_directory != ""):
             if (self.household_directory != "none"):  # none is used for tests only
-                self.read_transactions_for_households(self.household_directory)
+                self.add_transactions_from_records(household_records)
                 logging.info("  households read from directory: %s",  self.household_directory)
         else:
             logging.error("ERROR: no household_directory given in %s\n",  environment_filename)
@@ -368,7 +445,7 @@ class Environment(BaseConfig):
         # then, initialize transactions from the config files for central bank
         if (self.central_bank_directory != ""):
             if (self.central_bank_directory != "none"):  # none is used for tests only
-                self.read_transactions_for_central_bank(self.central_bank_directory)
+                self.add_transactions_from_records(central_bank_records)
                 logging.info("  central bank's transactions read from directory: %s",  self.central_bank_directory)
         else:
             logging.error("ERROR: no central_bank_directory given in %s\n",  environment_filename)
@@ -376,30 +453,212 @@ class Environment(BaseConfig):
 
     # -------------------------------------------------------------------------
 
+    # -------------------------------------------------------------------------
+    # seed_rng(seed, stream)
+    # sets the random number generator of the run, which is passed on to
+    # the updater, the market and the agents, runs done in parallel use
+    # the same seed with different streams, see src.rng.new_rng
+    # -------------------------------------------------------------------------
+    def seed_rng(self, seed=None, stream=None):
+        from src.rng import new_rng
+        self.rng = new_rng(seed, stream)
+        return self.rng
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # fork()
+    # returns an independent copy of the initialized environment, so that
+    # many replications can start from the same state without reading
+    # the config files again. Agents and transactions are cloned flat,
+    # every ledger gets the clones in its own order, and the network is
+    # copied with the agents replaced by their clones. The transactions
+    # keep their identifiers, which are unique within every fork.
+    # Every fork gets its own random stream spawned from the rng of the
+    # environment (see src.rng.spawn_rng), reseed it with seed_rng to
+    # tie it to a seed of its own.
+    # -------------------------------------------------------------------------
+    def fork(self):
+        import copy
+        from src.ledger import Ledger
+        from src.rng import spawn_rng
+        forked = Environment.__new__(Environment)
+        forked.__dict__.update(self.__dict__)
+        forked.static_parameters = dict(self.static_parameters)
+        forked.variable_parameters = dict(self.variable_parameters)
+        forked.assets = copy.deepcopy(self.assets)
+        forked.shocks = list(self.shocks)
+        forked.rng = spawn_rng(self.rng)
+        forked.agent_index = {}
+        forked.agent_index_signature = None
+        forked.duplicate_ids = set()
+
+        # the lists of agents are class variables shared by all environments
+        # so the fork needs lists of its own
+        clones = {}  # id(agent) -> clone of the agent
+        for kind in ["banks", "firms", "households", "central_bank"]:
+            agents = []
+            for agent in getattr(self, kind):
+                clone = agent.__class__()
+                clone.identifier = agent.identifier
+                clone.parameters = dict(agent.parameters)
+                clone.state_variables = copy.deepcopy(agent.state_variables)
+                clone.accounts = Ledger()
+                clones[id(agent)] = clone
+                agents.append(clone)
+            setattr(forked, kind, agents)
+        forked.agents = [forked.banks, forked.firms, forked.households, forked.central_bank]
+
+        # every transaction is cloned once and booked in the ledgers of the
+        # clones of its agents in the order the original ledgers have it
+        transactions = {}  # identifier -> clone of the transaction
+        for agent in self.agents_generator():
+            ledger = clones[id(agent)].accounts
+            for transaction in agent.accounts:
+                if transaction.identifier not in transactions:
+                    clone = transaction.__class__()
+                    clone.identifier = transaction.identifier
+                    clone.type_ = transaction.type_
+                    clone.asset = transaction.asset
+                    clone.from_ = clones.get(id(transaction.from_), transaction.from_)
+                    clone.to = clones.get(id(transaction.to), transaction.to)
+                    clone.amount = transaction.amount
+                    clone.interest = transaction.interest
+                    clone.maturity = transaction.maturity
+                    clone.time_of_default = transaction.time_of_default
+                    transactions[transaction.identifier] = clone
+                ledger.append(transactions[transaction.identifier])
+
+        forked.transaction_store = None
+        if self.transaction_store is not None:
+            from src.transaction_store import TransactionStore
+            forked.transaction_store = TransactionStore()
+            forked.transaction_store.sync(forked)
+
+        # the network is a class variable as well, the fork gets a copy
+        # of the graph with the agents replaced by their clones
+        mapping = {}
+        for node in self.network.transactions.nodes():
+            if id(node) in clones:
+                mapping[node] = clones[id(node)]
+        forked.network = Network(self.network.identifier)
+        forked.network.identifier = self.network.identifier
+        forked.network.transactions = nx.relabel_nodes(self.network.transactions, mapping, copy=True)
+        # an incremental network needs the edges of the cloned transactions
+        if self.network.incremental:
+            forked.network.rebuild(forked)
+        # and so do the aggregates
+        forked.aggregates = None
+        if self.aggregates is not None:
+            from src.aggregates import Aggregates
+            forked.aggregates = Aggregates()
+            for name, definition in self.aggregates.sums.items():
+                forked.aggregates.register(name, *definition)
+            forked.aggregates.rebuild(forked)
+        return forked
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # initialize_from_snapshot(environment_directory, identifier, snapshot_directory)
+    # initializes the environment from the binary snapshot in the snapshot
+    # directory if there is one made from the current config files, and
+    # otherwise initializes it from the config files and saves the snapshot
+    # for the next time, returns True if the snapshot was used
+    # -------------------------------------------------------------------------
+    def initialize_from_snapshot(self, environment_directory, identifier, snapshot_directory):
+        from src.snapshot import config_hash, read_snapshot
+        current_hash = config_hash(environment_directory, identifier)
+        snapshot_filename = os.path.join(snapshot_directory, identifier + ".snapshot")
+        snapshot = read_snapshot(snapshot_filename, current_hash)
+        if snapshot is not None:
+            self.restore_snapshot(snapshot)
+            logging.info("  environment restored from snapshot: %s",  snapshot_filename)
+            return True
+        self.initialize(environment_directory, identifier)
+        self.save_snapshot(snapshot_filename, current_hash)
+        logging.info("  environment snapshot saved: %s",  snapshot_filename)
+        return False
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # save_snapshot(snapshot_filename, config_hash)
+    # saves the agents, parameters and transactions of the environment
+    # to a binary snapshot, config_hash is the hash of the config files
+    # the environment was read from (see src.snapshot.config_hash)
+    # -------------------------------------------------------------------------
+    def save_snapshot(self, snapshot_filename, config_hash=None):
+        from src.snapshot import snapshot_of, write_snapshot
+        write_snapshot(snapshot_of(self, config_hash), snapshot_filename)
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # restore_snapshot(snapshot)
+    # sets the environment to the state in the snapshot (as returned by
+    # src.snapshot.read_snapshot), going through the same steps as
+    # initialize but without reading any of the config files
+    # -------------------------------------------------------------------------
+    def restore_snapshot(self, snapshot):
+        import copy
+        from src.bank import Bank
+        from src.firm import Firm
+        from src.household import Household
+        from src.central_bank import CentralBank
+        self.identifier = snapshot["identifier"]
+        self.agent_index_signature = None  # see initialize
+        self.static_parameters = copy.deepcopy(snapshot["static_parameters"])
+        self.variable_parameters = copy.deepcopy(snapshot["variable_parameters"])
+        self.assets = copy.deepcopy(snapshot["assets"])
+        self.shocks = copy.deepcopy(snapshot["shocks"])
+        self.seed_rng(self.static_parameters.get("seed", None))
+
+        # the lists of agents are emptied and filled again, as in initialize
+        for kind, agents, agent_class in [("banks", self.banks, Bank), ("firms", self.firms, Firm),
+                                          ("households", self.households, Household), ("central_bank", self.central_bank, CentralBank)]:
+            while len(agents) > 0:
+                agents.pop()
+            for identifier, parameters, state_variables in snapshot["agents"][kind]:
+                agent = agent_class()
+                agent.identifier = identifier
+                agent.parameters = copy.deepcopy(parameters)
+                agent.state_variables = copy.deepcopy(state_variables)
+                agents.append(agent)
+        self.agents = [self.banks, self.firms, self.households, self.central_bank]
+
+        self.transaction_store = None
+        if self.static_parameters.get("columnar_transactions", 0.0) == 1.0:
+            from src.transaction_store import TransactionStore
+            self.transaction_store = TransactionStore()
+
+        # the aggregates count the transactions as they are added below
+        self.initialize_aggregates()
+
+        # initialize the network
+        self.network.identifier = snapshot["network"]
+        self.network.initialize_networks(self)
+
+        # and add the transactions back in the order they were booked
+        for type_, asset, from_, to, amount, interest, maturity, time_of_default in snapshot["transactions"]:
+            self.new_transaction(type_, asset, from_, to, amount, interest, maturity, time_of_default)
+    # -------------------------------------------------------------------------
+
     # -------------------------------------------------------------------------
     # initialize_banks_from_files(self,  bank_directory)
     # banks have to be initialized for each simulation as a number of
     # banks might become inactive in the previous simulation
     # this reads all config files in the provided directory and
     # initializes banks with the contents of these configs
+    # returns the records of the files, so the transactions found in them
+    # can be added without parsing the files again
     # -------------------------------------------------------------------------
     def initialize_banks_from_files(self,  bank_directory):
         from src.bank import Bank
-        # this routine is called more than once, so we have to reset the list of banks each time
-        while len(self.banks) > 0:
-            self.banks.pop()
         # we list all the files in the specified directory
         listing = os.listdir(bank_directory)
         # and check if the number of files is in line with the parameters
         if (len(listing) != self.num_banks):
             logging.error("    ERROR: number of configuration files in %s (=%s) does not match num_banks (=%s)",
                           bank_directory,  str(len(listing)), str(self.num_banks))
-        # we read the files sequentially
-        for infile in listing:
-            bank = Bank()
-            bank.get_parameters_from_file(bank_directory + infile,  self)
-            # and read parameters to the banks, only to add them to the environment
-            self.banks.append(bank)
+        # this routine is called more than once, so the list of banks is reset each time
+        return self.load_agents_from_files(bank_directory, listing, self.banks, Bank)
     # -------------------------------------------------------------------------
 
     # -------------------------------------------------------------------------
@@ -408,24 +667,18 @@ class Environment(BaseConfig):
     # banks might become inactive in the previous simulation
     # this reads all config files in the provided directory and
     # initializes firms with the contents of these configs
+    # returns the records of the files, as for banks
     # -------------------------------------------------------------------------
     def initialize_firms_from_files(self,  firm_directory):
         from src.firm import Firm
-        # this routine is called more than once, so we have to reset the list of firms each time
-        while len(self.firms) > 0:
-            self.firms.pop()
         # we list all the files in the specified directory
         listing = os.listdir(firm_directory)
         # and check if the number of files is in line with the parameters
         if (len(listing) != self.num_firms):
             logging.error("    ERROR: number of configuration files in %s (=%s) does not match num_firms (=%s)",
                           firm_directory,  str(len(listing)), str(self.num_firms))
-        # we read the files sequentially
-        for infile in listing:
-            firm = Firm()
-            firm.get_parameters_from_file(firm_directory + infile,  self)
-            # and read parameters to the firms, only to add them to the environment
-            self.firms.append(firm)
+        # this routine is called more than once, so the list of firms is reset each time
+        return self.load_agents_from_files(firm_directory, listing, self.firms, Firm)
     # -------------------------------------------------------------------------
 
     # -------------------------------------------------------------------------
@@ -434,24 +687,18 @@ class Environment(BaseConfig):
     # households might become inactive in the previous simulation
     # this reads all config files in the provided directory and
     # initializes households with the contents of these configs
+    # returns the records of the files, as for banks
     # -------------------------------------------------------------------------
     def initialize_households_from_files(self,  household_directory):
         from src.household import Household
-        # this routine is called more than once, so we have to reset the list of households each time
-        while len(self.households) > 0:
-            self.households.pop()
         # we list all the files in the specified directory
         listing = os.listdir(household_directory)
         # and check if the number of files is in line with the parameters
         if (len(listing) != self.num_households):
             logging.error("    ERROR: number of configuration files in %s (=%s) does not match num_households (=%s)",
                           household_directory,  str(len(listing)), str(self.num_households))
-        # we read the files sequentially
-        for infile in listing:
-            household = Household()
-            household.get_parameters_from_file(household_directory + infile,  self)
-            # and read parameters to the firms, only to add them to the environment
-            self.households.append(household)
+        # this routine is called more than once, so the list of households is reset each time
+        return self.load_agents_from_files(household_directory, listing, self.households, Household)
     # -------------------------------------------------------------------------
 
     # -------------------------------------------------------------------------
@@ -459,48 +706,85 @@ class Environment(BaseConfig):
     # central bank has to be initialized for each simulation
     # this reads all config files in the provided directory and
     # initializes central bank with the contents of the config
+    # returns the records of the files, as for banks
     # -------------------------------------------------------------------------
     def initialize_central_bank_from_files(self,  central_bank_directory):
         from src.central_bank import CentralBank
-        # this routine is called more than once, so we have to reset the list of households each time
-        while len(self.central_bank) > 0:
-            self.central_bank.pop()
         # we list all the files in the specified directory
         listing = os.listdir(central_bank_directory)
         # and check if the number of files is in line with the parameters
         if (len(listing) != 1):
             logging.error("    ERROR: number of configuration files in %s (=%s) does not match one central bank",
                           central_bank_directory,  str(len(listing)))
-        # we read the files sequentially
-        for infile in listing:
-            cb = CentralBank()
-            cb.get_parameters_from_file(central_bank_directory + infile,  self)
-            # and read parameters to the firms, only to add them to the environment
-            self.central_bank.append(cb)
+        # this routine is called more than once, so the list of central banks is reset each time
+        return self.load_agents_from_files(central_bank_directory, listing, self.central_bank, CentralBank)
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # load_agents_from_files(directory, listing, agents, agent_class)
+    # parses the listed config files in the directory once, each of them
+    # with src.agent_loader, and replaces the contents of the list of agents
+    # with new instances of agent_class holding the parameters found
+    # the files are parsed in a process pool if the static parameter
+    # loader_processes is larger than one
+    # returns the records of the files for add_transactions_from_records
+    # -------------------------------------------------------------------------
+    def load_agents_from_files(self, directory, listing, agents, agent_class):
+        from src.agent_loader import parse_agent_directory
+        records = parse_agent_directory(directory, listing, int(self.static_parameters.get("loader_processes", 1)))
+        while len(agents) > 0:
+            agents.pop()
+        for identifier, parameters, transactions in records:
+            agent = agent_class()
+            agent.identifier = identifier
+            for name in parameters:
+                agent.parameters[name] = parameters[name]
+            agents.append(agent)
+        return records
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # add_transactions_from_records(records)
+    # adds the transactions read from the config files to the agents
+    # whose files they were found in, this is the second, in-memory pass
+    # once all agents are known and counterparties can be resolved
+    # -------------------------------------------------------------------------
+    def add_transactions_from_records(self, records):
+        for identifier, parameters, transactions in records:
+            # the agents of files which couldn't be parsed have none
+            if len(transactions) == 0:
+                continue
+            # we find the agent with the identifier of the config
+            agent = self.get_agent_by_id(identifier)
+            for type_, asset, from_, to, amount, interest, maturity, time_of_default in transactions:
+                # we find the actual agents by the ID found in the config
+                try:
+                    from_agent = self.get_agent_by_id(from_)
+                    to_agent = self.get_agent_by_id(to)
+                except LookupError:
+                    logging.error("    ERROR: transaction of %s from %s to %s could not be resolved",  identifier, from_, to)
+                    continue
+                # and add the transaction to the agent's accounts
+                agent.add_transaction(type_, asset, from_agent, to_agent, amount, interest, maturity, time_of_default, self)
     # -------------------------------------------------------------------------
 
     # -------------------------------------------------------------------------
     # read_transactions_from_files(self,  bank_directory)
     # reads transactions for banks from the config files
+    # initialize doesn't use this, it keeps the records from
+    # initialize_banks_from_files instead of parsing the files again
     # -------------------------------------------------------------------------
     def read_transactions_for_banks(self,  bank_directory):
-        from xml.etree import ElementTree
+        from src.agent_loader import parse_agent_directory
         # we list all the files in the specified directory
         listing = os.listdir(bank_directory)
         # and check if the number of files is in line with the parameters
         if (len(listing) != self.num_banks):
             logging.error("    ERROR: number of configuration files in %s (=%s) does not match num_banks (=%s)",
                           bank_directory,  str(len(listing)), str(self.num_banks))
-        # we read the files sequentially)
-        for infile in listing:
-            # we open the file and find the identifier of the config
-            xmlText = open(bank_directory + infile).read()
-            element = ElementTree.XML(xmlText)
-            identifier = element.attrib['identifier']
-            # and we find the bank with this identifier
-            bank = self.get_agent_by_id(identifier)
-            # then we read the transactions from the config to the appropriate bank
-            bank.get_transactions_from_file(bank_directory + infile, self)
+        # we read the files and add their transactions to the appropriate banks
+        records = parse_agent_directory(bank_directory, listing, int(self.static_parameters.get("loader_processes", 1)))
+        self.add_transactions_from_records(records)
     # -------------------------------------------------------------------------
 
     # -------------------------------------------------------------------------
@@ -508,23 +792,16 @@ class Environment(BaseConfig):
     # reads transactions for firms from the config files
     # -------------------------------------------------------------------------
     def read_transactions_for_firms(self,  firm_directory):
-        from xml.etree import ElementTree
+        from src.agent_loader import parse_agent_directory
         # we list all the files in the specified directory
         listing = os.listdir(firm_directory)
         # and check if the number of files is in line with the parameters
         if (len(listing) != self.num_firms):
             logging.error("    ERROR: number of configuration files in %s (=%s) does not match num_firms (=%s)",
                           firm_directory,  str(len(listing)), str(self.num_firms))
-        # we read the files sequentially
-        for infile in listing:
-            # we open the file and find the identifier of the config
-            xmlText = open(firm_directory + infile).read()
-            element = ElementTree.XML(xmlText)
-            identifier = element.attrib['identifier']
-            # and we find the firm with this identifier
-            firm = self.get_agent_by_id(identifier)
-            # then we read the transactions from the config to the appropriate firm
-            firm.get_transactions_from_file(firm_directory + infile, self)
+        # we read the files and add their transactions to the appropriate firms
+        records = parse_agent_directory(firm_directory, listing, int(self.static_parameters.get("loader_processes", 1)))
+        self.add_transactions_from_records(records)
     # -------------------------------------------------------------------------
 
     # -------------------------------------------------------------------------
@@ -532,23 +809,16 @@ class Environment(BaseConfig):
     # reads transactions for households from the config files
     # -------------------------------------------------------------------------
     def read_transactions_for_households(self,  household_directory):
-        from xml.etree import ElementTree
+        from src.agent_loader import parse_agent_directory
         # we list all the files in the specified directory
         listing = os.listdir(household_directory)
         # and check if the number of files is in line with the parameters
         if (len(listing) != self.num_households):
             logging.error("    ERROR: number of configuration files in %s (=%s) does not match num_households (=%s)",
                           household_directory,  str(len(listing)), str(self.num_households))
-        # we read the files sequentially
-        for infile in listing:
-            # we open the file and find the identifier of the config
-            xmlText = open(household_directory + infile).read()
-            element = ElementTree.XML(xmlText)
-            identifier = element.attrib['identifier']
-            # and we find the firm with this identifier
-            household = self.get_agent_by_id(identifier)
-            # then we read the transactions from the config to the appropriate firm
-            household.get_transactions_from_file(household_directory + infile, self)
+        # we read the files and add their transactions to the appropriate households
+        records = parse_agent_directory(household_directory, listing, int(self.static_parameters.get("loader_processes", 1)))
+        self.add_transactions_from_records(records)
     # -------------------------------------------------------------------------
 
     # -------------------------------------------------------------------------
@@ -556,23 +826,16 @@ class Environment(BaseConfig):
     # reads transactions for central bank from the config file
     # -------------------------------------------------------------------------
     def read_transactions_for_central_bank(self,  central_bank_directory):
-        from xml.etree import ElementTree
+        from src.agent_loader import parse_agent_directory
         # we list all the files in the specified directory
         listing = os.listdir(central_bank_directory)
         # and check if the number of files is in line with the parameters
         if (len(listing) != 1):
             logging.error("    ERROR: number of configuration files in %s (=%s) does not match one central bank",
                           central_bank_directory,  str(len(listing)))
-        # we read the files sequentially
-        for infile in listing:
-            # we open the file and find the identifier of the config
-            xmlText = open(central_bank_directory + infile).read()
-            element = ElementTree.XML(xmlText)
-            identifier = element.attrib['identifier']
-            # and we find the bank with this identifier
-            cb = self.get_agent_by_id(identifier)
-            # then we read the transactions from the config to the appropriate bank
-            cb.get_transactions_from_file(central_bank_directory + infile, self)
+        # we read the file and add its transactions to the central bank
+        records = parse_agent_directory(central_bank_directory, listing, int(self.static_parameters.get("loader_processes", 1)))
+        self.add_transactions_from_records(records)
     # -------------------------------------------------------------------------
 
     # -------------------------------------------------------------------------
@@ -593,18 +856,53 @@ class Environment(BaseConfig):
     # making sure we don't double count the transactions that are
     # on the books of multiple agents, interest is specified within the
     # transaction itself
+    # with the columnar store this is a single vectorized operation,
+    # otherwise we keep the identifiers of amended transactions in a set
     # -------------------------------------------------------------------------
     def accrue_interests(self):
-        super(Environment, self).accrue_interests()
+        if self.transaction_store is not None:
+            self.transaction_store.sync(self)
+            self.transaction_store.accrue_interests()
+            if self.aggregates is not None:
+                self.aggregates.refresh()
+            return
+        done = set()  # This keeps the IDs of updated transactions
+        for agent in self.agents_generator():
+            for tranx in agent.accounts:
+                if tranx.identifier not in done:
+                    tranx.amount = tranx.amount + tranx.amount * tranx.interest
+                    done.add(tranx.identifier)
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # initialize_aggregates()
+    # sets up the incremental aggregates if the static parameter
+    # incremental_aggregates is set to 1, counting what is on the books
+    # -------------------------------------------------------------------------
+    def initialize_aggregates(self):
+        self.aggregates = None
+        if self.static_parameters.get("incremental_aggregates", 0.0) == 1.0:
+            from src.aggregates import Aggregates
+            self.aggregates = Aggregates()
+            self.aggregates.rebuild(self)
     # -------------------------------------------------------------------------
 
     # -------------------------------------------------------------------------
     # new_transaction()
+    # if the static parameter compact_transactions is set to 1 the slotted
+    # CompactTransaction with integer identifiers is used, which saves
+    # memory and construction time on runs with many transactions
     # -------------------------------------------------------------------------
     def new_transaction(self, type_, asset, from_, to, amount,  interest,  maturity, time_of_default):
-        from src.transaction import Transaction
-        transaction = Transaction()
+        if self.static_parameters.get("compact_transactions", 0.0) == 1.0:
+            from src.compact_transaction import CompactTransaction
+            transaction = CompactTransaction()
+        else:
+            from src.transaction import Transaction
+            transaction = Transaction()
         transaction.add_transaction(type_, asset, from_, to, amount,  interest,  maturity, time_of_default, self)
+        if self.transaction_store is not None:
+            self.transaction_store.bind(transaction)
     # -------------------------------------------------------------------------
 
     # -------------------------------------------------------------------------
@@ -22,6 +22,7 @@ along with this program. If not, see <http://www.gnu.org/licenses/>.
 
 import logging
 from abm_template.src.baseagent import BaseAgent
+from src.ledger import Ledger
 
 # ============================================================================
 #
@@ -40,7 +41,7 @@ class Firm(BaseAgent):
     identifier = ""  # identifier of the specific firm
     parameters = {}  # parameters of the specific firm
     state_variables = {}  # state variables of the specific firm
-    accounts = []  # all accounts of a firm (filled with transactions)
+    accounts = Ledger()  # all accounts of a firm (filled with transactions)
 
     #
     #
@@ -99,7 +100,7 @@ class Firm(BaseAgent):
         self.identifier = ""  # identifier of the specific firm
         self.parameters = {}  # parameters of the specific firm
         self.state_variables = {}  # state variables of the specific firm
-        self.accounts = []  # all accounts of a firm (filled with transactions)
+        self.accounts = Ledger()  # all accounts of a firm (filled with transactions)
         # DO NOT EVER ASSIGN PARAMETERS BY HAND AS DONE BELOW IN PRODUCTION CODE
         # ALWAYS READ THE PARAMETERS FROM CONFIG FILES
         # OR USE THE FUNCTIONS FOR SETTING / CHANGING VARIABLES
@@ -162,15 +163,16 @@ class Firm(BaseAgent):
     def check_consistency(self):
         assets = []
         liabilities = []
-        return super(Firm, self).check_consistency(assets, liabilities)
+        return self.accounts.is_balanced(assets, liabilities)
     # -------------------------------------------------------------------------
 
     # -------------------------------------------------------------------------
     # get_account
     # returns the value of all transactions of a given type
+    # this is read from the running balances kept by the ledger
     # -------------------------------------------------------------------------
     def get_account(self,  type_):
-        return super(Firm, self).get_account(type_)
+        return self.accounts.get_balance(type_)
     # -------------------------------------------------------------------------
 
     # -------------------------------------------------------------------------
@@ -178,7 +180,7 @@ class Firm(BaseAgent):
     # returns the number of transactions of a given type
     # -------------------------------------------------------------------------
     def get_account_num_transactions(self,  type_):
-        return super(Firm, self).get_account_num_transactions(type_)
+        return float(self.accounts.get_num_transactions(type_))
     # -------------------------------------------------------------------------
 
     # -------------------------------------------------------------------------
@@ -279,14 +281,30 @@ class Firm(BaseAgent):
         goods_price = 10.0
         # We calculate the net capital, that is the difference between
         # own capital stock, and owned capital of other agents
-        capital = 0.0
-        for tranx in self.accounts:
-            # Own capital stock is added here
-            if tranx.type_ == "capital" and tranx.from_ == self:
-                capital = capital + tranx.amount
-            # Owned capital of other agents is subtracted here
-            if tranx.type_ == "capital" and tranx.to == self:
-                capital = capital - tranx.amount
+        # Own capital stock is added and owned capital of other agents is subtracted
+        capital = self.accounts.get_net_balance("capital", self)
         # Finally max(U) given particular wage
         return max(0, (price_of_labour / (a * b * goods_price * capital ** c)) ** (1 / (b-1)))
     # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # demand_for_labour_solow_parameters()
+    # returns the parameters of the firm's demand for labour
+    # [a, b, c, capital] for demand_for_labour_solow_vectorized
+    # -------------------------------------------------------------------------
+    def demand_for_labour_solow_parameters(self):
+        return [self.total_factor_productivity, self.labour_elasticity, self.capital_elasticity,
+                self.accounts.get_net_balance("capital", self)]
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # demand_for_labour_solow_vectorized(price_of_labour, a, b, c, capital)
+    # demand_for_labour_solow for many firms at once, the parameters are
+    # arrays with one entry per firm, see Market.curve
+    # -------------------------------------------------------------------------
+    @staticmethod
+    def demand_for_labour_solow_vectorized(price_of_labour, a, b, c, capital):
+        import numpy as np
+        goods_price = 10.0
+        return np.maximum(0.0, (price_of_labour / (a * b * goods_price * capital ** c)) ** (1 / (b-1)))
+    # -------------------------------------------------------------------------
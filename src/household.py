@@ -22,6 +22,7 @@ along with this program. If not, see <http://www.gnu.org/licenses/>.
 
 import logging
 from abm_template.src.baseagent import BaseAgent
+from src.ledger import Ledger
 
 # ============================================================================
 #
@@ -40,7 +41,7 @@ class Household(BaseAgent):
     identifier = ""  # identifier of the specific household
     parameters = {}  # parameters of the specific household
     state_variables = {}  # state variables of the specific household
-    accounts = []  # all accounts of a household (filled with transactions)
+    accounts = Ledger()  # all accounts of a household (filled with transactions)
 
     #
     #
@@ -98,7 +99,7 @@ class Household(BaseAgent):
         self.identifier = ""  # identifier of the specific household
         self.parameters = {}  # parameters of the specific household
         self.state_variables = {}  # state variables of the specific household
-        self.accounts = []  # all accounts of a household (filled with transactions)
+        self.accounts = Ledger()  # all accounts of a household (filled with transactions)
         # DO NOT EVER ASSIGN PARAMETERS BY HAND AS DONE BELOW IN PRODUCTION CODE
         # ALWAYS READ THE PARAMETERS FROM CONFIG FILES
         # OR USE THE FUNCTIONS FOR SETTING / CHANGING VARIABLES
@@ -164,15 +165,16 @@ class Household(BaseAgent):
     def check_consistency(self):
         assets = []
         liabilities = []
-        return super(Household, self).check_consistency(assets, liabilities)
+        return self.accounts.is_balanced(assets, liabilities)
     # -------------------------------------------------------------------------
 
     # -------------------------------------------------------------------------
     # get_account
     # returns the value of all transactions of a given type
+    # this is read from the running balances kept by the ledger
     # -------------------------------------------------------------------------
     def get_account(self,  type_):
-        return super(Household, self).get_account(type_)
+        return self.accounts.get_balance(type_)
     # -------------------------------------------------------------------------
 
     # -------------------------------------------------------------------------
@@ -180,7 +182,7 @@ class Household(BaseAgent):
     # returns the number of transactions of a given type
     # -------------------------------------------------------------------------
     def get_account_num_transactions(self,  type_):
-        return super(Household, self).get_account_num_transactions(type_)
+        return float(self.accounts.get_num_transactions(type_))
     # -------------------------------------------------------------------------
 
     # -------------------------------------------------------------------------
@@ -274,15 +276,10 @@ class Household(BaseAgent):
         # as they can spend their savings instead of working if they
         # have saving in excess
         # Thus we calculate their accumulated wealth here
-        wealth = 0.0
-        # By looking through the household's accounts
-        for tranx in self.accounts:
-            # Adding deposits the household has in the banks
-            if tranx.type_ == "deposits" and tranx.from_ == self:
-                wealth = wealth + tranx.amount
-            # And subtracting the loans household has in the banks
-            if tranx.type_ == "loans" and tranx.to == self:
-                wealth = wealth - tranx.amount
+        # from the running balances of the household's accounts
+        # Adding deposits the household has in the banks
+        # And subtracting the loans household has in the banks
+        wealth = self.accounts.get_balance("deposits", from_=self) - self.accounts.get_balance("loans", to=self)
         # Armed with the savings of the household, and its labour endowment
         # We find its supply of labour at a given price (wage)
         # We have to remember that the supply of labour has to be bounded
@@ -291,3 +288,24 @@ class Household(BaseAgent):
         # Thus (see docs for the economics):
         return min(self.labour, max(0, ((self.labour + 1) * price - wealth)/(2*price)))
     # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # supply_of_labour_solow_parameters()
+    # returns the parameters of the household's supply of labour
+    # [labour, wealth] for supply_of_labour_solow_vectorized
+    # -------------------------------------------------------------------------
+    def supply_of_labour_solow_parameters(self):
+        wealth = self.accounts.get_balance("deposits", from_=self) - self.accounts.get_balance("loans", to=self)
+        return [self.labour, wealth]
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # supply_of_labour_solow_vectorized(price, labour, wealth)
+    # supply_of_labour_solow for many households at once, labour and wealth
+    # are arrays with one entry per household, see Market.curve
+    # -------------------------------------------------------------------------
+    @staticmethod
+    def supply_of_labour_solow_vectorized(price, labour, wealth):
+        import numpy as np
+        return np.minimum(labour, np.maximum(0.0, ((labour + 1) * price - wealth)/(2*price)))
+    # -------------------------------------------------------------------------
@@ -0,0 +1,401 @@
+#!/usr/bin/env python
+# [SublimeLinter pep8-max-line-length:150]
+# -*- coding: utf-8 -*-
+
+"""
+black_rhino is a multi-agent simulator for financial network analysis
+Copyright (C) 2016 Co-Pierre Georg (co-pierre.georg@keble.ox.ac.uk)
+Pawel Fiedor (pawel@fiedor.eu)
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, version 3 of the License.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program. If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import math
+from collections import OrderedDict
+
+# ============================================================================
+#
+# class Ledger
+#
+# ============================================================================
+
+
+class Ledger(object):
+    #
+    #
+    # VARIABLES
+    #
+    #
+
+    # The ledger stores the transactions of a single agent and behaves like
+    # the list that used to be kept in agent.accounts, so iterating, len(),
+    # append() and remove() still work as before. On top of that it keeps
+    # index buckets and running balances for the combinations of
+    # (type_, from_, to, asset) below, where 1 means the field is part of
+    # the key and 0 means it is a wildcard. Balance queries on these
+    # combinations are O(1), filtered iteration only touches the bucket.
+    # IMPLEMENTATION NOTE: the keys use the identifiers of the agents,
+    # changing type_, asset, from_ or to of a transaction that is already
+    # on the books requires removing it and adding it again
+    indexed_patterns = ((1, 0, 0, 0),  # by type
+                        (1, 1, 0, 0),  # by type and originator
+                        (1, 0, 1, 0),  # by type and recipient
+                        (1, 1, 1, 0),  # by type and counterparty pair
+                        (1, 0, 0, 1),  # by type and asset
+                        (0, 0, 0, 1))  # by asset
+
+    # removing more than 1/compaction_ratio of the ledger at once rebuilds it
+    compaction_ratio = 4
+    # the running balances drift from the sums of the amounts by the
+    # rounding of the changes added to them, so they are compared with
+    # a relative and an absolute tolerance
+    relative_tolerance = 1e-9
+    absolute_tolerance = 1e-6
+
+    transactions = OrderedDict()  # identifier -> transaction, in the order of booking
+    buckets = {}  # index key -> OrderedDict of transactions matching the key
+    balances = {}  # index key -> running sum of amounts of the transactions in the bucket
+    ordered = None  # list of the transactions for indexing, built on first use after a change
+
+    #
+    #
+    # CODE
+    #
+    #
+
+    # -------------------------------------------------------------------------
+    # __init__
+    # optionally takes an iterable of transactions to be booked right away
+    # -------------------------------------------------------------------------
+    def __init__(self, transactions=None):
+        self.transactions = OrderedDict()
+        self.buckets = {}
+        self.balances = {}
+        self.ordered = None
+        if transactions is not None:
+            for transaction in transactions:
+                self.append(transaction)
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # functions emulating the list previously stored in agent.accounts
+    # we iterate over the ledger itself, to remove transactions while
+    # looping iterate over a copy, e.g. list(agent.accounts)
+    # indexing uses a list of the transactions kept until the next change,
+    # only the first transaction is taken without building it, so that
+    # removing accounts[0] until the ledger is empty stays linear
+    # -------------------------------------------------------------------------
+    def __iter__(self):
+        return iter(self.transactions.values())
+
+    def __len__(self):
+        return len(self.transactions)
+
+    def __contains__(self, transaction):
+        return getattr(transaction, "identifier", None) in self.transactions
+
+    def __getitem__(self, index):
+        if self.ordered is None:
+            if index == 0 and len(self.transactions) > 0:
+                return next(iter(self.transactions.values()))
+            self.ordered = list(self.transactions.values())
+        return self.ordered[index]
+
+    def __str__(self):
+        return str(list(self.transactions.values()))
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # agent_key(agent)
+    # returns the value used for agents in the index keys, the identifier
+    # of the agent if it has one, and the value itself otherwise
+    # -------------------------------------------------------------------------
+    @staticmethod
+    def agent_key(agent):
+        return getattr(agent, "identifier", agent)
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # index_keys(transaction)
+    # returns the index keys under which the transaction is booked
+    # -------------------------------------------------------------------------
+    def index_keys(self, transaction):
+        values = (transaction.type_, self.agent_key(transaction.from_), self.agent_key(transaction.to), transaction.asset)
+        keys = []
+        for pattern in self.indexed_patterns:
+            keys.append(tuple(value if used else None for value, used in zip(values, pattern)))
+        return keys
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # append(transaction)
+    # books the transaction in the ledger and updates the indexes
+    # booking the same transaction twice has no effect
+    # -------------------------------------------------------------------------
+    def append(self, transaction):
+        if transaction.identifier in self.transactions:
+            return
+        # the buckets of a transaction in a columnar store are set when it
+        # is bound, so it needs to be bound again after booking it here
+        self.unbind(transaction)
+        self.book(transaction)
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # book(transaction)
+    # adds the transaction to the ledger and the indexes
+    # -------------------------------------------------------------------------
+    def book(self, transaction):
+        self.transactions[transaction.identifier] = transaction
+        self.ordered = None
+        amount = float(transaction.amount)
+        for key in self.index_keys(transaction):
+            if key not in self.buckets:
+                self.buckets[key] = OrderedDict()
+                self.balances[key] = 0.0
+            self.buckets[key][transaction.identifier] = transaction
+            self.balances[key] = self.balances[key] + amount
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # discard(transaction)
+    # removes the transaction from the ledger and the indexes
+    # returns True if the transaction was on the books, False otherwise
+    # -------------------------------------------------------------------------
+    def discard(self, transaction):
+        if transaction.identifier not in self.transactions:
+            return False
+        self.unbind(transaction)
+        self.unlink(transaction)
+        del self.transactions[transaction.identifier]
+        self.ordered = None
+        amount = float(transaction.amount)
+        for key in self.index_keys(transaction):
+            bucket = self.buckets[key]
+            del bucket[transaction.identifier]
+            # empty buckets are dropped so the floating point error
+            # accumulated in the running balance does not survive them
+            if len(bucket) == 0:
+                del self.buckets[key]
+                del self.balances[key]
+            else:
+                self.balances[key] = self.balances[key] - amount
+        return True
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # remove(transaction)
+    # removes the transaction from the ledger, raises ValueError like
+    # list.remove if the transaction is not on the books
+    # -------------------------------------------------------------------------
+    def remove(self, transaction):
+        if not self.discard(transaction):
+            raise ValueError("Transaction is not in the ledger.")
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # discard_many(transactions)
+    # removes a number of transactions at once, if they make up a large
+    # part of the ledger it is cheaper to rebuild the ledger from the
+    # remaining transactions in one compaction pass than to unbook them
+    # one by one, returns the number of transactions removed
+    # -------------------------------------------------------------------------
+    def discard_many(self, transactions):
+        to_remove = set()
+        for transaction in transactions:
+            if transaction.identifier in self.transactions:
+                to_remove.add(transaction.identifier)
+        if len(to_remove) * self.compaction_ratio < len(self.transactions):
+            for identifier in to_remove:
+                self.discard(self.transactions[identifier])
+        else:
+            self.compact(to_remove)
+        return len(to_remove)
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # purge()
+    # removes all transactions with amount of zero in one compaction pass
+    # returns the list of transactions removed
+    # -------------------------------------------------------------------------
+    def purge(self):
+        purged = [transaction for transaction in self.transactions.values() if not transaction.amount > 0.0]
+        if len(purged) > 0:
+            self.compact(set(transaction.identifier for transaction in purged))
+        return purged
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # compact(to_remove)
+    # rebuilds the ledger and its indexes leaving out the transactions
+    # with identifiers in to_remove, the running balances are summed
+    # anew which also gets rid of accumulated floating point error
+    # -------------------------------------------------------------------------
+    def compact(self, to_remove):
+        remaining = []
+        for identifier, transaction in self.transactions.items():
+            if identifier in to_remove:
+                self.unbind(transaction)
+                self.unlink(transaction)
+            else:
+                remaining.append(transaction)
+        self.transactions = OrderedDict()
+        self.buckets = {}
+        self.balances = {}
+        self.ordered = None
+        for transaction in remaining:
+            self.book(transaction)
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # unbind(transaction)
+    # takes the transaction out of the columnar store it is bound to, if any
+    # the store binds it again on the next sync if it is still on the books
+    # -------------------------------------------------------------------------
+    @staticmethod
+    def unbind(transaction):
+        store = getattr(transaction, "store", None)
+        if store is not None:
+            store.unbind(transaction)
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # unlink(transaction)
+    # takes the edge of the transaction out of the incremental network it
+    # is in, and the transaction out of the incremental aggregates it is
+    # counted in, if any, as the transaction is taken off the books
+    # -------------------------------------------------------------------------
+    @staticmethod
+    def unlink(transaction):
+        network = getattr(transaction, "network", None)
+        if network is not None:
+            network.remove_transaction(transaction)
+        aggregates = getattr(transaction, "aggregates", None)
+        if aggregates is not None:
+            aggregates.remove_transaction(transaction)
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # update_amount(transaction, previous_amount)
+    # called by the transaction whenever its amount changes so that
+    # the running balances stay in line with the transactions
+    # -------------------------------------------------------------------------
+    def update_amount(self, transaction, previous_amount):
+        if transaction.identifier not in self.transactions:
+            return
+        change = float(transaction.amount) - float(previous_amount)
+        for key in self.index_keys(transaction):
+            self.balances[key] = self.balances[key] + change
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # query_key(type_, from_, to, asset)
+    # returns the key of the smallest indexed bucket containing all
+    # transactions matching the query, and whether the bucket matches
+    # the query exactly (otherwise it needs to be filtered further)
+    # -------------------------------------------------------------------------
+    def query_key(self, type_, from_, to, asset):
+        values = (type_, self.agent_key(from_), self.agent_key(to), asset)
+        pattern = tuple(0 if value is None else 1 for value in values)
+        if pattern in self.indexed_patterns:
+            return tuple(values), True
+        # we look for the indexed pattern covering most of the query fields
+        best = None
+        for indexed in self.indexed_patterns:
+            if all(used <= wanted for used, wanted in zip(indexed, pattern)):
+                if best is None or sum(indexed) > sum(best):
+                    best = indexed
+        if best is None:
+            return None, False
+        return tuple(value if used else None for value, used in zip(values, best)), False
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # filter(type_, from_, to, asset)
+    # returns a list of the transactions matching all of the given fields
+    # fields left at None are not used for filtering, agents can be given
+    # either as agents or as their identifiers
+    # -------------------------------------------------------------------------
+    def filter(self, type_=None, from_=None, to=None, asset=None):
+        key, exact = self.query_key(type_, from_, to, asset)
+        if key is None:
+            candidates = self.transactions
+        else:
+            candidates = self.buckets.get(key, {})
+        if exact:
+            return list(candidates.values())
+        from_key = self.agent_key(from_)
+        to_key = self.agent_key(to)
+        to_return = []
+        for transaction in candidates.values():
+            if type_ is not None and transaction.type_ != type_:
+                continue
+            if from_ is not None and self.agent_key(transaction.from_) != from_key:
+                continue
+            if to is not None and self.agent_key(transaction.to) != to_key:
+                continue
+            if asset is not None and transaction.asset != asset:
+                continue
+            to_return.append(transaction)
+        return to_return
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # get_balance(type_, from_, to, asset)
+    # returns the sum of amounts of the transactions matching the query
+    # this is O(1) for the indexed combinations of fields
+    # -------------------------------------------------------------------------
+    def get_balance(self, type_=None, from_=None, to=None, asset=None):
+        key, exact = self.query_key(type_, from_, to, asset)
+        if exact:
+            return self.balances.get(key, 0.0)
+        balance = 0.0
+        for transaction in self.filter(type_, from_, to, asset):
+            balance = balance + float(transaction.amount)
+        return balance
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # get_num_transactions(type_, from_, to, asset)
+    # returns the number of transactions matching the query
+    # -------------------------------------------------------------------------
+    def get_num_transactions(self, type_=None, from_=None, to=None, asset=None):
+        key, exact = self.query_key(type_, from_, to, asset)
+        if exact:
+            return len(self.buckets.get(key, {}))
+        if key is None and type_ is None and from_ is None and to is None and asset is None:
+            return len(self.transactions)
+        return len(self.filter(type_, from_, to, asset))
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # get_net_balance(type_, agent)
+    # returns the amount of transactions of a given type originating
+    # from the agent minus the amount of those the agent is a recipient of
+    # this is the pattern used for capital, deposits and loans in the updater
+    # -------------------------------------------------------------------------
+    def get_net_balance(self, type_, agent):
+        return self.get_balance(type_, from_=agent) - self.get_balance(type_, to=agent)
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # is_balanced(assets, liabilities)
+    # returns whether the transactions of the types in assets add up to
+    # those of the types in liabilities, this is check_consistency of the
+    # agents read from the running balances
+    # -------------------------------------------------------------------------
+    def is_balanced(self, assets, liabilities):
+        total_assets = sum(self.get_balance(type_) for type_ in assets)
+        total_liabilities = sum(self.get_balance(type_) for type_ in liabilities)
+        return math.isclose(total_assets, total_liabilities, rel_tol=self.relative_tolerance, abs_tol=self.absolute_tolerance)
+    # -------------------------------------------------------------------------
@@ -20,7 +20,15 @@ You should have received a copy of the GNU General Public License
 along with this program. If not, see <http://www.gnu.org/licenses/>.
 """
 
+import heapq
+import math
+try:
+    import numpy as np
+except ImportError:  # numpy is only needed for the vectorized tatonnement
+    np = None
 from abm_template.src.basemarket import BaseMarket
+from src.order_book import OrderBook
+from src.rng import new_rng, shuffle
 
 # -------------------------------------------------------------------------
 #  class Updater
@@ -38,253 +46,158 @@ class Market(BaseMarket):
     tolerance = 0.01  # Tolerance when matching demand and supply
     resolution = 0.01  # Resolution by which we crawl in price finding
     amplification = 1.1  # Factor for exponential search (Wolffgang 2015 "A multi-agent non-stochastic economic simulator.")
+    rng = None  # Random number generator used for the random pairings, that of the environment when used by the updater
+    max_iterations = 1000  # Number of prices tried before the search for the equilibrium price gives up
+    iterations = 0  # Number of prices tried in the last search for the equilibrium price
+    price_history = []  # Equilibrium prices found by the searches of the market, oldest first
+    iteration_history = []  # Number of prices tried by each of the searches in price_history
+    volatility_window = 10  # Number of the last prices the volatility of the price is measured over
+    minimum_step = 0.0001  # Smallest relative step a warm started search starts with
 
     #
     #
-    # TENTATIVE FOR LIMIT ORDER BOOKS SO I DON'T FORGET
+    # LIMIT ORDER BOOK
     #
     #
-    # NOTES:
-    # - price-time matching
-    # - pro rata matching
-    # - price-size matching
-    #
-    # - block list??? may be tricky
-    # - clear at the end of the day (step)?
-    # - how to cancel orders ???
+    # The limit order book has price-time priority, see src.order_book
+    # Note that trades are executed at the price of the resting order!!!
+    # The topology of an order for simplicity:
+    # order[0] = agent
+    # order[1] = price
+    # order[2] = volume
+    # order[3] = time
+    # order[4] = ident
+    # order[5] = type_
+    # In the LOB functions we'll return list of trades
+    # These trades will be then used by the models as they see fit
+    # [seller, buyer, quantity, price]
+    # The market keeps one book per security, given by the asset argument
+    # of the functions below, the book of None being the default one
+    # The orders can also be cleared in a periodic call auction instead,
+    # one per security, see src.call_auction, where all the orders
+    # submitted in a sweep are executed at a single uniform price
 
     lob_lot = 1  # multiplier for orders, order
     lob_resolution = 0.00001
-    lob_buy_book = []
-    lob_sell_book = []
-
-    def add_order(self, agent, price, volume, time, ident, type_):
-        # We import operator to be able to quickly sort the books
-        from operator import itemgetter
-        # Note that trades are executed at the price of the active order!!!
-        # The topology of an order for simplicity:
-        # order[0] = agent
-        # order[1] = price
-        # order[2] = volume
-        # order[3] = time
-        # order[4] = ident
-        # order[5] = type_
-        # In the LOB functions we'll return list of trades
-        # These trades will be then used by the models as they see fit
-        # We need selling agent, buying agent, quantity and price
-        # If we need markets for every single security then add init (TODO)
-        # return [seller, buyer, quantity, price]
-        # We initialise the container for returning executed trades
-        to_return = []
-        # We check whether we add a sell or buy order
-        # If it is a sell order:
-        if type_ == "sell":
-            # We check how much buy volume do we have above or on the price of the incoming sell
-            volume_above_price = 0.0
-            # So we go through the buy book
-            for order in self.lob_buy_book:
-                # And find orders the price of which is above the incoming sell price
-                if order[1] >= price:
-                    # We add those to the volume we're looking for
-                    volume_above_price = volume_above_price + order[2]
-            # If that volume is bigger than the volume of the incoming sell
-            # Then all of the incoming sell will be executed
-            if volume_above_price >= volume:
-                # We need order in the way we execute the trades
-                # So we reorder by price and time (price priority first, then time priority)
-                self.lob_buy_book = sorted(self.lob_buy_book, key=itemgetter(1, 3))
-                # We initialise a helper variable showing volume left to settle
-                volume_to_settle = volume
-                # We go through the ordered buy book
-                for order in self.lob_buy_book:
-                    # And if we still have some volume to settle
-                    settle_dummy = min(volume_to_settle, order[2])
-                    # We execute this bit of the trade
-                    # That is add it to the list of trades we'll return
-                    to_return.append(agent, order[0], settle_dummy, order[1])
-                    # And amend the volume to settle by the current settlement
-                    volume_to_settle = volume_to_settle - settle_dummy
-                    order[2] = order[2] - settle_dummy
-            # If not all of the incoming sell can be executed right away
-            else:
-                # We execute just parts of the trade and add active trade to the books
-                # We need order in the way we execute the trades
-                # So we reorder by price and time (price priority first, then time priority)
-                self.lob_buy_book = sorted(self.lob_buy_book, key=itemgetter(1, 3))
-                # We initialise a helper variable showing volume left to settle
-                volume_to_settle = volume
-                # We go through the ordered buy book
-                for order in self.lob_buy_book:
-                    # If the price of the buy trade is still at least the price of the incoming sell
-                    if order[1] >= price:
-                        # And if we still have some volume to settle
-                        settle_dummy = min(volume_to_settle, order[2])
-                        # We execute this bit of the trade
-                        # That is add it to the list of trades we'll return
-                        to_return.append(agent, order[0], settle_dummy, order[1])
-                        # And amend the volume to settle by the current settlement
-                        volume_to_settle = volume_to_settle - settle_dummy
-                        order[2] = order[2] - settle_dummy
-                # And we add the unsettled part of the order as an active order to the sell book
-                self.lob_sell_book.append([agent, price, volume_to_settle, time, ident, type_])
-        # If it is a buy order:
-        elif type_ == "buy":
-            # We check how much buy volume do we have below or on the price of the incoming buy
-            volume_below_price = 0.0
-            # So we go through the sell book
-            for order in self.lob_sell_book:
-                # And find orders the price of which is below the incoming buy price
-                if order[1] <= price:
-                    # We add those to the volume we're looking for
-                    volume_below_price = volume_below_price + order[2]
-            # If that volume is bigger than the volume of the incoming sell
-            # Then all of the incoming sell will be executed
-            if volume_below_price >= volume:
-                # We need order in the way we execute the trades
-                # So we reorder by price and time (price priority first, then time priority)
-                self.lob_sell_book = sorted(self.lob_sell_book, key=itemgetter(1, 3))
-                # We initialise a helper variable showing volume left to settle
-                volume_to_settle = volume
-                # We go through the ordered buy book
-                for order in self.lob_sell_book:
-                    # And if we still have some volume to settle
-                    # We execute this bit of the trade
-                    settle_dummy = min(volume_to_settle, order[2])
-                    # That is add it to the list of trades we'll return
-                    to_return.append(agent, order[0], settle_dummy, order[1])
-                    # And amend the volume to settle by the current settlement
-                    volume_to_settle = volume_to_settle - settle_dummy
-                    order[2] = order[2] - settle_dummy
-            # If not all of the incoming sell can be executed right away
-            else:
-                # We execute just parts of the trade and add active trade to the books
-                # We need order in the way we execute the trades
-                # So we reorder by price and time (price priority first, then time priority)
-                self.lob_sell_book = sorted(self.lob_sell_book, key=itemgetter(1, 3))
-                # We initialise a helper variable showing volume left to settle
-                volume_to_settle = volume
-                # We go through the ordered buy book
-                for order in self.lob_sell_book:
-                    # If the price of the buy trade is still at least the price of the incoming sell
-                    if order[1] <= price:
-                        # And if we still have some volume to settle
-                        settle_dummy = min(volume_to_settle, order[2])
-                        # We execute this bit of the trade
-                        # That is add it to the list of trades we'll return
-                        to_return.append(agent, order[0], settle_dummy, order[1])
-                        # And amend the volume to settle by the current settlement
-                        volume_to_settle = volume_to_settle - settle_dummy
-                        order[2] = order[2] - settle_dummy
-                # And we add the unsettled part of the order as an active order to the sell book
-                self.lob_buy_book.append([agent, price, volume_to_settle, time, ident, type_])
-        # and finally we return the executed trades
-        return to_return
+    order_book = None  # the default OrderBook of the market
+    order_books = {}  # asset -> OrderBook of the asset, None -> order_book
+    call_auctions = {}  # asset -> CallAuction of the asset
 
-    def cancel_order(self, ident):
-        # We go through sell book first
-        for order in self.lob_sell_book:
-            # If the order has the identifier we're looking for
-            if order[4] == ident:
-                # We set the order volume to 0
-                # This will be pruned with clear_book later
-                order[2] = 0.0
-                # If we do this then we return True (success)
-                return True
-        # Then we go through the buy book
-        for order in self.lob_sell_book:
-            # If the order has the identifier we're looking for
-            if order[4] == ident:
-                # We set the order volume to 0
-                # This will be pruned with clear_book later
-                order[2] = 0.0
-                # If we do this then we return True (success)
-                return True
-        # If we didn't find the order with such id
-        # Return False (failure)
-        return False
-        # just cancel based on ident
-
-    def replace_order(self, new_volume, ident):
-        # We go through the sell book
-        for order in self.lob_sell_book:
-            # Find the order with provided identifier
-            if order[4] == ident:
-                # Check if the new volume is smaller than previous
-                if order[2] >= new_volume:
-                    # If it is then exchange the volumes
-                    order[2] == new_volume
-                    # And return True (success)
-                    return True
-                else:
-                    # If the new volume is bigger than old
-                    # We return false (failure to replace)
-                    return False
-        # Then we go through the buy book
-        for order in self.lob_buy_book:
-            # Find the order with provided identifier
-            if order[4] == ident:
-                # Check if the new volume is smaller than previous
-                if order[2] >= new_volume:
-                    # If it is then exchange the volumes
-                    order[2] == new_volume
-                    # And return True (success)
-                    return True
-                else:
-                    # If the new volume is bigger than old
-                    # We return false (failure to replace)
-                    return False
-        # change the volume to smaller (do not time)
-        # We assume unique identifiers (UUID4)
-
-    def market_order(self, agent, volume, time, ident, type_):
-        # We import operator to be able to quickly sort the books
-        from operator import itemgetter
-        to_return = []
-        if type_ == "sell":
-            # We execute just parts of the trade and add active trade to the books
-            # We need order in the way we execute the trades
-            # So we reorder by price and time (price priority first, then time priority)
-            self.lob_buy_book = sorted(self.lob_buy_book, key=itemgetter(1, 3))
-            # We initialise a helper variable showing volume left to settle
-            volume_to_settle = volume
-            # We go through the ordered buy book
-            for order in self.lob_buy_book:
-                # If the price of the buy trade is still at least the price of the incoming sell
-                # And if we still have some volume to settle
-                settle_dummy = min(volume_to_settle, order[2])
-                # We execute this bit of the trade
-                # That is add it to the list of trades we'll return
-                to_return.append(agent, order[0], settle_dummy, order[1])
-                # And amend the volume to settle by the current settlement
-                volume_to_settle = volume_to_settle - settle_dummy
-                order[2] = order[2] - settle_dummy
-            # And we add the unsettled part of the order as an active order to the sell book
-        elif type_ == "buy":
-            # We execute just parts of the trade and add active trade to the books
-            # We need order in the way we execute the trades
-            # So we reorder by price and time (price priority first, then time priority)
-            self.lob_sell_book = sorted(self.lob_sell_book, key=itemgetter(1, 3))
-            # We initialise a helper variable showing volume left to settle
-            volume_to_settle = volume
-            # We go through the ordered buy book
-            for order in self.lob_sell_book:
-                # If the price of the buy trade is still at least the price of the incoming sell
-                # And if we still have some volume to settle
-                settle_dummy = min(volume_to_settle, order[2])
-                # We execute this bit of the trade
-                # That is add it to the list of trades we'll return
-                to_return.append(agent, order[0], settle_dummy, order[1])
-                # And amend the volume to settle by the current settlement
-                volume_to_settle = volume_to_settle - settle_dummy
-                order[2] = order[2] - settle_dummy
-            # And we add the unsettled part of the order as an active order to the sell book
-
-    def clear_book(self):
-        # We remove the orders with 0 volume from the sell book
-        self.lob_sell_book = [item for item in self.lob_sell_book if item[2] > 0.0]
-        # We remove the orders with 0 volume from the buy book
-        self.lob_buy_book = [item for item in self.lob_buy_book if item[2] > 0.0]
-        # remove all orders with 0 volume left
+    # -------------------------------------------------------------------------
+    # get_order_book(asset)
+    # returns the book of the security, which is added if there is none yet
+    # -------------------------------------------------------------------------
+    def get_order_book(self, asset=None):
+        book = self.order_books.get(asset)
+        if book is None:
+            book = OrderBook()
+            self.order_books[asset] = book
+        return book
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # add_order(agent, price, volume, time, ident, type_, asset)
+    # Executes the limit order against the opposite side of the book as far
+    # as the prices cross and adds the rest to the book, type_ is either
+    # "buy" or "sell", returns the list of executed trades
+    # -------------------------------------------------------------------------
+    def add_order(self, agent, price, volume, time, ident, type_, asset=None):
+        return self.get_order_book(asset).add_order(agent, price, volume, time, ident, type_)
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # cancel_order(ident, asset)
+    # Removes the order from the book, returns True if there was such
+    # an order and False otherwise
+    # -------------------------------------------------------------------------
+    def cancel_order(self, ident, asset=None):
+        return self.get_order_book(asset).cancel_order(ident)
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # replace_order(new_volume, ident, asset)
+    # Changes the volume of the order to a smaller one, keeping its time
+    # priority, returns False if there is no such order or the new volume
+    # is larger than the old one (that needs a new order)
+    # We assume unique identifiers (UUID4)
+    # -------------------------------------------------------------------------
+    def replace_order(self, new_volume, ident, asset=None):
+        return self.get_order_book(asset).replace_order(new_volume, ident)
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # market_order(agent, volume, time, ident, type_, asset)
+    # Executes the order at the best prices in the book, the volume which
+    # can't be executed is not added to the book, returns the list of trades
+    # -------------------------------------------------------------------------
+    def market_order(self, agent, volume, time, ident, type_, asset=None):
+        return self.get_order_book(asset).market_order(agent, volume, type_)
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # clear_book(asset)
+    # Removes the cancelled orders left in the book
+    # -------------------------------------------------------------------------
+    def clear_book(self, asset=None):
+        self.get_order_book(asset).clear_book()
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # lob_buy_book, lob_sell_book
+    # The orders in the default book in the order in which they are executed
+    # -------------------------------------------------------------------------
+    @property
+    def lob_buy_book(self):
+        return self.order_book.book("buy")
+
+    @property
+    def lob_sell_book(self):
+        return self.order_book.book("sell")
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # get_call_auction(asset)
+    # returns the call auction of the security, which is added if there
+    # is none yet
+    # -------------------------------------------------------------------------
+    def get_call_auction(self, asset=None):
+        from src.call_auction import CallAuction
+        auction = self.call_auctions.get(asset)
+        if auction is None:
+            auction = CallAuction()
+            self.call_auctions[asset] = auction
+        return auction
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # submit_order(agent, price, volume, time, ident, type_, asset)
+    # Collects the order for the next call auction of the security,
+    # a price of None is a market order
+    # -------------------------------------------------------------------------
+    def submit_order(self, agent, price, volume, time, ident, type_, asset=None):
+        self.get_call_auction(asset).submit_order(agent, price, volume, time, ident, type_)
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # call_auction(asset)
+    # Executes all the orders submitted for the security at one uniform
+    # price, returns the list of trades
+    # -------------------------------------------------------------------------
+    def call_auction(self, asset=None):
+        return self.get_call_auction(asset).clear()
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # clear_call_auctions()
+    # Executes the call auctions of all the securities, returns a dictionary
+    # of asset -> list of trades
+    # -------------------------------------------------------------------------
+    def clear_call_auctions(self):
+        trades = {}
+        for asset in list(self.call_auctions.keys()):
+            trades[asset] = self.call_auction(asset)
+        return trades
+    # -------------------------------------------------------------------------
 
     #
     #
@@ -317,13 +230,27 @@ class Market(BaseMarket):
         super(Market, self).set_amplification(_value)
 
     # -------------------------------------------------------------------------
-    # __init__(environment)
+    # __init__(identifier, rng, assets)
+    # if no random number generator is given the market gets its own one
+    # and it gets an order book for each of the assets given
     # -------------------------------------------------------------------------
-    def __init__(self, identifier):
+    def __init__(self, identifier, rng=None, assets=None):
         self.identifier = identifier
         self.tolerance = 0.01
         self.resolution = 0.01
         self.amplification = 1.1
+        if rng is None:
+            rng = new_rng()
+        self.rng = rng
+        self.price_history = []
+        self.iteration_history = []
+        self.order_book = OrderBook()
+        self.order_books = {None: self.order_book}
+        self.call_auctions = {}
+        # the securities traded, e.g. the keys of environment.assets
+        if assets is not None:
+            for asset in assets:
+                self.get_order_book(asset)
     # -------------------------------------------------------------------------
 
     # -------------------------------------------------------------------------
@@ -340,24 +267,241 @@ class Market(BaseMarket):
         self.tolerance = tolerance
         self.resolution = resolution
         self.amplification = amplification
-        return super(Market, self).tatonnement(sellers, buyers, starting_price)
+        self.iterations = 0
+        # the prices tried are counted by the calls to one of the functions
+        counted = buyers if len(buyers) > 0 else sellers
+        if len(counted) > 0:
+            function = counted[0][1]
+
+            def counting(price):
+                self.iterations = self.iterations + 1
+                return function(price)
+            counted = list(counted)
+            counted[0] = [counted[0][0], counting]
+            if len(buyers) > 0:
+                buyers = counted
+            else:
+                sellers = counted
+        return self.record_price(super(Market, self).tatonnement(sellers, buyers, starting_price))
     # -------------------------------------------------------------------------
 
     # -------------------------------------------------------------------------
-    # tatonnement([sellers], [buyers], starting_price)
-    # This function performs a Walrasian auction to determine the
-    # price at equilibrium (market clearing).
-    # Note that the input to this method are two lists, first contains pairs
-    # of agents and their supply functions (methods), and seconds contains pairs
-    # of agents and their demand functions (methods), so that:
-    # [sellers] = [[agent_1, supply_function_1],[agent_2, supply_function_2],...]
-    # [buyers] = [[agent_1, demand_function_1],[agent_2, demand_function_2],...]
+    # record_price(price)
+    # Adds the equilibrium price and the number of prices tried to find it
+    # to the history of the market and returns the price
+    # -------------------------------------------------------------------------
+    def record_price(self, price):
+        self.price_history.append(price)
+        self.iteration_history.append(self.iterations)
+        return price
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # warm_start(starting_price)
+    # Returns the last equilibrium price of the market to start the next
+    # search from, or the starting price if the market hasn't cleared yet
+    # -------------------------------------------------------------------------
+    def warm_start(self, starting_price):
+        if len(self.price_history) == 0:
+            return starting_price
+        return self.price_history[-1]
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # price_volatility()
+    # Returns the root mean square of the log changes of the last
+    # volatility_window equilibrium prices, None without two changes yet,
+    # a steady trend counts as volatility as the next price moves as much
+    # -------------------------------------------------------------------------
+    def price_volatility(self):
+        prices = [price for price in self.price_history[-(self.volatility_window + 1):] if price > 0.0]
+        if len(prices) < 3:
+            return None
+        changes = [math.log(prices[i] / prices[i-1]) for i in range(1, len(prices))]
+        return math.sqrt(sum(change ** 2 for change in changes) / len(changes))
+    # -------------------------------------------------------------------------
+
     # -------------------------------------------------------------------------
-    def tatonnement_parallel(self, sellers, buyers, starting_price, tolerance, resolution, amplification):
+    # initial_step(default, maximum)
+    # Returns the relative step a warm started search starts with, twice
+    # the recent volatility of the price within [minimum_step, maximum],
+    # so that calm markets are searched close to the last price, and the
+    # default if the market doesn't have enough history yet
+    # -------------------------------------------------------------------------
+    def initial_step(self, default, maximum):
+        volatility = self.price_volatility()
+        if volatility is None:
+            return default
+        return min(maximum, max(self.minimum_step, 2.0 * volatility))
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # tatonnement_parallel([supply_curves], [demand_curves], starting_price, tolerance, pool, step)
+    # This function finds the price at equilibrium (market clearing) as
+    # tatonnement_vectorized does, with the curves split between the worker
+    # processes of a ClearingPool (see src.clearing_pool). The curves are
+    # sent to the workers once, and each price tried only sends the price
+    # and gets the partial sums back. The pool should be kept and passed
+    # again for the next search, otherwise one is started and stopped here.
+    # A daemonic process can't start the workers, there the search is done
+    # by tatonnement_vectorized in this process.
+    # -------------------------------------------------------------------------
+    def tatonnement_parallel(self, supply_curves, demand_curves, starting_price, tolerance, pool=None, step=1.0):
+        from src.clearing_pool import ClearingPool, can_start_workers
+        own_pool = pool is None
+        if own_pool and not can_start_workers():
+            return self.tatonnement_vectorized(supply_curves, demand_curves, starting_price, tolerance, step)
         self.tolerance = tolerance
-        self.resolution = resolution
-        self.amplification = amplification
-        return super(Market, self).tatonnement_parallel(sellers, buyers, starting_price)
+        if own_pool:
+            pool = ClearingPool()
+        try:
+            pool.load(supply_curves, demand_curves)
+            return self.record_price(self.find_price(pool.excess_demand, starting_price, step))
+        finally:
+            if own_pool:
+                pool.close()
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # curve(function, rows)
+    # Returns the supply or demand curve of a group of agents for
+    # tatonnement_vectorized, i.e. [function, [parameter arrays]], where
+    # rows holds the parameters of each agent, e.g.
+    # market.curve(Household.supply_of_labour_solow_vectorized,
+    #              [household.supply_of_labour_solow_parameters() for household in households])
+    # and function(price, *parameter_arrays) returns the array of the
+    # agents' supply or demand at the price
+    # -------------------------------------------------------------------------
+    def curve(self, function, rows):
+        if np is None:
+            raise ImportError("The vectorized tatonnement requires numpy.")
+        if len(rows) == 0:
+            return [function, None]
+        return [function, [np.asarray(column, dtype=float) for column in zip(*rows)]]
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # aggregate(curves, price)
+    # Returns the total supply or demand of the curves at the price
+    # -------------------------------------------------------------------------
+    def aggregate(self, curves, price):
+        from src.clearing_pool import aggregate
+        return aggregate(curves, price)
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # tatonnement_vectorized([supply_curves], [demand_curves], starting_price, tolerance, step)
+    # This function finds the price at equilibrium (market clearing) like
+    # tatonnement, but the supply and demand are given as curves of
+    # groups of agents (see curve above), so that each price tried costs
+    # one vectorized call per group instead of one call per agent, and the
+    # price is found with Brent's method over the aggregate excess demand
+    # once it is bracketed, instead of the exponential search
+    # -------------------------------------------------------------------------
+    def tatonnement_vectorized(self, supply_curves, demand_curves, starting_price, tolerance, step=1.0):
+        self.tolerance = tolerance
+
+        def excess_demand(price):
+            demand = self.aggregate(demand_curves, price)
+            supply = self.aggregate(supply_curves, price)
+            return demand, supply
+        return self.record_price(self.find_price(excess_demand, starting_price, step))
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # find_price(excess_demand, starting_price, step)
+    # Returns the price at which demand and supply, as returned by
+    # excess_demand(price), are within the tolerance of the market
+    # First the price is bracketed by moving away from the starting price
+    # by the factor (1 + step), which is squared after every move up to
+    # doubling, until the excess demand changes sign, then the bracket is
+    # narrowed with Brent's method (bisection with inverse quadratic
+    # interpolation). The number of prices tried is kept in iterations.
+    # -------------------------------------------------------------------------
+    def find_price(self, excess_demand, starting_price, step=1.0):
+        self.iterations = 0
+
+        def evaluate(price):
+            self.iterations = self.iterations + 1
+            if self.iterations > self.max_iterations:
+                raise LookupError("Price search in tatonnement took too long. Something's amiss.")
+            demand, supply = excess_demand(price)
+            if demand == 0.0 and supply == 0.0:
+                raise LookupError("Both supply and demand have yielded 0.0 in price search, check the supply and demand functions supplied.")
+            # the exit condition is the same as in tatonnement
+            return demand - supply, abs(demand - supply) / (demand + supply) <= self.tolerance
+
+        # We bracket the price, excess demand means the price is too low
+        low = high = starting_price if starting_price > 0.0 else 0.00001
+        f_low, converged = evaluate(low)
+        if converged:
+            return low
+        f_high = f_low
+        factor = 1.0 + step
+        largest_factor = max(2.0, factor)
+        while f_low > 0.0 and f_high > 0.0:
+            low, f_low = high, f_high
+            high = high * factor
+            factor = min(factor * factor, largest_factor)
+            f_high, converged = evaluate(high)
+            if converged:
+                return high
+        while f_low < 0.0 and f_high < 0.0:
+            high, f_high = low, f_low
+            low = low / factor
+            factor = min(factor * factor, largest_factor)
+            if low <= 0.0:
+                raise LookupError("Price search in tatonnement went to 0. Something's amiss.")
+            f_low, converged = evaluate(low)
+            if converged:
+                return low
+
+        # Brent's method on [low, high], b is the best estimate so far
+        a, b, c = low, high, high
+        f_a, f_b = f_low, f_high
+        f_c = f_b
+        d = e = b - a
+        while True:
+            if (f_b > 0.0 and f_c > 0.0) or (f_b < 0.0 and f_c < 0.0):
+                c, f_c = a, f_a
+                d = e = b - a
+            if abs(f_c) < abs(f_b):
+                a, b, c = b, c, b
+                f_a, f_b, f_c = f_b, f_c, f_b
+            precision = 2.0 * 1e-15 * abs(b) + 0.5e-12
+            middle = 0.5 * (c - b)
+            if abs(middle) <= precision or f_b == 0.0:
+                # the curves jump over each other, b is as close as we get
+                return b
+            if abs(e) >= precision and abs(f_a) > abs(f_b):
+                # inverse quadratic interpolation, or secant if only two points
+                s = f_b / f_a
+                if a == c:
+                    p = 2.0 * middle * s
+                    q = 1.0 - s
+                else:
+                    q = f_a / f_c
+                    r = f_b / f_c
+                    p = s * (2.0 * middle * q * (q - r) - (b - a) * (r - 1.0))
+                    q = (q - 1.0) * (r - 1.0) * (s - 1.0)
+                if p > 0.0:
+                    q = -q
+                p = abs(p)
+                if 2.0 * p < min(3.0 * middle * q - abs(precision * q), abs(e * q)):
+                    e, d = d, p / q
+                else:
+                    d = e = middle
+            else:
+                # bisection
+                d = e = middle
+            a, f_a = b, f_b
+            if abs(d) > precision:
+                b = b + d
+            else:
+                b = b + math.copysign(precision, middle)
+            f_b, converged = evaluate(b)
+            if converged:
+                return b
     # -------------------------------------------------------------------------
 
     # -------------------------------------------------------------------------
@@ -374,7 +518,7 @@ class Market(BaseMarket):
     # is extinguished
     # -------------------------------------------------------------------------
     def rationing(self, agents):
-        return super(Market, self).rationing(agents)
+        return self.match_randomly(agents)
     # -------------------------------------------------------------------------
 
     # -------------------------------------------------------------------------
@@ -391,7 +535,144 @@ class Market(BaseMarket):
     # still random however
     # -------------------------------------------------------------------------
     def rationing_proportional(self, agents):
-        return super(Market, self).rationing_proportional(agents)
+        # We adjust the supply or demand of all agents
+        # proportionately to the mismatch between supply and demand
+        # so that final allocations are proportionate to the original
+        # supply or demand
+        self.scale_proportionally(agents)
+        return self.match_randomly(agents)
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # match_randomly(agents)
+    # Matches the agents with excess supply and demand in random pairs,
+    # as in BaseMarket.rationing, with the random order taken from the
+    # generator of the market so the pairings are reproducible
+    # -------------------------------------------------------------------------
+    def match_randomly(self, agents):
+        to_return = []
+        # We iterate over the agents in random order
+        itrange = list(range(0, len(agents)))
+        shuffle(self.rng, itrange)
+        for i in itrange:
+            # And pair each with the other agents in random order
+            itrange_inner = list(range(0, len(agents)))
+            itrange_inner.remove(i)
+            shuffle(self.rng, itrange_inner)
+            for j in itrange_inner:
+                # We only trade if one agent has excess supply (positive value)
+                # while the other has excess demand (negative value)
+                if agents[i][1] * agents[j][1] < 0:
+                    # The amount traded is the minimum of the two
+                    value = min(abs(agents[i][1]), abs(agents[j][1]))
+                    # [the_seller, the_buyer, amount_sold]
+                    if agents[i][1] < 0:
+                        to_return.append([agents[j][0], agents[i][0], value])
+                        agents[i][1] = agents[i][1] + value
+                        agents[j][1] = agents[j][1] - value
+                    else:
+                        to_return.append([agents[i][0], agents[j][0], value])
+                        agents[i][1] = agents[i][1] - value
+                        agents[j][1] = agents[j][1] + value
+        return to_return
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # rationing_linear(agents, proportional)
+    # This function performs the same rationing as rationing (or as
+    # rationing_proportional if proportional is True) with the same input
+    # and output, but in linear time: the agents with excess supply and
+    # those with excess demand are put in two queues, each shuffled once,
+    # and the queues are walked in a single merge pass, each step
+    # exhausting the supply of a seller or the demand of a buyer, so
+    # there are at most (sellers + buyers - 1) trades
+    # -------------------------------------------------------------------------
+    def rationing_linear(self, agents, proportional=False):
+        to_return = []
+        if proportional:
+            self.scale_proportionally(agents)
+        sellers = [agent for agent in agents if agent[1] > 0]
+        buyers = [agent for agent in agents if agent[1] < 0]
+        shuffle(self.rng, sellers)
+        shuffle(self.rng, buyers)
+        i = 0
+        j = 0
+        while i < len(sellers) and j < len(buyers):
+            seller = sellers[i]
+            buyer = buyers[j]
+            # [the_seller, the_buyer, amount_sold]
+            value = min(seller[1], -buyer[1])
+            to_return.append([seller[0], buyer[0], value])
+            seller[1] = seller[1] - value
+            buyer[1] = buyer[1] + value
+            # one of the two is exhausted exactly, as value is one of them
+            if seller[1] <= 0:
+                i = i + 1
+            if buyer[1] >= 0:
+                j = j + 1
+        return to_return
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # scale_proportionally(agents)
+    # Scales the supply and demand of the agents so that both sum up
+    # to the amount exchanged, as done in rationing_proportional
+    # -------------------------------------------------------------------------
+    def scale_proportionally(self, agents):
+        supply = 0.0
+        demand = 0.0
+        for agent in agents:
+            if agent[1] > 0:
+                supply = supply + agent[1]
+            else:
+                demand = demand - agent[1]
+        exchange = min(supply, demand)
+        for agent in agents:
+            if agent[1] > 0:  # supply
+                agent[1] = agent[1] * (exchange / supply)
+            if agent[1] < 0:  # demand
+                agent[1] = agent[1] * (exchange / demand)
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # rationing_proportional_matrix(agents)
+    # This function performs a fully deterministic proportional rationing
+    # every seller sells to every buyer in proportion to their supply
+    # and demand, the amount exchanged being min(supply, demand)
+    # and returns [sellers], [buyers] and the matrix of the amounts sold
+    # with one row per seller and one column per buyer, so that
+    # the amounts are given in vectorized form
+    # -------------------------------------------------------------------------
+    def rationing_proportional_matrix(self, agents):
+        if np is None:
+            raise ImportError("The proportional rationing matrix requires numpy.")
+        sellers = [agent[0] for agent in agents if agent[1] > 0]
+        buyers = [agent[0] for agent in agents if agent[1] < 0]
+        supplies = np.array([agent[1] for agent in agents if agent[1] > 0], dtype=float)
+        demands = -np.array([agent[1] for agent in agents if agent[1] < 0], dtype=float)
+        supply = supplies.sum()
+        demand = demands.sum()
+        if supply <= 0.0 or demand <= 0.0:
+            return sellers, buyers, np.zeros((len(sellers), len(buyers)))
+        exchange = min(supply, demand)
+        # the amount from seller i to buyer j is
+        # exchange * (supply_i / supply) * (demand_j / demand)
+        matrix = np.outer(supplies * (exchange / supply), demands / demand)
+        return sellers, buyers, matrix
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # rationing_deterministic(agents)
+    # This function performs the rationing of rationing_proportional_matrix
+    # and returns the list of pairs and their exchange amounts
+    # [to_return] = [[agent_selling_1, agent_buying_1, amount_sold_1], ...]
+    # -------------------------------------------------------------------------
+    def rationing_deterministic(self, agents):
+        sellers, buyers, matrix = self.rationing_proportional_matrix(agents)
+        to_return = []
+        for i, j in zip(*np.nonzero(matrix)):
+            to_return.append([sellers[i], buyers[j], float(matrix[i, j])])
+        return to_return
     # -------------------------------------------------------------------------
 
     # -------------------------------------------------------------------------
@@ -411,3 +692,120 @@ class Market(BaseMarket):
     def rationing_abstract(self, agents, matching_function, allow_match):
         return super(Market, self).rationing_abstract(agents, matching_function, allow_match)
     # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # rationing_abstract_lazy(agents, matching_function, allow_match, vectorized, batch, attribute)
+    # This function performs the same rationing as rationing_abstract
+    # and gives the same trades, without scoring and sorting all the pairs
+    # of agents. Only a seller and a buyer can trade, so only such pairs
+    # are considered, and allow_match is checked before matching_function.
+    # Every agent has a row of the pairs it makes with the agents after it
+    # in the list, of which only the best (batch) are scored and kept at
+    # a time, and the best pair of every row is kept in a heap, so that
+    # the pairs are taken in the order of rationing_abstract (by priority
+    # and then by the position of the agents in the list). When the pairs
+    # kept for a row run out, the row is scored again against the agents
+    # which still have something to trade. The rationing stops as soon as
+    # all the supply or all the demand is exhausted.
+    # If vectorized is True, matching_function and allow_match are called
+    # with one agent and a numpy array of the agents it is paired with, and
+    # return an array of priorities and an array of booleans respectively.
+    # The functions are then given attribute(agent) instead of the agent,
+    # e.g. its identifier or its wealth, so that the arrays are numeric.
+    # -------------------------------------------------------------------------
+    def rationing_abstract_lazy(self, agents, matching_function, allow_match, vectorized=False, batch=16, attribute=None):
+        to_return = []
+        if vectorized:
+            if np is None:
+                raise ImportError("The vectorized abstract rationing requires numpy.")
+            if attribute is None:
+                attribute = self.agent_itself
+            values = np.asarray([attribute(agent[0]) for agent in agents])
+            # signs of the supply and demand which is left, 0 when exhausted
+            signs = np.sign(np.array([agent[1] for agent in agents], dtype=float))
+        batch = max(1, int(batch))
+        sellers_left = len([agent for agent in agents if agent[1] > 0])
+        buyers_left = len([agent for agent in agents if agent[1] < 0])
+        rows = {}  # position of the agent -> pairs kept for it as (-priority, position of the other agent)
+        heap = []  # (-priority, position of the agent, position of the other agent)
+
+        # The pairs of a row which come after the key (-priority, position)
+        # best first, at most batch of them, or a few more with equal keys
+        def score_row(i, after):
+            sign = agents[i][1]
+            if vectorized:
+                others = np.nonzero(signs[i+1:] * np.sign(sign) < 0)[0] + (i + 1)
+                if len(others) == 0:
+                    return []
+                others = others[np.asarray(allow_match(values[i], values[others]), dtype=bool)]
+                if len(others) == 0:
+                    return []
+                keys = -np.asarray(matching_function(values[i], values[others]), dtype=float)
+                if after is not None:
+                    later = (keys > after[0]) | ((keys == after[0]) & (others > after[1]))
+                    others = others[later]
+                    keys = keys[later]
+                if len(keys) > batch:
+                    # the top (batch) keys, with the ties at the threshold
+                    threshold = np.partition(keys, batch - 1)[batch - 1]
+                    best = keys <= threshold
+                    others = others[best]
+                    keys = keys[best]
+                order = np.lexsort((others, keys))
+                return [(float(keys[k]), int(others[k])) for k in order]
+            pairs = []
+            for j in range(i + 1, len(agents)):
+                if sign * agents[j][1] < 0 and allow_match(agents[i][0], agents[j][0]) is True:
+                    key = (-matching_function(agents[i][0], agents[j][0]), j)
+                    if after is None or key > after:
+                        pairs.append(key)
+            return heapq.nsmallest(batch, pairs)
+
+        # Puts the next pair of the row in the heap
+        def next_pair(i, after):
+            if len(rows[i]) == 0:
+                rows[i] = score_row(i, after)
+                rows[i].reverse()
+            if len(rows[i]) > 0:
+                key, j = rows[i].pop()
+                heapq.heappush(heap, (key, i, j))
+
+        for i in range(len(agents)):
+            if agents[i][1] != 0:
+                rows[i] = []
+                next_pair(i, None)
+        while len(heap) > 0 and sellers_left > 0 and buyers_left > 0:
+            key, i, j = heapq.heappop(heap)
+            agent_one = agents[i]
+            agent_two = agents[j]
+            # We check whether one agent has excess supply and the other excess demand
+            if agent_one[1] * agent_two[1] < 0 and agent_one[0] != agent_two[0]:
+                if agent_one[1] < 0:
+                    seller, buyer = agent_two, agent_one
+                else:
+                    seller, buyer = agent_one, agent_two
+                # The value traded is the minimum of the excess supply and demand
+                value = min(seller[1], -buyer[1])
+                to_return.append([seller[0], buyer[0], value])
+                seller[1] = seller[1] - value
+                buyer[1] = buyer[1] + value
+                if seller[1] == 0:
+                    sellers_left = sellers_left - 1
+                if buyer[1] == 0:
+                    buyers_left = buyers_left - 1
+                if vectorized:
+                    signs[i] = np.sign(agent_one[1])
+                    signs[j] = np.sign(agent_two[1])
+            if agent_one[1] != 0:
+                next_pair(i, (key, j))
+        return to_return
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # agent_itself(agent)
+    # the default attribute of rationing_abstract_lazy
+    # -------------------------------------------------------------------------
+    @staticmethod
+    def agent_itself(agent):
+        return agent
+    # -------------------------------------------------------------------------
@@ -21,6 +21,7 @@ along with this program. If not, see <http://www.gnu.org/licenses/>.
 """
 
 import logging
+import os
 from abm_template.src.basemeasurement import BaseMeasurement
 
 # ============================================================================
@@ -50,6 +51,18 @@ class Measurement(BaseMeasurement):
     file = None
     # plus the csv writer
     csv_writer = None
+    # if a sink is set (a function taking a row), the rows are passed
+    # to it instead of being written to the file, see src.monte_carlo
+    sink = None
+    # the callables returning the values of the output columns in their
+    # order, compiled from the config on the first measure after the
+    # config was replaced, see compile_columns
+    columns = None
+    compiled_config = None  # the config the columns were compiled from
+    # if the static parameter measurement_format is set ("csv", "npz" or
+    # "parquet") the rows are kept in a MeasurementBuffer and written
+    # out in chunks of measurement_chunk_size rows
+    buffer = None
 
     #
     # METHODS
@@ -66,6 +79,7 @@ class Measurement(BaseMeasurement):
 
     def set_config(self, config):
         super(Measurement, self).set_config(config)
+        self.columns = None
 
     def get_environment(self):
         return self.environment
@@ -102,6 +116,7 @@ class Measurement(BaseMeasurement):
     # Initialises the Measurements object and reads the config
     # -------------------------------------------------------------------------
     def __init__(self, environment, runner):
+        self.columns = None
         super(Measurement, self).__init__(environment, runner)
     # -------------------------------------------------------------------------
 
@@ -110,7 +125,24 @@ class Measurement(BaseMeasurement):
     # Opens the file and writes the headers
     # -------------------------------------------------------------------------
     def open_file(self):
-        super(Measurement, self).open_file()
+        if self.sink is not None:
+            return
+        format_ = self.environment.static_parameters.get("measurement_format", "")
+        if format_ in ("", "none"):
+            super(Measurement, self).open_file()
+            return
+        from src.measurement_buffer import MeasurementBuffer
+        filename = self.filename
+        if self.environment.num_simulations > 1:
+            # a unique name for every run, as in BaseMeasurement.open_file
+            import datetime
+            import time
+            timestamp = datetime.datetime.fromtimestamp(time.time()).strftime('%Y_%m_%d_%H_%M_%S_%f')
+            filename = os.path.splitext(filename)[0] + timestamp
+        self.filename = os.path.splitext(filename)[0] + "." + format_
+        chunk_size = int(self.environment.static_parameters.get("measurement_chunk_size", 1024))
+        self.buffer = MeasurementBuffer(self.get_headers(), self.filename, format_, chunk_size)
+        self.buffer.open()
     # -------------------------------------------------------------------------
 
     # -------------------------------------------------------------------------
@@ -119,7 +151,13 @@ class Measurement(BaseMeasurement):
     # at the time of calling this method
     # -------------------------------------------------------------------------
     def write_to_file(self):
-        super(Measurement, self).write_to_file()
+        out_row = self.measure()
+        if self.sink is not None:
+            self.sink(out_row)
+        elif self.buffer is not None:
+            self.buffer.append(out_row)
+        else:
+            self.csv_writer.writerow(out_row)
     # -------------------------------------------------------------------------
 
     # -------------------------------------------------------------------------
@@ -127,7 +165,58 @@ class Measurement(BaseMeasurement):
     # Closes the file so we don't have issues with the disk and the file
     # -------------------------------------------------------------------------
     def close_file(self):
-        super(Measurement, self).close_file()
+        if self.sink is not None:
+            return
+        if self.buffer is not None:
+            self.buffer.close()
+        else:
+            super(Measurement, self).close_file()
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # compile_columns(self)
+    # Looks up the function of every output column once, so that the
+    # values of a row are not dispatched on the identifiers every sweep
+    # -------------------------------------------------------------------------
+    def compile_columns(self):
+        self.columns = []
+        for i in range(0, len(self.config)):
+            self.columns.append(self.column(self.config[i+1][1]))
+        self.compiled_config = self.config
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # column(self, ident)
+    # Returns the function without arguments giving the value of the
+    # output with the identifier, i.e. the method measure_<ident>
+    # -------------------------------------------------------------------------
+    def column(self, ident):
+        method = getattr(self, "measure_" + str(ident), None)
+        if method is None:
+            raise ValueError("Unknown measurement output: " + str(ident))
+        return method
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # measure(self)
+    # Returns the row of values of the output columns in their order
+    # -------------------------------------------------------------------------
+    def measure(self):
+        # the config may also have been replaced by assigning it directly
+        if self.columns is None or self.compiled_config is not self.config:
+            self.compile_columns()
+        return [column() for column in self.columns]
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # get_headers(self)
+    # Returns the headers of the output columns in their order
+    # -------------------------------------------------------------------------
+    def get_headers(self):
+        headers = []
+        for i in range(0, len(self.config)):
+            headers.append(self.config[i+1][0])
+        return headers
     # -------------------------------------------------------------------------
 
     # -------------------------------------------------------------------------
@@ -157,6 +246,7 @@ class Measurement(BaseMeasurement):
     # -------------------------------------------------------------------------
     def read_xml_config_file(self, config_file_name):
         super(Measurement, self).read_xml_config_file(config_file_name)
+        self.columns = None
     # -------------------------------------------------------------------------
 
     # -------------------------------------------------------------------------
@@ -164,17 +254,39 @@ class Measurement(BaseMeasurement):
     # Wrapper for functions returning the desired values to be written
     # -------------------------------------------------------------------------
     def wrapper(self, ident):
-        if ident == "current_step":
-            return self.runner.current_step+1
-
-        if ident == "household_deposits":
-            #return self.environment.households[0].get_account("deposits")
-            wealth = 0.0
-            for household in self.environment.households:
-                for tranx in household.accounts:
-                    if tranx.type_ == "deposits" and tranx.from_ == household:
-                        wealth = wealth + tranx.amount
-                    if tranx.type_ == "loans" and tranx.to == household:
-                        wealth = wealth - tranx.amount
-            return wealth
+        return self.column(ident)()
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # measure_current_step(self)
+    # -------------------------------------------------------------------------
+    def measure_current_step(self):
+        return self.runner.current_step+1
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # measure_household_deposits(self)
+    # -------------------------------------------------------------------------
+    def measure_household_deposits(self):
+        #return self.environment.households[0].get_account("deposits")
+        if getattr(self.environment, "aggregates", None) is not None:
+            return self.aggregate("household_deposits", "deposits", "from", "Household") - \
+                self.aggregate("household_loans", "loans", "to", "Household")
+        wealth = 0.0
+        for household in self.environment.households:
+            wealth = wealth + household.accounts.get_balance("deposits", from_=household)
+            wealth = wealth - household.accounts.get_balance("loans", to=household)
+        return wealth
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # aggregate(self, name, type_, direction, agent_class)
+    # Returns the total kept by the incremental aggregates of the
+    # environment, registering the aggregate the first time it is asked for
+    # -------------------------------------------------------------------------
+    def aggregate(self, name, type_, direction, agent_class):
+        aggregates = self.environment.aggregates
+        if name not in aggregates:
+            aggregates.register(name, type_, direction, agent_class)
+        return aggregates.total(name)
     # -------------------------------------------------------------------------
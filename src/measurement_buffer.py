@@ -0,0 +1,269 @@
+#!/usr/bin/env python
+# [SublimeLinter pep8-max-line-length:150]
+# -*- coding: utf-8 -*-
+
+"""
+black_rhino is a multi-agent simulator for financial network analysis
+Copyright (C) 2016 Co-Pierre Georg (co-pierre.georg@keble.ox.ac.uk)
+Pawel Fiedor (pawel@fiedor.eu)
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, version 3 of the License.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program. If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import csv
+import zipfile
+try:
+    import numpy as np
+except ImportError:  # numpy is only needed for the buffered measurements
+    np = None
+
+MEASUREMENT_FORMATS = ("csv", "npz", "parquet")
+KINDS = ("int", "float", "text")  # the kinds of the columns, a column is only ever promoted to a later one
+
+
+# -------------------------------------------------------------------------
+# read_npz(filename)
+# returns the columns written by a MeasurementBuffer to an npz file as a
+# dictionary of header -> array, with the chunks of every column joined
+# -------------------------------------------------------------------------
+def read_npz(filename):
+    chunks = {}  # header -> list of the arrays of its chunks
+    with np.load(filename) as data:
+        for name in data.files:
+            header = name.rsplit("/", 1)[0]
+            chunks.setdefault(header, []).append(data[name])
+    columns = {}
+    for header, arrays in chunks.items():
+        # the chunks written before a column turned to text are numbers
+        if any(array.dtype.kind == "U" for array in arrays):
+            arrays = [array.astype(str) for array in arrays]
+        columns[header] = np.concatenate(arrays)
+    return columns
+# -------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------
+# kind_of(value)
+# returns the kind of column needed to store the value, None is stored
+# as nan in a float column
+# -------------------------------------------------------------------------
+def kind_of(value):
+    if isinstance(value, (int, np.integer)) and not isinstance(value, (bool, np.bool_)):
+        return "int"
+    if value is None or isinstance(value, (float, bool, np.floating, np.bool_)):
+        return "float"
+    return "text"
+# -------------------------------------------------------------------------
+
+# ============================================================================
+#
+# class MeasurementBuffer
+#
+# ============================================================================
+
+
+class MeasurementBuffer(object):
+    #
+    #
+    # VARIABLES
+    #
+    #
+
+    # The buffered writer used by Measurement when the static parameter
+    # measurement_format is set. The values of each sweep are stored in
+    # preallocated numpy arrays, one per column, of chunk_size rows, and
+    # whenever the arrays are full they are written out in one go:
+    #   "csv"     - the rows of the chunk are appended to the csv file
+    #   "npz"     - every column of the chunk is added to the zip archive
+    #               as the array "header/chunk", see read_npz
+    #   "parquet" - the chunk is written as a row group (requires pyarrow)
+    # The kind of each column is taken from its value in the first row,
+    # integers are kept as int64, other numbers and None (as nan) as
+    # float64 and anything else as text. A column is promoted as soon as
+    # a value doesn't fit, from int to float and from either to text, and
+    # keeps its kind for the rest of the file. The row groups of a parquet
+    # file share one schema, so there all the numbers are float64 from the
+    # start, and a column can't turn to text after the first row group.
+    headers = []
+    filename = ""
+    format_ = "npz"
+    chunk_size = 1024
+    columns = None  # the numpy arrays of the current chunk, allocated on the first row
+    kinds = None  # the kind of each column, see KINDS
+    size = 0  # number of rows in the current chunk
+    chunks = 0  # number of chunks written
+    rows = 0  # number of rows written
+    file = None  # the csv file or the zip archive
+    writer = None  # the csv writer or the parquet writer
+
+    #
+    #
+    # CODE
+    #
+    #
+
+    # -------------------------------------------------------------------------
+    # __init__(headers, filename, format_, chunk_size)
+    # -------------------------------------------------------------------------
+    def __init__(self, headers, filename, format_="npz", chunk_size=1024):
+        if np is None:
+            raise ImportError("The buffered measurements require numpy.")
+        if format_ not in MEASUREMENT_FORMATS:
+            raise ValueError("Unknown measurement format: " + str(format_))
+        if format_ == "parquet":
+            import pyarrow  # so that a missing pyarrow fails here and not at the first flush
+        self.headers = list(headers)
+        self.filename = filename
+        self.format_ = format_
+        self.chunk_size = max(1, int(chunk_size))
+        self.columns = None
+        self.kinds = None
+        self.size = 0
+        self.chunks = 0
+        self.rows = 0
+        self.file = None
+        self.writer = None
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # __len__
+    # returns the number of rows appended so far
+    # -------------------------------------------------------------------------
+    def __len__(self):
+        return self.rows + self.size
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # open()
+    # opens the output file, and writes the headers for csv
+    # -------------------------------------------------------------------------
+    def open(self):
+        if self.format_ == "csv":
+            self.file = open(self.filename, "w")
+            self.writer = csv.writer(self.file, lineterminator='\n')
+            self.writer.writerow(self.headers)
+        elif self.format_ == "npz":
+            self.file = zipfile.ZipFile(self.filename, "w", zipfile.ZIP_STORED, allowZip64=True)
+        # the parquet writer needs the types of the columns, it is opened on the first flush
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # allocate(row)
+    # allocates the arrays of the chunk with the kinds of the values in row
+    # -------------------------------------------------------------------------
+    def allocate(self, row):
+        self.kinds = [kind_of(value) for value in row]
+        if self.format_ == "parquet":
+            self.kinds = ["float" if kind == "int" else kind for kind in self.kinds]
+        self.columns = [np.zeros(self.chunk_size, dtype=self.dtype(kind)) for kind in self.kinds]
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # dtype(kind)
+    # returns the type of the arrays of a column of the kind, text is kept
+    # as python objects until the chunk is written
+    # -------------------------------------------------------------------------
+    @staticmethod
+    def dtype(kind):
+        return {"int": np.int64, "float": np.float64, "text": object}[kind]
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # promote(position, kind)
+    # changes the kind of the column, converting the values of the chunk
+    # -------------------------------------------------------------------------
+    def promote(self, position, kind):
+        if self.format_ == "parquet" and self.writer is not None and kind == "text":
+            raise ValueError("The column " + self.headers[position] + " can't hold text after the first row group of the parquet file.")
+        self.kinds[position] = kind
+        self.columns[position] = self.columns[position].astype(self.dtype(kind))
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # append(row)
+    # stores the values of the row, promoting the columns the values don't
+    # fit in, and writes the chunk out when it is full
+    # -------------------------------------------------------------------------
+    def append(self, row):
+        if len(row) != len(self.headers):
+            raise ValueError("The row has " + str(len(row)) + " values for " + str(len(self.headers)) + " columns.")
+        if self.columns is None:
+            self.allocate(row)
+        for position, value in enumerate(row):
+            kind = self.kinds[position]
+            if kind != "text":
+                needed = kind_of(value)
+                if KINDS.index(needed) > KINDS.index(kind):
+                    self.promote(position, needed)
+                    kind = needed
+            if kind == "float" and value is None:
+                value = np.nan
+            self.columns[position][self.size] = value
+        self.size = self.size + 1
+        if self.size == self.chunk_size:
+            self.flush()
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # text(column)
+    # returns the values of a text column as strings, None as an empty one
+    # -------------------------------------------------------------------------
+    @staticmethod
+    def text(column):
+        return ["" if value is None else str(value) for value in column]
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # flush()
+    # writes the rows of the current chunk to the file
+    # -------------------------------------------------------------------------
+    def flush(self):
+        if self.size == 0:
+            return
+        chunk = [column[:self.size] for column in self.columns]
+        if self.format_ == "csv":
+            self.writer.writerows(zip(*[column.tolist() for column in chunk]))
+        elif self.format_ == "npz":
+            for header, kind, column in zip(self.headers, self.kinds, chunk):
+                if kind == "text":
+                    column = np.array(self.text(column), dtype=str)
+                with self.file.open(header + "/" + str(self.chunks) + ".npy", "w", force_zip64=True) as array_file:
+                    np.lib.format.write_array(array_file, column, allow_pickle=False)
+        else:
+            import pyarrow
+            import pyarrow.parquet
+            arrays = [pyarrow.array(self.text(column), type=pyarrow.string()) if kind == "text" else pyarrow.array(column)
+                      for kind, column in zip(self.kinds, chunk)]
+            table = pyarrow.Table.from_arrays(arrays, names=self.headers)
+            if self.writer is None:
+                self.writer = pyarrow.parquet.ParquetWriter(self.filename, table.schema)
+            self.writer.write_table(table)
+        self.rows = self.rows + self.size
+        self.chunks = self.chunks + 1
+        self.size = 0
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # close()
+    # writes the rows left and closes the file
+    # -------------------------------------------------------------------------
+    def close(self):
+        self.flush()
+        if self.format_ == "parquet":
+            if self.writer is not None:
+                self.writer.close()
+        elif self.file is not None:
+            self.file.close()
+        self.writer = None
+        self.file = None
+    # -------------------------------------------------------------------------
@@ -0,0 +1,265 @@
+#!/usr/bin/env python
+# [SublimeLinter pep8-max-line-length:150]
+# -*- coding: utf-8 -*-
+
+"""
+black_rhino is a multi-agent simulator for financial network analysis
+Copyright (C) 2016 Co-Pierre Georg (co-pierre.georg@keble.ox.ac.uk)
+Pawel Fiedor (pawel@fiedor.eu)
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, version 3 of the License.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program. If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import csv
+import logging
+import os
+import random
+from src.rng import random_index
+
+# -------------------------------------------------------------------------
+# Parallel Monte Carlo driver over Runner.do_run
+#
+# The runs of an environment are fanned out across a process pool. Every
+# worker process reads the environment once and does each of its runs on
+# a fork of it (see Environment.fork), so no mutable state is shared
+# between the runs or with the parent. The measurement rows of each run
+# are collected through Measurement.sink instead of being written to a
+# file and sent back to the parent as soon as the run is done, where they
+# are written to a single csv file with the id and the seed of the run
+# in the first two columns. If the static parameter profile_updates is
+# set the records of the profiler of each run are sent back with its rows
+# and written next to the csv file, see do_runs.
+#
+# The random number generator of each run (environment.rng) is given by
+# the seed policy:
+#   "spawn"      - run i gets the i-th stream spawned from base_seed (the default)
+#   "sequential" - run i gets base_seed + i
+#   "fixed"      - every run gets base_seed
+#   "random"     - every run gets a seed drawn from os.urandom
+# or the policy is a list of seeds, one for each run.
+# The functions are module level so that they can be sent to the pool.
+# -------------------------------------------------------------------------
+
+SEED_POLICIES = ("spawn", "sequential", "fixed", "random")
+
+# the environment read by the worker process, see initialize_worker
+worker_environment = None
+
+
+# -------------------------------------------------------------------------
+# seed_for_run(seed_policy, base_seed, run_id)
+# returns the seed of the given run under the seed policy
+# -------------------------------------------------------------------------
+def seed_for_run(seed_policy, base_seed, run_id):
+    if isinstance(seed_policy, (list, tuple)):
+        return int(seed_policy[run_id])
+    if seed_policy == "sequential":
+        return int(base_seed) + run_id
+    if seed_policy == "fixed" or seed_policy == "spawn":
+        return int(base_seed)
+    if seed_policy == "random":
+        return int.from_bytes(os.urandom(4), "big")
+    raise ValueError("Unknown seed policy: " + str(seed_policy))
+# -------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------
+# stream_for_run(seed_policy, run_id)
+# returns the stream of the given run, None if the seed alone is used
+# -------------------------------------------------------------------------
+def stream_for_run(seed_policy, run_id):
+    if seed_policy == "spawn":
+        return run_id
+    return None
+# -------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------
+# seed_run(environment, seed, stream)
+# seeds the generator of the run, and the global generators from it
+# for any code which still draws from those
+# -------------------------------------------------------------------------
+def seed_run(environment, seed, stream=None):
+    rng = environment.seed_rng(seed, stream)
+    random.seed(random_index(rng, 2 ** 32))
+    try:
+        import numpy as np
+        np.random.seed(random_index(rng, 2 ** 32))
+    except ImportError:
+        pass
+# -------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------
+# read_environment(environment_directory, identifier, snapshot_directory)
+# returns the initialized environment, from the snapshot if one is given
+# -------------------------------------------------------------------------
+def read_environment(environment_directory, identifier, snapshot_directory=None):
+    from src.environment import Environment
+    environment = Environment.__new__(Environment)
+    if snapshot_directory is None or not environment.initialize_from_snapshot(environment_directory, identifier, snapshot_directory):
+        environment.initialize(environment_directory, identifier)
+    return environment
+# -------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------
+# initialize_worker(environment_directory, identifier, snapshot_directory)
+# reads the environment once for all the runs done by the worker
+# -------------------------------------------------------------------------
+def initialize_worker(environment_directory, identifier, snapshot_directory=None):
+    global worker_environment
+    worker_environment = read_environment(environment_directory, identifier, snapshot_directory)
+# -------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------
+# do_simulation(task)
+# does one run on a fork of the worker's environment, task is a tuple
+# (run_id, seed, stream), returns (run_id, seed, headers, rows, profile)
+# where profile is the list of the records of the profiler of the run,
+# None if the run wasn't profiled
+# -------------------------------------------------------------------------
+def do_simulation(task):
+    from src.runner import Runner
+    from src.measurement import Measurement
+    run_id, seed, stream = task
+    logging.info('  STARTED with run %s',  str(run_id))
+    environment = worker_environment.fork()
+    seed_run(environment, seed, stream)
+    runner = Runner(environment)
+    rows = []
+    runner.measurement_sink = rows.append
+    runner.do_run(environment)
+    headers = Measurement(environment, runner).get_headers()
+    profile = None
+    if runner.updater.profiler is not None:
+        profile = runner.updater.profiler.records
+    logging.info('  DONE with run %s',  str(run_id))
+    return (run_id, seed, headers, rows, profile)
+# -------------------------------------------------------------------------
+
+# ============================================================================
+#
+# class MonteCarlo
+#
+# ============================================================================
+
+
+class MonteCarlo(object):
+    #
+    #
+    # VARIABLES
+    #
+    #
+
+    environment_directory = ""
+    identifier = ""
+    num_simulations = 0  # if not given, the num_simulations of the environment is used
+    seed_policy = "spawn"
+    base_seed = 0
+    processes = 1  # number of worker processes, one means the runs are done in this process
+    snapshot_directory = None  # if given, the workers read the environment from a snapshot there
+
+    #
+    #
+    # CODE
+    #
+    #
+
+    # -------------------------------------------------------------------------
+    # __init__
+    # -------------------------------------------------------------------------
+    def __init__(self, environment_directory, identifier, num_simulations=None, seed_policy="spawn", base_seed=0,
+                 processes=None, snapshot_directory=None):
+        if not isinstance(seed_policy, (list, tuple)) and seed_policy not in SEED_POLICIES:
+            raise ValueError("Unknown seed policy: " + str(seed_policy))
+        self.environment_directory = environment_directory
+        self.identifier = identifier
+        if num_simulations is None:
+            num_simulations = int(read_environment(environment_directory, identifier, snapshot_directory).num_simulations)
+        self.num_simulations = int(num_simulations)
+        if isinstance(seed_policy, (list, tuple)) and len(seed_policy) < self.num_simulations:
+            raise ValueError("The seed policy needs one seed for each of the runs.")
+        self.seed_policy = seed_policy
+        self.base_seed = base_seed
+        if processes is None:
+            processes = os.cpu_count() or 1
+        self.processes = max(1, min(int(processes), self.num_simulations))
+        self.snapshot_directory = snapshot_directory
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # tasks()
+    # returns the (run_id, seed, stream) of all the runs
+    # -------------------------------------------------------------------------
+    def tasks(self):
+        return [(run_id, seed_for_run(self.seed_policy, self.base_seed, run_id), stream_for_run(self.seed_policy, run_id))
+                for run_id in range(self.num_simulations)]
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # results()
+    # yields (run_id, seed, headers, rows, profile) for every run in the order of
+    # the run ids, each as soon as it and the runs before it are done
+    # -------------------------------------------------------------------------
+    def results(self):
+        initargs = (self.environment_directory, self.identifier, self.snapshot_directory)
+        if self.processes == 1:
+            initialize_worker(*initargs)
+            for task in self.tasks():
+                yield do_simulation(task)
+            return
+        from multiprocessing import Pool
+        pool = Pool(self.processes, initialize_worker, initargs)
+        try:
+            for result in pool.imap(do_simulation, self.tasks()):
+                yield result
+        finally:
+            pool.close()
+            pool.join()
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # do_runs(filename)
+    # does all the runs and writes their measurement rows to the csv file
+    # with the run id and the seed prepended, the records of the profiler
+    # of the runs, if they were profiled, are written the same way to the
+    # file with -profile appended to the name, returns the number of rows
+    # -------------------------------------------------------------------------
+    def do_runs(self, filename):
+        from src.profiler import Profiler
+        num_rows = 0
+        profile_file = None
+        try:
+            with open(filename, "w", newline="") as output_file:
+                csv_writer = csv.writer(output_file, lineterminator='\n')
+                for run_id, seed, headers, rows, profile in self.results():
+                    if run_id == 0:
+                        csv_writer.writerow(["Run", "Seed"] + headers)
+                    for row in rows:
+                        csv_writer.writerow([run_id, seed] + row)
+                    num_rows = num_rows + len(rows)
+                    output_file.flush()
+                    if profile is not None:
+                        if profile_file is None:
+                            profile_file = open(os.path.splitext(filename)[0] + "-profile.csv", "w", newline="")
+                            profile_writer = csv.writer(profile_file, lineterminator='\n')
+                            profile_writer.writerow(["Run", "Seed"] + Profiler.headers)
+                        for record in profile:
+                            profile_writer.writerow([run_id, seed] + list(record))
+        finally:
+            if profile_file is not None:
+                profile_file.close()
+        return num_rows
+    # -------------------------------------------------------------------------
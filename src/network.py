@@ -38,6 +38,18 @@ class Network(BaseNetwork):
     #
     identifier = ""
     transactions = nx.MultiDiGraph()
+    # If incremental, the graph is kept up to date by the transactions
+    # themselves: adding a transaction adds its edge, keyed by the
+    # identifier of the transaction, changing its amount updates the edge
+    # and taking it off the books removes the edge, each in constant time.
+    # The transactions on the graph point to it through their network
+    # variable, like they point to their columnar store.
+    # It is switched on by the static parameter incremental_network.
+    incremental = False
+    # The incremental network also keeps secondary indexes of its edges
+    # (see src.network_index), so that the subnetworks by the attributes
+    # of the transactions are found without scanning all the edges.
+    index = None
 
     #
     #
@@ -62,6 +74,8 @@ class Network(BaseNetwork):
     # -------------------------------------------------------------------------
     def __init__(self, identifier):
         super(Network, self).__init__(identifier)
+        self.incremental = False
+        self.index = None
     # -------------------------------------------------------------------------
 
     # -------------------------------------------------------------------------
@@ -69,6 +83,85 @@ class Network(BaseNetwork):
     # -------------------------------------------------------------------------
     def initialize_networks(self,  environment):
         super(Network, self).initialize_networks(environment)
+        self.incremental = environment.static_parameters.get("incremental_network", 0.0) == 1.0
+        if self.incremental:
+            self.rebuild(environment)
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # rebuild(environment)
+    # replaces the edges of the graph with one edge for every transaction
+    # on the books of the agents, keyed by its identifier, from then on the
+    # graph is kept up to date incrementally
+    # -------------------------------------------------------------------------
+    def rebuild(self, environment):
+        from src.network_index import NetworkIndex
+        self.incremental = True
+        self.index = NetworkIndex()
+        self.transactions.remove_edges_from(list(self.transactions.edges(keys=True)))
+        for agent in environment.agents_generator():
+            self.transactions.add_node(agent)
+            for transaction in agent.accounts:
+                self.add_transaction(transaction)
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # edge_attributes(transaction)
+    # returns the attributes of the edge of the transaction
+    # -------------------------------------------------------------------------
+    @staticmethod
+    def edge_attributes(transaction):
+        return {"type_": transaction.type_,
+                "asset": transaction.asset,
+                "amount": transaction.amount,
+                "interest": transaction.interest,
+                "maturity": transaction.maturity,
+                "time_of_default": transaction.time_of_default}
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # add_transaction(transaction)
+    # adds the edge of the transaction, or updates it if it's there already
+    # -------------------------------------------------------------------------
+    def add_transaction(self, transaction):
+        attributes = self.edge_attributes(transaction)
+        self.transactions.add_edge(transaction.from_, transaction.to, key=transaction.identifier, **attributes)
+        if self.index is not None:
+            self.index.add(transaction.from_, transaction.to, transaction.identifier, attributes)
+        transaction.network = self
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # remove_transaction(transaction)
+    # removes the edge of the transaction, if it is in the graph
+    # -------------------------------------------------------------------------
+    def remove_transaction(self, transaction):
+        if self.transactions.has_edge(transaction.from_, transaction.to, key=transaction.identifier):
+            self.transactions.remove_edge(transaction.from_, transaction.to, key=transaction.identifier)
+        if self.index is not None:
+            self.index.remove(transaction.identifier)
+        transaction.network = None
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # set_amount(transaction)
+    # updates the edge of the transaction after its amount changed
+    # -------------------------------------------------------------------------
+    def set_amount(self, transaction):
+        edges = self.transactions.succ.get(transaction.from_, {}).get(transaction.to)
+        if edges is not None and transaction.identifier in edges:
+            edges[transaction.identifier]["amount"] = transaction.amount
+            if self.index is not None:
+                self.index.update(transaction.identifier, "amount", transaction.amount)
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # snapshot()
+    # returns a copy of the graph as it is now, e.g. to keep the network
+    # of every sweep
+    # -------------------------------------------------------------------------
+    def snapshot(self):
+        return self.transactions.copy()
     # -------------------------------------------------------------------------
 
 #
@@ -98,18 +191,51 @@ class Network(BaseNetwork):
 
     # -------------------------------------------------------------------------
     # update_network
-    # TODO: think if this is necessary
-    # This would loop through the transactions and update all the fields
-    # in the network, but if properly applied this should be unnecessary
+    # This loops through the transactions and updates all the fields
+    # in the network, with an incremental network only the amounts are
+    # kept up to date on every change so it's needed only after the other
+    # fields, or the amounts through a columnar store, were changed in bulk
     # -------------------------------------------------------------------------
     def update_network(self, environment):
-        super(Network, self).update_network(environment)
+        if not self.incremental:
+            super(Network, self).update_network(environment)
+            return
+        # the amounts are kept up to date, the rest is refreshed here, e.g.
+        # after a columnar store changed the transactions in bulk, and the
+        # edges of transactions which are not on the books anymore removed
+        gone = []
+        for from_, to, key, data in self.transactions.edges(keys=True, data=True):
+            transaction = self.find_transaction(from_, to, key)
+            if transaction is None:
+                gone.append((from_, to, key))
+                continue
+            data.update(self.edge_attributes(transaction))
+            if self.index is not None:
+                self.index.add(from_, to, key, data)
+        for from_, to, key in gone:
+            self.transactions.remove_edge(from_, to, key=key)
+            if self.index is not None:
+                self.index.remove(key)
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # find_transaction(from_, to, key)
+    # returns the transaction of the edge, looked up in the ledger of the
+    # originator by its identifier, None if it isn't on the books anymore
+    # -------------------------------------------------------------------------
+    def find_transaction(self, from_, to, key):
+        accounts = getattr(from_, "accounts", None)
+        if accounts is None:
+            return None
+        return accounts.transactions.get(key)
     # -------------------------------------------------------------------------
 
     # -------------------------------------------------------------------------
     # subnetwork_by_type
     # -------------------------------------------------------------------------
     def subnetwork_by_type(self, _type):
+        if self.index is not None:
+            return self.subnetwork(type_=_type)
         return super(Network, self).subnetwork_by_type(_type)
     # -------------------------------------------------------------------------
 
@@ -117,6 +243,8 @@ class Network(BaseNetwork):
     # subnetwork_by_asset
     # -------------------------------------------------------------------------
     def subnetwork_by_asset(self, _asset):
+        if self.index is not None:
+            return self.subnetwork(asset=_asset)
         return super(Network, self).subnetwork_by_asset(_asset)
     # -------------------------------------------------------------------------
 
@@ -124,6 +252,8 @@ class Network(BaseNetwork):
     # subnetwork_by_amount
     # -------------------------------------------------------------------------
     def subnetwork_by_amount(self, lower_bound, upper_bound):
+        if self.index is not None:
+            return self.subnetwork(amount=(lower_bound, upper_bound))
         return super(Network, self).subnetwork_by_amount(lower_bound, upper_bound)
     # -------------------------------------------------------------------------
 
@@ -131,6 +261,8 @@ class Network(BaseNetwork):
     # subnetwork_by_interest
     # -------------------------------------------------------------------------
     def subnetwork_by_interest(self, lower_bound, upper_bound):
+        if self.index is not None:
+            return self.subnetwork(interest=(lower_bound, upper_bound))
         return super(Network, self).subnetwork_by_interest(lower_bound, upper_bound)
     # -------------------------------------------------------------------------
 
@@ -138,6 +270,8 @@ class Network(BaseNetwork):
     # subnetwork_by_maturity
     # -------------------------------------------------------------------------
     def subnetwork_by_maturity(self, lower_bound, upper_bound):
+        if self.index is not None:
+            return self.subnetwork(maturity=(lower_bound, upper_bound))
         return super(Network, self).subnetwork_by_maturity(lower_bound, upper_bound)
     # -------------------------------------------------------------------------
 
@@ -145,5 +279,38 @@ class Network(BaseNetwork):
     # subnetwork_by_time_of_default
     # -------------------------------------------------------------------------
     def subnetwork_by_time_of_default(self, lower_bound, upper_bound):
+        if self.index is not None:
+            return self.subnetwork(time_of_default=(lower_bound, upper_bound))
         return super(Network, self).subnetwork_by_time_of_default(lower_bound, upper_bound)
     # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # query(type_, asset, amount, interest, maturity, time_of_default)
+    # returns the (from_, to, key) of the edges meeting all the conditions
+    # given, type_ and asset are values and the others are pairs of bounds
+    # (lower_bound, upper_bound), both inclusive, None meaning unbounded,
+    # e.g. query(type_="loans", amount=(100.0, None))
+    # The incremental network uses its indexes, otherwise the edges are
+    # scanned once for all the conditions
+    # -------------------------------------------------------------------------
+    def query(self, **conditions):
+        if self.index is not None:
+            return self.index.query(conditions)
+        from src.network_index import NetworkIndex
+        index = NetworkIndex()
+        edges = []
+        for from_, to, key, data in self.transactions.edges(keys=True, data=True):
+            if all(attribute in data and index.meets(data, attribute, condition) for attribute, condition in conditions.items()):
+                edges.append((from_, to, key))
+        return edges
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # subnetwork(type_, asset, amount, interest, maturity, time_of_default)
+    # returns the subnetwork of the edges meeting all the conditions, as
+    # in query, and of the agents they connect, the subnetwork is a read
+    # only view of the network rather than a new graph
+    # -------------------------------------------------------------------------
+    def subnetwork(self, **conditions):
+        return self.transactions.edge_subgraph(self.query(**conditions))
+    # -------------------------------------------------------------------------
@@ -0,0 +1,241 @@
+#!/usr/bin/env python
+# [SublimeLinter pep8-max-line-length:150]
+# -*- coding: utf-8 -*-
+
+"""
+black_rhino is a multi-agent simulator for financial network analysis
+Copyright (C) 2016 Co-Pierre Georg (co-pierre.georg@keble.ox.ac.uk)
+Pawel Fiedor (pawel@fiedor.eu)
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, version 3 of the License.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program. If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from bisect import bisect_left, bisect_right
+
+# ============================================================================
+#
+# class NetworkIndex
+#
+# ============================================================================
+
+
+class NetworkIndex(object):
+    #
+    #
+    # VARIABLES
+    #
+    #
+
+    # The secondary indexes of the edges of an incremental Network, so
+    # that the subnetwork queries don't scan all the edges of the graph.
+    # Every edge (from_, to, key) gets a sequence number, the edges are
+    # hashed by their type_ and asset, and the sequence numbers are kept
+    # in lists sorted by (value, sequence number) for the amount, interest,
+    # maturity and time_of_default, so a range of values is found with two
+    # bisections, in O(log n + k) for k edges. A query over a number of
+    # attributes starts from the attribute with the fewest candidates and
+    # checks the rest on the values kept for each edge.
+    # Adding, removing or changing an edge is O(1): the sorted lists are
+    # not touched, the edges whose value changed are noted as pending and
+    # the lists are brought up to date by the next query which needs them
+    # (see sorted_list), entries of removed or changed edges are dropped
+    # then. The interest accrual changes every amount in each sweep, so the
+    # lists are sorted once per sweep at most instead of on every change.
+    hashed_attributes = ("type_", "asset")
+    ordered_attributes = ("amount", "interest", "maturity", "time_of_default")
+
+    sequence = 0  # the next sequence number
+    sequences = {}  # key of the edge -> sequence number
+    edges = {}  # sequence number -> (from_, to, key)
+    values = {}  # sequence number -> dictionary of attribute -> value
+    hashed = {}  # attribute -> dictionary of value -> dictionary of sequence numbers (an ordered set)
+    ordered = {}  # attribute -> sorted list of (value, sequence number), up to date only if not dirty
+    pending = {}  # attribute -> dictionary of the sequence numbers added or changed since the list was sorted
+    dirty = set()  # the ordered attributes whose lists are not up to date
+
+    #
+    #
+    # CODE
+    #
+    #
+
+    # -------------------------------------------------------------------------
+    # __init__
+    # -------------------------------------------------------------------------
+    def __init__(self):
+        self.sequence = 0
+        self.sequences = {}
+        self.edges = {}
+        self.values = {}
+        self.hashed = dict((attribute, {}) for attribute in self.hashed_attributes)
+        self.ordered = dict((attribute, []) for attribute in self.ordered_attributes)
+        self.pending = dict((attribute, {}) for attribute in self.ordered_attributes)
+        self.dirty = set()
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # __len__
+    # -------------------------------------------------------------------------
+    def __len__(self):
+        return len(self.edges)
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # add(from_, to, key, values)
+    # indexes the edge with the attributes given in values, an edge
+    # which is indexed already is indexed anew
+    # -------------------------------------------------------------------------
+    def add(self, from_, to, key, values):
+        if key in self.sequences:
+            self.remove(key)
+        number = self.sequence
+        self.sequence = self.sequence + 1
+        self.sequences[key] = number
+        self.edges[number] = (from_, to, key)
+        self.values[number] = dict((attribute, values[attribute]) for attribute in self.hashed_attributes + self.ordered_attributes)
+        for attribute in self.hashed_attributes:
+            self.hashed[attribute].setdefault(values[attribute], {})[number] = None
+        for attribute in self.ordered_attributes:
+            self.pending[attribute][number] = None
+        self.dirty.update(self.ordered_attributes)
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # remove(key)
+    # takes the edge out of the indexes, if it is indexed
+    # -------------------------------------------------------------------------
+    def remove(self, key):
+        number = self.sequences.pop(key, None)
+        if number is None:
+            return
+        del self.edges[number]
+        values = self.values.pop(number)
+        for attribute in self.hashed_attributes:
+            bucket = self.hashed[attribute][values[attribute]]
+            del bucket[number]
+            if len(bucket) == 0:
+                del self.hashed[attribute][values[attribute]]
+        # the entries in the sorted lists are dropped when they are sorted next
+        for attribute in self.ordered_attributes:
+            self.pending[attribute].pop(number, None)
+        self.dirty.update(self.ordered_attributes)
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # update(key, attribute, value)
+    # changes the value of an ordered attribute of the edge, e.g. its amount
+    # -------------------------------------------------------------------------
+    def update(self, key, attribute, value):
+        number = self.sequences.get(key)
+        if number is None:
+            return
+        values = self.values[number]
+        if values[attribute] == value:
+            return
+        values[attribute] = value
+        self.pending[attribute][number] = None
+        self.dirty.add(attribute)
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # sorted_list(attribute)
+    # returns the list of (value, sequence number) of the attribute sorted,
+    # first dropping the entries of the edges removed or changed since it
+    # was last sorted and adding the pending ones, the list is still sorted
+    # but for the pending entries at its end, which sort merges in
+    # O(n + p log p) for p pending entries
+    # -------------------------------------------------------------------------
+    def sorted_list(self, attribute):
+        if attribute not in self.dirty:
+            return self.ordered[attribute]
+        pending = self.pending[attribute]
+        values = self.values
+        ordered = [entry for entry in self.ordered[attribute] if entry[1] in values and entry[1] not in pending]
+        ordered.extend((values[number][attribute], number) for number in pending)
+        ordered.sort()
+        self.ordered[attribute] = ordered
+        self.pending[attribute] = {}
+        self.dirty.discard(attribute)
+        return ordered
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # candidates(attribute, condition)
+    # returns the sequence numbers of the edges meeting the condition on
+    # the attribute, a value for hashed attributes and a pair of bounds
+    # (lower, upper), both inclusive, for ordered ones
+    # -------------------------------------------------------------------------
+    def candidates(self, attribute, condition):
+        if attribute in self.hashed:
+            return list(self.hashed[attribute].get(condition, {}))
+        ordered = self.sorted_list(attribute)
+        start, end = self.bounds(ordered, condition)
+        return [number for value, number in ordered[start:end]]
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # bounds(ordered, condition)
+    # returns the slice of the sorted list within the bounds
+    # -------------------------------------------------------------------------
+    @staticmethod
+    def bounds(ordered, condition):
+        lower, upper = condition
+        start = 0 if lower is None else bisect_left(ordered, (lower, -1))
+        end = len(ordered) if upper is None else bisect_right(ordered, (upper, float("inf")))
+        return start, max(start, end)
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # count(attribute, condition)
+    # returns the number of candidates of the condition without listing them
+    # -------------------------------------------------------------------------
+    def count(self, attribute, condition):
+        if attribute in self.hashed:
+            return len(self.hashed[attribute].get(condition, {}))
+        start, end = self.bounds(self.sorted_list(attribute), condition)
+        return end - start
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # meets(values, attribute, condition)
+    # returns whether the value of the attribute meets the condition
+    # -------------------------------------------------------------------------
+    def meets(self, values, attribute, condition):
+        value = values[attribute]
+        if attribute in self.hashed:
+            return value == condition
+        lower, upper = condition
+        return (lower is None or value >= lower) and (upper is None or value <= upper)
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # query(conditions)
+    # returns the (from_, to, key) of the edges meeting all the conditions,
+    # a dictionary of attribute -> condition as in candidates()
+    # -------------------------------------------------------------------------
+    def query(self, conditions):
+        for attribute in conditions:
+            if attribute not in self.hashed and attribute not in self.ordered_attributes:
+                raise KeyError("The network is not indexed by " + str(attribute) + ".")
+        if len(conditions) == 0:
+            return list(self.edges.values())
+        # we start from the most selective condition
+        first = min(conditions, key=lambda attribute: self.count(attribute, conditions[attribute]))
+        others = [(attribute, condition) for attribute, condition in conditions.items() if attribute != first]
+        edges = []
+        for number in self.candidates(first, conditions[first]):
+            values = self.values[number]
+            if all(self.meets(values, attribute, condition) for attribute, condition in others):
+                edges.append(self.edges[number])
+        return edges
+    # -------------------------------------------------------------------------
@@ -0,0 +1,302 @@
+#!/usr/bin/env python
+# [SublimeLinter pep8-max-line-length:150]
+# -*- coding: utf-8 -*-
+
+"""
+black_rhino is a multi-agent simulator for financial network analysis
+Copyright (C) 2016 Co-Pierre Georg (co-pierre.georg@keble.ox.ac.uk)
+Pawel Fiedor (pawel@fiedor.eu)
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, version 3 of the License.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program. If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import heapq
+from collections import deque
+
+# ============================================================================
+#
+# class OrderBook
+#
+# ============================================================================
+
+
+class OrderBook(object):
+    #
+    #
+    # VARIABLES
+    #
+    #
+
+    # The limit order book with price-time priority used by Market.
+    # Each side of the book ("buy" and "sell") is a dictionary of price
+    # levels, and each level is a FIFO queue of the orders resting at
+    # that price in the order they arrived. The prices of the levels are
+    # kept in a heap per side (the buy heap holds negative prices), so
+    # the best price is at the top of the heap. Levels which run empty are
+    # deleted from the dictionary straight away and from the heap lazily,
+    # when they come up to the top. Orders are indexed by their identifier,
+    # a cancelled order is taken out of the index and its volume set to
+    # zero, and it is dropped from its queue when it reaches the front
+    # or when the book is cleared.
+    # The topology of an order is that of Market:
+    # order[0] = agent
+    # order[1] = price
+    # order[2] = volume
+    # order[3] = time
+    # order[4] = ident
+    # order[5] = type_
+    # Trades are returned as [seller, buyer, quantity, price], and are
+    # executed at the price of the resting order.
+    levels = {}  # "buy", "sell" -> dictionary of price -> [queue of orders, volume, number of orders]
+    prices = {}  # "buy", "sell" -> heap of the prices of the levels (negative for "buy")
+    orders = {}  # identifier -> order
+
+    #
+    #
+    # CODE
+    #
+    #
+
+    # -------------------------------------------------------------------------
+    # __init__
+    # -------------------------------------------------------------------------
+    def __init__(self):
+        self.levels = {"buy": {}, "sell": {}}
+        self.prices = {"buy": [], "sell": []}
+        self.orders = {}
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # __len__
+    # returns the number of orders resting in the book
+    # -------------------------------------------------------------------------
+    def __len__(self):
+        return len(self.orders)
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # __contains__(ident)
+    # -------------------------------------------------------------------------
+    def __contains__(self, ident):
+        return ident in self.orders
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # opposite(type_)
+    # returns the side of the book the order of the given type trades with
+    # -------------------------------------------------------------------------
+    @staticmethod
+    def opposite(type_):
+        if type_ == "sell":
+            return "buy"
+        if type_ == "buy":
+            return "sell"
+        raise ValueError("The type of an order is either buy or sell.")
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # best_price(side)
+    # returns the best price on the side of the book, None if it is empty
+    # i.e. the highest bid for "buy" and the lowest ask for "sell"
+    # -------------------------------------------------------------------------
+    def best_price(self, side):
+        heap = self.prices[side]
+        levels = self.levels[side]
+        sign = -1.0 if side == "buy" else 1.0
+        # levels which ran empty are removed from the heap here
+        while len(heap) > 0 and sign * heap[0] not in levels:
+            heapq.heappop(heap)
+        if len(heap) == 0:
+            return None
+        return sign * heap[0]
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # best_bid(), best_ask()
+    # -------------------------------------------------------------------------
+    def best_bid(self):
+        return self.best_price("buy")
+
+    def best_ask(self):
+        return self.best_price("sell")
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # volume_at(side, price)
+    # returns the volume resting at the price on the side of the book
+    # -------------------------------------------------------------------------
+    def volume_at(self, side, price):
+        level = self.levels[side].get(price)
+        if level is None:
+            return 0.0
+        return level[1]
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # crosses(type_, limit, price)
+    # returns whether an order of the type with the limit price trades
+    # with a resting order at price, a limit of None is a market order
+    # -------------------------------------------------------------------------
+    @staticmethod
+    def crosses(type_, limit, price):
+        if limit is None:
+            return True
+        if type_ == "sell":
+            return price >= limit
+        return price <= limit
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # match(agent, limit, volume, type_, trades)
+    # executes the incoming order against the opposite side of the book
+    # in price-time priority for as long as the prices cross, appends the
+    # trades to the list and returns the volume left unexecuted
+    # -------------------------------------------------------------------------
+    def match(self, agent, limit, volume, type_, trades):
+        side = self.opposite(type_)
+        levels = self.levels[side]
+        while volume > 0.0:
+            price = self.best_price(side)
+            if price is None or not self.crosses(type_, limit, price):
+                break
+            level = levels[price]
+            queue = level[0]
+            while volume > 0.0 and level[2] > 0:
+                order = queue[0]
+                if order[2] <= 0.0:
+                    # a cancelled order reached the front of the queue
+                    queue.popleft()
+                    continue
+                quantity = min(volume, order[2])
+                if type_ == "sell":
+                    trades.append([agent, order[0], quantity, price])
+                else:
+                    trades.append([order[0], agent, quantity, price])
+                volume = volume - quantity
+                order[2] = order[2] - quantity
+                level[1] = level[1] - quantity
+                if order[2] <= 0.0:
+                    queue.popleft()
+                    del self.orders[order[4]]
+                    level[2] = level[2] - 1
+            if level[2] == 0:
+                del levels[price]
+        return volume
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # rest(order)
+    # puts the order at the back of the queue of its price level
+    # -------------------------------------------------------------------------
+    def rest(self, order):
+        if order[4] in self.orders:
+            raise ValueError("An order with the identifier " + str(order[4]) + " is already in the book.")
+        side = order[5]
+        levels = self.levels[side]
+        price = order[1]
+        if price not in levels:
+            levels[price] = [deque(), 0.0, 0]
+            heapq.heappush(self.prices[side], -price if side == "buy" else price)
+        level = levels[price]
+        level[0].append(order)
+        level[1] = level[1] + order[2]
+        level[2] = level[2] + 1
+        self.orders[order[4]] = order
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # add_order(agent, price, volume, time, ident, type_)
+    # executes what it can of the limit order and rests the remainder
+    # returns the list of trades
+    # -------------------------------------------------------------------------
+    def add_order(self, agent, price, volume, time, ident, type_):
+        trades = []
+        volume = self.match(agent, price, volume, type_, trades)
+        if volume > 0.0:
+            self.rest([agent, price, volume, time, ident, type_])
+        return trades
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # market_order(agent, volume, type_)
+    # executes the order at the best prices available, the part which
+    # can't be executed is dropped, returns the list of trades
+    # -------------------------------------------------------------------------
+    def market_order(self, agent, volume, type_):
+        trades = []
+        self.match(agent, None, volume, type_, trades)
+        return trades
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # cancel_order(ident)
+    # returns True if the order was in the book, False otherwise
+    # -------------------------------------------------------------------------
+    def cancel_order(self, ident):
+        order = self.orders.pop(ident, None)
+        if order is None:
+            return False
+        levels = self.levels[order[5]]
+        level = levels[order[1]]
+        level[1] = level[1] - order[2]
+        level[2] = level[2] - 1
+        order[2] = 0.0
+        if level[2] == 0:
+            del levels[order[1]]
+        return True
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # replace_order(new_volume, ident)
+    # reduces the volume of the order keeping its time priority, returns
+    # False if there is no such order or the new volume is larger
+    # -------------------------------------------------------------------------
+    def replace_order(self, new_volume, ident):
+        order = self.orders.get(ident)
+        if order is None or new_volume > order[2]:
+            return False
+        if new_volume <= 0.0:
+            return self.cancel_order(ident)
+        level = self.levels[order[5]][order[1]]
+        level[1] = level[1] - (order[2] - new_volume)
+        order[2] = new_volume
+        return True
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # clear_book()
+    # drops the cancelled orders from the queues
+    # -------------------------------------------------------------------------
+    def clear_book(self):
+        for side in ["buy", "sell"]:
+            for level in self.levels[side].values():
+                if len(level[0]) > level[2]:
+                    level[0] = deque(order for order in level[0] if order[2] > 0.0)
+            # and the heap is rebuilt from the levels left
+            self.prices[side] = [-price if side == "buy" else price for price in self.levels[side]]
+            heapq.heapify(self.prices[side])
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # book(side)
+    # returns the orders resting on the side of the book in the order
+    # in which they would be executed, this is for inspection only
+    # -------------------------------------------------------------------------
+    def book(self, side):
+        to_return = []
+        for price in sorted(self.levels[side], reverse=(side == "buy")):
+            for order in self.levels[side][price][0]:
+                if order[2] > 0.0:
+                    to_return.append(order)
+        return to_return
+    # -------------------------------------------------------------------------
@@ -0,0 +1,162 @@
+#!/usr/bin/env python
+# [SublimeLinter pep8-max-line-length:150]
+# -*- coding: utf-8 -*-
+
+"""
+black_rhino is a multi-agent simulator for financial network analysis
+Copyright (C) 2016 Co-Pierre Georg (co-pierre.georg@keble.ox.ac.uk)
+Pawel Fiedor (pawel@fiedor.eu)
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, version 3 of the License.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program. If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import csv
+import time
+import tracemalloc
+
+# ============================================================================
+#
+# class Profiler
+#
+# ============================================================================
+
+
+class Profiler(object):
+    #
+    #
+    # VARIABLES
+    #
+    #
+
+    # The instrumentation of the phases of Updater.do_update, switched on
+    # by the static parameter profile_updates. Every phase run through
+    # run() gives one record per sweep with
+    #   sweep, phase       - the time given to do_update and the name of the phase
+    #   wall_time          - the seconds the phase took
+    #   created, removed   - the number of transactions which appeared on and
+    #                        disappeared from the books during the phase
+    #   ledger_entries     - the number of entries in all ledgers after the phase
+    #   largest_ledger     - the number of entries in the largest ledger
+    #   memory_peak        - the peak of the memory traced by tracemalloc during
+    #                        the phase above what was traced before it, in bytes
+    # The books are counted outside of the timed part. Tracing the memory
+    # slows the run down considerably, so the wall times are comparable
+    # across the phases of one run but not with runs without the profiler.
+    # The records are written to a csv file next to the measurement output
+    # by the runner, see Runner.do_run.
+    headers = ["sweep", "phase", "wall_time", "created", "removed", "ledger_entries", "largest_ledger", "memory_peak"]
+    records = []  # one list of values in the order of headers per phase per sweep
+    trace_memory = True
+    started_tracing = False  # whether tracemalloc was started here, and is to be stopped in close
+
+    #
+    #
+    # CODE
+    #
+    #
+
+    # -------------------------------------------------------------------------
+    # __init__(trace_memory)
+    # -------------------------------------------------------------------------
+    def __init__(self, trace_memory=True):
+        self.records = []
+        self.trace_memory = trace_memory
+        self.started_tracing = False
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self.started_tracing = True
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # books(environment)
+    # returns the identifiers of the transactions on the books, the number
+    # of ledger entries and the size of the largest ledger
+    # -------------------------------------------------------------------------
+    @staticmethod
+    def books(environment):
+        identifiers = set()
+        entries = 0
+        largest = 0
+        for agent in environment.agents_generator():
+            size = len(agent.accounts)
+            entries = entries + size
+            largest = max(largest, size)
+            for transaction in agent.accounts:
+                identifiers.add(transaction.identifier)
+        return identifiers, entries, largest
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # run(name, phase, environment, sweep)
+    # runs the phase, phase(environment, sweep), and records it
+    # -------------------------------------------------------------------------
+    def run(self, name, phase, environment, sweep):
+        before, entries, largest = self.books(environment)
+        if self.trace_memory:
+            traced = tracemalloc.get_traced_memory()[0]
+            if hasattr(tracemalloc, "reset_peak"):
+                tracemalloc.reset_peak()
+            else:  # before Python 3.9 the peak is only reset by clearing the traces
+                tracemalloc.clear_traces()
+                traced = 0
+        start = time.perf_counter()
+        phase(environment, sweep)
+        wall_time = time.perf_counter() - start
+        memory_peak = 0
+        if self.trace_memory:
+            memory_peak = max(0, tracemalloc.get_traced_memory()[1] - traced)
+        after, entries, largest = self.books(environment)
+        self.records.append([sweep, name, wall_time, len(after - before), len(before - after), entries, largest, memory_peak])
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # summary()
+    # returns phase -> [total wall time, transactions created, transactions
+    # removed, largest memory peak] over all the sweeps, in the order the
+    # phases were first run
+    # -------------------------------------------------------------------------
+    def summary(self):
+        totals = {}
+        order = []
+        for sweep, name, wall_time, created, removed, entries, largest, memory_peak in self.records:
+            if name not in totals:
+                totals[name] = [0.0, 0, 0, 0]
+                order.append(name)
+            total = totals[name]
+            total[0] = total[0] + wall_time
+            total[1] = total[1] + created
+            total[2] = total[2] + removed
+            total[3] = max(total[3], memory_peak)
+        return [(name, totals[name]) for name in order]
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # write(filename)
+    # writes the records to a csv file
+    # -------------------------------------------------------------------------
+    def write(self, filename):
+        with open(filename, "w") as profile_file:
+            csv_writer = csv.writer(profile_file, lineterminator='\n')
+            csv_writer.writerow(self.headers)
+            csv_writer.writerows(self.records)
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # close()
+    # stops tracing the memory if it was started here
+    # -------------------------------------------------------------------------
+    def close(self):
+        if self.started_tracing:
+            tracemalloc.stop()
+            self.started_tracing = False
+    # -------------------------------------------------------------------------
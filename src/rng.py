@@ -0,0 +1,107 @@
+#!/usr/bin/env python
+# [SublimeLinter pep8-max-line-length:150]
+# -*- coding: utf-8 -*-
+
+"""
+black_rhino is a multi-agent simulator for financial network analysis
+Copyright (C) 2016 Co-Pierre Georg (co-pierre.georg@keble.ox.ac.uk)
+Pawel Fiedor (pawel@fiedor.eu)
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, version 3 of the License.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program. If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import random
+try:
+    import numpy as np
+except ImportError:  # without numpy the generators are random.Random
+    np = None
+
+# -------------------------------------------------------------------------
+# Random number generators of the runs
+#
+# Every run has one generator, owned by the environment (environment.rng)
+# and passed to the updater, the market and the agents, so that a run is
+# reproduced exactly by its seed. The generator is a NumPy Generator,
+# and the runs done in parallel get independent streams spawned from the
+# same seed: stream i is the i-th child of the seed's SeedSequence.
+# The helpers below work on both NumPy generators and random.Random,
+# which is used if numpy isn't installed.
+# -------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------
+# new_rng(seed, stream)
+# returns a new generator for the seed, or for the given stream spawned
+# from the seed, a seed of None takes fresh entropy from the system
+# -------------------------------------------------------------------------
+def new_rng(seed=None, stream=None):
+    if seed is not None:
+        seed = int(seed)
+    if np is None:
+        if stream is not None:
+            return random.Random(str(seed) + "/" + str(stream))
+        return random.Random(seed)
+    if stream is not None:
+        return np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(int(stream),)))
+    return np.random.default_rng(seed)
+# -------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------
+# spawn_rng(rng)
+# returns a new generator on a child stream of the generator, every call
+# spawns the next child, so the generators spawned from one seed are
+# independent of each other and reproduced by the seed
+# -------------------------------------------------------------------------
+def spawn_rng(rng):
+    if isinstance(rng, random.Random):
+        return random.Random(rng.getrandbits(64))
+    return np.random.default_rng(rng.bit_generator.seed_seq.spawn(1)[0])
+# -------------------------------------------------------------------------
+
+# -------------------------------------------------------------------------
+# random_index(rng, length)
+# returns an integer drawn uniformly from 0 to length - 1
+# -------------------------------------------------------------------------
+def random_index(rng, length):
+    if isinstance(rng, random.Random):
+        return rng.randrange(length)
+    return int(rng.integers(length))
+# -------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------
+# choice(rng, items)
+# returns an element of the list drawn uniformly
+# -------------------------------------------------------------------------
+def choice(rng, items):
+    return items[random_index(rng, len(items))]
+# -------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------
+# shuffle(rng, items)
+# shuffles the list in place
+# -------------------------------------------------------------------------
+def shuffle(rng, items):
+    rng.shuffle(items)
+# -------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------
+# uniform(rng, low, high)
+# returns a float drawn uniformly from [low, high)
+# -------------------------------------------------------------------------
+def uniform(rng, low=0.0, high=1.0):
+    return float(rng.uniform(low, high))
+# -------------------------------------------------------------------------
@@ -20,6 +20,7 @@ You should have received a copy of the GNU General Public License
 along with this program. If not, see <http://www.gnu.org/licenses/>.
 """
 
+import os
 from src.updater import Updater
 from abm_template.src.baserunner import BaseRunner
 from src.measurement import Measurement
@@ -42,6 +43,7 @@ class Runner(BaseRunner):
     identifier = ""
     num_sweeps = 0
     current_step = 0
+    measurement_sink = None  # if set, measurement rows are passed to it instead of the output file
 
     #
     #
@@ -102,6 +104,7 @@ class Runner(BaseRunner):
         # measurement = Measurement("Measurement", environment, self, {1: ["Step", "static", "self.runner.current_step"],
         # 2: ["Deposits", "dynamic", "self.environment.households[0].get_account", ["deposits"]]}, "TestMeasurement.csv")
         measurement = Measurement(environment, self)
+        measurement.sink = self.measurement_sink
         # And open the output file
         measurement.open_file()
         # We start the shock class as well
@@ -153,8 +156,16 @@ class Runner(BaseRunner):
             #     if tranx.type_ == "capital" and tranx.to == environment.firms[2]:
             #         capital = capital - tranx.amount
             # print(environment.firms[2].get_account("deposits")+capital-environment.firms[2].get_account("loans"))
-            print(environment.banks[0])
+            if self.updater.trace.sweeps:
+                self.updater.trace.sweep("  %s", environment.banks[0])
             # print(environment.firms[0])
         # Close the output file at the end of the simulation
         measurement.close_file()
+        # The profile of the updates is written next to the measurements,
+        # with a sink the profiler is left to whoever set the sink, e.g.
+        # MonteCarlo writes the profiles of all its runs to one file
+        if self.updater.profiler is not None and measurement.sink is None:
+            self.updater.profiler.write(os.path.splitext(measurement.filename)[0] + "-profile.csv")
+        # And stop the worker processes the updater may have started
+        self.updater.close()
     # ------------------------------------------------------------------------
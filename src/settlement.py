@@ -0,0 +1,119 @@
+#!/usr/bin/env python
+# [SublimeLinter pep8-max-line-length:150]
+# -*- coding: utf-8 -*-
+
+"""
+black_rhino is a multi-agent simulator for financial network analysis
+Copyright (C) 2016 Co-Pierre Georg (co-pierre.georg@keble.ox.ac.uk)
+Pawel Fiedor (pawel@fiedor.eu)
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, version 3 of the License.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program. If not, see <http://www.gnu.org/licenses/>.
+"""
+
+# ============================================================================
+#
+# class Settlement
+#
+# ============================================================================
+
+
+class Settlement(object):
+    #
+    #
+    # VARIABLES
+    #
+    #
+
+    # The netting buffer of a market round. The flows of the round are
+    # accumulated by (type_, from_, to, asset) instead of becoming one
+    # transaction each, and post() adds one transaction per key with the
+    # total amount at the end of the round, so the ledgers grow by the
+    # number of distinct pairs of agents rather than by the number of trades.
+    # The interest, maturity and time_of_default of a key are those of its
+    # first flow; the flows of one key have the same terms in the updater,
+    # since the terms are given by the bank on one side of the flow.
+    # Flows of zero are dropped. If netting is False, every flow is posted
+    # straight away, as one transaction, like environment.new_transaction.
+    environment = None
+    netting = True
+    flows = {}  # (type_, from_, to, asset) -> [amount, interest, maturity, time_of_default]
+
+    #
+    #
+    # CODE
+    #
+    #
+
+    # -------------------------------------------------------------------------
+    # __init__(environment, netting)
+    # -------------------------------------------------------------------------
+    def __init__(self, environment, netting=True):
+        self.environment = environment
+        self.netting = netting
+        self.flows = {}
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # __len__
+    # returns the number of transactions waiting to be posted
+    # -------------------------------------------------------------------------
+    def __len__(self):
+        return len(self.flows)
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # add(type_, asset, from_, to, amount, interest, maturity, time_of_default)
+    # adds the flow to the buffer, the arguments are those of
+    # environment.new_transaction, flows of zero add nothing to the
+    # buffer, without netting every flow is booked as it is
+    # -------------------------------------------------------------------------
+    def add(self, type_, asset, from_, to, amount, interest, maturity, time_of_default):
+        if not self.netting:
+            self.environment.new_transaction(type_, asset, from_, to, amount, interest, maturity, time_of_default)
+            return
+        if amount == 0:
+            return
+        key = (type_, from_, to, asset)
+        flow = self.flows.get(key)
+        if flow is None:
+            self.flows[key] = [amount, interest, maturity, time_of_default]
+        else:
+            flow[0] = flow[0] + amount
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # pending(type_, from_, to, asset)
+    # returns the amount of the flows of the key which are not posted yet,
+    # so that balances can be read within the round as if they were
+    # -------------------------------------------------------------------------
+    def pending(self, type_, from_, to, asset=""):
+        flow = self.flows.get((type_, from_, to, asset))
+        if flow is None:
+            return 0.0
+        return flow[0]
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # post()
+    # adds one transaction for each key in the order the keys were first
+    # used, empties the buffer and returns the number of transactions added
+    # -------------------------------------------------------------------------
+    def post(self):
+        num_posted = 0
+        for (type_, from_, to, asset), flow in self.flows.items():
+            if flow[0] != 0:
+                self.environment.new_transaction(type_, asset, from_, to, flow[0], flow[1], flow[2], flow[3])
+                num_posted = num_posted + 1
+        self.flows = {}
+        return num_posted
+    # -------------------------------------------------------------------------
@@ -21,7 +21,6 @@ along with this program. If not, see <http://www.gnu.org/licenses/>.
 """
 
 from abm_template.src.baseshock import BaseShock
-import random
 import logging
 
 # -------------------------------------------------------------------------
@@ -0,0 +1,188 @@
+#!/usr/bin/env python
+# [SublimeLinter pep8-max-line-length:150]
+# -*- coding: utf-8 -*-
+
+"""
+black_rhino is a multi-agent simulator for financial network analysis
+Copyright (C) 2016 Co-Pierre Georg (co-pierre.georg@keble.ox.ac.uk)
+Pawel Fiedor (pawel@fiedor.eu)
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, version 3 of the License.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program. If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import copy
+import hashlib
+import logging
+import os
+import pickle
+from xml.etree import ElementTree
+
+# -------------------------------------------------------------------------
+# Binary snapshots of initialized environments, used by Environment
+#
+# A snapshot is a pickled dictionary of plain Python values (no agent or
+# transaction objects), so it doesn't depend on how the classes pickle:
+#   format           - SNAPSHOT_FORMAT, snapshots of other formats are ignored
+#   config_hash      - hash of the config files the environment was read from
+#   identifier, static_parameters, variable_parameters, assets, shocks
+#   agents           - "banks", "firms", "households", "central_bank" ->
+#                      list of (identifier, parameters, state_variables)
+#   transactions     - list of (type_, asset, from_, to, amount, interest,
+#                      maturity, time_of_default) with agents' identifiers
+#                      in an order consistent with every agent's accounts
+#   network          - identifier of the network, the network itself is
+#                      initialized again as it is after reading the XML
+# -------------------------------------------------------------------------
+
+SNAPSHOT_FORMAT = 1
+AGENT_KINDS = ("banks", "firms", "households", "central_bank")
+DIRECTORY_PARAMETERS = ("bank_directory", "firm_directory", "household_directory", "central_bank_directory")
+
+
+# -------------------------------------------------------------------------
+# config_hash(environment_directory, identifier)
+# returns a hash of the environment config file and of all the files in
+# the agent directories it points to, so the snapshot is invalidated
+# whenever any of the inputs change
+# -------------------------------------------------------------------------
+def config_hash(environment_directory, identifier):
+    environment_filename = environment_directory + identifier + ".xml"
+    digest = hashlib.sha256()
+    digest.update(str(SNAPSHOT_FORMAT).encode("utf-8"))
+    with open(environment_filename, "rb") as environment_file:
+        text = environment_file.read()
+    digest.update(text)
+    directories = []
+    for element in ElementTree.XML(text):
+        if element.attrib.get("type") == "static" and element.attrib.get("name") in DIRECTORY_PARAMETERS:
+            directories.append(element.attrib["value"])
+    for directory in directories:
+        if directory in ("", "none") or not os.path.isdir(directory):
+            continue
+        for infile in sorted(os.listdir(directory)):
+            digest.update(infile.encode("utf-8"))
+            with open(os.path.join(directory, infile), "rb") as agent_file:
+                digest.update(agent_file.read())
+    return digest.hexdigest()
+# -------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------
+# agent_key(agent)
+# returns the identifier of the agent, or the value if it isn't an agent
+# -------------------------------------------------------------------------
+def agent_key(agent):
+    return getattr(agent, "identifier", agent)
+# -------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------
+# ordered_transactions(environment)
+# returns all transactions on the books of the agents, each once, in an
+# order in which every agent's accounts list them, so that adding them
+# back one by one rebuilds the accounts in the same order
+# -------------------------------------------------------------------------
+def ordered_transactions(environment):
+    transactions = {}  # identifier -> transaction
+    following = {}  # identifier -> identifiers of the transactions booked right after it
+    waiting = {}  # identifier -> number of transactions it has to wait for
+    first_seen = []
+    for agent in environment.agents_generator():
+        previous = None
+        for transaction in agent.accounts:
+            if transaction.identifier not in transactions:
+                transactions[transaction.identifier] = transaction
+                following[transaction.identifier] = []
+                waiting[transaction.identifier] = 0
+                first_seen.append(transaction.identifier)
+            if previous is not None:
+                following[previous].append(transaction.identifier)
+                waiting[transaction.identifier] = waiting[transaction.identifier] + 1
+            previous = transaction.identifier
+    # we go through the transactions in the order they were first seen
+    # and only emit those which don't wait for anything anymore
+    ordered = []
+    ready = [identifier for identifier in reversed(first_seen) if waiting[identifier] == 0]
+    while len(ready) > 0:
+        identifier = ready.pop()
+        ordered.append(transactions[identifier])
+        for next_identifier in reversed(following[identifier]):
+            waiting[next_identifier] = waiting[next_identifier] - 1
+            if waiting[next_identifier] == 0:
+                ready.append(next_identifier)
+    if len(ordered) != len(transactions):
+        # the accounts disagree on the order, we fall back to the order of first sight
+        ordered = [transactions[identifier] for identifier in first_seen]
+    return ordered
+# -------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------
+# snapshot_of(environment, config_hash)
+# returns the snapshot of the environment as a dictionary of plain values
+# -------------------------------------------------------------------------
+def snapshot_of(environment, config_hash):
+    agents = {}
+    for kind, agent_list in zip(AGENT_KINDS, [environment.banks, environment.firms, environment.households, environment.central_bank]):
+        agents[kind] = [(agent.identifier, copy.deepcopy(agent.parameters), copy.deepcopy(agent.state_variables)) for agent in agent_list]
+    transactions = []
+    for transaction in ordered_transactions(environment):
+        transactions.append((transaction.type_, transaction.asset, agent_key(transaction.from_), agent_key(transaction.to),
+                             transaction.amount, transaction.interest, transaction.maturity, transaction.time_of_default))
+    return {"format": SNAPSHOT_FORMAT,
+            "config_hash": config_hash,
+            "identifier": environment.identifier,
+            "static_parameters": copy.deepcopy(environment.static_parameters),
+            "variable_parameters": copy.deepcopy(environment.variable_parameters),
+            "assets": copy.deepcopy(environment.assets),
+            "shocks": copy.deepcopy(environment.shocks),
+            "agents": agents,
+            "transactions": transactions,
+            "network": environment.network.identifier}
+# -------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------
+# write_snapshot(snapshot, filename)
+# writes the snapshot to a temporary file first and moves it in place
+# so that runs reading the snapshot never see a partial file
+# -------------------------------------------------------------------------
+def write_snapshot(snapshot, filename):
+    temporary_filename = filename + "." + str(os.getpid()) + ".tmp"
+    with open(temporary_filename, "wb") as snapshot_file:
+        pickle.dump(snapshot, snapshot_file, pickle.HIGHEST_PROTOCOL)
+    os.replace(temporary_filename, filename)
+# -------------------------------------------------------------------------
+
+
+# -------------------------------------------------------------------------
+# read_snapshot(filename, config_hash)
+# returns the snapshot in the file, or None if there is no snapshot,
+# it can't be read, or it was made from different config files
+# -------------------------------------------------------------------------
+def read_snapshot(filename, config_hash=None):
+    if not os.path.isfile(filename):
+        return None
+    try:
+        with open(filename, "rb") as snapshot_file:
+            snapshot = pickle.load(snapshot_file)
+    except Exception:
+        logging.error("    ERROR: snapshot %s could not be read",  filename)
+        return None
+    if not isinstance(snapshot, dict) or snapshot.get("format") != SNAPSHOT_FORMAT:
+        return None
+    if config_hash is not None and snapshot.get("config_hash") != config_hash:
+        logging.info("  snapshot %s is out of date",  filename)
+        return None
+    return snapshot
+# -------------------------------------------------------------------------
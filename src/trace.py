@@ -0,0 +1,180 @@
+#!/usr/bin/env python
+# [SublimeLinter pep8-max-line-length:150]
+# -*- coding: utf-8 -*-
+
+"""
+black_rhino is a multi-agent simulator for financial network analysis
+Copyright (C) 2016 Co-Pierre Georg (co-pierre.georg@keble.ox.ac.uk)
+Pawel Fiedor (pawel@fiedor.eu)
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, version 3 of the License.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program. If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import logging
+import struct
+
+# -------------------------------------------------------------------------
+# Events and traces of the runs
+#
+# The updater reports what it does through a Trace instead of printing
+# it. The events have levels, and nothing is done for an event above the
+# level of the trace, the call sites check the flags of the trace before
+# building the arguments of an event, so a disabled trace costs one
+# attribute lookup. The level is the static parameter trace_level:
+#   TRACE_OFF    - nothing is reported (the default)
+#   TRACE_SWEEPS - one event per sweep, e.g. the state of a bank
+#   TRACE_TRADES - every trade made on the markets as well
+# Sweep events go to the log. Trades go to the binary trace file given
+# by the static parameter trace_file if there is one, and to the log
+# otherwise. The file is a sequence of records, each starting with one
+# byte giving its kind:
+#   "N" - code (uint32), length (uint16) and utf-8 bytes of a name, a name
+#         is written once, before the first record using its code
+#   "T" - time (int32), codes (uint32) of the good, the seller and the
+#         buyer, quantity and price (float64)
+# all little-endian, see read_trace.
+# -------------------------------------------------------------------------
+
+TRACE_OFF = 0
+TRACE_SWEEPS = 1
+TRACE_TRADES = 2
+
+NAME_RECORD = struct.Struct("<cIH")
+TRADE_RECORD = struct.Struct("<ciIIIdd")
+
+
+# -------------------------------------------------------------------------
+# read_trace(filename)
+# yields the trades in the binary trace file as tuples of (time, good,
+# seller, buyer, quantity, price)
+# -------------------------------------------------------------------------
+def read_trace(filename):
+    names = {}
+    with open(filename, "rb") as trace_file:
+        while True:
+            kind = trace_file.read(1)
+            if kind == b"":
+                return
+            if kind == b"N":
+                code, length = struct.unpack("<IH", trace_file.read(NAME_RECORD.size - 1))
+                names[code] = trace_file.read(length).decode("utf-8")
+            elif kind == b"T":
+                time, good, seller, buyer, quantity, price = struct.unpack("<iIIIdd", trace_file.read(TRADE_RECORD.size - 1))
+                yield (time, names[good], names[seller], names[buyer], quantity, price)
+            else:
+                raise ValueError("Unknown record in the trace file " + filename)
+# -------------------------------------------------------------------------
+
+# ============================================================================
+#
+# class Trace
+#
+# ============================================================================
+
+
+class Trace(object):
+    #
+    #
+    # VARIABLES
+    #
+    #
+
+    level = TRACE_OFF
+    sweeps = False  # whether sweep events are reported
+    trades = False  # whether trades are reported
+    filename = None  # the binary trace file, if any
+    file = None
+    names = {}  # name -> code in the trace file
+
+    #
+    #
+    # CODE
+    #
+    #
+
+    # -------------------------------------------------------------------------
+    # __init__(level, filename)
+    # -------------------------------------------------------------------------
+    def __init__(self, level=TRACE_OFF, filename=None):
+        self.level = int(level)
+        self.sweeps = self.level >= TRACE_SWEEPS
+        self.trades = self.level >= TRACE_TRADES
+        self.filename = filename
+        self.file = None
+        self.names = {}
+        if self.trades and filename is not None:
+            self.file = open(filename, "wb")
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # from_environment(environment)
+    # returns the trace set up by the static parameters trace_level and
+    # trace_file of the environment
+    # -------------------------------------------------------------------------
+    @staticmethod
+    def from_environment(environment):
+        filename = environment.static_parameters.get("trace_file", None)
+        if filename in ("", "none"):
+            filename = None
+        return Trace(environment.static_parameters.get("trace_level", TRACE_OFF), filename)
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # sweep(message, *args)
+    # reports a sweep event, the message is formatted with the arguments
+    # only if the event is logged
+    # -------------------------------------------------------------------------
+    def sweep(self, message, *args):
+        if self.sweeps:
+            logging.info(message, *args)
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # code(name)
+    # returns the code of the name in the trace file, writing the name
+    # to the file the first time it is used
+    # -------------------------------------------------------------------------
+    def code(self, name):
+        code = self.names.get(name)
+        if code is None:
+            code = len(self.names)
+            self.names[name] = code
+            encoded = str(name).encode("utf-8")
+            self.file.write(NAME_RECORD.pack(b"N", code, len(encoded)))
+            self.file.write(encoded)
+        return code
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # trade(good, seller, buyer, quantity, price, time)
+    # reports a trade, seller and buyer are the identifiers of the agents
+    # -------------------------------------------------------------------------
+    def trade(self, good, seller, buyer, quantity, price, time):
+        if not self.trades:
+            return
+        if self.file is None:
+            logging.info("  %s sold %f units of %s at a price %f to %s at time %d", seller, quantity, good, price, buyer, time)
+            return
+        self.file.write(TRADE_RECORD.pack(b"T", int(time), self.code(good), self.code(seller), self.code(buyer),
+                                          float(quantity), float(price)))
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # close()
+    # closes the trace file, if any
+    # -------------------------------------------------------------------------
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+    # -------------------------------------------------------------------------
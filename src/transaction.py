@@ -21,6 +21,8 @@ along with this program. If not, see <http://www.gnu.org/licenses/>.
 """
 
 from abm_template.src.basetransaction import BaseTransaction
+from src.ledger import Ledger
+from src.transaction_store import stored_column
 import networkx as nx
 
 # -------------------------------------------------------------------------
@@ -43,12 +45,20 @@ class Transaction(BaseTransaction):
     asset = ""  # type of asset, used for investment types
     from_ = 0.0  # agent being the originator of the transaction
     to = 0.0  # agent being the recipient of the transaction
-    amount = 0.0  # amount of the transaction
-    interest = 0.0  # interest rate paid to the originator each time step
-    maturity = 0  # time (in steps) to maturity
+    _amount = 0.0  # amount of the transaction, accessed through the amount property below
+    _interest = 0.0  # interest rate paid to the originator each time step
+    _maturity = 0  # time (in steps) to maturity
     # this is used only for loans I, and will be > 0 for defaulting loans. with each update step, it is reduced by 1
     # if timeOfDefault == 0: loan defaults
-    time_of_default = -1  # control variable checking for defaulted transactions
+    _time_of_default = -1  # control variable checking for defaulted transactions
+    # the columnar store (src.transaction_store) the transaction is bound to and its row there
+    # while bound, the amount, interest, maturity and time_of_default are kept in the store
+    store = None
+    row = -1
+    # the incremental network (src.network) the transaction is an edge of, if any
+    network = None
+    # the incremental aggregates (src.aggregates) the transaction is counted in, if any
+    aggregates = None
 
     #
     #
@@ -62,6 +72,11 @@ class Transaction(BaseTransaction):
     # This may be useful for looping over various agent's accounts
     # -------------------------------------------------------------------------
     def __init__(self):
+        self.store = None  # needs to be there before amount is first set
+        self.row = -1
+        self.network = None
+        self.aggregates = None
+        self._amount = 0.0
         self.identifier = None  # unique identifier of the transaction, may be useful for iterators
         self.type_ = ""  # type of transactions, e.g. "deposit"
         self.asset = ""  # type of asset, used for investment types
@@ -76,6 +91,20 @@ class Transaction(BaseTransaction):
         super(Transaction, self).__init__()
     # ------------------------------------------------------------------------
 
+    # -------------------------------------------------------------------------
+    # __del__
+    # makes sure the transaction is not left on the books of the agents
+    # this goes through the ledgers so it is constant time as well
+    # -------------------------------------------------------------------------
+    def __del__(self):
+        try:
+            for ledger in self.get_ledgers():
+                ledger.discard(self)
+        except Exception:
+            # the agents may already be gone at interpreter shutdown
+            pass
+    # -------------------------------------------------------------------------
+
     # -------------------------------------------------------------------------
     # functions for setting/changing variables
     # these either return or set specific value to the above variables
@@ -116,6 +145,38 @@ class Transaction(BaseTransaction):
     def set_amount(self, amount, environment):
         super(Transaction, self).set_amount(amount, environment)
 
+    # -------------------------------------------------------------------------
+    # amount
+    # the amount is a property so that the ledgers of the agents holding
+    # the transaction can update their running balances on every change
+    # no matter if it's done through set_amount or by direct assignment
+    # -------------------------------------------------------------------------
+    @property
+    def amount(self):
+        if self.store is None:
+            return self._amount
+        return self.store.table["amount"][self.row].item()
+
+    @amount.setter
+    def amount(self, value):
+        previous_amount = self.amount
+        if self.store is None:
+            self._amount = value
+        else:
+            self.store.table["amount"][self.row] = value
+        for ledger in self.get_ledgers():
+            ledger.update_amount(self, previous_amount)
+        if self.network is not None:
+            self.network.set_amount(self)
+        if self.aggregates is not None:
+            self.aggregates.set_amount(self)
+    # -------------------------------------------------------------------------
+
+    # the remaining numeric variables are backed by the store as well
+    interest = stored_column("interest")
+    maturity = stored_column("maturity")
+    time_of_default = stored_column("time_of_default")
+
     def get_interest(self):
         return self.interest
 
@@ -135,6 +196,20 @@ class Transaction(BaseTransaction):
         super(Transaction, self).set_time_of_default(time_of_default, environment)
     # -------------------------------------------------------------------------
 
+    # -------------------------------------------------------------------------
+    # get_ledgers()
+    # returns the ledgers (accounts) of the agents holding the transaction
+    # a transaction from an agent to itself is held in one ledger only
+    # -------------------------------------------------------------------------
+    def get_ledgers(self):
+        ledgers = []
+        for agent in (self.from_, self.to):
+            accounts = getattr(agent, "accounts", None)
+            if isinstance(accounts, Ledger) and not any(accounts is ledger for ledger in ledgers):
+                ledgers.append(accounts)
+        return ledgers
+    # -------------------------------------------------------------------------
+
     # -------------------------------------------------------------------------
     # add_transaction
     # adds the transaction to appropriate agents' accounts
@@ -143,14 +218,39 @@ class Transaction(BaseTransaction):
     # -------------------------------------------------------------------------
     def add_transaction(self, type_, asset, from_, to, amount,  interest,  maturity, time_of_default, environment):
         super(Transaction, self).add_transaction(type_, asset, from_, to, amount,  interest,  maturity, time_of_default, environment)
+        network = getattr(environment, "network", None)
+        if network is not None and network.incremental:
+            network.add_transaction(self)
+        aggregates = getattr(environment, "aggregates", None)
+        if aggregates is not None:
+            aggregates.add_transaction(self)
     # -------------------------------------------------------------------------
 
     # -------------------------------------------------------------------------
     # remove_transaction
     # removes the transaction from appropriate agents' accounts
+    # the ledgers are keyed by the identifier of the transaction, so this
+    # is constant time instead of scanning the accounts of both agents
     # -------------------------------------------------------------------------
     def remove_transaction(self, environment):
-        super(Transaction, self).remove_transaction(environment)
+        for ledger in self.get_ledgers():
+            ledger.discard(self)
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # remove_transactions(transactions, environment)
+    # removes a number of transactions from the appropriate agents' accounts
+    # grouping them by ledger so each ledger is compacted at most once
+    # -------------------------------------------------------------------------
+    def remove_transactions(self, transactions, environment):
+        ledgers = {}
+        for transaction in transactions:
+            for ledger in transaction.get_ledgers():
+                if id(ledger) not in ledgers:
+                    ledgers[id(ledger)] = [ledger, []]
+                ledgers[id(ledger)][1].append(transaction)
+        for ledger, to_remove in ledgers.values():
+            ledger.discard_many(to_remove)
     # -------------------------------------------------------------------------
 
     # -------------------------------------------------------------------------
@@ -184,13 +284,16 @@ class Transaction(BaseTransaction):
     # for the economics of the process
     # -------------------------------------------------------------------------
     def clear_accounts(self, agent, environment):
-        super(Transaction, self).clear_accounts(agent, environment)
+        self.remove_transactions(agent.accounts, environment)
     # -------------------------------------------------------------------------
 
     # -------------------------------------------------------------------------
     # purge_accounts()
     # removes all transactions of all agents with amount of zero
+    # every agent's ledger is compacted in a single pass, a transaction
+    # is purged from the books of both agents as each of them is visited
     # -------------------------------------------------------------------------
     def purge_accounts(self, environment):
-        super(Transaction, self).purge_accounts(environment)
+        for agent in environment.agents_generator():
+            agent.accounts.purge()
     # -------------------------------------------------------------------------
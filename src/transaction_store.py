@@ -0,0 +1,316 @@
+#!/usr/bin/env python
+# [SublimeLinter pep8-max-line-length:150]
+# -*- coding: utf-8 -*-
+
+"""
+black_rhino is a multi-agent simulator for financial network analysis
+Copyright (C) 2016 Co-Pierre Georg (co-pierre.georg@keble.ox.ac.uk)
+Pawel Fiedor (pawel@fiedor.eu)
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, version 3 of the License.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program. If not, see <http://www.gnu.org/licenses/>.
+"""
+
+try:
+    import numpy as np
+except ImportError:  # numpy is only needed for the columnar backend
+    np = None
+from src.ledger import Ledger
+
+# -------------------------------------------------------------------------
+# stored_column(name)
+# returns a property which reads and writes the given column of the
+# store the transaction is bound to, and the private attribute
+# (the name with a leading underscore) if it is not bound to any store
+# -------------------------------------------------------------------------
+
+
+def stored_column(name):
+    private = "_" + name
+
+    def getter(self):
+        if self.store is None:
+            return getattr(self, private)
+        return self.store.table[name][self.row].item()
+
+    def setter(self, value):
+        if self.store is None:
+            setattr(self, private, value)
+        else:
+            self.store.table[name][self.row] = value
+
+    return property(getter, setter)
+# -------------------------------------------------------------------------
+
+# ============================================================================
+#
+# class TransactionStore
+#
+# ============================================================================
+
+
+class TransactionStore(object):
+    #
+    #
+    # VARIABLES
+    #
+    #
+
+    # The store keeps the numeric columns of all transactions bound to it
+    # in one NumPy structured array, so that interest accrual and the
+    # revaluation of assets are single vectorized operations per sweep
+    # instead of Python loops over the accounts of all agents.
+    # The transactions stay the objects the rest of the code works with,
+    # but while they are bound their amount, interest, maturity and
+    # time_of_default are read from and written to their row in the table.
+    # The agents' ledgers remain the index views into the transactions,
+    # for every row we keep the codes of the ledger buckets it is booked
+    # in, so the change of the running balances made by a vectorized
+    # operation is found with a bincount before and after it.
+    dtype = [("type_", "i4"),  # code of the type of the transaction
+             ("asset", "i4"),  # code of the asset of the transaction
+             ("from_", "i4"),  # code of the originator of the transaction
+             ("to", "i4"),  # code of the recipient of the transaction
+             ("amount", "f8"),
+             ("interest", "f8"),
+             ("maturity", "i8"),
+             ("time_of_default", "i8")]
+    columns = ("amount", "interest", "maturity", "time_of_default")  # columns backing the properties of the transactions
+    max_buckets = 2 * len(Ledger.indexed_patterns)  # the indexed patterns in each of the two ledgers
+
+    table = None  # the structured array with one row per transaction
+    active = None  # whether the row holds a transaction
+    buckets = None  # codes of the ledger buckets each row is booked in, -1 if unused
+    transactions = []  # row -> transaction
+    free_rows = []  # rows which can be reused
+    codes = {}  # "type_", "asset", "agent" -> dictionary of value -> code
+    bucket_codes = {}  # (id(ledger), key) -> code of the bucket
+    bucket_ledgers = []  # code of the bucket -> (ledger, key)
+    num_bookings = 0  # number of ledger entries of the bound transactions
+
+    #
+    #
+    # CODE
+    #
+    #
+
+    # -------------------------------------------------------------------------
+    # __init__(capacity)
+    # the table grows by doubling once the capacity is used up
+    # -------------------------------------------------------------------------
+    def __init__(self, capacity=1024):
+        if np is None:
+            raise ImportError("The columnar transaction store requires numpy.")
+        self.table = np.zeros(capacity, dtype=self.dtype)
+        self.active = np.zeros(capacity, dtype=bool)
+        self.buckets = np.full((capacity, self.max_buckets), -1, dtype=np.int64)
+        self.transactions = [None] * capacity
+        self.free_rows = list(range(capacity - 1, -1, -1))
+        self.codes = {"type_": {}, "asset": {}, "agent": {}}
+        self.bucket_codes = {}
+        self.bucket_ledgers = []
+        self.num_bookings = 0
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # __len__
+    # returns the number of transactions bound to the store
+    # -------------------------------------------------------------------------
+    def __len__(self):
+        return len(self.transactions) - len(self.free_rows)
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # code(kind, value)
+    # returns the integer code of a type, asset or agent identifier
+    # -------------------------------------------------------------------------
+    def code(self, kind, value):
+        codes = self.codes[kind]
+        if value not in codes:
+            codes[value] = len(codes)
+        return codes[value]
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # bucket_code(ledger, key)
+    # returns the code of the bucket under key in the given ledger
+    # -------------------------------------------------------------------------
+    def bucket_code(self, ledger, key):
+        if (id(ledger), key) not in self.bucket_codes:
+            self.bucket_codes[(id(ledger), key)] = len(self.bucket_ledgers)
+            self.bucket_ledgers.append((ledger, key))
+        return self.bucket_codes[(id(ledger), key)]
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # grow()
+    # doubles the capacity of the store
+    # -------------------------------------------------------------------------
+    def grow(self):
+        capacity = len(self.transactions)
+        self.table = np.concatenate([self.table, np.zeros(capacity, dtype=self.dtype)])
+        self.active = np.concatenate([self.active, np.zeros(capacity, dtype=bool)])
+        self.buckets = np.concatenate([self.buckets, np.full((capacity, self.max_buckets), -1, dtype=np.int64)])
+        self.transactions.extend([None] * capacity)
+        self.free_rows.extend(range(2 * capacity - 1, capacity - 1, -1))
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # bind(transaction)
+    # moves the numeric values of the transaction into a row of the table
+    # the transaction needs to be on the books of its agents already
+    # -------------------------------------------------------------------------
+    def bind(self, transaction):
+        if transaction.store is self:
+            return transaction.row
+        if transaction.store is not None:
+            transaction.store.unbind(transaction)
+        if len(self.free_rows) == 0:
+            self.grow()
+        row = self.free_rows.pop()
+        values = [getattr(transaction, column) for column in self.columns]
+        self.table[row] = (self.code("type_", transaction.type_), self.code("asset", transaction.asset),
+                           self.code("agent", getattr(transaction.from_, "identifier", transaction.from_)),
+                           self.code("agent", getattr(transaction.to, "identifier", transaction.to)),
+                           values[0], values[1], values[2], values[3])
+        self.active[row] = True
+        position = 0
+        for ledger in transaction.get_ledgers():
+            for key in ledger.index_keys(transaction):
+                self.buckets[row, position] = self.bucket_code(ledger, key)
+                position = position + 1
+            self.num_bookings = self.num_bookings + 1
+        self.transactions[row] = transaction
+        transaction.store = self
+        transaction.row = row
+        return row
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # unbind(transaction)
+    # moves the numeric values back to the transaction and frees its row
+    # -------------------------------------------------------------------------
+    def unbind(self, transaction):
+        if transaction.store is not self:
+            return
+        row = transaction.row
+        values = [self.table[column][row].item() for column in self.columns]
+        transaction.store = None
+        transaction.row = -1
+        for column, value in zip(self.columns, values):
+            setattr(transaction, "_" + column, value)
+        self.num_bookings = self.num_bookings - int((self.buckets[row] >= 0).sum()) // len(Ledger.indexed_patterns)
+        self.active[row] = False
+        self.buckets[row] = -1
+        self.transactions[row] = None
+        self.free_rows.append(row)
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # sync(environment)
+    # binds all transactions on the books of the agents which are not bound
+    # yet, e.g. the ones read from the config files, if the number of
+    # ledger entries matches the bound ones there is nothing to do
+    # -------------------------------------------------------------------------
+    def sync(self, environment):
+        bookings = 0
+        for agent in environment.agents_generator():
+            bookings = bookings + len(agent.accounts)
+        if bookings == self.num_bookings:
+            return
+        for agent in environment.agents_generator():
+            for transaction in agent.accounts:
+                if transaction.store is not self:
+                    self.bind(transaction)
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # bucket_sums()
+    # returns the sums of the amounts of the bound rows in every bucket
+    # -------------------------------------------------------------------------
+    def bucket_sums(self):
+        booked = self.buckets >= 0
+        amounts = np.broadcast_to(self.table["amount"][:, None], self.buckets.shape)
+        return np.bincount(self.buckets[booked], weights=amounts[booked], minlength=len(self.bucket_ledgers))
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # refresh_balances(before)
+    # adds to the running balances of the ledgers the change of the sums
+    # of the bound rows since before (as returned by bucket_sums), so the
+    # transactions in the buckets which are not bound are kept
+    # -------------------------------------------------------------------------
+    def refresh_balances(self, before):
+        changes = self.bucket_sums() - before
+        for code in np.flatnonzero(changes):
+            ledger, key = self.bucket_ledgers[code]
+            if key in ledger.balances:
+                ledger.balances[key] = ledger.balances[key] + float(changes[code])
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # accrue_interests()
+    # adds the interest to the amount of every bound transaction
+    # -------------------------------------------------------------------------
+    def accrue_interests(self):
+        active = self.active
+        amounts = self.table["amount"]
+        before = self.bucket_sums()
+        amounts[active] = amounts[active] + amounts[active] * self.table["interest"][active]
+        self.refresh_balances(before)
+        self.refresh_edges(active & (self.table["interest"] != 0.0))
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # revalue(type_, returns, holders)
+    # multiplies the amount of transactions of the given type by one plus
+    # the returns of their asset, returns is a dictionary asset -> return
+    # if holders are given only transactions with one of them are revalued,
+    # and a transaction between two of them is revalued once for each,
+    # as the loop over the holders' accounts in the updater does
+    # -------------------------------------------------------------------------
+    def revalue(self, type_, returns, holders=None):
+        if type_ not in self.codes["type_"]:
+            return
+        mask = self.active & (self.table["type_"] == self.codes["type_"][type_])
+        twice = None
+        if holders is not None:
+            codes = [self.code("agent", getattr(holder, "identifier", holder)) for holder in holders]
+            from_held = np.isin(self.table["from_"], codes)
+            to_held = np.isin(self.table["to"], codes)
+            twice = mask & from_held & to_held & (self.table["from_"] != self.table["to"])
+            mask = mask & (from_held | to_held)
+        factors = np.ones(len(self.codes["asset"]))
+        for asset, value in returns.items():
+            if asset in self.codes["asset"]:
+                factors[self.codes["asset"][asset]] = 1.0 + value
+        amounts = self.table["amount"]
+        before = self.bucket_sums()
+        amounts[mask] = amounts[mask] * factors[self.table["asset"][mask]]
+        if twice is not None:
+            amounts[twice] = amounts[twice] * factors[self.table["asset"][twice]]
+        self.refresh_balances(before)
+        self.refresh_edges(mask)
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # refresh_edges(mask)
+    # the vectorized operations bypass the amount setter of the transactions,
+    # so we pass the new amounts of the rows in the mask on to the
+    # incremental network the transactions are edges of
+    # -------------------------------------------------------------------------
+    def refresh_edges(self, mask):
+        for row in np.flatnonzero(mask):
+            transaction = self.transactions[row]
+            if transaction is not None and transaction.network is not None:
+                transaction.network.set_amount(transaction)
+    # -------------------------------------------------------------------------
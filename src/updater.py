@@ -21,8 +21,10 @@ along with this program. If not, see <http://www.gnu.org/licenses/>.
 """
 
 from abm_template.src.basemodel import BaseModel
-import random
 import logging
+from src.rng import choice, shuffle
+from src.settlement import Settlement
+from src.trace import Trace
 from src.transaction import Transaction
 
 # -------------------------------------------------------------------------
@@ -40,6 +42,10 @@ class Updater(BaseModel):
     identifier = ""
     model_parameters = {}
     interactions = None
+    clearing_pool = None  # worker processes for the parallel tatonnement, kept for the whole run
+    labour_market = None  # the market of sell_labour, kept for the whole run for its price history
+    profiler = None  # records the phases of do_update if the static parameter profile_updates is set to 1
+    trace = None  # reports the sweeps and the trades, see src/trace.py
 
     #
     #
@@ -73,6 +79,27 @@ class Updater(BaseModel):
     # -------------------------------------------------------------------------
     def __init__(self,  environment):
         self.environment = environment
+        self.clearing_pool = None
+        self.labour_market = None
+        self.profiler = None
+        if environment.static_parameters.get("profile_updates", 0.0) == 1.0:
+            from src.profiler import Profiler
+            self.profiler = Profiler()
+        self.trace = Trace.from_environment(environment)
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # close()
+    # stops the worker processes of the parallel tatonnement, if any
+    # and closes the trace file
+    # -------------------------------------------------------------------------
+    def close(self):
+        if self.clearing_pool is not None:
+            self.clearing_pool.close()
+            self.clearing_pool = None
+        if self.profiler is not None:
+            self.profiler.close()
+        self.trace.close()
     # -------------------------------------------------------------------------
 
     # -------------------------------------------------------------------------
@@ -82,24 +109,66 @@ class Updater(BaseModel):
         # As a first step, we accrue all interest over the transactions
         # Thus, important to notice to keep 0 as interest by default
         # Unless transaction should carry interest
-        self.accrue_interests(environment, time)
+        self.do_phase("accrue_interests", self.accrue_interests, environment, time)
         # The households sell labour to firms
-        self.sell_labour(environment, time)
+        self.do_phase("sell_labour", self.sell_labour, environment, time)
         # The firms sell goods to households
-        self.consume_rationed(environment, time)
+        self.do_phase("consume_rationed", self.consume_rationed, environment, time)
         # We net deposits and loans
-        self.net_loans_deposits(environment, time)
+        self.do_phase("net_loans_deposits", self.net_loans_deposits, environment, time)
         # We remove the perishable transactions
-        self.remove_perishable(environment, time)
+        self.do_phase("remove_perishable", self.remove_perishable, environment, time)
         # And add capital to balance the books
-        self.capitalise(environment, time)
+        self.do_phase("capitalise", self.capitalise, environment, time)
         # Investing of the banks
-        self.invest(environment, time)
+        self.do_phase("invest", self.invest, environment, time)
         # Purging accounts at every step just in case
+        self.do_phase("purge_accounts", self.purge_accounts, environment, time)
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # do_phase(name, phase, environment, time)
+    # runs one phase of do_update, through the profiler if there is one
+    # -------------------------------------------------------------------------
+    def do_phase(self, name, phase, environment, time):
+        if self.profiler is None:
+            phase(environment, time)
+        else:
+            self.profiler.run(name, phase, environment, time)
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # purge_accounts(environment, time)
+    # removes the transactions with amount of zero from all the books
+    # -------------------------------------------------------------------------
+    def purge_accounts(self, environment, time):
         transaction = Transaction()
         transaction.purge_accounts(environment)
     # -------------------------------------------------------------------------
 
+    # -------------------------------------------------------------------------
+    # ration(environment, market, for_rationing)
+    # The proportional rationing used by the updater, done by the linear
+    # merge pass of the market if the static parameter linear_rationing
+    # is set to 1, and by the pairwise rationing otherwise
+    # -------------------------------------------------------------------------
+    def ration(self, environment, market, for_rationing):
+        if environment.static_parameters.get("linear_rationing", 0.0) == 1.0:
+            return market.rationing_linear(for_rationing, True)
+        return market.rationing_proportional(for_rationing)
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # settlement(environment)
+    # The buffer the flows of a market round go through, the flows are
+    # netted and posted as one transaction per (type, from, to, asset) at
+    # the end of the round if the static parameter net_settlement is set
+    # to 1, and posted one by one as they come otherwise
+    # -------------------------------------------------------------------------
+    def settlement(self, environment):
+        return Settlement(environment, environment.static_parameters.get("net_settlement", 0.0) == 1.0)
+    # -------------------------------------------------------------------------
+
     # -------------------------------------------------------------------------
     # accrue_interests(environment, time)
     # This method accrues interest on all transaction
@@ -114,17 +183,25 @@ class Updater(BaseModel):
         # And returns for assets
         # First, we update the current step returns
         environment.update_asset_returns()
+        # With the columnar store all investments of the banks are
+        # revalued at once
+        if environment.transaction_store is not None:
+            returns = {}
+            for asset_key in environment.assets:
+                returns[asset_key] = environment.assets[asset_key][2]
+            environment.transaction_store.revalue("investment", returns, environment.banks)
+            if environment.aggregates is not None:
+                environment.aggregates.refresh()
+            logging.info("  interest accrued on step: %s",  time)
+            return
         # Then update the books of each bank
         for bank in environment.banks:
             # We go asset by asset
             for asset_key in environment.assets:
-                # And find investment transactions
-                for tranx in bank.accounts:
-                    if tranx.type_ == "investment":
-                        # For the specific asset
-                        if tranx.asset == asset_key:
-                            # And amend its value by the current returns
-                            tranx.set_amount(tranx.amount * (1 + environment.assets[asset_key][2]), environment)
+                # And find investment transactions for the specific asset
+                for tranx in bank.accounts.filter("investment", asset=asset_key):
+                    # And amend its value by the current returns
+                    tranx.set_amount(tranx.amount * (1 + environment.assets[asset_key][2]), environment)
         # Then, banks give their revenue as dividends to households
         # which own the banks in the model
         # for now we have them given out through ownership weights
@@ -195,13 +272,57 @@ class Updater(BaseModel):
         # Import market clearing class
         from market import Market
         # Put the appropriate settings, i.e. desired identifier
-        market = Market("market")
+        # the market is kept between the sweeps with its price history
+        if self.labour_market is None:
+            self.labour_market = Market("market", environment.rng)
+        market = self.labour_market
+        # With warm starts the search starts from the last equilibrium price
+        # and with a step given by the recent volatility of the price
+        step = 1.0
+        resolution = 0.01
+        if environment.static_parameters.get("warm_start_tatonnement", 0.0) == 1.0:
+            starting_price = market.warm_start(starting_price)
+            step = market.initial_step(step, 1.0)
+            resolution = market.initial_step(resolution, 0.5)
         # And we find the market price of labour
         # given supply and demand of the agents
         # and tolerance of error, resolution of search
         # and amplification factor for exponential search
-        price = market.tatonnement(sellers, buyers, starting_price, 0.001, 0.01, 1.1)
+        parallel = environment.static_parameters.get("parallel_tatonnement", 0.0) == 1.0
+        vectorized = parallel or environment.static_parameters.get("vectorized_tatonnement", 0.0) == 1.0
+        if parallel and self.clearing_pool is None:
+            from src.clearing_pool import can_start_workers
+            if not can_start_workers():
+                # e.g. in a worker of MonteCarlo, which is daemonic and
+                # can't start processes of its own, the vectorized search
+                # is done in this process instead
+                logging.info("  parallel tatonnement unavailable in a daemonic process on step: %s",  time)
+                parallel = False
+        if vectorized:
+            # the supply and demand are evaluated for all households
+            # and all firms at once, and the price found by bracketing
+            from src.household import Household
+            from src.firm import Firm
+            supply_curves = [market.curve(Household.supply_of_labour_solow_vectorized,
+                                          [agent.supply_of_labour_solow_parameters() for agent in environment.households])]
+            demand_curves = [market.curve(Firm.demand_for_labour_solow_vectorized,
+                                          [agent.demand_for_labour_solow_parameters() for agent in environment.firms])]
+            if parallel:
+                # the worker processes are started on the first sweep
+                # and reused on the following ones
+                if self.clearing_pool is None:
+                    from src.clearing_pool import ClearingPool
+                    processes = int(environment.static_parameters.get("clearing_processes", 0.0))
+                    self.clearing_pool = ClearingPool(processes if processes > 0 else None)
+                price = market.tatonnement_parallel(supply_curves, demand_curves, starting_price, 0.001, self.clearing_pool, step)
+            else:
+                price = market.tatonnement_vectorized(supply_curves, demand_curves, starting_price, 0.001, step)
+        else:
+            price = market.tatonnement(sellers, buyers, starting_price, 0.001, resolution, 1.1)
         environment.variable_parameters["price_of_labour"] = price
+        # The cost of the search is kept in the iteration_history of the labour market,
+        # variable_parameters only holds the ranges of the parameters and the prices
+        logging.info("  price of labour %s found in %s iterations on step: %s",  price, market.iterations, time)
         # now we use rationing to find the actual transactions between agents
         for_rationing = []
         for household in environment.households:
@@ -210,30 +331,32 @@ class Updater(BaseModel):
             for_rationing.append([firm, -firm.demand_for_labour_solow(price)])
         # And we find the rationing, ie the amounts
         # of goods sold between pairs of agents
-        rationed = market.rationing_proportional(for_rationing)
+        rationed = self.ration(environment, market, for_rationing)
         #
         #             A (from)    L (to)
         # bank        loan        deposit
         # household   deposit     labour
         # firm        labour      loan
         #
+        settlement = self.settlement(environment)
         for ration in rationed:
             # The labour is an asset (production factor) for the firm
             # and a liability (promise to work) for the household
-            environment.new_transaction("labour", "",  ration[1].identifier, ration[0].identifier,
-                                        ration[2], 0,  0, -1)
-            random_bank = random.choice(environment.banks)
+            settlement.add("labour", "",  ration[1].identifier, ration[0].identifier,
+                           ration[2], 0,  0, -1)
+            random_bank = choice(environment.rng, environment.banks)
             # Deposit is a liability of the bank
             # and an asset of the household
-            environment.new_transaction("deposits", "",  ration[0].identifier, random_bank.identifier,
-                                        ration[2]*price, random_bank.interest_rate_deposits,  0, -1)
+            settlement.add("deposits", "",  ration[0].identifier, random_bank.identifier,
+                           ration[2]*price, random_bank.interest_rate_deposits,  0, -1)
             # Loan is an asset of the bank
             # and a liability of the firm
-            environment.new_transaction("loans", "",  random_bank.identifier, ration[1].identifier,
-                                        ration[2]*price, random_bank.interest_rate_loans,  0, -1)
-            # We print the action of selling to the screen
-            print("%s sold %d units of labour at a price %f to %s at time %d.") % (ration[0].identifier,
-                                                                                   ration[2], price, ration[1].identifier, time)
+            settlement.add("loans", "",  random_bank.identifier, ration[1].identifier,
+                           ration[2]*price, random_bank.interest_rate_loans,  0, -1)
+            # We trace the sale, the check keeps the disabled trace free
+            if self.trace.trades:
+                self.trace.trade("labour", ration[0].identifier, ration[1].identifier, ration[2], price, time)
+        settlement.post()
         logging.info("  labour sold to firms on step: %s",  time)
         # Keep on the log with the number of step, for debugging mostly
     # -------------------------------------------------------------------------
@@ -263,14 +386,8 @@ class Updater(BaseModel):
             # Firms produce based on their capital, for generality
             # we use their net capital, as in their capital stock
             # minus the capital owned of other agents
-            capital = 0.0
-            for tranx in firm.accounts:
-                # This is own capital stock
-                if tranx.type_ == "capital" and tranx.from_ == firm:
-                    capital = capital + tranx.amount
-                # And here is the ownership of other agents' stock
-                if tranx.type_ == "capital" and tranx.to == firm:
-                    capital = capital - tranx.amount
+            # This is own capital stock less the ownership of other agents' stock
+            capital = firm.accounts.get_net_balance("capital", firm)
             # We find the amount produced through the Cobb-Douglas function
             amount = helper.cobb_douglas(firm.get_account("labour"), capital,
                                          firm.total_factor_productivity, firm.labour_elasticity, firm.capital_elasticity)*price
@@ -283,14 +400,9 @@ class Updater(BaseModel):
         # households want to spend by price to get the demand
         for household in environment.households:
             demand = 0.0
-            wealth = 0.0
             # For generality we calculate net wealth for this, that is the
             # amount of deposits they carry minus the amount of loans
-            for tranx in household.accounts:
-                if tranx.type_ == "deposits" and tranx.from_ == household:
-                    wealth = wealth + tranx.amount
-                if tranx.type_ == "loans" and tranx.to == household:
-                    wealth = wealth - tranx.amount
+            wealth = household.accounts.get_balance("deposits", from_=household) - household.accounts.get_balance("loans", to=household)
             # Then the demand is determined by the agent's propensity to save
             # and the wealth calculated above
             demand = -((wealth * (1 - household.propensity_to_save)) / price)
@@ -303,13 +415,14 @@ class Updater(BaseModel):
         # This does not matter for rationing
         # But in principle we need to initialize
         # with these values
-        market = Market("market")
+        market = Market("market", environment.rng)
         # And we find the rationing, ie the amounts
         # of goods sold between pairs of agents
         # We find the actual trades
-        rationed = market.rationing_proportional(for_rationing)
+        rationed = self.ration(environment, market, for_rationing)
         # Then we go through the rationing
         # and move the goods and cash appropriately
+        settlement = self.settlement(environment)
         for ration in rationed:
             #
             #             A (from)    L (to)
@@ -318,38 +431,38 @@ class Updater(BaseModel):
             # firm        deposit     goods
             #
             # TODO: in the new version this may be irrelevant
-            environment.new_transaction("goods", "",  ration[1].identifier, ration[0].identifier,
-                                        ration[2], 0,  0, -1)
+            settlement.add("goods", "",  ration[1].identifier, ration[0].identifier,
+                           ration[2], 0,  0, -1)
             # The below makes sure the allocations of loans are correct
             # That is the banks don't allow overdraft for buying
             # consumption goods by the households
             to_finance = ration[2]*price
             itrange = list(range(0, len(environment.banks)))
             # And randomise this list for the purposes of iterating randomly
-            random.shuffle(itrange)
+            shuffle(environment.rng, itrange)
             # And we iterate over the agents randomly by proxy of iterating
             # through their places on the list [agents]
             for i in itrange:
                 current_bank = self.environment.banks[i]
                 # We find how much in deposits the household has
-                deposits_available = 0.0
-                for tranx in ration[1].accounts:
-                    if tranx.type_ == "deposits" and tranx.to == current_bank:
-                        deposits_available = deposits_available + tranx.amount
-                    # This should be irrelevant, but for completeness:
-                    if tranx.type_ == "loans" and tranx.from_ == current_bank:
-                        deposits_available = deposits_available - tranx.amount
+                # The loans should be irrelevant, but for completeness we subtract them
+                # together with the flows of this round which are not posted yet
+                deposits_available = ration[1].accounts.get_balance("deposits", to=current_bank) - \
+                    ration[1].accounts.get_balance("loans", from_=current_bank) + \
+                    settlement.pending("deposits", ration[1].identifier, current_bank.identifier) - \
+                    settlement.pending("loans", current_bank.identifier, ration[1].identifier)
                 # We find the amount of deposits the household can spend for this particular bank
                 current_amount = min(to_finance, deposits_available)
                 # And add the appropriate transactions
-                environment.new_transaction("deposits", "",  ration[0].identifier, current_bank.identifier,
-                                            current_amount, current_bank.interest_rate_deposits,  0, -1)
-                environment.new_transaction("loans", "",  current_bank.identifier, ration[1].identifier,
-                                            current_amount, current_bank.interest_rate_loans,  0, -1)
+                settlement.add("deposits", "",  ration[0].identifier, current_bank.identifier,
+                               current_amount, current_bank.interest_rate_deposits,  0, -1)
+                settlement.add("loans", "",  current_bank.identifier, ration[1].identifier,
+                               current_amount, current_bank.interest_rate_loans,  0, -1)
                 to_finance = to_finance - current_amount
-            # We print the action of selling to the screen
-            print("%s sold %d units of goods at a price %f to %s at time %d.") % (ration[0].identifier,
-                                                                                  ration[2], price, ration[1].identifier, time)
+            # We trace the sale, the check keeps the disabled trace free
+            if self.trace.trades:
+                self.trace.trade("goods", ration[0].identifier, ration[1].identifier, ration[2], price, time)
+        settlement.post()
         logging.info("  goods consumed on step: %s",  time)
         # Keep on the log with the number of step, for debugging mostly
     # -------------------------------------------------------------------------
@@ -368,25 +481,11 @@ class Updater(BaseModel):
             # And first go through the firms
             for firm in environment.firms:
                 # Finding what their balance of deposits (+) and loans (-) is
-                balance = 0.0
+                # that is deposits from the firm to the bank
+                # and loans from the bank to the firm
+                balance = firm.accounts.get_balance("deposits", to=bank) - firm.accounts.get_balance("loans", from_=bank)
                 # And mark all the loan and deposits we account for to be deleted
-                to_delete = []
-                # We go through the firm's accounts
-                for tranx in firm.accounts:
-                    # And find deposits from the firm to the bank
-                    if tranx.type_ == "deposits":
-                        if tranx.to == bank:
-                            # If we find one we append the balance
-                            balance = balance + tranx.amount
-                            # And mark the transaction for deletion
-                            to_delete.append(tranx)
-                    # And find loans from the bank to the firm
-                    if tranx.type_ == "loans":
-                        if tranx.from_ == bank:
-                            # If we find one we append the balance
-                            balance = balance - tranx.amount
-                            # And mark the transaction for deletio
-                            to_delete.append(tranx)
+                to_delete = firm.accounts.filter("deposits", to=bank) + firm.accounts.filter("loans", from_=bank)
                 # Then we delete all market transactions
                 for tranx in to_delete:
                     tranx.remove_transaction(environment)
@@ -404,25 +503,11 @@ class Updater(BaseModel):
             # And first go through the households
             for household in environment.households:
                 # Finding what their balance of deposits (+) and loans (-) is
-                balance = 0.0
+                # that is deposits from the household to the bank
+                # and loans from the bank to the household
+                balance = household.accounts.get_balance("deposits", to=bank) - household.accounts.get_balance("loans", from_=bank)
                 # And mark all the loan and deposits we account for to be deleted
-                to_delete = []
-                # We go through the household's accounts
-                for tranx in household.accounts:
-                    # And find deposits from the household to the bank
-                    if tranx.type_ == "deposits":
-                        if tranx.to == bank:
-                            # If we find one we append the balance
-                            balance = balance + tranx.amount
-                            # And mark the transaction for deletion
-                            to_delete.append(tranx)
-                    # And find loans from the bank to the household
-                    if tranx.type_ == "loans":
-                        if tranx.from_ == bank:
-                            # If we find one we append the balance
-                            balance = balance - tranx.amount
-                            # And mark the transaction for deletion
-                            to_delete.append(tranx)
+                to_delete = household.accounts.filter("deposits", to=bank) + household.accounts.filter("loans", from_=bank)
                 # Then we delete all market transactions
                 for tranx in to_delete:
                     tranx.remove_transaction(environment)
@@ -452,42 +537,24 @@ class Updater(BaseModel):
             # We create a list of things to be removed
             # since removing things from a list
             # in a loop over this list is not a good idea
-            to_delete = []
-            # Then go through transactions
-            for tranx in firm.accounts:
-                # Append the things to delete
-                # if it's a labour
-                if tranx.type_ == "labour":
-                    to_delete.append(tranx)
-                # or goods transaction
-                if tranx.type_ == "goods":
-                    to_delete.append(tranx)
+            # these are labour and goods transactions
+            to_delete = firm.accounts.filter("labour") + firm.accounts.filter("goods")
             # And once we have them all we
-            # go through the things to delete
-            # and remove them from the books of agents
-            for tranx in to_delete:
-                tranx.remove_transaction(environment)
+            # remove them from the books of agents in one go
+            transaction = Transaction()
+            transaction.remove_transactions(to_delete, environment)
 
         # Then, remove labour, goods from households
         for household in environment.households:
             # We create a list of things to be removed
             # since removing things from a list
             # in a loop over this list is not a good idea
-            to_delete = []
-            # Then go through transactions
-            for tranx in firm.accounts:
-                # Append the things to delete
-                # if it's a labour
-                if tranx.type_ == "labour":
-                    to_delete.append(tranx)
-                # or goods transaction
-                if tranx.type_ == "goods":
-                    to_delete.append(tranx)
+            # these are labour and goods transactions
+            to_delete = household.accounts.filter("labour") + household.accounts.filter("goods")
             # And once we have them all we
-            # go through the things to delete
-            # and remove them from the books of agents
-            for tranx in to_delete:
-                tranx.remove_transaction(environment)
+            # remove them from the books of agents in one go
+            transaction = Transaction()
+            transaction.remove_transactions(to_delete, environment)
 
         # If necessary, another line for banks will be added here
 
@@ -514,27 +581,19 @@ class Updater(BaseModel):
         # ie when firm needs to sell existing  capital instead of getting new owners
         for firm in environment.firms:
             # We calculate how much capital the firm has
-            capital = 0.0
-            for tranx in firm.accounts:
-                if tranx.type_ == "capital":
-                    if tranx.from_ == firm:
-                        capital = capital + tranx.amount
-                    if tranx.to == firm:
-                        capital = capital - tranx.amount
+            capital = firm.accounts.get_net_balance("capital", firm)
             # Then find the firm's supply of capital given current books
             supply = -capital - firm.get_account("deposits") + firm.get_account("loans")
             # If there is a shortfall of capital supply
             if supply < 0.0:
-                # We go through the books
-                for tranx in firm.accounts:
-                    # And find capital transactions
-                    if tranx.type_ == "capital" and tranx.from_ == firm:
-                        # Then we sell the appropriate amount to cover the shortfall
-                        # TODO: we may want the sellout to be proportional or at least
-                        # going through books at random, though in the current model it shouldn't matter
-                        to_remove = min(-supply, tranx.amount)
-                        tranx.set_amount(tranx.amount - to_remove, environment)
-                        supply = supply + to_remove
+                # We go through the capital transactions on the books
+                for tranx in firm.accounts.filter("capital", from_=firm):
+                    # Then we sell the appropriate amount to cover the shortfall
+                    # TODO: we may want the sellout to be proportional or at least
+                    # going through books at random, though in the current model it shouldn't matter
+                    to_remove = min(-supply, tranx.amount)
+                    tranx.set_amount(tranx.amount - to_remove, environment)
+                    supply = supply + to_remove
 
         # First, we create the list that will be used for rationing
         # method from Market class, containing agents and their
@@ -545,21 +604,9 @@ class Updater(BaseModel):
         for household in environment.households:
             # We calculate the demand as the amount of wealth (deposits-loans) minus previously owned capital
             # We calculate capital by hand in case there is some reverse ownership
-            deposits = 0.0
-            loans = 0.0
-            capital = 0.0
-            for tranx in household.accounts:
-                if tranx.type_ == "deposits":
-                    if tranx.from_ == household:
-                        deposits = deposits + tranx.amount
-                if tranx.type_ == "loans":
-                    if tranx.to == household:
-                        loans = loans + tranx.amount
-                if tranx.type_ == "capital":
-                    if tranx.to == household:
-                        capital = capital + tranx.amount
-                    if tranx.from_ == household:
-                        capital = capital - tranx.amount
+            deposits = household.accounts.get_balance("deposits", from_=household)
+            loans = household.accounts.get_balance("loans", to=household)
+            capital = -household.accounts.get_net_balance("capital", household)
             # demand = household.get_account("deposits") - household.get_account("loans") - household.get_account("capital")
             demand = deposits - loans - capital
             # And we add the household together with its demand to the list
@@ -569,13 +616,7 @@ class Updater(BaseModel):
             # Supply of the firms is the opposite of the demand of the household
             # that is the loans minus issued capital claims minus deposits
             # We calculate capital by hand in case there is some reverse ownership
-            capital = 0.0
-            for tranx in firm.accounts:
-                if tranx.type_ == "capital":
-                    if tranx.from_ == firm:
-                        capital = capital + tranx.amount
-                    if tranx.to == firm:
-                        capital = capital - tranx.amount
+            capital = firm.accounts.get_net_balance("capital", firm)
             supply = -capital - firm.get_account("deposits") + firm.get_account("loans")
             # supply = -firm.get_account("capital") - firm.get_account("deposits") + firm.get_account("loans")
             # And we add the firm together with its supply to the list
@@ -583,19 +624,19 @@ class Updater(BaseModel):
 
         # We initialise the market clearing class
         from market import Market
-        market = Market("market")
+        market = Market("market", environment.rng)
 
         # We find the pairs of capital ownership transfers
         # We move the capital proportionately with respect to demand
-        rationed = market.rationing_proportional(for_rationing)
+        rationed = self.ration(environment, market, for_rationing)
 
         # We add these to the books
         for ration in rationed:
             environment.new_transaction("capital", "",  ration[0].identifier, ration[1].identifier,
                                         ration[2], 0,  0, -1)
-            # And print it to the screen for easy greping
-            print("%s sold %f worth of capital to %s at time %d.") % (ration[0].identifier,
-                                                                      ration[2], ration[1].identifier, time)
+            # And trace it, capital is traded at its book value
+            if self.trace.trades:
+                self.trace.trade("capital", ration[0].identifier, ration[1].identifier, ration[2], 1.0, time)
 
         # And net the capital transactions, so we don't accumulate
         # them over the course of the transaction
@@ -608,22 +649,13 @@ class Updater(BaseModel):
             # And then pair them with households
             for household in environment.households:
                 # We will look for the capital balance of the pair
-                balance = 0.0
-                # So we need to look through all their books
-                for tranx in household.accounts:
-                    # Find the capital transactions
-                    if tranx.type_ == "capital":
-                        # And if they are ownership of the firm's equity
-                        # We add them to the balance
-                        # And mark for deletion
-                        if tranx.from_ == firm:
-                            balance = balance + tranx.amount
-                            to_delete.append(tranx)
-                        # If they are the other way around for some reason
-                        # we would subtract them and mark for deletion
-                        elif tranx.to == firm:
-                            balance = balance - tranx.amount
-                            to_delete.append(tranx)
+                # Capital transactions which are ownership of the firm's equity
+                # are added to the balance, if they are the other way around
+                # for some reason we subtract them
+                balance = household.accounts.get_balance("capital", from_=firm) - household.accounts.get_balance("capital", to=firm)
+                # And mark all of them for deletion
+                to_delete.extend(household.accounts.filter("capital", from_=firm))
+                to_delete.extend(household.accounts.filter("capital", to=firm))
                 # We create a new transactions from the balance
                 # depending on what the value of the balance is
                 if balance > 0.0:
@@ -633,8 +665,8 @@ class Updater(BaseModel):
                     environment.new_transaction("capital", "",  household.identifier, firm.identifier,
                                                 balance, 0,  0, -1)
         # And at the end, we remove all the transactions that we marked before
-        for tranx in to_delete:
-            tranx.remove_transaction(environment)
+        transaction = Transaction()
+        transaction.remove_transactions(to_delete, environment)
 
         logging.info("  capitalised on step: %s",  time)
         # Keep on the log with the number of step, for debugging mostly
@@ -667,9 +699,8 @@ class Updater(BaseModel):
                                             investment_volume, environment.central_bank[0].interest_rate_cb_loans,  0, -1)
             # If we have a prior central bank loan we just adjust the amount
             else:
-                for tranx in bank.accounts:
-                    if tranx.type_ == "cb_loans":
-                        tranx.set_amount(investment_volume, environment)
+                for tranx in bank.accounts.filter("cb_loans"):
+                    tranx.set_amount(investment_volume, environment)
 
             # Then we add or remove investments
             # We do it for every investment class, for now we have 1/n portfolio
@@ -678,22 +709,15 @@ class Updater(BaseModel):
                 one_investment_volume = investment_volume / len(environment.assets)
                 # We find if there are already transactions
                 # We will want one transaction of one type of investment also, as above
-                number_of_asset_transactions = 0
-                # We go through the books
-                for tranx in bank.accounts:
-                    if tranx.asset == asset_key:
-                        # And find the transactions that match
-                        number_of_asset_transactions = number_of_asset_transactions + 1
+                number_of_asset_transactions = bank.accounts.get_num_transactions(asset=asset_key)
                 # If the bank doesn't yet have an investment we create one
                 if number_of_asset_transactions == 0:
                     environment.new_transaction("investment", asset_key,  bank.identifier, bank.identifier,
                                                 one_investment_volume, 0,  0, -1)
                 # If they do have one we just amend the amount
                 elif number_of_asset_transactions == 1:
-                    for tranx in bank.accounts:
-                        if tranx.type_ == "investment":
-                            if tranx.asset == asset_key:
-                                tranx.set_amount(one_investment_volume, environment)
+                    for tranx in bank.accounts.filter("investment", asset=asset_key):
+                        tranx.set_amount(one_investment_volume, environment)
                 # If there are multiple investments in one asset we raise an error
                 else:
                     raise LookupError("More than one transaction of the same asset.")
@@ -0,0 +1,236 @@
+#!/usr/bin/env python
+# [SublimeLinter pep8-max-line-length:150]
+# -*- coding: utf-8 -*-
+
+"""
+black_rhino is a multi-agent simulator for financial network analysis
+Copyright (C) 2016 Co-Pierre Georg (co-pierre.georg@keble.ox.ac.uk)
+Pawel Fiedor (pawel@fiedor.eu)
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, version 3 of the License.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program. If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import logging
+from src.helper import Helper
+
+# -------------------------------------------------------------------------
+#  class Tests
+# -------------------------------------------------------------------------
+
+
+class TestsAgentLoader(object):
+    #
+    # VARIABLES
+    #
+
+    #
+    # METHODS
+    #
+
+    # -------------------------------------------------------------------------
+    # __init__
+    # -------------------------------------------------------------------------
+    def __init__(self):
+        pass
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # print_info(text)
+    # -------------------------------------------------------------------------
+    def print_info(self, text):
+        print('##############################################################################\n')
+        print(text)
+        print('##############################################################################\n')
+    # -------------------------------------------------------------------------
+
+# -------------------------------------------------------------------------
+#  TESTS FOR AGENT_LOADER.PY
+# -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # agent_loader__parse_agent_file
+    # -------------------------------------------------------------------------
+
+    def agent_loader__parse_agent_file(self, args):
+        import os
+        from src.environment import Environment
+        from src.agent_loader import parse_agent_file, parse_agent_directory
+
+        text = "This test checks agent_loader.parse_agent_file \n"
+        self.print_info(text)
+        #
+        # INITIALIZATION
+        #
+        environment_directory = str(args[0])
+        identifier = str(args[1])
+        log_directory = str(args[2])
+
+        # Configure logging parameters so we get output while the program runs
+        logging.basicConfig(format='%(asctime)s %(message)s', datefmt='%m/%d/%Y %H:%M:%S',
+                            filename=log_directory + identifier + ".log", level=logging.INFO)
+        logging.info('START logging for test agent_loader__parse_agent_file in run: %s',
+                     environment_directory + identifier + ".xml")
+
+        # Construct household filename
+        environment = Environment(environment_directory,  identifier)
+
+        #
+        # TESTING
+        #
+
+        print("Parsing the config file of a bank in one pass")
+        identifier, parameters, transactions = parse_agent_file("tests/agents/banks/bank_for_tests.xml")
+        print("Identifier (should be bank_test_config_id):")
+        print(identifier)
+        print("Parameters:")
+        print(parameters)
+        print("Transactions:")
+        print(transactions)
+
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # agent_loader__parse_agent_directory
+    # -------------------------------------------------------------------------
+
+    def agent_loader__parse_agent_directory(self, args):
+        import os
+        from src.environment import Environment
+        from src.agent_loader import parse_agent_file, parse_agent_directory
+
+        text = "This test checks agent_loader.parse_agent_directory \n"
+        self.print_info(text)
+        #
+        # INITIALIZATION
+        #
+        environment_directory = str(args[0])
+        identifier = str(args[1])
+        log_directory = str(args[2])
+
+        # Configure logging parameters so we get output while the program runs
+        logging.basicConfig(format='%(asctime)s %(message)s', datefmt='%m/%d/%Y %H:%M:%S',
+                            filename=log_directory + identifier + ".log", level=logging.INFO)
+        logging.info('START logging for test agent_loader__parse_agent_directory in run: %s',
+                     environment_directory + identifier + ".xml")
+
+        # Construct household filename
+        environment = Environment(environment_directory,  identifier)
+
+        #
+        # TESTING
+        #
+
+        print("Parsing the households' directory sequentially and with two processes")
+        records = parse_agent_directory("tests/agents/households/")
+        parallel_records = parse_agent_directory("tests/agents/households/", processes=2)
+        print("Number of records (should be 3):")
+        print(len(records))
+        print("Are the records the same (should be True):")
+        print(records == parallel_records)
+
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # agent_loader__parse_in_worker
+    # -------------------------------------------------------------------------
+
+    def agent_loader__parse_in_worker(self, args):
+        import os
+        from src.environment import Environment
+        import multiprocessing
+        import shutil
+        from src.agent_loader import parse_agent_file, parse_agent_directory
+
+        text = "This test checks agent_loader.parse_agent_directory in a worker process \n"
+        self.print_info(text)
+        #
+        # INITIALIZATION
+        #
+        environment_directory = str(args[0])
+        identifier = str(args[1])
+        log_directory = str(args[2])
+
+        # Configure logging parameters so we get output while the program runs
+        logging.basicConfig(format='%(asctime)s %(message)s', datefmt='%m/%d/%Y %H:%M:%S',
+                            filename=log_directory + identifier + ".log", level=logging.INFO)
+        logging.info('START logging for test agent_loader__parse_in_worker in run: %s',
+                     environment_directory + identifier + ".xml")
+
+        # Construct household filename
+        environment = Environment(environment_directory,  identifier)
+
+        #
+        # TESTING
+        #
+
+        print("Parsing the households' directory with two processes in a daemonic worker of a process pool")
+        records = parse_agent_directory("tests/agents/households/")
+        worker_pool = multiprocessing.Pool(1)
+        worker_records = worker_pool.apply(parse_agent_directory, ("tests/agents/households/", None, 2))
+        worker_pool.close()
+        worker_pool.join()
+        print("Are the records the same as parsed sequentially (should be True):")
+        print(records == worker_records)
+        print("Parsing a directory with a file which can't be parsed")
+        directory = log_directory + "agent_loader/"
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        with open(directory + "broken.xml", "w") as broken_file:
+            broken_file.write("<household identifier='broken'><parameter name='labour'")
+        print("The record of the file, an agent without transactions as before the loader (should be ('broken', {}, [])):")
+        print(parse_agent_directory(directory))
+        shutil.rmtree(directory)
+
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # agent_loader__load_agents_from_files
+    # -------------------------------------------------------------------------
+
+    def agent_loader__load_agents_from_files(self, args):
+        import os
+        from src.environment import Environment
+
+        text = "This test checks environment.load_agents_from_files \n"
+        self.print_info(text)
+        #
+        # INITIALIZATION
+        #
+        environment_directory = str(args[0])
+        identifier = str(args[1])
+        log_directory = str(args[2])
+
+        # Configure logging parameters so we get output while the program runs
+        logging.basicConfig(format='%(asctime)s %(message)s', datefmt='%m/%d/%Y %H:%M:%S',
+                            filename=log_directory + identifier + ".log", level=logging.INFO)
+        logging.info('START logging for test agent_loader__load_agents_from_files in run: %s',
+                     environment_directory + identifier + ".xml")
+
+        # Construct household filename
+        environment = Environment(environment_directory,  identifier)
+
+        #
+        # TESTING
+        #
+
+        print("Loading the banks again with load_agents_from_files")
+        from src.bank import Bank
+        listing = os.listdir(environment.bank_directory)
+        records = environment.load_agents_from_files(environment.bank_directory, listing, environment.banks, Bank)
+        print("Number of banks (should be 3):")
+        print(len(environment.banks))
+        print("Adding the transactions found in the records")
+        environment.add_transactions_from_records(records)
+        print(environment.get_agent_by_id("bank_test_config_id"))
+
+    # -------------------------------------------------------------------------
@@ -0,0 +1,189 @@
+#!/usr/bin/env python
+# [SublimeLinter pep8-max-line-length:150]
+# -*- coding: utf-8 -*-
+
+"""
+black_rhino is a multi-agent simulator for financial network analysis
+Copyright (C) 2016 Co-Pierre Georg (co-pierre.georg@keble.ox.ac.uk)
+Pawel Fiedor (pawel@fiedor.eu)
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, version 3 of the License.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program. If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import logging
+from src.helper import Helper
+
+# -------------------------------------------------------------------------
+#  class Tests
+# -------------------------------------------------------------------------
+
+
+class TestsAggregates(object):
+    #
+    # VARIABLES
+    #
+
+    #
+    # METHODS
+    #
+
+    # -------------------------------------------------------------------------
+    # __init__
+    # -------------------------------------------------------------------------
+    def __init__(self):
+        pass
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # print_info(text)
+    # -------------------------------------------------------------------------
+    def print_info(self, text):
+        print('##############################################################################\n')
+        print(text)
+        print('##############################################################################\n')
+    # -------------------------------------------------------------------------
+
+# -------------------------------------------------------------------------
+#  TESTS FOR AGGREGATES
+# -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # aggregates__add_transaction
+    # -------------------------------------------------------------------------
+
+    def aggregates__add_transaction(self, args):
+        import os
+        from src.bank import Bank
+        from src.household import Household
+        from src.firm import Firm
+        from src.environment import Environment
+        from src.transaction import Transaction
+        from src.aggregates import Aggregates
+
+        text = "This test checks aggregates.add_transaction \n"
+        self.print_info(text)
+        #
+        # INITIALIZATION
+        #
+        environment_directory = str(args[0])
+        identifier = str(args[1])
+        log_directory = str(args[2])
+
+        # Configure logging parameters so we get output while the program runs
+        logging.basicConfig(format='%(asctime)s %(message)s', datefmt='%m/%d/%Y %H:%M:%S',
+                            filename=log_directory + identifier + ".log", level=logging.INFO)
+        logging.info('START logging for test aggregates__add_transaction in run: %s',
+                     environment_directory + identifier + ".xml")
+
+        # Construct household filename
+        environment = Environment(environment_directory,  identifier)
+
+        # generate a bank
+        bank = Bank()
+        bank.identifier = "test_bank"
+        environment.banks.append(bank)
+
+        # generate a firm
+        firm = Firm()
+        firm.identifier = "test_firm"
+        environment.firms.append(firm)
+
+        # generate a household
+        household = Household()
+        household.identifier = "test_household"
+        environment.households.append(household)
+
+        #
+        # TESTING
+        #
+
+        environment.aggregates = Aggregates()
+        environment.aggregates.register("household_deposits", "deposits", "from", "Household")
+        environment.new_transaction("deposits", "", "test_household", "test_bank", 10.0, 0.01, 0, -1)
+        environment.new_transaction("deposits", "", "test_firm", "test_bank", 20.0, 0.01, 0, -1)
+        print("Deposits of the households (should be 10.0):")
+        print(environment.aggregates.total("household_deposits"))
+        environment.aggregates.register("firm_deposits", "deposits", "from", "Firm")
+        print("Deposits of the firms, registered after the transactions were added (should be 20.0):")
+        print(environment.aggregates.total("firm_deposits"))
+        transaction = household.accounts.filter("deposits")[0]
+        transaction.amount = 15.0
+        print("Deposits of the households after the amount changed (should be 15.0):")
+        print(environment.aggregates.total("household_deposits"))
+        household.accounts.discard(transaction)
+        print("Deposits of the households after the deposit was taken off the books (should be 0.0):")
+        print(environment.aggregates.total("household_deposits"))
+
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # aggregates__set_active
+    # -------------------------------------------------------------------------
+
+    def aggregates__set_active(self, args):
+        import os
+        from src.bank import Bank
+        from src.household import Household
+        from src.firm import Firm
+        from src.environment import Environment
+        from src.transaction import Transaction
+        from src.aggregates import Aggregates
+
+        text = "This test checks aggregates.set_active \n"
+        self.print_info(text)
+        #
+        # INITIALIZATION
+        #
+        environment_directory = str(args[0])
+        identifier = str(args[1])
+        log_directory = str(args[2])
+
+        # Configure logging parameters so we get output while the program runs
+        logging.basicConfig(format='%(asctime)s %(message)s', datefmt='%m/%d/%Y %H:%M:%S',
+                            filename=log_directory + identifier + ".log", level=logging.INFO)
+        logging.info('START logging for test aggregates__set_active in run: %s',
+                     environment_directory + identifier + ".xml")
+
+        # Construct household filename
+        environment = Environment(environment_directory,  identifier)
+
+        # generate a bank
+        bank = Bank()
+        bank.identifier = "test_bank"
+        environment.banks.append(bank)
+
+        # generate a firm
+        firm = Firm()
+        firm.identifier = "test_firm"
+        environment.firms.append(firm)
+
+        # generate a household
+        household = Household()
+        household.identifier = "test_household"
+        environment.households.append(household)
+
+        #
+        # TESTING
+        #
+
+        environment.aggregates = Aggregates()
+        environment.aggregates.rebuild(environment)
+        print("Number of active households and of all active agents:")
+        print(environment.aggregates.num_active("Household"), environment.aggregates.num_active())
+        environment.aggregates.set_active(household, -1)
+        print("Number of active households and of all active agents after the household became inactive:")
+        print(environment.aggregates.num_active("Household"), environment.aggregates.num_active())
+        print("The active parameter of the household (should be -1):")
+        print(household.parameters["active"])
+
+    # -------------------------------------------------------------------------
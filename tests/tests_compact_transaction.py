@@ -0,0 +1,283 @@
+#!/usr/bin/env python
+# [SublimeLinter pep8-max-line-length:150]
+# -*- coding: utf-8 -*-
+
+"""
+black_rhino is a multi-agent simulator for financial network analysis
+Copyright (C) 2016 Co-Pierre Georg (co-pierre.georg@keble.ox.ac.uk)
+Pawel Fiedor (pawel@fiedor.eu)
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, version 3 of the License.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program. If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import logging
+from src.helper import Helper
+
+# -------------------------------------------------------------------------
+#  class Tests
+# -------------------------------------------------------------------------
+
+
+class TestsCompactTransaction(object):
+    #
+    # VARIABLES
+    #
+
+    #
+    # METHODS
+    #
+
+    # -------------------------------------------------------------------------
+    # __init__
+    # -------------------------------------------------------------------------
+    def __init__(self):
+        pass
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # print_info(text)
+    # -------------------------------------------------------------------------
+    def print_info(self, text):
+        print('##############################################################################\n')
+        print(text)
+        print('##############################################################################\n')
+    # -------------------------------------------------------------------------
+
+# -------------------------------------------------------------------------
+#  TESTS FOR COMPACT_TRANSACTION.PY
+# -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # compact_transaction__init
+    # -------------------------------------------------------------------------
+
+    def compact_transaction__init(self, args):
+        import os
+        from src.bank import Bank
+        from src.household import Household
+        from src.firm import Firm
+        from src.environment import Environment
+        from src.compact_transaction import CompactTransaction
+
+        text = "This test checks compact_transaction.__init__ \n"
+        self.print_info(text)
+        #
+        # INITIALIZATION
+        #
+        environment_directory = str(args[0])
+        identifier = str(args[1])
+        log_directory = str(args[2])
+
+        # Configure logging parameters so we get output while the program runs
+        logging.basicConfig(format='%(asctime)s %(message)s', datefmt='%m/%d/%Y %H:%M:%S',
+                            filename=log_directory + identifier + ".log", level=logging.INFO)
+        logging.info('START logging for test compact_transaction__init in run: %s',
+                     environment_directory + identifier + ".xml")
+
+        # Construct household filename
+        environment = Environment(environment_directory,  identifier)
+
+        #
+        # TESTING
+        #
+
+        print("Creating two compact transactions")
+        transaction = CompactTransaction()
+        other = CompactTransaction()
+        print("Their identifiers (should be increasing integers):")
+        print(transaction.identifier)
+        print(other.identifier)
+        print("Does the transaction have a __dict__ (should be False):")
+        print(hasattr(transaction, "__dict__"))
+
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # compact_transaction__add_transaction
+    # -------------------------------------------------------------------------
+
+    def compact_transaction__add_transaction(self, args):
+        import os
+        from src.bank import Bank
+        from src.household import Household
+        from src.firm import Firm
+        from src.environment import Environment
+        from src.compact_transaction import CompactTransaction
+
+        text = "This test checks compact_transaction.add_transaction \n"
+        self.print_info(text)
+        #
+        # INITIALIZATION
+        #
+        environment_directory = str(args[0])
+        identifier = str(args[1])
+        log_directory = str(args[2])
+
+        # Configure logging parameters so we get output while the program runs
+        logging.basicConfig(format='%(asctime)s %(message)s', datefmt='%m/%d/%Y %H:%M:%S',
+                            filename=log_directory + identifier + ".log", level=logging.INFO)
+        logging.info('START logging for test compact_transaction__add_transaction in run: %s',
+                     environment_directory + identifier + ".xml")
+
+        # Construct household filename
+        environment = Environment(environment_directory,  identifier)
+
+        # generate a bank
+        bank = Bank()
+        bank.identifier = "test_bank"
+        environment.banks.append(bank)
+
+        # generate a firm
+        firm = Firm()
+        firm.identifier = "test_firm"
+        environment.firms.append(firm)
+
+        # generate a household
+        household = Household()
+        household.identifier = "test_household"
+        environment.households.append(household)
+
+        #
+        # TESTING
+        #
+
+        print("Creating a compact transaction")
+        transaction = CompactTransaction()
+        print("Adding the transaction to the books")
+        transaction.add_transaction("type", "asset", "test_household", "test_firm", 1,  2,  3, 4, environment)
+        print("The transaction:")
+        print(transaction)
+        print("The firm:")
+        print(environment.get_agent_by_id("test_firm"))
+        print("The household:")
+        print(environment.get_agent_by_id("test_household"))
+
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # compact_transaction__remove_transaction
+    # -------------------------------------------------------------------------
+
+    def compact_transaction__remove_transaction(self, args):
+        import os
+        from src.bank import Bank
+        from src.household import Household
+        from src.firm import Firm
+        from src.environment import Environment
+        from src.compact_transaction import CompactTransaction
+
+        text = "This test checks compact_transaction.remove_transaction \n"
+        self.print_info(text)
+        #
+        # INITIALIZATION
+        #
+        environment_directory = str(args[0])
+        identifier = str(args[1])
+        log_directory = str(args[2])
+
+        # Configure logging parameters so we get output while the program runs
+        logging.basicConfig(format='%(asctime)s %(message)s', datefmt='%m/%d/%Y %H:%M:%S',
+                            filename=log_directory + identifier + ".log", level=logging.INFO)
+        logging.info('START logging for test compact_transaction__remove_transaction in run: %s',
+                     environment_directory + identifier + ".xml")
+
+        # Construct household filename
+        environment = Environment(environment_directory,  identifier)
+
+        # generate a bank
+        bank = Bank()
+        bank.identifier = "test_bank"
+        environment.banks.append(bank)
+
+        # generate a firm
+        firm = Firm()
+        firm.identifier = "test_firm"
+        environment.firms.append(firm)
+
+        # generate a household
+        household = Household()
+        household.identifier = "test_household"
+        environment.households.append(household)
+
+        #
+        # TESTING
+        #
+
+        print("Creating a compact transaction")
+        transaction = CompactTransaction()
+        transaction.add_transaction("deposits", "", "test_household", "test_bank", 10.0,  0.02,  0, -1, environment)
+        print("Number of transactions of the bank before removal:")
+        print(len(bank.accounts))
+        transaction.remove_transaction(environment)
+        print("Number of transactions of the bank after removal (should be 0):")
+        print(len(bank.accounts))
+
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # compact_transaction__new_transaction
+    # -------------------------------------------------------------------------
+
+    def compact_transaction__new_transaction(self, args):
+        import os
+        from src.bank import Bank
+        from src.household import Household
+        from src.firm import Firm
+        from src.environment import Environment
+
+        text = "This test checks environment.new_transaction with compact_transactions \n"
+        self.print_info(text)
+        #
+        # INITIALIZATION
+        #
+        environment_directory = str(args[0])
+        identifier = str(args[1])
+        log_directory = str(args[2])
+
+        # Configure logging parameters so we get output while the program runs
+        logging.basicConfig(format='%(asctime)s %(message)s', datefmt='%m/%d/%Y %H:%M:%S',
+                            filename=log_directory + identifier + ".log", level=logging.INFO)
+        logging.info('START logging for test compact_transaction__new_transaction in run: %s',
+                     environment_directory + identifier + ".xml")
+
+        # Construct household filename
+        environment = Environment(environment_directory,  identifier)
+
+        # generate a bank
+        bank = Bank()
+        bank.identifier = "test_bank"
+        environment.banks.append(bank)
+
+        # generate a firm
+        firm = Firm()
+        firm.identifier = "test_firm"
+        environment.firms.append(firm)
+
+        # generate a household
+        household = Household()
+        household.identifier = "test_household"
+        environment.households.append(household)
+
+        #
+        # TESTING
+        #
+
+        print("Setting compact_transactions in the environment")
+        environment.static_parameters["compact_transactions"] = 1.0
+        environment.new_transaction("deposits", "", "test_household", "test_bank", 10.0,  0.02,  0, -1)
+        print("The type of the new transaction (should be CompactTransaction):")
+        print(type(bank.accounts[0]).__name__)
+        print("Deposits of the bank (should be 10.0):")
+        print(bank.accounts.get_balance("deposits"))
+
+    # -------------------------------------------------------------------------
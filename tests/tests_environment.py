@@ -990,6 +990,108 @@ class TestsEnvironment(object):
 
     # -------------------------------------------------------------------------
 
+    # -------------------------------------------------------------------------
+    # environment__get_agents_by_ids
+    # -------------------------------------------------------------------------
+
+    def environment__get_agents_by_ids(self, args):
+        import os
+        from src.bank import Bank
+        from src.household import Household
+        from src.firm import Firm
+        from src.environment import Environment
+
+        text = "This test checks environment.get_agents_by_ids \n"
+        self.print_info(text)
+        #
+        # INITIALIZATION
+        #
+        environment_directory = str(args[0])
+        identifier = str(args[1])
+        log_directory = str(args[2])
+
+        # Configure logging parameters so we get output while the program runs
+        logging.basicConfig(format='%(asctime)s %(message)s', datefmt='%m/%d/%Y %H:%M:%S',
+                            filename=log_directory + identifier + ".log", level=logging.INFO)
+        logging.info('START logging for test environment__get_agents_by_ids in run: %s',
+                     environment_directory + identifier + ".xml")
+
+        # Construct household filename
+        environment = Environment(environment_directory,  identifier)
+
+        #
+        # TESTING
+        #
+        print("Adding a bank after the agents have been indexed")
+        bank = Bank()
+        bank.identifier = "test_bank"
+        environment.banks.append(bank)
+        print("Getting banks with ids: bank_test_config_id, test_bank")
+        print(environment.get_agents_by_ids(["bank_test_config_id", "test_bank"]))
+        print("Adding another bank with the same id")
+        bank = Bank()
+        bank.identifier = "test_bank"
+        environment.banks.append(bank)
+        try:
+            environment.get_agent_by_id("test_bank")
+        except LookupError as error:
+            print("Lookup failed as it should: " + str(error))
+
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # environment__fork
+    # -------------------------------------------------------------------------
+
+    def environment__fork(self, args):
+        import os
+        from src.bank import Bank
+        from src.household import Household
+        from src.firm import Firm
+        from src.environment import Environment
+
+        text = "This test checks environment.fork \n"
+        self.print_info(text)
+        #
+        # INITIALIZATION
+        #
+        environment_directory = str(args[0])
+        identifier = str(args[1])
+        log_directory = str(args[2])
+
+        # Configure logging parameters so we get output while the program runs
+        logging.basicConfig(format='%(asctime)s %(message)s', datefmt='%m/%d/%Y %H:%M:%S',
+                            filename=log_directory + identifier + ".log", level=logging.INFO)
+        logging.info('START logging for test environment__fork in run: %s',
+                     environment_directory + identifier + ".xml")
+
+        # Construct household filename
+        environment = Environment(environment_directory,  identifier)
+
+        #
+        # TESTING
+        #
+        print("Forking the environment")
+        forked = environment.fork()
+        bank = environment.get_agent_by_id("bank_test_config_id")
+        forked_bank = forked.get_agent_by_id("bank_test_config_id")
+        print("Is the bank in the fork a different object (should be True):")
+        print(bank is not forked_bank)
+        print("Deposits of the bank in both environments (should be the same):")
+        print(bank.get_account("deposits"))
+        print(forked_bank.get_account("deposits"))
+        print("Doubling the deposits in the fork")
+        for tranx in forked_bank.accounts.filter("deposits"):
+            tranx.amount = 2 * tranx.amount
+        print("Deposits of the bank in both environments (only the fork should change):")
+        print(bank.get_account("deposits"))
+        print(forked_bank.get_account("deposits"))
+        print("Do two forks draw different random numbers (should be True):")
+        other = environment.fork()
+        print(forked.rng.random() != other.rng.random())
+
+    # -------------------------------------------------------------------------
+
     # -------------------------------------------------------------------------
     # environment__read_transactions_for_banks
     # -------------------------------------------------------------------------
@@ -0,0 +1,651 @@
+#!/usr/bin/env python
+# [SublimeLinter pep8-max-line-length:150]
+# -*- coding: utf-8 -*-
+
+"""
+black_rhino is a multi-agent simulator for financial network analysis
+Copyright (C) 2016 Co-Pierre Georg (co-pierre.georg@keble.ox.ac.uk)
+Pawel Fiedor (pawel@fiedor.eu)
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, version 3 of the License.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program. If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import logging
+from src.helper import Helper
+
+# -------------------------------------------------------------------------
+#  class Tests
+# -------------------------------------------------------------------------
+
+
+class TestsLedger(object):
+    #
+    # VARIABLES
+    #
+
+    #
+    # METHODS
+    #
+
+    # -------------------------------------------------------------------------
+    # __init__
+    # -------------------------------------------------------------------------
+    def __init__(self):
+        pass
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # print_info(text)
+    # -------------------------------------------------------------------------
+    def print_info(self, text):
+        print('##############################################################################\n')
+        print(text)
+        print('##############################################################################\n')
+    # -------------------------------------------------------------------------
+
+# -------------------------------------------------------------------------
+#  TESTS FOR LEDGER.PY
+# -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # ledger__append
+    # -------------------------------------------------------------------------
+
+    def ledger__append(self, args):
+        import os
+        from src.bank import Bank
+        from src.household import Household
+        from src.firm import Firm
+        from src.environment import Environment
+        from src.transaction import Transaction
+
+        text = "This test checks ledger.append \n"
+        self.print_info(text)
+        #
+        # INITIALIZATION
+        #
+        environment_directory = str(args[0])
+        identifier = str(args[1])
+        log_directory = str(args[2])
+
+        # Configure logging parameters so we get output while the program runs
+        logging.basicConfig(format='%(asctime)s %(message)s', datefmt='%m/%d/%Y %H:%M:%S',
+                            filename=log_directory + identifier + ".log", level=logging.INFO)
+        logging.info('START logging for test ledger__append in run: %s',
+                     environment_directory + identifier + ".xml")
+
+        # Construct household filename
+        environment = Environment(environment_directory,  identifier)
+
+        # generate a bank
+        bank = Bank()
+        bank.identifier = "test_bank"
+        environment.banks.append(bank)
+
+        # generate a firm
+        firm = Firm()
+        firm.identifier = "test_firm"
+        environment.firms.append(firm)
+
+        # generate a household
+        household = Household()
+        household.identifier = "test_household"
+        environment.households.append(household)
+
+        #
+        # TESTING
+        #
+
+        print("Creating a transaction")
+        transaction = Transaction()
+        transaction.add_transaction("deposits", "", "test_household", "test_bank", 10.0,  0.02,  0, -1, environment)
+        print("The transaction is on the books of the household:")
+        print(transaction in household.accounts)
+        print("Appending it again does not book it twice, number of transactions:")
+        household.accounts.append(transaction)
+        print(len(household.accounts))
+
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # ledger__remove
+    # -------------------------------------------------------------------------
+
+    def ledger__remove(self, args):
+        import os
+        from src.bank import Bank
+        from src.household import Household
+        from src.firm import Firm
+        from src.environment import Environment
+        from src.transaction import Transaction
+
+        text = "This test checks ledger.remove \n"
+        self.print_info(text)
+        #
+        # INITIALIZATION
+        #
+        environment_directory = str(args[0])
+        identifier = str(args[1])
+        log_directory = str(args[2])
+
+        # Configure logging parameters so we get output while the program runs
+        logging.basicConfig(format='%(asctime)s %(message)s', datefmt='%m/%d/%Y %H:%M:%S',
+                            filename=log_directory + identifier + ".log", level=logging.INFO)
+        logging.info('START logging for test ledger__remove in run: %s',
+                     environment_directory + identifier + ".xml")
+
+        # Construct household filename
+        environment = Environment(environment_directory,  identifier)
+
+        # generate a bank
+        bank = Bank()
+        bank.identifier = "test_bank"
+        environment.banks.append(bank)
+
+        # generate a firm
+        firm = Firm()
+        firm.identifier = "test_firm"
+        environment.firms.append(firm)
+
+        # generate a household
+        household = Household()
+        household.identifier = "test_household"
+        environment.households.append(household)
+
+        #
+        # TESTING
+        #
+
+        print("Creating two transactions")
+        transaction = Transaction()
+        transaction.add_transaction("deposits", "", "test_household", "test_bank", 10.0,  0.02,  0, -1, environment)
+        transaction = Transaction()
+        transaction.add_transaction("deposits", "", "test_household", "test_bank", 5.0,  0.02,  0, -1, environment)
+        print("Deposits of the household before removing one transaction:")
+        print(household.accounts.get_balance("deposits"))
+        print("Amount of the last transaction of the household (should be 5.0):")
+        print(household.accounts[len(household.accounts) - 1].amount)
+        household.accounts.remove(transaction)
+        print("Deposits of the household after removing it (should be 10.0):")
+        print(household.accounts.get_balance("deposits"))
+        print("Amount of the last transaction of the household (should be 10.0):")
+        print(household.accounts[len(household.accounts) - 1].amount)
+        print("Removing it again raises ValueError:")
+        try:
+            household.accounts.remove(transaction)
+        except ValueError:
+            print("ValueError")
+
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # ledger__filter
+    # -------------------------------------------------------------------------
+
+    def ledger__filter(self, args):
+        import os
+        from src.bank import Bank
+        from src.household import Household
+        from src.firm import Firm
+        from src.environment import Environment
+        from src.transaction import Transaction
+
+        text = "This test checks ledger.filter \n"
+        self.print_info(text)
+        #
+        # INITIALIZATION
+        #
+        environment_directory = str(args[0])
+        identifier = str(args[1])
+        log_directory = str(args[2])
+
+        # Configure logging parameters so we get output while the program runs
+        logging.basicConfig(format='%(asctime)s %(message)s', datefmt='%m/%d/%Y %H:%M:%S',
+                            filename=log_directory + identifier + ".log", level=logging.INFO)
+        logging.info('START logging for test ledger__filter in run: %s',
+                     environment_directory + identifier + ".xml")
+
+        # Construct household filename
+        environment = Environment(environment_directory,  identifier)
+
+        # generate a bank
+        bank = Bank()
+        bank.identifier = "test_bank"
+        environment.banks.append(bank)
+
+        # generate a firm
+        firm = Firm()
+        firm.identifier = "test_firm"
+        environment.firms.append(firm)
+
+        # generate a household
+        household = Household()
+        household.identifier = "test_household"
+        environment.households.append(household)
+
+        #
+        # TESTING
+        #
+
+        print("Creating a deposit, a loan and an investment")
+        transaction = Transaction()
+        transaction.add_transaction("deposits", "", "test_household", "test_bank", 10.0,  0.02,  0, -1, environment)
+        transaction = Transaction()
+        transaction.add_transaction("loans", "", "test_bank", "test_firm", 20.0,  0.02,  0, -1, environment)
+        transaction = Transaction()
+        transaction.add_transaction("investment", "MBS", "test_bank", "test_bank", 30.0,  0.0,  0, -1, environment)
+        print("Deposits of the bank:")
+        for tranx in bank.accounts.filter("deposits"):
+            print(tranx)
+        print("Loans from the bank to the firm:")
+        for tranx in bank.accounts.filter("loans", from_=bank, to="test_firm"):
+            print(tranx)
+        print("Investments in MBS:")
+        for tranx in bank.accounts.filter("investment", asset="MBS"):
+            print(tranx)
+
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # ledger__get_balance
+    # -------------------------------------------------------------------------
+
+    def ledger__get_balance(self, args):
+        import os
+        from src.bank import Bank
+        from src.household import Household
+        from src.firm import Firm
+        from src.environment import Environment
+        from src.transaction import Transaction
+
+        text = "This test checks ledger.get_balance \n"
+        self.print_info(text)
+        #
+        # INITIALIZATION
+        #
+        environment_directory = str(args[0])
+        identifier = str(args[1])
+        log_directory = str(args[2])
+
+        # Configure logging parameters so we get output while the program runs
+        logging.basicConfig(format='%(asctime)s %(message)s', datefmt='%m/%d/%Y %H:%M:%S',
+                            filename=log_directory + identifier + ".log", level=logging.INFO)
+        logging.info('START logging for test ledger__get_balance in run: %s',
+                     environment_directory + identifier + ".xml")
+
+        # Construct household filename
+        environment = Environment(environment_directory,  identifier)
+
+        # generate a bank
+        bank = Bank()
+        bank.identifier = "test_bank"
+        environment.banks.append(bank)
+
+        # generate a firm
+        firm = Firm()
+        firm.identifier = "test_firm"
+        environment.firms.append(firm)
+
+        # generate a household
+        household = Household()
+        household.identifier = "test_household"
+        environment.households.append(household)
+
+        #
+        # TESTING
+        #
+
+        print("Creating deposits and loans")
+        transaction = Transaction()
+        transaction.add_transaction("deposits", "", "test_household", "test_bank", 10.0,  0.02,  0, -1, environment)
+        transaction = Transaction()
+        transaction.add_transaction("deposits", "", "test_firm", "test_bank", 15.0,  0.02,  0, -1, environment)
+        transaction = Transaction()
+        transaction.add_transaction("loans", "", "test_bank", "test_household", 4.0,  0.02,  0, -1, environment)
+        print("Deposits of the bank (should be 25.0):")
+        print(bank.accounts.get_balance("deposits"))
+        print("Deposits of the household in the bank (should be 10.0):")
+        print(bank.accounts.get_balance("deposits", from_=household, to=bank))
+        print("Net wealth of the household (should be 6.0):")
+        print(household.accounts.get_balance("deposits", from_=household) - household.accounts.get_balance("loans", to=household))
+
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # ledger__get_num_transactions
+    # -------------------------------------------------------------------------
+
+    def ledger__get_num_transactions(self, args):
+        import os
+        from src.bank import Bank
+        from src.household import Household
+        from src.firm import Firm
+        from src.environment import Environment
+        from src.transaction import Transaction
+
+        text = "This test checks ledger.get_num_transactions \n"
+        self.print_info(text)
+        #
+        # INITIALIZATION
+        #
+        environment_directory = str(args[0])
+        identifier = str(args[1])
+        log_directory = str(args[2])
+
+        # Configure logging parameters so we get output while the program runs
+        logging.basicConfig(format='%(asctime)s %(message)s', datefmt='%m/%d/%Y %H:%M:%S',
+                            filename=log_directory + identifier + ".log", level=logging.INFO)
+        logging.info('START logging for test ledger__get_num_transactions in run: %s',
+                     environment_directory + identifier + ".xml")
+
+        # Construct household filename
+        environment = Environment(environment_directory,  identifier)
+
+        # generate a bank
+        bank = Bank()
+        bank.identifier = "test_bank"
+        environment.banks.append(bank)
+
+        # generate a firm
+        firm = Firm()
+        firm.identifier = "test_firm"
+        environment.firms.append(firm)
+
+        # generate a household
+        household = Household()
+        household.identifier = "test_household"
+        environment.households.append(household)
+
+        #
+        # TESTING
+        #
+
+        print("Creating two deposits and a loan")
+        transaction = Transaction()
+        transaction.add_transaction("deposits", "", "test_household", "test_bank", 10.0,  0.02,  0, -1, environment)
+        transaction = Transaction()
+        transaction.add_transaction("deposits", "", "test_firm", "test_bank", 15.0,  0.02,  0, -1, environment)
+        transaction = Transaction()
+        transaction.add_transaction("loans", "", "test_bank", "test_firm", 4.0,  0.02,  0, -1, environment)
+        print("Number of deposits of the bank (should be 2):")
+        print(bank.accounts.get_num_transactions("deposits"))
+        print("Number of transactions of the firm (should be 2):")
+        print(firm.accounts.get_num_transactions())
+
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # ledger__update_amount
+    # -------------------------------------------------------------------------
+
+    def ledger__update_amount(self, args):
+        import os
+        from src.bank import Bank
+        from src.household import Household
+        from src.firm import Firm
+        from src.environment import Environment
+        from src.transaction import Transaction
+
+        text = "This test checks ledger.update_amount \n"
+        self.print_info(text)
+        #
+        # INITIALIZATION
+        #
+        environment_directory = str(args[0])
+        identifier = str(args[1])
+        log_directory = str(args[2])
+
+        # Configure logging parameters so we get output while the program runs
+        logging.basicConfig(format='%(asctime)s %(message)s', datefmt='%m/%d/%Y %H:%M:%S',
+                            filename=log_directory + identifier + ".log", level=logging.INFO)
+        logging.info('START logging for test ledger__update_amount in run: %s',
+                     environment_directory + identifier + ".xml")
+
+        # Construct household filename
+        environment = Environment(environment_directory,  identifier)
+
+        # generate a bank
+        bank = Bank()
+        bank.identifier = "test_bank"
+        environment.banks.append(bank)
+
+        # generate a firm
+        firm = Firm()
+        firm.identifier = "test_firm"
+        environment.firms.append(firm)
+
+        # generate a household
+        household = Household()
+        household.identifier = "test_household"
+        environment.households.append(household)
+
+        #
+        # TESTING
+        #
+
+        print("Creating a deposit")
+        transaction = Transaction()
+        transaction.add_transaction("deposits", "", "test_household", "test_bank", 10.0,  0.02,  0, -1, environment)
+        print("Deposits of the bank before changing the amount:")
+        print(bank.accounts.get_balance("deposits"))
+        transaction.set_amount(25.0, environment)
+        print("Deposits of the bank after set_amount (should be 25.0):")
+        print(bank.accounts.get_balance("deposits"))
+        transaction.amount = 40.0
+        print("Deposits of the household after direct assignment (should be 40.0):")
+        print(household.accounts.get_balance("deposits"))
+
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # ledger__is_balanced
+    # -------------------------------------------------------------------------
+
+    def ledger__is_balanced(self, args):
+        import os
+        from src.bank import Bank
+        from src.household import Household
+        from src.firm import Firm
+        from src.environment import Environment
+        from src.transaction import Transaction
+
+        text = "This test checks ledger.is_balanced \n"
+        self.print_info(text)
+        #
+        # INITIALIZATION
+        #
+        environment_directory = str(args[0])
+        identifier = str(args[1])
+        log_directory = str(args[2])
+
+        # Configure logging parameters so we get output while the program runs
+        logging.basicConfig(format='%(asctime)s %(message)s', datefmt='%m/%d/%Y %H:%M:%S',
+                            filename=log_directory + identifier + ".log", level=logging.INFO)
+        logging.info('START logging for test ledger__is_balanced in run: %s',
+                     environment_directory + identifier + ".xml")
+
+        # Construct household filename
+        environment = Environment(environment_directory,  identifier)
+
+        # generate a bank
+        bank = Bank()
+        bank.identifier = "test_bank"
+        environment.banks.append(bank)
+
+        # generate a firm
+        firm = Firm()
+        firm.identifier = "test_firm"
+        environment.firms.append(firm)
+
+        # generate a household
+        household = Household()
+        household.identifier = "test_household"
+        environment.households.append(household)
+
+        #
+        # TESTING
+        #
+
+        print("Creating a loan of 100.0 and a deposit of 0.3 of the bank")
+        loan = Transaction()
+        loan.add_transaction("loans", "", "test_bank", "test_firm", 100.0,  0.0,  0, -1, environment)
+        deposit = Transaction()
+        deposit.add_transaction("deposits", "", "test_household", "test_bank", 0.3,  0.0,  0, -1, environment)
+        print("Changing the amount of the loan to 0.1, 1000.3 and then 0.3")
+        for amount in [0.1, 1000.3, 0.3]:
+            loan.set_amount(amount, environment)
+        print("The running balance of the loans, which drifted from 0.3 by rounding:")
+        print(repr(bank.accounts.get_balance("loans")))
+        print("Whether the balance sheet of the bank is consistent (should be True):")
+        print(bank.accounts.is_balanced(["loans", "cash"], ["deposits"]))
+        print(bank.check_consistency())
+        deposit.set_amount(0.4, environment)
+        print("Whether it is consistent after changing the deposit to 0.4 (should be False):")
+        print(bank.check_consistency())
+
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # ledger__discard_many
+    # -------------------------------------------------------------------------
+
+    def ledger__discard_many(self, args):
+        import os
+        from src.bank import Bank
+        from src.household import Household
+        from src.firm import Firm
+        from src.environment import Environment
+        from src.transaction import Transaction
+
+        text = "This test checks ledger.discard_many \n"
+        self.print_info(text)
+        #
+        # INITIALIZATION
+        #
+        environment_directory = str(args[0])
+        identifier = str(args[1])
+        log_directory = str(args[2])
+
+        # Configure logging parameters so we get output while the program runs
+        logging.basicConfig(format='%(asctime)s %(message)s', datefmt='%m/%d/%Y %H:%M:%S',
+                            filename=log_directory + identifier + ".log", level=logging.INFO)
+        logging.info('START logging for test ledger__discard_many in run: %s',
+                     environment_directory + identifier + ".xml")
+
+        # Construct household filename
+        environment = Environment(environment_directory,  identifier)
+
+        # generate a bank
+        bank = Bank()
+        bank.identifier = "test_bank"
+        environment.banks.append(bank)
+
+        # generate a firm
+        firm = Firm()
+        firm.identifier = "test_firm"
+        environment.firms.append(firm)
+
+        # generate a household
+        household = Household()
+        household.identifier = "test_household"
+        environment.households.append(household)
+
+        #
+        # TESTING
+        #
+
+        print("Creating four labour transactions and a deposit")
+        transaction = Transaction()
+        labour = []
+        for i in range(4):
+            tranx = Transaction()
+            tranx.add_transaction("labour", "", "test_household", "test_firm", 1.0,  0,  0, -1, environment)
+            labour.append(tranx)
+        transaction.add_transaction("deposits", "", "test_household", "test_bank", 10.0,  0.02,  0, -1, environment)
+        print("Number of transactions of the household before removal:")
+        print(len(household.accounts))
+        print("Removing the labour transactions at once (household should be left with 1, firm with 0):")
+        transaction.remove_transactions(labour, environment)
+        print(len(household.accounts))
+        print(len(firm.accounts))
+        print("Labour balance of the household (should be 0.0):")
+        print(household.accounts.get_balance("labour"))
+        print("Deposits of the household (should be 10.0):")
+        print(household.accounts.get_balance("deposits"))
+
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # ledger__purge
+    # -------------------------------------------------------------------------
+
+    def ledger__purge(self, args):
+        import os
+        from src.bank import Bank
+        from src.household import Household
+        from src.firm import Firm
+        from src.environment import Environment
+        from src.transaction import Transaction
+
+        text = "This test checks ledger.purge \n"
+        self.print_info(text)
+        #
+        # INITIALIZATION
+        #
+        environment_directory = str(args[0])
+        identifier = str(args[1])
+        log_directory = str(args[2])
+
+        # Configure logging parameters so we get output while the program runs
+        logging.basicConfig(format='%(asctime)s %(message)s', datefmt='%m/%d/%Y %H:%M:%S',
+                            filename=log_directory + identifier + ".log", level=logging.INFO)
+        logging.info('START logging for test ledger__purge in run: %s',
+                     environment_directory + identifier + ".xml")
+
+        # Construct household filename
+        environment = Environment(environment_directory,  identifier)
+
+        # generate a bank
+        bank = Bank()
+        bank.identifier = "test_bank"
+        environment.banks.append(bank)
+
+        # generate a firm
+        firm = Firm()
+        firm.identifier = "test_firm"
+        environment.firms.append(firm)
+
+        # generate a household
+        household = Household()
+        household.identifier = "test_household"
+        environment.households.append(household)
+
+        #
+        # TESTING
+        #
+
+        print("Creating a deposit and a worthless loan")
+        transaction = Transaction()
+        transaction.add_transaction("deposits", "", "test_household", "test_bank", 10.0,  0.02,  0, -1, environment)
+        loan = Transaction()
+        loan.add_transaction("loans", "", "test_bank", "test_household", 0.0,  0.02,  0, -1, environment)
+        print("Number of transactions of the bank before purging:")
+        print(len(bank.accounts))
+        print("Purging the bank's ledger:")
+        print(bank.accounts.purge())
+        print("Number of transactions of the bank after purging (should be 1):")
+        print(len(bank.accounts))
+        print("Deposits of the bank (should be 10.0):")
+        print(bank.accounts.get_balance("deposits"))
+
+    # -------------------------------------------------------------------------
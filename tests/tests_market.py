@@ -770,3 +770,753 @@ class TestsMarket(object):
         print(rationed)
 
     # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # market__rationing_abstract_lazy
+    # -------------------------------------------------------------------------
+
+    def market__rationing_abstract_lazy(self, args):
+        import os
+        from src.bank import Bank
+        from src.household import Household
+        from src.firm import Firm
+        from src.environment import Environment
+        from src.transaction import Transaction
+        from src.market import Market
+
+        text = "This test checks market.rationing_abstract_lazy \n"
+        self.print_info(text)
+        #
+        # INITIALIZATION
+        #
+        environment_directory = str(args[0])
+        identifier = str(args[1])
+        log_directory = str(args[2])
+
+        # Configure logging parameters so we get output while the program runs
+        logging.basicConfig(format='%(asctime)s %(message)s', datefmt='%m/%d/%Y %H:%M:%S',
+                            filename=log_directory + identifier + ".log", level=logging.INFO)
+        logging.info('START logging for test market__rationing_abstract_lazy in run: %s',
+                     environment_directory + identifier + ".xml")
+
+        # Construct household filename
+        environment = Environment(environment_directory,  identifier)
+
+        # generate a bank
+        bank = Bank()
+        bank.identifier = "test_bank"
+        environment.banks.append(bank)
+
+        # generate a firm
+        firm = Firm()
+        firm.identifier = "test_firm"
+        environment.firms.append(firm)
+
+        # generate a household
+        household = Household()
+        household.identifier = "test_household"
+        environment.households.append(household)
+
+        #
+        # TESTING
+        #
+
+        def matching_agents_basic(agent_one, agent_two):
+            import difflib
+            seq = difflib.SequenceMatcher(a=agent_one.lower(), b=agent_two.lower())
+            return seq.ratio()
+
+        def allow_match_basic(agent_one, agent_two):
+            return True
+
+        def matching_agents_vectorized(agent_one, agents_two):
+            import numpy as np
+            return np.array([sum(1 for a, b in zip(agent_one, agent_two) if a == b) for agent_two in agents_two])
+
+        def allow_match_vectorized(agent_one, agents_two):
+            import numpy as np
+            return np.array([agent_two != "aaaabb" for agent_two in agents_two])
+
+        market = Market("market")
+        agents = [["aaaaaa", 5], ["bbbbbb", 7], ["aaaabb", -3], ["aabbbb", -4]]
+        rationed = market.rationing_abstract([list(agent) for agent in agents], matching_agents_basic, allow_match_basic)
+        print("Pairs found through abstract rationing prioritising similar names:")
+        print(rationed)
+        rationed = market.rationing_abstract_lazy([list(agent) for agent in agents], matching_agents_basic, allow_match_basic, batch=1)
+        print("Pairs found through lazy abstract rationing prioritising similar names (should be the same):")
+        print(rationed)
+        rationed = market.rationing_abstract_lazy([list(agent) for agent in agents], matching_agents_vectorized, allow_match_vectorized, vectorized=True)
+        print("Pairs found through vectorized lazy abstract rationing with 'aaaabb' not allowed (should be 4 from bbbbbb to aabbbb):")
+        print(rationed)
+
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # market__rationing_seeded
+    # -------------------------------------------------------------------------
+
+    def market__rationing_seeded(self, args):
+        import os
+        from src.bank import Bank
+        from src.household import Household
+        from src.firm import Firm
+        from src.environment import Environment
+        from src.transaction import Transaction
+        from src.market import Market
+        from src.rng import new_rng
+
+        text = "This test checks market.rationing with a seeded random number generator \n"
+        self.print_info(text)
+        #
+        # INITIALIZATION
+        #
+        environment_directory = str(args[0])
+        identifier = str(args[1])
+        log_directory = str(args[2])
+
+        # Configure logging parameters so we get output while the program runs
+        logging.basicConfig(format='%(asctime)s %(message)s', datefmt='%m/%d/%Y %H:%M:%S',
+                            filename=log_directory + identifier + ".log", level=logging.INFO)
+        logging.info('START logging for test market__rationing_seeded in run: %s',
+                     environment_directory + identifier + ".xml")
+
+        # Construct household filename
+        environment = Environment(environment_directory,  identifier)
+
+        # generate a bank
+        bank = Bank()
+        bank.identifier = "test_bank"
+        environment.banks.append(bank)
+
+        # generate a firm
+        firm = Firm()
+        firm.identifier = "test_firm"
+        environment.firms.append(firm)
+
+        # generate a household
+        household = Household()
+        household.identifier = "test_household"
+        environment.households.append(household)
+
+        #
+        # TESTING
+        #
+
+        print("Rationing twice with generators seeded alike (should be True):")
+        first = Market("market", new_rng(42)).rationing([["agent1", 5], ["agent2", 7], ["agent3", -3], ["agent4", -4]])
+        second = Market("market", new_rng(42)).rationing([["agent1", 5], ["agent2", 7], ["agent3", -3], ["agent4", -4]])
+        print(first)
+        print(first == second)
+        print("Rationing with the generator of the environment, seeded again with the same seed (should be True):")
+        environment.seed_rng(42, 0)
+        first = Market("market", environment.rng).rationing_proportional([["agent1", 5], ["agent2", 7], ["agent3", -3], ["agent4", -4]])
+        environment.seed_rng(42, 0)
+        second = Market("market", environment.rng).rationing_proportional([["agent1", 5], ["agent2", 7], ["agent3", -3], ["agent4", -4]])
+        print(first == second)
+
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # market__add_order
+    # -------------------------------------------------------------------------
+
+    def market__add_order(self, args):
+        import os
+        from src.bank import Bank
+        from src.household import Household
+        from src.firm import Firm
+        from src.environment import Environment
+        from src.transaction import Transaction
+        from src.market import Market
+
+        text = "This test checks market.add_order \n"
+        self.print_info(text)
+        #
+        # INITIALIZATION
+        #
+        environment_directory = str(args[0])
+        identifier = str(args[1])
+        log_directory = str(args[2])
+
+        # Configure logging parameters so we get output while the program runs
+        logging.basicConfig(format='%(asctime)s %(message)s', datefmt='%m/%d/%Y %H:%M:%S',
+                            filename=log_directory + identifier + ".log", level=logging.INFO)
+        logging.info('START logging for test market__add_order in run: %s',
+                     environment_directory + identifier + ".xml")
+
+        # Construct household filename
+        environment = Environment(environment_directory,  identifier)
+
+        # generate a bank
+        bank = Bank()
+        bank.identifier = "test_bank"
+        environment.banks.append(bank)
+
+        # generate a firm
+        firm = Firm()
+        firm.identifier = "test_firm"
+        environment.firms.append(firm)
+
+        # generate a household
+        household = Household()
+        household.identifier = "test_household"
+        environment.households.append(household)
+
+        #
+        # TESTING
+        #
+
+        market = Market("market")
+        print("Adding two sell orders at 10.0 and 9.0, and a later one at 9.0 (should trade nothing):")
+        print(market.add_order("seller_1", 10.0, 5.0, 0, "order_1", "sell"))
+        print(market.add_order("seller_2", 9.0, 5.0, 1, "order_2", "sell"))
+        print(market.add_order("seller_3", 9.0, 2.0, 2, "order_3", "sell"))
+        print("Adding a buy order for 6.0 at 9.5 (should buy 5.0 from seller_2 and 1.0 from seller_3 at 9.0):")
+        print(market.add_order("buyer_1", 9.5, 6.0, 3, "order_4", "buy"))
+        print("The sell book (should be seller_3 with 1.0 at 9.0, then seller_1 with 5.0 at 10.0):")
+        print(market.lob_sell_book)
+        print("Adding a buy order for 8.0 at 10.0 (should buy 6.0 and rest 2.0 at 10.0 in the buy book):")
+        print(market.add_order("buyer_2", 10.0, 8.0, 4, "order_5", "buy"))
+        print(market.lob_buy_book)
+
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # market__cancel_and_replace_order
+    # -------------------------------------------------------------------------
+
+    def market__cancel_and_replace_order(self, args):
+        import os
+        from src.bank import Bank
+        from src.household import Household
+        from src.firm import Firm
+        from src.environment import Environment
+        from src.transaction import Transaction
+        from src.market import Market
+
+        text = "This test checks market.cancel_order and market.replace_order \n"
+        self.print_info(text)
+        #
+        # INITIALIZATION
+        #
+        environment_directory = str(args[0])
+        identifier = str(args[1])
+        log_directory = str(args[2])
+
+        # Configure logging parameters so we get output while the program runs
+        logging.basicConfig(format='%(asctime)s %(message)s', datefmt='%m/%d/%Y %H:%M:%S',
+                            filename=log_directory + identifier + ".log", level=logging.INFO)
+        logging.info('START logging for test market__cancel_and_replace_order in run: %s',
+                     environment_directory + identifier + ".xml")
+
+        # Construct household filename
+        environment = Environment(environment_directory,  identifier)
+
+        # generate a bank
+        bank = Bank()
+        bank.identifier = "test_bank"
+        environment.banks.append(bank)
+
+        # generate a firm
+        firm = Firm()
+        firm.identifier = "test_firm"
+        environment.firms.append(firm)
+
+        # generate a household
+        household = Household()
+        household.identifier = "test_household"
+        environment.households.append(household)
+
+        #
+        # TESTING
+        #
+
+        market = Market("market")
+        market.add_order("seller_1", 10.0, 5.0, 0, "order_1", "sell")
+        market.add_order("seller_2", 10.0, 5.0, 1, "order_2", "sell")
+        print("Cancelling order_1 and an order that does not exist (should be True, False):")
+        print(market.cancel_order("order_1"), market.cancel_order("order_x"))
+        print("Reducing order_2 to 3.0 and increasing it to 30.0 (should be True, False):")
+        print(market.replace_order(3.0, "order_2"), market.replace_order(30.0, "order_2"))
+        print("A market order buying 10.0 (should buy 3.0 from seller_2 at 10.0):")
+        print(market.market_order("buyer_1", 10.0, 2, "order_3", "buy"))
+        market.clear_book()
+        print("The books after clearing (should be empty):")
+        print(market.lob_buy_book, market.lob_sell_book)
+
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # market__tatonnement_vectorized
+    # -------------------------------------------------------------------------
+
+    def market__tatonnement_vectorized(self, args):
+        import os
+        from src.bank import Bank
+        from src.household import Household
+        from src.firm import Firm
+        from src.environment import Environment
+        from src.transaction import Transaction
+        from src.market import Market
+
+        text = "This test checks market.tatonnement_vectorized \n"
+        self.print_info(text)
+        #
+        # INITIALIZATION
+        #
+        environment_directory = str(args[0])
+        identifier = str(args[1])
+        log_directory = str(args[2])
+
+        # Configure logging parameters so we get output while the program runs
+        logging.basicConfig(format='%(asctime)s %(message)s', datefmt='%m/%d/%Y %H:%M:%S',
+                            filename=log_directory + identifier + ".log", level=logging.INFO)
+        logging.info('START logging for test market__tatonnement_vectorized in run: %s',
+                     environment_directory + identifier + ".xml")
+
+        # Construct household filename
+        environment = Environment(environment_directory,  identifier)
+
+        # generate a bank
+        bank = Bank()
+        bank.identifier = "test_bank"
+        environment.banks.append(bank)
+
+        # generate a firm
+        firm = Firm()
+        firm.identifier = "test_firm"
+        environment.firms.append(firm)
+
+        # generate a household
+        household = Household()
+        household.identifier = "test_household"
+        environment.households.append(household)
+
+        #
+        # TESTING
+        #
+
+        market = Market("market")
+        # 100 households with 24 units of labour and wealth between 0 and 99
+        # and 10 firms with capital between 10 and 100
+        supply_curves = [market.curve(Household.supply_of_labour_solow_vectorized,
+                                      [[24.0, float(i)] for i in range(100)])]
+        demand_curves = [market.curve(Firm.demand_for_labour_solow_vectorized,
+                                      [[1.0, 0.5, 0.5, 10.0 * (i + 1)] for i in range(10)])]
+        price = market.tatonnement_vectorized(supply_curves, demand_curves, 10.0, 0.001)
+        print("Price found through vectorized tatonnement:")
+        print(price)
+        print("Number of prices tried:")
+        print(market.iterations)
+        supply = market.aggregate(supply_curves, price)
+        demand = market.aggregate(demand_curves, price)
+        print("Supply and demand at the price are within the tolerance (should be True):")
+        print(abs(demand - supply) / (demand + supply) <= 0.001)
+
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # market__tatonnement_parallel
+    # -------------------------------------------------------------------------
+
+    def market__tatonnement_parallel(self, args):
+        import os
+        import multiprocessing
+        import numpy as np
+        from src.bank import Bank
+        from src.household import Household
+        from src.firm import Firm
+        from src.environment import Environment
+        from src.transaction import Transaction
+        from src.market import Market
+        from src.clearing_pool import ClearingPool
+
+        text = "This test checks market.tatonnement_parallel \n"
+        self.print_info(text)
+        #
+        # INITIALIZATION
+        #
+        environment_directory = str(args[0])
+        identifier = str(args[1])
+        log_directory = str(args[2])
+
+        # Configure logging parameters so we get output while the program runs
+        logging.basicConfig(format='%(asctime)s %(message)s', datefmt='%m/%d/%Y %H:%M:%S',
+                            filename=log_directory + identifier + ".log", level=logging.INFO)
+        logging.info('START logging for test market__tatonnement_parallel in run: %s',
+                     environment_directory + identifier + ".xml")
+
+        # Construct household filename
+        environment = Environment(environment_directory,  identifier)
+
+        # generate a bank
+        bank = Bank()
+        bank.identifier = "test_bank"
+        environment.banks.append(bank)
+
+        # generate a firm
+        firm = Firm()
+        firm.identifier = "test_firm"
+        environment.firms.append(firm)
+
+        # generate a household
+        household = Household()
+        household.identifier = "test_household"
+        environment.households.append(household)
+
+        #
+        # TESTING
+        #
+
+        market = Market("market")
+        supply_curves = [market.curve(Household.supply_of_labour_solow_vectorized,
+                                      [[24.0, float(i)] for i in range(100)])]
+        demand_curves = [market.curve(Firm.demand_for_labour_solow_vectorized,
+                                      [[1.0, 0.5, 0.5, 10.0 * (i + 1)] for i in range(10)])]
+        price = market.tatonnement_vectorized(supply_curves, demand_curves, 10.0, 0.001)
+        print("Price found through vectorized tatonnement:")
+        print(price)
+        pool = ClearingPool(2)
+        print("Prices found through parallel tatonnement twice with the same pool (should be the same as above):")
+        print(market.tatonnement_parallel(supply_curves, demand_curves, 10.0, 0.001, pool))
+        print(market.tatonnement_parallel(supply_curves, demand_curves, 10.0, 0.001, pool))
+        print("Loading curves which fail in the first worker only:")
+        pool.load([[np.power, [[None, 1.0, 2.0]]]], [])
+        try:
+            pool.excess_demand(2.0)
+        except TypeError as error:
+            print(error)
+        print("Price found with the same pool afterwards (should be the same as above):")
+        print(market.tatonnement_parallel(supply_curves, demand_curves, 10.0, 0.001, pool))
+        pool.close()
+        print("Price found through parallel tatonnement in a daemonic worker process (should be the same as above):")
+        worker_pool = multiprocessing.Pool(1)
+        print(worker_pool.apply(market.tatonnement_parallel, (supply_curves, demand_curves, 10.0, 0.001)))
+        worker_pool.close()
+        worker_pool.join()
+
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # market__warm_start
+    # -------------------------------------------------------------------------
+
+    def market__warm_start(self, args):
+        import os
+        from src.bank import Bank
+        from src.household import Household
+        from src.firm import Firm
+        from src.environment import Environment
+        from src.transaction import Transaction
+        from src.market import Market
+
+        text = "This test checks market.warm_start \n"
+        self.print_info(text)
+        #
+        # INITIALIZATION
+        #
+        environment_directory = str(args[0])
+        identifier = str(args[1])
+        log_directory = str(args[2])
+
+        # Configure logging parameters so we get output while the program runs
+        logging.basicConfig(format='%(asctime)s %(message)s', datefmt='%m/%d/%Y %H:%M:%S',
+                            filename=log_directory + identifier + ".log", level=logging.INFO)
+        logging.info('START logging for test market__warm_start in run: %s',
+                     environment_directory + identifier + ".xml")
+
+        # Construct household filename
+        environment = Environment(environment_directory,  identifier)
+
+        # generate a bank
+        bank = Bank()
+        bank.identifier = "test_bank"
+        environment.banks.append(bank)
+
+        # generate a firm
+        firm = Firm()
+        firm.identifier = "test_firm"
+        environment.firms.append(firm)
+
+        # generate a household
+        household = Household()
+        household.identifier = "test_household"
+        environment.households.append(household)
+
+        #
+        # TESTING
+        #
+
+        def supply(price, slope):
+            return slope * price
+
+        def demand(price, budget):
+            return budget / price
+
+        market = Market("market")
+        print("Starting price before the market has cleared (should be 10.0):")
+        print(market.warm_start(10.0))
+        for budget in [100.0, 104.0, 108.0, 112.0]:
+            starting_price = market.warm_start(10.0)
+            step = market.initial_step(1.0, 1.0)
+            market.tatonnement_vectorized([market.curve(supply, [[1.0]])], [market.curve(demand, [[budget]])], starting_price, 0.001, step)
+        print("Equilibrium prices of the four searches (should be close to 10.0, 10.2, 10.39 and 10.58):")
+        print(market.price_history)
+        print("Number of prices tried by each of the searches:")
+        print(market.iteration_history)
+        print("Starting price and step of the next search (should be the last price and about 0.04):")
+        print(market.warm_start(10.0), market.initial_step(1.0, 1.0))
+
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # market__rationing_linear
+    # -------------------------------------------------------------------------
+
+    def market__rationing_linear(self, args):
+        import os
+        from src.bank import Bank
+        from src.household import Household
+        from src.firm import Firm
+        from src.environment import Environment
+        from src.transaction import Transaction
+        from src.market import Market
+
+        text = "This test checks market.rationing_linear \n"
+        self.print_info(text)
+        #
+        # INITIALIZATION
+        #
+        environment_directory = str(args[0])
+        identifier = str(args[1])
+        log_directory = str(args[2])
+
+        # Configure logging parameters so we get output while the program runs
+        logging.basicConfig(format='%(asctime)s %(message)s', datefmt='%m/%d/%Y %H:%M:%S',
+                            filename=log_directory + identifier + ".log", level=logging.INFO)
+        logging.info('START logging for test market__rationing_linear in run: %s',
+                     environment_directory + identifier + ".xml")
+
+        # Construct household filename
+        environment = Environment(environment_directory,  identifier)
+
+        # generate a bank
+        bank = Bank()
+        bank.identifier = "test_bank"
+        environment.banks.append(bank)
+
+        # generate a firm
+        firm = Firm()
+        firm.identifier = "test_firm"
+        environment.firms.append(firm)
+
+        # generate a household
+        household = Household()
+        household.identifier = "test_household"
+        environment.households.append(household)
+
+        #
+        # TESTING
+        #
+
+        market = Market("market")
+        rationed = market.rationing_linear([["agent1", 5], ["agent2", 7], ["agent3", -3], ["agent4", -4]])
+        print("Pairs found through linear rationing (should be at most 3 trades amounting to 7):")
+        print(rationed)
+        print(len(rationed) <= 3, sum(ration[2] for ration in rationed))
+        rationed = market.rationing_linear([["agent1", 5], ["agent2", 7], ["agent3", -3], ["agent4", -4]], True)
+        print("Amounts sold by agent1 and agent2 with proportional linear rationing (should be 2.91 and 4.08):")
+        print(sum(ration[2] for ration in rationed if ration[0] == "agent1"), sum(ration[2] for ration in rationed if ration[0] == "agent2"))
+
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # market__rationing_proportional_matrix
+    # -------------------------------------------------------------------------
+
+    def market__rationing_proportional_matrix(self, args):
+        import os
+        from src.bank import Bank
+        from src.household import Household
+        from src.firm import Firm
+        from src.environment import Environment
+        from src.transaction import Transaction
+        from src.market import Market
+
+        text = "This test checks market.rationing_proportional_matrix \n"
+        self.print_info(text)
+        #
+        # INITIALIZATION
+        #
+        environment_directory = str(args[0])
+        identifier = str(args[1])
+        log_directory = str(args[2])
+
+        # Configure logging parameters so we get output while the program runs
+        logging.basicConfig(format='%(asctime)s %(message)s', datefmt='%m/%d/%Y %H:%M:%S',
+                            filename=log_directory + identifier + ".log", level=logging.INFO)
+        logging.info('START logging for test market__rationing_proportional_matrix in run: %s',
+                     environment_directory + identifier + ".xml")
+
+        # Construct household filename
+        environment = Environment(environment_directory,  identifier)
+
+        # generate a bank
+        bank = Bank()
+        bank.identifier = "test_bank"
+        environment.banks.append(bank)
+
+        # generate a firm
+        firm = Firm()
+        firm.identifier = "test_firm"
+        environment.firms.append(firm)
+
+        # generate a household
+        household = Household()
+        household.identifier = "test_household"
+        environment.households.append(household)
+
+        #
+        # TESTING
+        #
+
+        market = Market("market")
+        sellers, buyers, matrix = market.rationing_proportional_matrix([["agent1", 5], ["agent2", 7], ["agent3", -3], ["agent4", -4]])
+        print("Sellers, buyers and the amounts sold (rows should sum to 2.91 and 4.08, columns to 3 and 4):")
+        print(sellers, buyers)
+        print(matrix)
+        print(matrix.sum(axis=1), matrix.sum(axis=0))
+        print("The same rationing as a list of pairs:")
+        print(market.rationing_deterministic([["agent1", 5], ["agent2", 7], ["agent3", -3], ["agent4", -4]]))
+
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # market__add_order_assets
+    # -------------------------------------------------------------------------
+
+    def market__add_order_assets(self, args):
+        import os
+        from src.bank import Bank
+        from src.household import Household
+        from src.firm import Firm
+        from src.environment import Environment
+        from src.transaction import Transaction
+        from src.market import Market
+
+        text = "This test checks market.add_order \n"
+        self.print_info(text)
+        #
+        # INITIALIZATION
+        #
+        environment_directory = str(args[0])
+        identifier = str(args[1])
+        log_directory = str(args[2])
+
+        # Configure logging parameters so we get output while the program runs
+        logging.basicConfig(format='%(asctime)s %(message)s', datefmt='%m/%d/%Y %H:%M:%S',
+                            filename=log_directory + identifier + ".log", level=logging.INFO)
+        logging.info('START logging for test market__add_order_assets in run: %s',
+                     environment_directory + identifier + ".xml")
+
+        # Construct household filename
+        environment = Environment(environment_directory,  identifier)
+
+        # generate a bank
+        bank = Bank()
+        bank.identifier = "test_bank"
+        environment.banks.append(bank)
+
+        # generate a firm
+        firm = Firm()
+        firm.identifier = "test_firm"
+        environment.firms.append(firm)
+
+        # generate a household
+        household = Household()
+        household.identifier = "test_household"
+        environment.households.append(household)
+
+        #
+        # TESTING
+        #
+
+        market = Market("market", None, environment.assets)
+        print("Securities with an order book (should be MBS and ABS besides the default book None):")
+        print(list(market.order_books.keys()))
+        market.add_order("seller", 10.0, 5, 0, "order_1", "sell", "MBS")
+        print("A buy order for ABS doesn't trade with a sell order for MBS (should be []):")
+        print(market.add_order("buyer", 11.0, 3, 1, "order_2", "buy", "ABS"))
+        print("A buy order for MBS does (should be 3 at the price of 10.0):")
+        print(market.add_order("buyer", 11.0, 3, 2, "order_3", "buy", "MBS"))
+        print("The default book is left empty (should be [] []):")
+        print(market.lob_buy_book, market.lob_sell_book)
+
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # market__call_auction
+    # -------------------------------------------------------------------------
+
+    def market__call_auction(self, args):
+        import os
+        from src.bank import Bank
+        from src.household import Household
+        from src.firm import Firm
+        from src.environment import Environment
+        from src.transaction import Transaction
+        from src.market import Market
+
+        text = "This test checks market.call_auction \n"
+        self.print_info(text)
+        #
+        # INITIALIZATION
+        #
+        environment_directory = str(args[0])
+        identifier = str(args[1])
+        log_directory = str(args[2])
+
+        # Configure logging parameters so we get output while the program runs
+        logging.basicConfig(format='%(asctime)s %(message)s', datefmt='%m/%d/%Y %H:%M:%S',
+                            filename=log_directory + identifier + ".log", level=logging.INFO)
+        logging.info('START logging for test market__call_auction in run: %s',
+                     environment_directory + identifier + ".xml")
+
+        # Construct household filename
+        environment = Environment(environment_directory,  identifier)
+
+        # generate a bank
+        bank = Bank()
+        bank.identifier = "test_bank"
+        environment.banks.append(bank)
+
+        # generate a firm
+        firm = Firm()
+        firm.identifier = "test_firm"
+        environment.firms.append(firm)
+
+        # generate a household
+        household = Household()
+        household.identifier = "test_household"
+        environment.households.append(household)
+
+        #
+        # TESTING
+        #
+
+        market = Market("market")
+        market.submit_order("seller_1", 9.0, 5, 0, "order_1", "sell", "ABS")
+        market.submit_order("seller_2", 10.0, 5, 1, "order_2", "sell", "ABS")
+        market.submit_order("seller_3", None, 2, 2, "order_3", "sell", "ABS")
+        market.submit_order("buyer_1", 11.0, 4, 3, "order_4", "buy", "ABS")
+        market.submit_order("buyer_2", 10.0, 6, 4, "order_5", "buy", "ABS")
+        market.submit_order("buyer_3", 8.0, 6, 5, "order_6", "buy", "ABS")
+        print("Uniform price and volume of the auction (should be 10.0 and 10.0):")
+        print(market.get_call_auction("ABS").clearing_price())
+        trades = market.call_auction("ABS")
+        print("Trades of the auction (should amount to 10, all at the price of 10.0, seller_2 selling 3 of 5):")
+        print(trades)
+        print("Number of orders left in the auction (should be 0):")
+        print(len(market.get_call_auction("ABS")))
+
+    # -------------------------------------------------------------------------
@@ -1231,3 +1231,169 @@ class TestsMeasurement(object):
         print(measurement.identifier)
 
     # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # measurement__write_to_buffer
+    # -------------------------------------------------------------------------
+
+    def measurement__write_to_buffer(self, args):
+        import os
+        from src.bank import Bank
+        from src.household import Household
+        from src.firm import Firm
+        from src.environment import Environment
+        from src.transaction import Transaction
+        from src.market import Market
+        from src.runner import Runner
+        from src.measurement import Measurement
+        from src.measurement_buffer import read_npz
+
+        text = "This test checks measurement.write_to_file with a buffer \n"
+        self.print_info(text)
+        #
+        # INITIALIZATION
+        #
+        environment_directory = str(args[0])
+        identifier = str(args[1])
+        log_directory = str(args[2])
+
+        # Configure logging parameters so we get output while the program runs
+        logging.basicConfig(format='%(asctime)s %(message)s', datefmt='%m/%d/%Y %H:%M:%S',
+                            filename=log_directory + identifier + ".log", level=logging.INFO)
+        logging.info('START logging for test measurement__write_to_buffer in run: %s',
+                     environment_directory + identifier + ".xml")
+
+        # Construct household filename
+        environment = Environment(environment_directory,  identifier)
+
+        # Construct a runner
+        runner = Runner(environment)
+
+        # generate a bank
+        bank = Bank()
+        bank.identifier = "test_bank"
+        environment.banks.append(bank)
+
+        # generate a firm
+        firm = Firm()
+        firm.identifier = "test_firm"
+        environment.firms.append(firm)
+
+        # generate a household
+        household = Household()
+        household.identifier = "test_household"
+        environment.households.append(household)
+
+        #
+        # TESTING
+        #
+        environment.static_parameters["measurement_format"] = "npz"
+        environment.static_parameters["measurement_chunk_size"] = 2.0
+        measurement = Measurement(environment, runner)
+        measurement.open_file()
+        print("The file the measurements are written to:")
+        print(measurement.filename)
+        for step in range(5):
+            runner.current_step = step
+            measurement.write_to_file()
+        print("The number of rows and of chunks written before closing the file:")
+        print(measurement.buffer.rows, measurement.buffer.chunks)
+        measurement.close_file()
+        print("The number of rows and of chunks written after closing the file:")
+        print(measurement.buffer.rows, measurement.buffer.chunks)
+        print("The columns read back from the file:")
+        print(read_npz(measurement.filename))
+        os.remove(measurement.filename)
+
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # measurement__buffer_kinds
+    # -------------------------------------------------------------------------
+
+    def measurement__buffer_kinds(self, args):
+        import os
+        from src.measurement_buffer import MeasurementBuffer, read_npz
+
+        text = "This test checks measurement_buffer.append with values of changing kinds \n"
+        self.print_info(text)
+        #
+        # INITIALIZATION
+        #
+        environment_directory = str(args[0])
+        identifier = str(args[1])
+        log_directory = str(args[2])
+
+        # Configure logging parameters so we get output while the program runs
+        logging.basicConfig(format='%(asctime)s %(message)s', datefmt='%m/%d/%Y %H:%M:%S',
+                            filename=log_directory + identifier + ".log", level=logging.INFO)
+        logging.info('START logging for test measurement__buffer_kinds in run: %s',
+                     environment_directory + identifier + ".xml")
+
+        #
+        # TESTING
+        #
+        filename = log_directory + identifier + "-kinds.npz"
+        buffer = MeasurementBuffer(["step", "amount", "label"], filename, "npz", 2)
+        buffer.open()
+        for row in [[0, 0, 1], [1, 12.75, 2], [2, None, "bank"], [3, 4, None]]:
+            buffer.append(row)
+        print("The kinds of the columns after the rows were appended (should be int, float, text):")
+        print(buffer.kinds)
+        buffer.close()
+        print("The columns read back from the file, 12.75 is kept and None is nan in amount and empty in label:")
+        print(read_npz(filename))
+        os.remove(filename)
+
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # measurement__measure
+    # -------------------------------------------------------------------------
+
+    def measurement__measure(self, args):
+        import os
+        from src.environment import Environment
+        from src.runner import Runner
+        from src.measurement import Measurement
+
+        text = "This test checks measurement.measure \n"
+        self.print_info(text)
+        #
+        # INITIALIZATION
+        #
+        environment_directory = str(args[0])
+        identifier = str(args[1])
+        log_directory = str(args[2])
+
+        # Configure logging parameters so we get output while the program runs
+        logging.basicConfig(format='%(asctime)s %(message)s', datefmt='%m/%d/%Y %H:%M:%S',
+                            filename=log_directory + identifier + ".log", level=logging.INFO)
+        logging.info('START logging for test measurement__measure in run: %s',
+                     environment_directory + identifier + ".xml")
+
+        # Construct household filename
+        environment = Environment(environment_directory,  identifier)
+
+        # Construct a runner
+        runner = Runner(environment)
+
+        #
+        # TESTING
+        #
+        measurement = Measurement(environment, runner)
+        runner.current_step = 4
+        measurement.set_config({1: ["Step", "current_step"], 2: ["Deposits", "household_deposits"]})
+        print("The row measured with the step first:")
+        print(measurement.measure())
+        measurement.config = {1: ["Deposits", "household_deposits"], 2: ["Step", "current_step"]}
+        print("The row measured after assigning a config of the same length with the columns swapped:")
+        print(measurement.measure())
+        measurement.set_config({1: ["Unknown", "no_such_output"]})
+        print("Measuring an unknown output (should raise ValueError):")
+        try:
+            measurement.measure()
+        except ValueError as error:
+            print(error)
+
+    # -------------------------------------------------------------------------
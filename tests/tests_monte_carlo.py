@@ -0,0 +1,152 @@
+#!/usr/bin/env python
+# [SublimeLinter pep8-max-line-length:150]
+# -*- coding: utf-8 -*-
+
+"""
+black_rhino is a multi-agent simulator for financial network analysis
+Copyright (C) 2016 Co-Pierre Georg (co-pierre.georg@keble.ox.ac.uk)
+Pawel Fiedor (pawel@fiedor.eu)
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, version 3 of the License.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program. If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import logging
+from src.helper import Helper
+
+# -------------------------------------------------------------------------
+#  class Tests
+# -------------------------------------------------------------------------
+
+
+class TestsMonteCarlo(object):
+    #
+    # VARIABLES
+    #
+
+    #
+    # METHODS
+    #
+
+    # -------------------------------------------------------------------------
+    # __init__
+    # -------------------------------------------------------------------------
+    def __init__(self):
+        pass
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # print_info(text)
+    # -------------------------------------------------------------------------
+    def print_info(self, text):
+        print('##############################################################################\n')
+        print(text)
+        print('##############################################################################\n')
+    # -------------------------------------------------------------------------
+
+# -------------------------------------------------------------------------
+#  TESTS FOR MONTE_CARLO.PY
+# -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # monte_carlo__seed_for_run
+    # -------------------------------------------------------------------------
+
+    def monte_carlo__seed_for_run(self, args):
+        import os
+        from src.environment import Environment
+        from src.monte_carlo import seed_for_run
+
+        text = "This test checks monte_carlo.seed_for_run \n"
+        self.print_info(text)
+        #
+        # INITIALIZATION
+        #
+        environment_directory = str(args[0])
+        identifier = str(args[1])
+        log_directory = str(args[2])
+
+        # Configure logging parameters so we get output while the program runs
+        logging.basicConfig(format='%(asctime)s %(message)s', datefmt='%m/%d/%Y %H:%M:%S',
+                            filename=log_directory + identifier + ".log", level=logging.INFO)
+        logging.info('START logging for test monte_carlo__seed_for_run in run: %s',
+                     environment_directory + identifier + ".xml")
+
+        # Construct household filename
+        environment = Environment(environment_directory,  identifier)
+
+        #
+        # TESTING
+        #
+
+        print("Seeds of the first three runs under the sequential policy with base seed 10 (should be 10, 11, 12):")
+        print([seed_for_run("sequential", 10, run_id) for run_id in range(3)])
+        print("Seeds of the first three runs under the fixed policy with base seed 10 (should be 10, 10, 10):")
+        print([seed_for_run("fixed", 10, run_id) for run_id in range(3)])
+        print("Seeds of the first two runs given as a list (should be 7, 3):")
+        print([seed_for_run([7, 3], 0, run_id) for run_id in range(2)])
+        print("Unknown seed policies are refused (should be True):")
+        try:
+            seed_for_run("unknown", 0, 0)
+            print(False)
+        except ValueError:
+            print(True)
+
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # monte_carlo__do_runs
+    # -------------------------------------------------------------------------
+
+    def monte_carlo__do_runs(self, args):
+        import os
+        from src.environment import Environment
+        import csv
+        from src.monte_carlo import MonteCarlo
+
+        text = "This test checks monte_carlo.do_runs \n"
+        self.print_info(text)
+        #
+        # INITIALIZATION
+        #
+        environment_directory = str(args[0])
+        identifier = str(args[1])
+        log_directory = str(args[2])
+
+        # Configure logging parameters so we get output while the program runs
+        logging.basicConfig(format='%(asctime)s %(message)s', datefmt='%m/%d/%Y %H:%M:%S',
+                            filename=log_directory + identifier + ".log", level=logging.INFO)
+        logging.info('START logging for test monte_carlo__do_runs in run: %s',
+                     environment_directory + identifier + ".xml")
+
+        # Construct household filename
+        environment = Environment(environment_directory,  identifier)
+
+        #
+        # TESTING
+        #
+
+        print("Doing two runs of the environment in two worker processes")
+        monte_carlo = MonteCarlo(environment_directory, identifier, num_simulations=2, seed_policy="sequential", base_seed=1, processes=2)
+        output_filename = log_directory + identifier + "_monte_carlo.csv"
+        num_rows = monte_carlo.do_runs(output_filename)
+        print("Number of rows written (should be twice the number of sweeps):")
+        print(num_rows, 2 * int(environment.num_sweeps))
+        with open(output_filename, "r") as output_file:
+            rows = list(csv.reader(output_file))
+        print("Headers of the merged output:")
+        print(rows[0])
+        print("Run ids and seeds of the rows (should be 0 1 for the first run, 1 2 for the second):")
+        print(sorted(set((row[0], row[1]) for row in rows[1:])))
+        os.remove(output_filename)
+
+    # -------------------------------------------------------------------------
@@ -736,3 +736,139 @@ class TestsNetwork(object):
         print("Printing network:")
         print(environment.network)
     # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # network__incremental
+    # -------------------------------------------------------------------------
+
+    def network__incremental(self, args):
+        import os
+        from src.bank import Bank
+        from src.household import Household
+        from src.firm import Firm
+        from src.environment import Environment
+        from src.transaction import Transaction
+        from src.network import Network
+
+        text = "This test checks network.add_transaction \n"
+        self.print_info(text)
+        #
+        # INITIALIZATION
+        #
+        environment_directory = str(args[0])
+        identifier = str(args[1])
+        log_directory = str(args[2])
+
+        # Configure logging parameters so we get output while the program runs
+        logging.basicConfig(format='%(asctime)s %(message)s', datefmt='%m/%d/%Y %H:%M:%S',
+                            filename=log_directory + identifier + ".log", level=logging.INFO)
+        logging.info('START logging for test network__incremental in run: %s',
+                     environment_directory + identifier + ".xml")
+
+        # Construct household filename
+        environment = Environment(environment_directory,  identifier)
+
+        # generate a bank
+        bank = Bank()
+        bank.identifier = "test_bank"
+        environment.banks.append(bank)
+
+        # generate a firm
+        firm = Firm()
+        firm.identifier = "test_firm"
+        environment.firms.append(firm)
+
+        # generate a household
+        household = Household()
+        household.identifier = "test_household"
+        environment.households.append(household)
+
+        #
+        # TESTING
+        #
+
+        environment.static_parameters["incremental_network"] = 1.0
+        environment.network.initialize_networks(environment)
+        print("Number of edges of the incremental network (should be the number of transactions on the books):")
+        print(environment.network.transactions.number_of_edges())
+        environment.new_transaction("deposits", "", "test_household", "test_bank", 100.0, 0.0, 0, -1)
+        transaction = household.accounts[len(household.accounts) - 1]
+        print("Number of edges after adding a transaction (should be one more):")
+        print(environment.network.transactions.number_of_edges())
+        transaction.amount = 700.0
+        print("Amount on the edge of the transaction after changing its amount (should be 700.0):")
+        print(environment.network.transactions[household][bank][transaction.identifier]["amount"])
+        snapshot = environment.network.snapshot()
+        transaction.remove_transaction(environment)
+        print("Number of edges after removing the transaction (should be one less), and of the snapshot taken before:")
+        print(environment.network.transactions.number_of_edges(), snapshot.number_of_edges())
+
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # network__query
+    # -------------------------------------------------------------------------
+
+    def network__query(self, args):
+        import os
+        from src.bank import Bank
+        from src.household import Household
+        from src.firm import Firm
+        from src.environment import Environment
+        from src.transaction import Transaction
+        from src.network import Network
+
+        text = "This test checks network.query \n"
+        self.print_info(text)
+        #
+        # INITIALIZATION
+        #
+        environment_directory = str(args[0])
+        identifier = str(args[1])
+        log_directory = str(args[2])
+
+        # Configure logging parameters so we get output while the program runs
+        logging.basicConfig(format='%(asctime)s %(message)s', datefmt='%m/%d/%Y %H:%M:%S',
+                            filename=log_directory + identifier + ".log", level=logging.INFO)
+        logging.info('START logging for test network__query in run: %s',
+                     environment_directory + identifier + ".xml")
+
+        # Construct household filename
+        environment = Environment(environment_directory,  identifier)
+
+        # generate a bank
+        bank = Bank()
+        bank.identifier = "test_bank"
+        environment.banks.append(bank)
+
+        # generate a firm
+        firm = Firm()
+        firm.identifier = "test_firm"
+        environment.firms.append(firm)
+
+        # generate a household
+        household = Household()
+        household.identifier = "test_household"
+        environment.households.append(household)
+
+        #
+        # TESTING
+        #
+
+        environment.static_parameters["incremental_network"] = 1.0
+        environment.network.initialize_networks(environment)
+        environment.new_transaction("loans", "", "test_bank", "test_household", 100.0, 0.05, 2, -1)
+        environment.new_transaction("loans", "", "test_bank", "test_firm", 300.0, 0.05, 4, -1)
+        environment.new_transaction("deposits", "", "test_household", "test_bank", 200.0, 0.01, 0, -1)
+        print("Number of loans to the test agents between 50 and 200 (should be 1):")
+        print(len([edge for edge in environment.network.query(type_="loans", amount=(50.0, 200.0)) if edge[0] == bank]))
+        print("Number of loans to the test agents with a maturity of at least 3 (should be 1):")
+        print(len([edge for edge in environment.network.query(type_="loans", maturity=(3, None)) if edge[0] == bank]))
+        subnetwork = environment.network.subnetwork_by_type("deposits")
+        print("Subnetwork of deposits, a view of the network:")
+        print(subnetwork.number_of_nodes(), subnetwork.number_of_edges())
+        print("Subnetwork of loans to the test agents between 50 and 400 (should have 3 nodes and 2 edges):")
+        subnetwork = environment.network.subnetwork(type_="loans", amount=(50.0, 400.0), interest=(0.05, 0.05))
+        print(subnetwork.subgraph([bank, household, firm]).number_of_nodes(), subnetwork.subgraph([bank, household, firm]).number_of_edges())
+
+    # -------------------------------------------------------------------------
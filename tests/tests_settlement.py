@@ -0,0 +1,196 @@
+#!/usr/bin/env python
+# [SublimeLinter pep8-max-line-length:150]
+# -*- coding: utf-8 -*-
+
+"""
+black_rhino is a multi-agent simulator for financial network analysis
+Copyright (C) 2016 Co-Pierre Georg (co-pierre.georg@keble.ox.ac.uk)
+Pawel Fiedor (pawel@fiedor.eu)
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, version 3 of the License.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program. If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import logging
+from src.helper import Helper
+
+# -------------------------------------------------------------------------
+#  class Tests
+# -------------------------------------------------------------------------
+
+
+class TestsSettlement(object):
+    #
+    # VARIABLES
+    #
+
+    #
+    # METHODS
+    #
+
+    # -------------------------------------------------------------------------
+    # __init__
+    # -------------------------------------------------------------------------
+    def __init__(self):
+        pass
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # print_info(text)
+    # -------------------------------------------------------------------------
+    def print_info(self, text):
+        print('##############################################################################\n')
+        print(text)
+        print('##############################################################################\n')
+    # -------------------------------------------------------------------------
+
+# -------------------------------------------------------------------------
+#  TESTS FOR SETTLEMENT.PY
+# -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # settlement__add
+    # -------------------------------------------------------------------------
+
+    def settlement__add(self, args):
+        import os
+        from src.bank import Bank
+        from src.household import Household
+        from src.firm import Firm
+        from src.environment import Environment
+        from src.transaction import Transaction
+        from src.settlement import Settlement
+
+        text = "This test checks settlement.add \n"
+        self.print_info(text)
+        #
+        # INITIALIZATION
+        #
+        environment_directory = str(args[0])
+        identifier = str(args[1])
+        log_directory = str(args[2])
+
+        # Configure logging parameters so we get output while the program runs
+        logging.basicConfig(format='%(asctime)s %(message)s', datefmt='%m/%d/%Y %H:%M:%S',
+                            filename=log_directory + identifier + ".log", level=logging.INFO)
+        logging.info('START logging for test settlement__add in run: %s',
+                     environment_directory + identifier + ".xml")
+
+        # Construct household filename
+        environment = Environment(environment_directory,  identifier)
+
+        # generate a bank
+        bank = Bank()
+        bank.identifier = "test_bank"
+        environment.banks.append(bank)
+
+        # generate a firm
+        firm = Firm()
+        firm.identifier = "test_firm"
+        environment.firms.append(firm)
+
+        # generate a household
+        household = Household()
+        household.identifier = "test_household"
+        environment.households.append(household)
+
+        #
+        # TESTING
+        #
+
+        settlement = Settlement(environment)
+        settlement.add("goods", "", "test_household", "test_firm", 2.0, 0.0, 0, -1)
+        settlement.add("goods", "", "test_household", "test_firm", 3.0, 0.0, 0, -1)
+        settlement.add("goods", "", "test_household", "test_firm", 0.0, 0.0, 0, -1)
+        settlement.add("deposits", "", "test_firm", "test_bank", 10.0, 0.01, 0, -1)
+        print("Number of transactions waiting to be posted (should be 2):")
+        print(len(settlement))
+        print("Amount of goods waiting to be posted (should be 5.0):")
+        print(settlement.pending("goods", "test_household", "test_firm"))
+        print("Number of transactions on the books of the firm before posting (should be 0):")
+        print(len(firm.accounts))
+        print("Adding a flow of zero without netting")
+        settlement = Settlement(environment, False)
+        settlement.add("goods", "", "test_household", "test_firm", 0.0, 0.0, 0, -1)
+        print("Number of transactions on the books of the firm (should be 1):")
+        print(len(firm.accounts))
+
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # settlement__post
+    # -------------------------------------------------------------------------
+
+    def settlement__post(self, args):
+        import os
+        from src.bank import Bank
+        from src.household import Household
+        from src.firm import Firm
+        from src.environment import Environment
+        from src.transaction import Transaction
+        from src.settlement import Settlement
+
+        text = "This test checks settlement.post \n"
+        self.print_info(text)
+        #
+        # INITIALIZATION
+        #
+        environment_directory = str(args[0])
+        identifier = str(args[1])
+        log_directory = str(args[2])
+
+        # Configure logging parameters so we get output while the program runs
+        logging.basicConfig(format='%(asctime)s %(message)s', datefmt='%m/%d/%Y %H:%M:%S',
+                            filename=log_directory + identifier + ".log", level=logging.INFO)
+        logging.info('START logging for test settlement__post in run: %s',
+                     environment_directory + identifier + ".xml")
+
+        # Construct household filename
+        environment = Environment(environment_directory,  identifier)
+
+        # generate a bank
+        bank = Bank()
+        bank.identifier = "test_bank"
+        environment.banks.append(bank)
+
+        # generate a firm
+        firm = Firm()
+        firm.identifier = "test_firm"
+        environment.firms.append(firm)
+
+        # generate a household
+        household = Household()
+        household.identifier = "test_household"
+        environment.households.append(household)
+
+        #
+        # TESTING
+        #
+
+        settlement = Settlement(environment)
+        for i in range(10):
+            settlement.add("goods", "", "test_household", "test_firm", 1.0, 0.0, 0, -1)
+            settlement.add("deposits", "", "test_firm", "test_bank", 10.0, 0.01, 0, -1)
+        print("Number of transactions posted for 20 flows (should be 2):")
+        print(settlement.post())
+        print("Number of transactions on the books of the firm (should be 2):")
+        print(len(firm.accounts))
+        print("Goods of the household and deposits of the firm (should be 10.0 and 100.0):")
+        print(household.accounts.get_balance("goods"), firm.accounts.get_balance("deposits"))
+        print("Number of transactions waiting to be posted after posting (should be 0):")
+        print(len(settlement))
+        settlement = Settlement(environment, netting=False)
+        settlement.add("goods", "", "test_household", "test_firm", 1.0, 0.0, 0, -1)
+        print("Number of transactions on the books of the firm after a flow without netting (should be 3):")
+        print(len(firm.accounts))
+
+    # -------------------------------------------------------------------------
@@ -0,0 +1,228 @@
+#!/usr/bin/env python
+# [SublimeLinter pep8-max-line-length:150]
+# -*- coding: utf-8 -*-
+
+"""
+black_rhino is a multi-agent simulator for financial network analysis
+Copyright (C) 2016 Co-Pierre Georg (co-pierre.georg@keble.ox.ac.uk)
+Pawel Fiedor (pawel@fiedor.eu)
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, version 3 of the License.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program. If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import logging
+from src.helper import Helper
+
+# -------------------------------------------------------------------------
+#  class Tests
+# -------------------------------------------------------------------------
+
+
+class TestsSnapshot(object):
+    #
+    # VARIABLES
+    #
+
+    #
+    # METHODS
+    #
+
+    # -------------------------------------------------------------------------
+    # __init__
+    # -------------------------------------------------------------------------
+    def __init__(self):
+        pass
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # print_info(text)
+    # -------------------------------------------------------------------------
+    def print_info(self, text):
+        print('##############################################################################\n')
+        print(text)
+        print('##############################################################################\n')
+    # -------------------------------------------------------------------------
+
+# -------------------------------------------------------------------------
+#  TESTS FOR SNAPSHOT.PY
+# -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # snapshot__config_hash
+    # -------------------------------------------------------------------------
+
+    def snapshot__config_hash(self, args):
+        import os
+        from src.environment import Environment
+        from src.snapshot import config_hash
+
+        text = "This test checks snapshot.config_hash \n"
+        self.print_info(text)
+        #
+        # INITIALIZATION
+        #
+        environment_directory = str(args[0])
+        identifier = str(args[1])
+        log_directory = str(args[2])
+
+        # Configure logging parameters so we get output while the program runs
+        logging.basicConfig(format='%(asctime)s %(message)s', datefmt='%m/%d/%Y %H:%M:%S',
+                            filename=log_directory + identifier + ".log", level=logging.INFO)
+        logging.info('START logging for test snapshot__config_hash in run: %s',
+                     environment_directory + identifier + ".xml")
+
+        # Construct household filename
+        environment = Environment(environment_directory,  identifier)
+
+        #
+        # TESTING
+        #
+
+        print("Hash of the config files of the environment")
+        print(config_hash(environment_directory, identifier))
+        print("Hashing again gives the same value (should be True):")
+        print(config_hash(environment_directory, identifier) == config_hash(environment_directory, identifier))
+
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # snapshot__save_and_restore
+    # -------------------------------------------------------------------------
+
+    def snapshot__save_and_restore(self, args):
+        import os
+        from src.environment import Environment
+        from src.snapshot import config_hash
+
+        text = "This test checks environment.save_snapshot and environment.restore_snapshot \n"
+        self.print_info(text)
+        #
+        # INITIALIZATION
+        #
+        environment_directory = str(args[0])
+        identifier = str(args[1])
+        log_directory = str(args[2])
+
+        # Configure logging parameters so we get output while the program runs
+        logging.basicConfig(format='%(asctime)s %(message)s', datefmt='%m/%d/%Y %H:%M:%S',
+                            filename=log_directory + identifier + ".log", level=logging.INFO)
+        logging.info('START logging for test snapshot__save_and_restore in run: %s',
+                     environment_directory + identifier + ".xml")
+
+        # Construct household filename
+        environment = Environment(environment_directory,  identifier)
+
+        #
+        # TESTING
+        #
+
+        print("Saving the environment to a snapshot")
+        environment.save_snapshot(log_directory + identifier + ".snapshot", config_hash(environment_directory, identifier))
+        print("Restoring it into another environment")
+        from src.snapshot import read_snapshot
+        restored = Environment(environment_directory,  identifier)
+        restored.restore_snapshot(read_snapshot(log_directory + identifier + ".snapshot"))
+        print("Number of banks, firms and households (should be 3, 3, 3):")
+        print(len(restored.banks))
+        print(len(restored.firms))
+        print(len(restored.households))
+        print("Deposits of the bank with id bank_test_config_id in both environments (should be the same):")
+        print(environment.get_agent_by_id("bank_test_config_id").get_account("deposits"))
+        print(restored.get_agent_by_id("bank_test_config_id").get_account("deposits"))
+
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # snapshot__restore_into_initialized
+    # -------------------------------------------------------------------------
+
+    def snapshot__restore_into_initialized(self, args):
+        import os
+        from src.environment import Environment
+        from src.snapshot import read_snapshot
+
+        text = "This test checks environment.restore_snapshot on an initialized environment \n"
+        self.print_info(text)
+        #
+        # INITIALIZATION
+        #
+        environment_directory = str(args[0])
+        identifier = str(args[1])
+        log_directory = str(args[2])
+
+        # Configure logging parameters so we get output while the program runs
+        logging.basicConfig(format='%(asctime)s %(message)s', datefmt='%m/%d/%Y %H:%M:%S',
+                            filename=log_directory + identifier + ".log", level=logging.INFO)
+        logging.info('START logging for test snapshot__restore_into_initialized in run: %s',
+                     environment_directory + identifier + ".xml")
+
+        # Construct household filename
+        environment = Environment(environment_directory,  identifier)
+
+        #
+        # TESTING
+        #
+
+        print("Deposits of the bank with id bank_test_config_id before the snapshot:")
+        print(environment.get_agent_by_id("bank_test_config_id").get_account("deposits"))
+        environment.save_snapshot(log_directory + identifier + ".snapshot")
+        print("Restoring the snapshot into the same environment, the agents are refilled to the same numbers")
+        environment.restore_snapshot(read_snapshot(log_directory + identifier + ".snapshot"))
+        print("Is the bank looked up by id the restored bank (should be True):")
+        bank = [bank for bank in environment.banks if bank.identifier == "bank_test_config_id"][0]
+        print(environment.get_agent_by_id("bank_test_config_id") is bank)
+        print("Deposits of the restored bank (should be the same as before):")
+        print(bank.get_account("deposits"))
+
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # snapshot__initialize_from_snapshot
+    # -------------------------------------------------------------------------
+
+    def snapshot__initialize_from_snapshot(self, args):
+        import os
+        from src.environment import Environment
+
+        text = "This test checks environment.initialize_from_snapshot \n"
+        self.print_info(text)
+        #
+        # INITIALIZATION
+        #
+        environment_directory = str(args[0])
+        identifier = str(args[1])
+        log_directory = str(args[2])
+
+        # Configure logging parameters so we get output while the program runs
+        logging.basicConfig(format='%(asctime)s %(message)s', datefmt='%m/%d/%Y %H:%M:%S',
+                            filename=log_directory + identifier + ".log", level=logging.INFO)
+        logging.info('START logging for test snapshot__initialize_from_snapshot in run: %s',
+                     environment_directory + identifier + ".xml")
+
+        # Construct household filename
+        environment = Environment(environment_directory,  identifier)
+
+        #
+        # TESTING
+        #
+
+        print("Removing an old snapshot if there is one")
+        if os.path.isfile(log_directory + identifier + ".snapshot"):
+            os.remove(log_directory + identifier + ".snapshot")
+        print("Initializing from the config files and saving the snapshot (should be False):")
+        print(environment.initialize_from_snapshot(environment_directory, identifier, log_directory))
+        print("Initializing from the snapshot (should be True):")
+        print(environment.initialize_from_snapshot(environment_directory, identifier, log_directory))
+        print(environment.get_agent_by_id("bank_test_config_id"))
+
+    # -------------------------------------------------------------------------
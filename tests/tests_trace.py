@@ -0,0 +1,128 @@
+#!/usr/bin/env python
+# [SublimeLinter pep8-max-line-length:150]
+# -*- coding: utf-8 -*-
+
+"""
+black_rhino is a multi-agent simulator for financial network analysis
+Copyright (C) 2016 Co-Pierre Georg (co-pierre.georg@keble.ox.ac.uk)
+Pawel Fiedor (pawel@fiedor.eu)
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, version 3 of the License.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program. If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import logging
+from src.helper import Helper
+
+# -------------------------------------------------------------------------
+#  class Tests
+# -------------------------------------------------------------------------
+
+
+class TestsTrace(object):
+    #
+    # VARIABLES
+    #
+
+    #
+    # METHODS
+    #
+
+    # -------------------------------------------------------------------------
+    # __init__
+    # -------------------------------------------------------------------------
+    def __init__(self):
+        pass
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # print_info(text)
+    # -------------------------------------------------------------------------
+    def print_info(self, text):
+        print('##############################################################################\n')
+        print(text)
+        print('##############################################################################\n')
+    # -------------------------------------------------------------------------
+
+# -------------------------------------------------------------------------
+#  TESTS FOR TRACE
+# -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # trace__trade
+    # -------------------------------------------------------------------------
+
+    def trace__trade(self, args):
+        import os
+        from src.bank import Bank
+        from src.household import Household
+        from src.firm import Firm
+        from src.environment import Environment
+        from src.transaction import Transaction
+        from src.trace import Trace, read_trace, TRACE_OFF, TRACE_TRADES
+
+        text = "This test checks trace.trade \n"
+        self.print_info(text)
+        #
+        # INITIALIZATION
+        #
+        environment_directory = str(args[0])
+        identifier = str(args[1])
+        log_directory = str(args[2])
+
+        # Configure logging parameters so we get output while the program runs
+        logging.basicConfig(format='%(asctime)s %(message)s', datefmt='%m/%d/%Y %H:%M:%S',
+                            filename=log_directory + identifier + ".log", level=logging.INFO)
+        logging.info('START logging for test trace__trade in run: %s',
+                     environment_directory + identifier + ".xml")
+
+        # Construct household filename
+        environment = Environment(environment_directory,  identifier)
+
+        # generate a bank
+        bank = Bank()
+        bank.identifier = "test_bank"
+        environment.banks.append(bank)
+
+        # generate a firm
+        firm = Firm()
+        firm.identifier = "test_firm"
+        environment.firms.append(firm)
+
+        # generate a household
+        household = Household()
+        household.identifier = "test_household"
+        environment.households.append(household)
+
+        #
+        # TESTING
+        #
+
+        trace = Trace(TRACE_OFF, log_directory + identifier + "-trace.bin")
+        print("A trace switched off reports neither sweeps nor trades, and opens no file:")
+        print(trace.sweeps, trace.trades, trace.file)
+        trace.close()
+
+        filename = log_directory + identifier + "-trace.bin"
+        trace = Trace(TRACE_TRADES, filename)
+        trace.trade("labour", "test_household", "test_firm", 8.0, 1.5, 0)
+        trace.trade("goods", "test_firm", "test_household", 4.0, 2.5, 0)
+        trace.trade("labour", "test_household", "test_firm", 6.0, 1.25, 1)
+        trace.close()
+        print("The trades read back from the trace file (time, good, seller, buyer, quantity, price):")
+        for trade in read_trace(filename):
+            print(trade)
+        print("The size of the file, with the names of the goods and the agents written once each:")
+        print(os.path.getsize(filename))
+        os.remove(filename)
+
+    # -------------------------------------------------------------------------
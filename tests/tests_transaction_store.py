@@ -0,0 +1,442 @@
+#!/usr/bin/env python
+# [SublimeLinter pep8-max-line-length:150]
+# -*- coding: utf-8 -*-
+
+"""
+black_rhino is a multi-agent simulator for financial network analysis
+Copyright (C) 2016 Co-Pierre Georg (co-pierre.georg@keble.ox.ac.uk)
+Pawel Fiedor (pawel@fiedor.eu)
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, version 3 of the License.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program. If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import logging
+from src.helper import Helper
+
+# -------------------------------------------------------------------------
+#  class Tests
+# -------------------------------------------------------------------------
+
+
+class TestsTransactionStore(object):
+    #
+    # VARIABLES
+    #
+
+    #
+    # METHODS
+    #
+
+    # -------------------------------------------------------------------------
+    # __init__
+    # -------------------------------------------------------------------------
+    def __init__(self):
+        pass
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # print_info(text)
+    # -------------------------------------------------------------------------
+    def print_info(self, text):
+        print('##############################################################################\n')
+        print(text)
+        print('##############################################################################\n')
+    # -------------------------------------------------------------------------
+
+# -------------------------------------------------------------------------
+#  TESTS FOR TRANSACTION_STORE.PY
+# -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # transaction_store__bind
+    # -------------------------------------------------------------------------
+
+    def transaction_store__bind(self, args):
+        import os
+        from src.bank import Bank
+        from src.household import Household
+        from src.firm import Firm
+        from src.environment import Environment
+        from src.transaction import Transaction
+        from src.transaction_store import TransactionStore
+
+        text = "This test checks transaction_store.bind \n"
+        self.print_info(text)
+        #
+        # INITIALIZATION
+        #
+        environment_directory = str(args[0])
+        identifier = str(args[1])
+        log_directory = str(args[2])
+
+        # Configure logging parameters so we get output while the program runs
+        logging.basicConfig(format='%(asctime)s %(message)s', datefmt='%m/%d/%Y %H:%M:%S',
+                            filename=log_directory + identifier + ".log", level=logging.INFO)
+        logging.info('START logging for test transaction_store__bind in run: %s',
+                     environment_directory + identifier + ".xml")
+
+        # Construct household filename
+        environment = Environment(environment_directory,  identifier)
+
+        # generate a bank
+        bank = Bank()
+        bank.identifier = "test_bank"
+        environment.banks.append(bank)
+
+        # generate a firm
+        firm = Firm()
+        firm.identifier = "test_firm"
+        environment.firms.append(firm)
+
+        # generate a household
+        household = Household()
+        household.identifier = "test_household"
+        environment.households.append(household)
+
+        #
+        # TESTING
+        #
+
+        print("Creating a deposit and binding it to a columnar store")
+        environment.transaction_store = TransactionStore()
+        environment.new_transaction("deposits", "", "test_household", "test_bank", 10.0,  0.02,  0, -1)
+        transaction = bank.accounts[0]
+        print("The row of the transaction in the store:")
+        print(transaction.row)
+        print("The amount read from the store (should be 10.0):")
+        print(transaction.amount)
+        print("Changing the amount to 20.0 through set_amount")
+        transaction.set_amount(20.0, environment)
+        print("The amount in the table and the balance of the bank (should be 20.0):")
+        print(environment.transaction_store.table["amount"][transaction.row])
+        print(bank.accounts.get_balance("deposits"))
+
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # transaction_store__sync
+    # -------------------------------------------------------------------------
+
+    def transaction_store__sync(self, args):
+        import os
+        from src.bank import Bank
+        from src.household import Household
+        from src.firm import Firm
+        from src.environment import Environment
+        from src.transaction import Transaction
+        from src.transaction_store import TransactionStore
+
+        text = "This test checks transaction_store.sync \n"
+        self.print_info(text)
+        #
+        # INITIALIZATION
+        #
+        environment_directory = str(args[0])
+        identifier = str(args[1])
+        log_directory = str(args[2])
+
+        # Configure logging parameters so we get output while the program runs
+        logging.basicConfig(format='%(asctime)s %(message)s', datefmt='%m/%d/%Y %H:%M:%S',
+                            filename=log_directory + identifier + ".log", level=logging.INFO)
+        logging.info('START logging for test transaction_store__sync in run: %s',
+                     environment_directory + identifier + ".xml")
+
+        # Construct household filename
+        environment = Environment(environment_directory,  identifier)
+
+        # generate a bank
+        bank = Bank()
+        bank.identifier = "test_bank"
+        environment.banks.append(bank)
+
+        # generate a firm
+        firm = Firm()
+        firm.identifier = "test_firm"
+        environment.firms.append(firm)
+
+        # generate a household
+        household = Household()
+        household.identifier = "test_household"
+        environment.households.append(household)
+
+        #
+        # TESTING
+        #
+
+        print("Creating a deposit and a loan outside of the store")
+        transaction = Transaction()
+        transaction.add_transaction("deposits", "", "test_household", "test_bank", 10.0,  0.1,  0, -1, environment)
+        transaction = Transaction()
+        transaction.add_transaction("loans", "", "test_bank", "test_firm", 20.0,  0.2,  0, -1, environment)
+        print("Binding them to the store through sync")
+        environment.transaction_store = TransactionStore()
+        environment.transaction_store.sync(environment)
+        print("Number of transactions in the store:")
+        print(len(environment.transaction_store))
+        print("Accruing interests")
+        environment.accrue_interests()
+        print("Deposits of the household (should be 11.0):")
+        print(household.accounts.get_balance("deposits"))
+        print("Loans of the firm (should be 24.0):")
+        print(firm.accounts.get_balance("loans"))
+
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # transaction_store__revalue
+    # -------------------------------------------------------------------------
+
+    def transaction_store__revalue(self, args):
+        import os
+        from src.bank import Bank
+        from src.household import Household
+        from src.firm import Firm
+        from src.environment import Environment
+        from src.transaction import Transaction
+        from src.transaction_store import TransactionStore
+
+        text = "This test checks transaction_store.revalue \n"
+        self.print_info(text)
+        #
+        # INITIALIZATION
+        #
+        environment_directory = str(args[0])
+        identifier = str(args[1])
+        log_directory = str(args[2])
+
+        # Configure logging parameters so we get output while the program runs
+        logging.basicConfig(format='%(asctime)s %(message)s', datefmt='%m/%d/%Y %H:%M:%S',
+                            filename=log_directory + identifier + ".log", level=logging.INFO)
+        logging.info('START logging for test transaction_store__revalue in run: %s',
+                     environment_directory + identifier + ".xml")
+
+        # Construct household filename
+        environment = Environment(environment_directory,  identifier)
+
+        # generate a bank
+        bank = Bank()
+        bank.identifier = "test_bank"
+        environment.banks.append(bank)
+
+        # generate a firm
+        firm = Firm()
+        firm.identifier = "test_firm"
+        environment.firms.append(firm)
+
+        # generate a household
+        household = Household()
+        household.identifier = "test_household"
+        environment.households.append(household)
+
+        #
+        # TESTING
+        #
+
+        print("Creating investments of the bank into MBS and ABS")
+        environment.transaction_store = TransactionStore()
+        environment.new_transaction("investment", "MBS", "test_bank", "test_firm", 100.0,  0.0,  0, -1)
+        environment.new_transaction("investment", "ABS", "test_bank", "test_firm", 100.0,  0.0,  0, -1)
+        print("Revaluing with returns of 10% on MBS and -10% on ABS")
+        environment.transaction_store.revalue("investment", {"MBS": 0.1, "ABS": -0.1}, environment.banks)
+        print("MBS and ABS of the bank (should be 110.0 and 90.0):")
+        print(bank.accounts.get_balance("investment", asset="MBS"))
+        print(bank.accounts.get_balance("investment", asset="ABS"))
+
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # transaction_store__revalue_between_banks
+    # -------------------------------------------------------------------------
+
+    def transaction_store__revalue_between_banks(self, args):
+        import os
+        from src.bank import Bank
+        from src.environment import Environment
+        from src.transaction import Transaction
+        from src.transaction_store import TransactionStore
+
+        text = "This test checks transaction_store.revalue with investments between banks \n"
+        self.print_info(text)
+        #
+        # INITIALIZATION
+        #
+        environment_directory = str(args[0])
+        identifier = str(args[1])
+        log_directory = str(args[2])
+
+        # Configure logging parameters so we get output while the program runs
+        logging.basicConfig(format='%(asctime)s %(message)s', datefmt='%m/%d/%Y %H:%M:%S',
+                            filename=log_directory + identifier + ".log", level=logging.INFO)
+        logging.info('START logging for test transaction_store__revalue_between_banks in run: %s',
+                     environment_directory + identifier + ".xml")
+
+        # Construct household filename
+        environment = Environment(environment_directory,  identifier)
+
+        # generate two banks
+        bank = Bank()
+        bank.identifier = "test_bank"
+        environment.banks.append(bank)
+        other_bank = Bank()
+        other_bank.identifier = "test_other_bank"
+        environment.banks.append(other_bank)
+
+        #
+        # TESTING
+        #
+
+        print("Creating an investment of one bank in the other, without and with the store")
+        environment.network.rebuild(environment)
+        environment.new_transaction("investment", "MBS", "test_bank", "test_other_bank", 100.0,  0.0,  0, -1)
+        for holder in [bank, other_bank]:
+            for tranx in holder.accounts.filter("investment", asset="MBS"):
+                tranx.set_amount(tranx.amount * 1.1, environment)
+        print("Revalued once for each bank by the loop over their accounts:")
+        print(bank.accounts.get_balance("investment", asset="MBS"))
+        environment.transaction_store = TransactionStore()
+        environment.new_transaction("investment", "ABS", "test_bank", "test_other_bank", 100.0,  0.0,  0, -1)
+        environment.transaction_store.revalue("investment", {"ABS": 0.1}, environment.banks)
+        print("Revalued by the store (should be the same):")
+        print(bank.accounts.get_balance("investment", asset="ABS"))
+        print("Amount on the edge of the network (should be the same):")
+        for tranx in bank.accounts.filter("investment", asset="ABS"):
+            print(environment.network.transactions[tranx.from_][tranx.to][tranx.identifier]["amount"])
+
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # transaction_store__refresh_balances
+    # -------------------------------------------------------------------------
+
+    def transaction_store__refresh_balances(self, args):
+        import os
+        from src.bank import Bank
+        from src.household import Household
+        from src.firm import Firm
+        from src.environment import Environment
+        from src.transaction import Transaction
+        from src.transaction_store import TransactionStore
+
+        text = "This test checks transaction_store.refresh_balances \n"
+        self.print_info(text)
+        #
+        # INITIALIZATION
+        #
+        environment_directory = str(args[0])
+        identifier = str(args[1])
+        log_directory = str(args[2])
+
+        # Configure logging parameters so we get output while the program runs
+        logging.basicConfig(format='%(asctime)s %(message)s', datefmt='%m/%d/%Y %H:%M:%S',
+                            filename=log_directory + identifier + ".log", level=logging.INFO)
+        logging.info('START logging for test transaction_store__refresh_balances in run: %s',
+                     environment_directory + identifier + ".xml")
+
+        # Construct household filename
+        environment = Environment(environment_directory,  identifier)
+
+        # generate a bank
+        bank = Bank()
+        bank.identifier = "test_bank"
+        environment.banks.append(bank)
+
+        # generate a firm
+        firm = Firm()
+        firm.identifier = "test_firm"
+        environment.firms.append(firm)
+
+        # generate a household
+        household = Household()
+        household.identifier = "test_household"
+        environment.households.append(household)
+
+        #
+        # TESTING
+        #
+
+        print("Creating a deposit of 100.0 with interest 0.1 bound to the store")
+        environment.transaction_store = TransactionStore()
+        environment.new_transaction("deposits", "", "test_household", "test_bank", 100.0,  0.1,  0, -1)
+        print("Creating a deposit of 50.0 without interest which is not bound to the store")
+        store = environment.transaction_store
+        environment.transaction_store = None
+        environment.new_transaction("deposits", "", "test_household", "test_bank", 50.0,  0.0,  0, -1)
+        environment.transaction_store = store
+        store.accrue_interests()
+        print("Deposits of the household, the unbound deposit is kept (should be 160.0):")
+        print(household.get_account("deposits"))
+
+    # -------------------------------------------------------------------------
+
+    # -------------------------------------------------------------------------
+    # transaction_store__unbind
+    # -------------------------------------------------------------------------
+
+    def transaction_store__unbind(self, args):
+        import os
+        from src.bank import Bank
+        from src.household import Household
+        from src.firm import Firm
+        from src.environment import Environment
+        from src.transaction import Transaction
+        from src.transaction_store import TransactionStore
+
+        text = "This test checks transaction_store.unbind \n"
+        self.print_info(text)
+        #
+        # INITIALIZATION
+        #
+        environment_directory = str(args[0])
+        identifier = str(args[1])
+        log_directory = str(args[2])
+
+        # Configure logging parameters so we get output while the program runs
+        logging.basicConfig(format='%(asctime)s %(message)s', datefmt='%m/%d/%Y %H:%M:%S',
+                            filename=log_directory + identifier + ".log", level=logging.INFO)
+        logging.info('START logging for test transaction_store__unbind in run: %s',
+                     environment_directory + identifier + ".xml")
+
+        # Construct household filename
+        environment = Environment(environment_directory,  identifier)
+
+        # generate a bank
+        bank = Bank()
+        bank.identifier = "test_bank"
+        environment.banks.append(bank)
+
+        # generate a firm
+        firm = Firm()
+        firm.identifier = "test_firm"
+        environment.firms.append(firm)
+
+        # generate a household
+        household = Household()
+        household.identifier = "test_household"
+        environment.households.append(household)
+
+        #
+        # TESTING
+        #
+
+        print("Creating a deposit bound to the store")
+        environment.transaction_store = TransactionStore()
+        environment.new_transaction("deposits", "", "test_household", "test_bank", 10.0,  0.02,  0, -1)
+        transaction = bank.accounts[0]
+        print("Removing the transaction")
+        transaction.remove_transaction(environment)
+        print("Number of transactions in the store (should be 0):")
+        print(len(environment.transaction_store))
+        print("The amount of the transaction after unbinding (should be 10.0):")
+        print(transaction.amount)
+
+    # -------------------------------------------------------------------------